@@ -2,6 +2,8 @@
 import warnings
 
 from .async_webcrawler import AsyncWebCrawler, CacheMode
+from .cache_context import CachePolicy, EvictionStrategy
+from .cache_backend import CacheBackend, LocalCacheBackend, RedisCacheBackend
 # MODIFIED: Add SeedingConfig and VirtualScrollConfig here
 from .async_configs import BrowserConfig, CrawlerRunConfig, HTTPCrawlerConfig, LLMConfig, ProxyConfig, GeolocationConfig, SeedingConfig, VirtualScrollConfig, LinkPreviewConfig, MatchMode
 
@@ -49,8 +51,16 @@ from .async_dispatcher import (
     MemoryAdaptiveDispatcher,
     SemaphoreDispatcher,
     RateLimiter,
+    RateLimitStore,
+    MemoryRateLimitStore,
+    SQLiteRateLimitStore,
+    ConcurrencyController,
+    MemoryAccountant,
+    RetryPolicy,
+    DistributedDispatcher,
     BaseDispatcher,
 )
+from .work_queue import WorkQueue, SQLiteWorkQueue, RedisWorkQueue
 from .docker_client import Crawl4aiDockerClient
 from .hub import CrawlerHub
 from .browser_profiler import BrowserProfiler
@@ -149,6 +159,11 @@ __all__ = [
     "CrawlResult",
     "CrawlerHub",
     "CacheMode",
+    "CachePolicy",
+    "CacheBackend",
+    "LocalCacheBackend",
+    "RedisCacheBackend",
+    "EvictionStrategy",
     "MatchMode",
     "ContentScrapingStrategy",
     "WebScrapingStrategy",
@@ -177,6 +192,16 @@ __all__ = [
     "MemoryAdaptiveDispatcher",
     "SemaphoreDispatcher",
     "RateLimiter",
+    "RateLimitStore",
+    "MemoryRateLimitStore",
+    "SQLiteRateLimitStore",
+    "ConcurrencyController",
+    "MemoryAccountant",
+    "RetryPolicy",
+    "DistributedDispatcher",
+    "WorkQueue",
+    "SQLiteWorkQueue",
+    "RedisWorkQueue",
     "CrawlerMonitor",
     "LinkPreview",
     "DisplayMode",
@@ -3,6 +3,7 @@ import functools
 import importlib
 import os
 import warnings
+from concurrent.futures import Executor
 import requests
 from .config import (
     DEFAULT_PROVIDER,
@@ -594,11 +595,29 @@ class BrowserConfig:
                                         process to reclaim leaked memory. 0 = disabled.
                                         Recommended: 500-1000 for long-running crawlers.
                                         Default: 0.
+        page_pool_size (int): Number of idle pages kept open per browser context and reused by
+                              later crawls with the same context, instead of opening a new page
+                              for every crawl. Pages are reset (about:blank, sessionStorage,
+                              extra headers, viewport) between uses. Page-level state added by
+                              hooks, such as routes or listeners, is not reset. 0 = disabled.
+                              Default: 0.
+        page_pool_max_uses (int): Number of crawls a pooled page serves before it is closed and
+                                  replaced by a new one. Default: 50.
+        browser_shards (int): Number of browser processes one crawler launches and spreads new
+                              pages over, picking the shard with the fewest open pages, the
+                              fastest recent page creation and the lowest RSS. Each shard has its
+                              own Playwright driver, contexts and recycling, so
+                              max_pages_before_recycle and page_pool_size apply per shard. Ignored
+                              for CDP, managed and persistent browsers. Default: 1.
         avoid_ads (bool): If True, blocks ad-related and tracker network requests at the
                           browser context level using a curated blocklist of top ad/tracker
                           domains. Default: False.
         avoid_css (bool): If True, blocks loading of CSS files (css, less, scss, sass) to
                           reduce resource usage and speed up crawling. Default: False.
+        blocked_resource_types (list of str or None): Playwright resource types to block in every
+                                                      context, e.g. ["image", "font", "media", "xhr"].
+                                                      Unlike the URL-based flags above, these rules
+                                                      inspect every request. Default: None.
     """
 
     def __init__(
@@ -649,9 +668,13 @@ class BrowserConfig:
         enable_stealth: bool = False,
         avoid_ads: bool = False,
         avoid_css: bool = False,
+        blocked_resource_types: List[str] = None,
         init_scripts: List[str] = None,
         memory_saving_mode: bool = False,
         max_pages_before_recycle: int = 0,
+        page_pool_size: int = 0,
+        page_pool_max_uses: int = 50,
+        browser_shards: int = 1,
     ):
         
         self.browser_type = browser_type
@@ -716,9 +739,13 @@ class BrowserConfig:
         self.enable_stealth = enable_stealth
         self.avoid_ads = avoid_ads
         self.avoid_css = avoid_css
+        self.blocked_resource_types = blocked_resource_types or []
         self.init_scripts = init_scripts if init_scripts is not None else []
         self.memory_saving_mode = memory_saving_mode
         self.max_pages_before_recycle = max_pages_before_recycle
+        self.page_pool_size = page_pool_size
+        self.page_pool_max_uses = page_pool_max_uses
+        self.browser_shards = browser_shards
 
         fa_user_agenr_generator = ValidUAGenerator()
         if self.user_agent_mode == "random":
@@ -811,9 +838,13 @@ class BrowserConfig:
             "enable_stealth": self.enable_stealth,
             "avoid_ads": self.avoid_ads,
             "avoid_css": self.avoid_css,
+            "blocked_resource_types": self.blocked_resource_types,
             "init_scripts": self.init_scripts,
             "memory_saving_mode": self.memory_saving_mode,
             "max_pages_before_recycle": self.max_pages_before_recycle,
+            "page_pool_size": self.page_pool_size,
+            "page_pool_max_uses": self.page_pool_max_uses,
+            "browser_shards": self.browser_shards,
         }
 
 
@@ -1243,6 +1274,24 @@ class CrawlerRunConfig():
                                       Default: False.
         cache_validation_timeout (float): Timeout in seconds for cache validation HTTP requests.
                                           Default: 10.0.
+        skip_near_duplicates (bool): If True, a freshly crawled page whose content fingerprint
+                                     (SimHash of its markdown) is close to a cached page's is
+                                     marked with `duplicate_of`. Extraction is skipped, deep
+                                     crawls don't follow its links and the page is cached as a
+                                     stub served with the content of the page it duplicates.
+                                     Pages are only fingerprinted when this is on.
+                                     Default: False.
+        near_duplicate_distance (int): Maximum fingerprint distance (differing bits out of 64)
+                                       for a page to count as a near duplicate. Default: 3.
+
+        # Processing Parameters
+        processing_executor (concurrent.futures.Executor or None): Executor (typically a
+                                      ProcessPoolExecutor) that runs scraping, markdown generation
+                                      and sync extraction strategies off the event loop. Strategies
+                                      are shipped to the worker as picklable copies, so state they
+                                      accumulate there does not come back. Overrides the crawler's
+                                      processing_executor. Not serialized by dump().
+                                      Default: None.
 
         # Page Navigation and Timing Parameters
         wait_until (str): The condition to wait for when navigating, e.g. "domcontentloaded".
@@ -1381,6 +1430,15 @@ class CrawlerRunConfig():
         user_agent_generator_config (dict or None): Configuration for user agent generation if user_agent_mode is set.
                                                     Default: None.
 
+        # Scheduling Parameters
+        priority_class (str): Priority class of the URLs crawled with this config, as listed in
+                              MemoryAdaptiveDispatcher's `priority_classes` (e.g. "interactive" or "bulk").
+                              Default: "default".
+        deadline (float or None): Seconds after a URL is queued by arun_many by which its crawl must
+                                  start; URLs still waiting at their deadline are dropped with a failed
+                                  result. None means no deadline.
+                                  Default: None.
+
         # Experimental Parameters
         experimental (dict): Dictionary containing experimental parameters that are in beta phase.
                             This allows passing temporary features that are not yet fully integrated 
@@ -1437,6 +1495,11 @@ class CrawlerRunConfig():
         # Cache Validation Parameters (Smart Cache)
         check_cache_freshness: bool = False,
         cache_validation_timeout: float = 10.0,
+        # Near-duplicate detection
+        skip_near_duplicates: bool = False,
+        near_duplicate_distance: int = 3,
+        # Processing Parameters
+        processing_executor: Optional[Executor] = None,
         # Page Navigation and Timing Parameters
         wait_until: str = "domcontentloaded",
         page_timeout: int = PAGE_TIMEOUT,
@@ -1511,6 +1574,9 @@ class CrawlerRunConfig():
         # URL Matching Parameters
         url_matcher: Optional[UrlMatcher] = None,
         match_mode: MatchMode = MatchMode.OR,
+        # Scheduling Parameters
+        priority_class: str = "default",
+        deadline: Optional[float] = None,
         # Experimental Parameters
         experimental: Dict[str, Any] = None,
         # Anti-Bot Retry Parameters
@@ -1565,6 +1631,12 @@ class CrawlerRunConfig():
         # Cache Validation (Smart Cache)
         self.check_cache_freshness = check_cache_freshness
         self.cache_validation_timeout = cache_validation_timeout
+        # Near-duplicate detection
+        self.skip_near_duplicates = skip_near_duplicates
+        self.near_duplicate_distance = near_duplicate_distance
+
+        # Processing Parameters
+        self.processing_executor = processing_executor
 
         # Page Navigation and Timing Parameters
         self.wait_until = wait_until
@@ -1706,6 +1778,10 @@ class CrawlerRunConfig():
         # URL Matching Parameters
         self.url_matcher = url_matcher
         self.match_mode = match_mode
+
+        # Scheduling Parameters
+        self.priority_class = priority_class
+        self.deadline = deadline
         
         # Experimental Parameters
         self.experimental = experimental or {}
@@ -1933,6 +2009,9 @@ class CrawlerRunConfig():
             "no_cache_read": self.no_cache_read,
             "no_cache_write": self.no_cache_write,
             "shared_data": self.shared_data,
+            "skip_near_duplicates": self.skip_near_duplicates,
+            "near_duplicate_distance": self.near_duplicate_distance,
+            "processing_executor": self.processing_executor,
             "wait_until": self.wait_until,
             "page_timeout": self.page_timeout,
             "wait_for": self.wait_for,
@@ -1992,6 +2071,8 @@ class CrawlerRunConfig():
             "url": self.url,
             "url_matcher": self.url_matcher,
             "match_mode": self.match_mode,
+            "priority_class": self.priority_class,
+            "deadline": self.deadline,
             "experimental": self.experimental,
             "max_retries": self.max_retries,
         }
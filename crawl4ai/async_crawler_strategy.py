@@ -1186,20 +1186,49 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
             if not config.session_id:
                 # ALWAYS decrement refcount first — must succeed even if
                 # the browser crashed or the page is in a bad state.
+                pooled = False
                 try:
-                    await self.browser_manager.release_page_with_context(page)
+                    pooled = await self.browser_manager.release_page_with_context(
+                        page, reusable=self._page_is_reusable(config)
+                    )
                 except Exception:
                     pass
 
-                # Close the page unless it's the last one in a headless/managed browser
+                # Close the page unless it went back to the page pool or it's
+                # the last one in a headless/managed browser
                 try:
                     all_contexts = page.context.browser.contexts
                     total_pages = sum(len(context.pages) for context in all_contexts)
-                    if not (total_pages <= 1 and (self.browser_config.use_managed_browser or self.browser_config.headless)):
+                    if not pooled and not (total_pages <= 1 and (self.browser_config.use_managed_browser or self.browser_config.headless)):
                         await page.close()
                 except Exception:
                     pass
 
+    def _page_is_reusable(self, config: CrawlerRunConfig) -> bool:
+        """
+        Whether a page used by this crawl can go back to the browser's page pool.
+
+        Downloads, viewport emulation, console/network capture and page-level hooks
+        can leave listeners, routes, init scripts and device overrides on the page
+        that a reset does not remove, so those pages are closed.
+        """
+        if self.browser_config.page_pool_size <= 0 or self.browser_config.accept_downloads:
+            return False
+        if any(
+            hook is not None
+            for hook_type, hook in self.hooks.items()
+            if hook_type != "on_browser_created"
+        ):
+            return False
+        return not (
+            config.screenshot
+            or config.pdf
+            or config.adjust_viewport_to_content
+            or config.capture_console_messages
+            or config.capture_network_requests
+            or config.experimental.get("use_csp_nonce")
+        )
+
     # async def _handle_full_page_scan(self, page: Page, scroll_delay: float = 0.1):
     async def _handle_full_page_scan(self, page: Page, scroll_delay: float = 0.1, max_scroll_steps: Optional[int] = None):
         """
@@ -3,16 +3,21 @@ import time
 from pathlib import Path
 import aiosqlite
 import asyncio
-from typing import Optional, Dict
+from typing import Awaitable, Callable, Optional, Dict, Iterable, List, Set, Union
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from collections import Counter
 import json
-from .models import CrawlResult, MarkdownGenerationResult, StringCompatibleMarkdown
-import aiofiles
+from urllib.parse import urlparse
+from .models import CrawlResult, MarkdownGenerationResult, StringCompatibleMarkdown, LAZY_RESULT_FIELDS
 from .async_logger import AsyncLogger
+from .content_store import ContentStore, MissingContentError, create_content_store
+from .cache_context import CachePolicy, EvictionStrategy
 
-from .utils import ensure_content_dirs, generate_content_hash
+from .utils import ensure_content_dirs
 from .utils import VersionManager
 from .utils import get_error_context, create_box_message
+from .utils import simhash_distance
 
 base_directory = DB_PATH = os.path.join(
     os.getenv("CRAWL4_AI_BASE_DIRECTORY", Path.home()), ".crawl4ai"
@@ -21,12 +26,155 @@ os.makedirs(DB_PATH, exist_ok=True)
 DB_PATH = os.path.join(base_directory, "crawl4ai.db")
 
 
+# Content columns of crawled_data and the content type their blobs are stored under
+CONTENT_COLUMNS = {
+    "html": "html",
+    "cleaned_html": "cleaned",
+    "markdown": "markdown",
+    "extracted_content": "extracted",
+    "screenshot": "screenshots",
+}
+
+
+# Batch state shared with every task spawned inside batch_writes()/prefetched(),
+# e.g. the per-URL arun calls of arun_many
+_active_write_batch: ContextVar[Optional["CacheWriteBatch"]] = ContextVar(
+    "cache_write_batch", default=None
+)
+_prefetched_results: ContextVar[Optional[Dict[str, CrawlResult]]] = ContextVar(
+    "prefetched_cache_results", default=None
+)
+
+
+class CacheWriteBatch:
+    """
+    Write-behind queue for `acache_url`: rows are collected and upserted
+    `batch_size` at a time in a single transaction.
+    """
+
+    def __init__(self, db_manager: "AsyncDatabaseManager", batch_size: int = 100):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.rows: List[tuple] = []
+        self.written = 0
+        self._lock = asyncio.Lock()
+        self._writing: Set[str] = set()
+        self._after_flush: List[Callable[[], Awaitable]] = []
+
+    async def add(self, row: tuple):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            await self.flush()
+
+    def holds(self, url: str) -> bool:
+        """Whether a row for `url` is queued or being written"""
+        return url in self._writing or any(row[0] == url for row in self.rows)
+
+    def after_flush(self, callback: Callable[[], Awaitable]):
+        """Await `callback()` once the next flush has committed (or failed)"""
+        self._after_flush.append(callback)
+
+    async def flush(self):
+        async with self._lock:
+            rows, self.rows = self.rows, []
+            callbacks, self._after_flush = self._after_flush, []
+            self._writing = {row[0] for row in rows}
+            try:
+                if rows:
+                    await self.db_manager._write_cache_rows(rows)
+                    self.written += len(rows)
+            finally:
+                self._writing = set()
+                for callback in callbacks:
+                    try:
+                        await callback()
+                    except Exception as e:
+                        self.db_manager.logger.error(
+                            message="Error after flushing cache writes: {error}",
+                            tag="ERROR",
+                            force_verbose=True,
+                            params={"error": str(e)},
+                        )
+
+
+def _decode_cached_field(field: str, value):
+    """Turn a stored media/links/metadata/response_headers/markdown value back into its model value."""
+    if field not in ("media", "links", "metadata", "response_headers", "markdown"):
+        return value
+    try:
+        value = json.loads(value) if value else {}
+    except json.JSONDecodeError:
+        # Very UGLY, never mention it to me please
+        if field == "markdown" and isinstance(value, str):
+            return MarkdownGenerationResult(
+                raw_markdown=value or "",
+                markdown_with_citations="",
+                references_markdown="",
+                fit_markdown="",
+                fit_html="",
+            )
+        return {}
+
+    if field == "markdown" and isinstance(value, Dict):
+        if value.get("raw_markdown"):
+            value = value["raw_markdown"]
+    return value
+
+
+def _row_content_keys(content_hashes: Dict[str, str]) -> List[tuple]:
+    """(hash, content_type) keys of a row's stored content columns"""
+    return [
+        (content_hashes[field], content_type)
+        for field, content_type in CONTENT_COLUMNS.items()
+        if content_hashes.get(field)
+    ]
+
+
+# content_fingerprint (64-bit SimHash) is indexed as 4 16-bit bands: two fingerprints at
+# most 3 bits apart always share at least one band
+SIMHASH_BAND_COLUMNS = ["fp_band0", "fp_band1", "fp_band2", "fp_band3"]
+
+
+def _simhash_bands(fingerprint: Optional[str]) -> List[Optional[int]]:
+    if not fingerprint:
+        return [None] * len(SIMHASH_BAND_COLUMNS)
+    value = int(fingerprint, 16)
+    return [(value >> (16 * i)) & 0xFFFF for i in range(len(SIMHASH_BAND_COLUMNS))]
+
+
+def _reset_context_var(var: ContextVar, token):
+    try:
+        var.reset(token)
+    except ValueError:
+        # Closed from another context (e.g. an abandoned async generator)
+        var.set(None)
+
+
 class AsyncDatabaseManager:
-    def __init__(self, pool_size: int = 10, max_retries: int = 3):
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        content_store: Optional[Union[str, ContentStore]] = None,
+        write_batch_size: int = 100,
+        cache_policy: Optional[CachePolicy] = None,
+        content_gc_grace_period: float = 3600.0,
+    ):
         self.db_path = DB_PATH
         self.content_paths = ensure_content_dirs(os.path.dirname(DB_PATH))
         self.pool_size = pool_size
         self.max_retries = max_retries
+        self.write_batch_size = write_batch_size
+        self.cache_policy = cache_policy
+        # url -> (last access time, reads since the last flush); only kept with a policy
+        self._pending_access: Dict[str, List[float]] = {}
+        self._eviction_task: Optional[asyncio.Task] = None
+        # Content keys of rows prepared but not yet written (e.g. queued in a write batch)
+        self._unwritten_content: Counter = Counter()
+        # Blobs stored this recently survive content GC even when unreferenced: other
+        # processes sharing the cache may not have committed their rows yet
+        self.content_gc_grace_period = content_gc_grace_period
+        self._content_gc_lock = asyncio.Lock()
         self.connection_pool: Dict[int, aiosqlite.Connection] = {}
         self.pool_lock = asyncio.Lock()
         self.init_lock = asyncio.Lock()
@@ -38,6 +186,15 @@ class AsyncDatabaseManager:
             verbose=False,
             tag_width=10,
         )
+        # Where html/markdown/screenshot blobs live: "files" (one file per blob),
+        # "packed" (segment files + index) or a ContentStore instance.
+        # Defaults to $CRAWL4_AI_CONTENT_STORE, then "files".
+        if isinstance(content_store, ContentStore):
+            self.content_store = content_store
+        else:
+            self.content_store = create_content_store(
+                content_store, self.content_paths, base_directory, logger=self.logger
+            )
 
     async def initialize(self):
         """Initialize the database and connection pool"""
@@ -61,10 +218,12 @@ class AsyncDatabaseManager:
                     if not result:
                         raise Exception("crawled_data table was not created")
 
+            # Adding missing columns is idempotent and cheap, so don't wait for a version bump
+            await self.update_db_schema()
+
             # If version changed or fresh install, run updates
             if needs_update:
                 self.logger.info("New version detected, running updates", tag="INIT")
-                await self.update_db_schema()
                 from .migrations import (
                     run_migration,
                 )  # Import here to avoid circular imports
@@ -93,6 +252,9 @@ class AsyncDatabaseManager:
 
     async def cleanup(self):
         """Cleanup connections when shutting down"""
+        if self._eviction_task and not self._eviction_task.done():
+            self._eviction_task.cancel()
+        await self._flush_access_stats()
         async with self.pool_lock:
             for conn in self.connection_pool.values():
                 await conn.close()
@@ -246,6 +408,16 @@ class AsyncDatabaseManager:
                 )
             """
             )
+            # URLs claimed by a crawler (see LocalCacheBackend)
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS crawl_locks (
+                    url TEXT PRIMARY KEY,
+                    token TEXT,
+                    expires_at REAL
+                )
+            """
+            )
             await db.commit()
 
     async def update_db_schema(self):
@@ -268,11 +440,27 @@ class AsyncDatabaseManager:
                 "last_modified",
                 "head_fingerprint",
                 "cached_at",
+                # Cache policy columns (see CachePolicy)
+                "last_accessed",
+                "access_count",
+                "content_size",
+                "domain",
+                # Near-duplicate detection (see afind_near_duplicates)
+                "content_fingerprint",
+                *SIMHASH_BAND_COLUMNS,
+                "duplicate_of",
             ]
 
             for column in new_columns:
                 if column not in column_names:
                     await self.aalter_db_add_column(column, db)
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_crawled_data_domain ON crawled_data (domain)"
+            )
+            for column in SIMHASH_BAND_COLUMNS:
+                await db.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_crawled_data_{column} ON crawled_data ({column})"
+                )
             await db.commit()
 
     async def aalter_db_add_column(self, new_column: str, db):
@@ -281,11 +469,15 @@ class AsyncDatabaseManager:
             await db.execute(
                 f'ALTER TABLE crawled_data ADD COLUMN {new_column} TEXT DEFAULT "{{}}"'
             )
-        elif new_column == "cached_at":
-            # Timestamp column for cache validation
+        elif new_column in ("cached_at", "last_accessed"):
+            # Timestamp columns for cache validation and eviction
             await db.execute(
                 f"ALTER TABLE crawled_data ADD COLUMN {new_column} REAL DEFAULT 0"
             )
+        elif new_column in ("access_count", "content_size", *SIMHASH_BAND_COLUMNS):
+            await db.execute(
+                f"ALTER TABLE crawled_data ADD COLUMN {new_column} INTEGER DEFAULT 0"
+            )
         else:
             await db.execute(
                 f'ALTER TABLE crawled_data ADD COLUMN {new_column} TEXT DEFAULT ""'
@@ -296,8 +488,26 @@ class AsyncDatabaseManager:
             params={"column": new_column},
         )
 
-    async def aget_cached_url(self, url: str) -> Optional[CrawlResult]:
-        """Retrieve cached URL data as CrawlResult"""
+    async def aget_cached_url(
+        self, url: str, fields: Optional[Iterable[str]] = None
+    ) -> Optional[CrawlResult]:
+        """
+        Retrieve cached URL data as CrawlResult.
+
+        Args:
+            url: The cached URL.
+            fields: CrawlResult fields to load up front, e.g. {"markdown", "links"}.
+                The remaining content blobs (html, cleaned_html, markdown,
+                extracted_content, screenshot) and JSON fields (media, links, metadata)
+                are read from the cache on first attribute access. None loads everything.
+        """
+        # Served from a bulk lookup made by the surrounding batch (see prefetched())
+        prefetched = _prefetched_results.get()
+        if prefetched and url in prefetched:
+            result = prefetched.pop(url)
+            if result is not None:
+                self._record_access([url])
+            return result
 
         async def _get(db):
             async with db.execute(
@@ -310,73 +520,10 @@ class AsyncDatabaseManager:
                 # Get column names
                 columns = [description[0] for description in cursor.description]
                 # Create dict from row data
-                row_dict = dict(zip(columns, row))
-
-                # Load content from files using stored hashes
-                content_fields = {
-                    "html": row_dict["html"],
-                    "cleaned_html": row_dict["cleaned_html"],
-                    "markdown": row_dict["markdown"],
-                    "extracted_content": row_dict["extracted_content"],
-                    "screenshot": row_dict["screenshot"],
-                    "screenshots": row_dict["screenshot"],
-                }
-
-                for field, hash_value in content_fields.items():
-                    if hash_value:
-                        content = await self._load_content(
-                            hash_value,
-                            field.split("_")[0],  # Get content type from field name
-                        )
-                        row_dict[field] = content or ""
-                    else:
-                        row_dict[field] = ""
-
-                # Parse JSON fields
-                json_fields = [
-                    "media",
-                    "links",
-                    "metadata",
-                    "response_headers",
-                    "markdown",
-                ]
-                for field in json_fields:
-                    try:
-                        row_dict[field] = (
-                            json.loads(row_dict[field]) if row_dict[field] else {}
-                        )
-                    except json.JSONDecodeError:
-                        # Very UGLY, never mention it to me please
-                        if field == "markdown" and isinstance(row_dict[field], str):
-                            row_dict[field] = MarkdownGenerationResult(
-                                raw_markdown=row_dict[field] or "",
-                                markdown_with_citations="",
-                                references_markdown="",
-                                fit_markdown="",
-                                fit_html="",
-                            )
-                        else:
-                            row_dict[field] = {}
-
-                if isinstance(row_dict["markdown"], Dict):
-                    if row_dict["markdown"].get("raw_markdown"):
-                        row_dict["markdown"] = row_dict["markdown"]["raw_markdown"]
-
-                # Parse downloaded_files
-                try:
-                    row_dict["downloaded_files"] = (
-                        json.loads(row_dict["downloaded_files"])
-                        if row_dict["downloaded_files"]
-                        else []
-                    )
-                except json.JSONDecodeError:
-                    row_dict["downloaded_files"] = []
-
-                # Remove any fields not in CrawlResult model
-                valid_fields = CrawlResult.__annotations__.keys()
-                filtered_dict = {k: v for k, v in row_dict.items() if k in valid_fields}
-                filtered_dict["markdown"] = row_dict["markdown"]
-                return CrawlResult(**filtered_dict)
+                self._record_access([url])
+                rows = await self._collapse_duplicates(db, [dict(zip(columns, row))])
+                results = await self._rows_to_results(rows, fields)
+                return results[0] if results else None
 
         try:
             return await self.execute_with_retry(_get)
@@ -389,6 +536,206 @@ class AsyncDatabaseManager:
             )
             return None
 
+    async def aget_cached_urls(
+        self, urls: List[str], fields: Optional[Iterable[str]] = None, chunk_size: int = 500
+    ) -> Dict[str, CrawlResult]:
+        """
+        Bulk variant of `aget_cached_url`: one `WHERE url IN (...)` query per
+        `chunk_size` URLs and one batched content read per chunk.
+
+        Returns:
+            Dict[str, CrawlResult]: Cached results keyed by URL; misses are absent.
+        """
+        urls = list(dict.fromkeys(urls))
+
+        async def _get(db, chunk):
+            placeholders = ", ".join("?" * len(chunk))
+            async with db.execute(
+                f"SELECT * FROM crawled_data WHERE url IN ({placeholders})", chunk
+            ) as cursor:
+                rows = await cursor.fetchall()
+                columns = [description[0] for description in cursor.description]
+            rows = await self._collapse_duplicates(
+                db, [dict(zip(columns, row)) for row in rows]
+            )
+            results = await self._rows_to_results(rows, fields)
+            return {result.url: result for result in results}
+
+        found = {}
+        for start in range(0, len(urls), chunk_size):
+            try:
+                found.update(
+                    await self.execute_with_retry(_get, urls[start:start + chunk_size])
+                )
+            except Exception as e:
+                self.logger.error(
+                    message="Error retrieving cached URLs: {error}",
+                    tag="ERROR",
+                    force_verbose=True,
+                    params={"error": str(e)},
+                )
+        return found
+
+    async def _rows_to_results(
+        self, rows: List[Dict], fields: Optional[Iterable[str]] = None
+    ) -> List[CrawlResult]:
+        """
+        Build CrawlResults from crawled_data rows, loading the content of `fields` eagerly.
+        Rows past the cache policy's TTL and rows whose eagerly loaded content is missing
+        from the store are left out.
+        """
+        ttl = self.cache_policy.ttl if self.cache_policy is not None else None
+        if ttl is not None:
+            # Expired rows stay in the table until the next eviction sweep; never serve them
+            cutoff = time.time() - ttl
+            rows = [row for row in rows if row["cached_at"] is None or row["cached_at"] >= cutoff]
+
+        eager = LAZY_RESULT_FIELDS if fields is None else LAZY_RESULT_FIELDS & set(fields)
+        eager_content = [f for f in CONTENT_COLUMNS if f in eager]
+
+        # Load requested content with one batched read (a single seek per row for the
+        # packed store) and defer the rest
+        contents = iter(
+            await self.content_store.get_many(
+                [(row[f], CONTENT_COLUMNS[f]) for row in rows for f in eager_content]
+            )
+        )
+
+        results = []
+        for row_dict in rows:
+            lazy = {}
+            missing = []
+            for field in eager_content:
+                content = next(contents)
+                if content is None and row_dict[field]:
+                    missing.append(field)
+                row_dict[field] = content or ""
+            if missing:
+                # The row outlived its content (e.g. blobs deleted by hand); report a
+                # miss so the page is fetched again instead of serving empty fields
+                self.logger.warning(
+                    message="Cached {fields} of {url} missing from the content store, treating as a cache miss",
+                    tag="CACHE",
+                    params={"fields": ", ".join(missing), "url": row_dict["url"]},
+                )
+                continue
+            for field in CONTENT_COLUMNS:
+                if field not in eager:
+                    lazy[field] = self._lazy_content_loader(
+                        field, row_dict[field], row_dict["url"]
+                    )
+
+            # Parse JSON fields
+            for field in ["media", "links", "metadata", "markdown"]:
+                if field in lazy:
+                    continue
+                if field in eager:
+                    row_dict[field] = _decode_cached_field(field, row_dict[field])
+                else:
+                    raw = row_dict[field]
+                    lazy[field] = lambda field=field, raw=raw: _decode_cached_field(field, raw)
+            row_dict["response_headers"] = _decode_cached_field(
+                "response_headers", row_dict["response_headers"]
+            )
+
+            # Parse downloaded_files
+            try:
+                row_dict["downloaded_files"] = (
+                    json.loads(row_dict["downloaded_files"])
+                    if row_dict["downloaded_files"]
+                    else []
+                )
+            except json.JSONDecodeError:
+                row_dict["downloaded_files"] = []
+
+            # Remove any fields not in CrawlResult model
+            valid_fields = CrawlResult.__annotations__.keys()
+            filtered_dict = {
+                k: v for k, v in row_dict.items() if k in valid_fields and k not in lazy
+            }
+            filtered_dict.setdefault("html", "")
+            if "markdown" not in lazy:
+                filtered_dict["markdown"] = row_dict["markdown"]
+            result = CrawlResult(**filtered_dict)
+            for field, loader in lazy.items():
+                result.set_lazy_field(field, loader)
+            results.append(result)
+        return results
+
+    async def _collapse_duplicates(self, db, rows: List[Dict]) -> List[Dict]:
+        """
+        Point the content columns of near-duplicate stubs at the content of the page
+        they duplicate. Stubs whose original is no longer cached are left out.
+        """
+        originals = list({row["duplicate_of"] for row in rows if row.get("duplicate_of")})
+        if not originals:
+            return rows
+        columns = list(CONTENT_COLUMNS)
+        placeholders = ", ".join("?" * len(originals))
+        async with db.execute(
+            f"SELECT url, {', '.join(columns)} FROM crawled_data WHERE url IN ({placeholders})",
+            originals,
+        ) as cursor:
+            found = {row[0]: dict(zip(columns, row[1:])) for row in await cursor.fetchall()}
+        collapsed = []
+        for row in rows:
+            if row.get("duplicate_of"):
+                if row["duplicate_of"] not in found:
+                    continue
+                row.update(found[row["duplicate_of"]])
+            collapsed.append(row)
+        return collapsed
+
+    @asynccontextmanager
+    async def batch_writes(self, batch_size: Optional[int] = None):
+        """
+        Queue `acache_url` rows written by this task (and tasks it spawns) and flush
+        them in transactions of `batch_size` rows, plus once more on exit.
+
+        Example:
+            async with async_db_manager.batch_writes():
+                await asyncio.gather(*(crawler.arun(url) for url in urls))
+        """
+        if _active_write_batch.get() is not None:
+            # Already batching (e.g. nested arun_many); the outer batch flushes
+            yield _active_write_batch.get()
+            return
+        batch = CacheWriteBatch(self, batch_size or self.write_batch_size)
+        token = _active_write_batch.set(batch)
+        try:
+            yield batch
+        finally:
+            _reset_context_var(_active_write_batch, token)
+            await batch.flush()
+
+    def defer_until_written(self, url: str, callback: Callable[[], Awaitable]) -> bool:
+        """
+        If the row for `url` is still queued in the active `batch_writes()` batch, run
+        `callback` once it is committed and return True. Returns False otherwise.
+        """
+        batch = _active_write_batch.get()
+        if batch is None or batch.db_manager is not self or not batch.holds(url):
+            return False
+        batch.after_flush(callback)
+        return True
+
+    @asynccontextmanager
+    async def prefetched(self, results: Dict[str, Optional[CrawlResult]]):
+        """
+        Serve `aget_cached_url` from `results` (e.g. from `aget_cached_urls`) within
+        this block; each entry is handed out once. A None entry is served as a miss
+        without querying the database (e.g. an entry already found stale).
+
+        Yields the live mapping: entries added to it later are served as well, to
+        `arun` calls of tasks started inside the block too.
+        """
+        entries = dict(results)
+        token = _prefetched_results.set(entries)
+        try:
+            yield entries
+        finally:
+            _reset_context_var(_prefetched_results, token)
+
     async def aget_cache_metadata(self, url: str) -> Optional[Dict]:
         """
         Retrieve only cache validation metadata for a URL (lightweight query).
@@ -431,6 +778,51 @@ class AsyncDatabaseManager:
             )
             return None
 
+    async def aget_cache_metadata_many(
+        self, urls: List[str], chunk_size: int = 500
+    ) -> Dict[str, Dict]:
+        """
+        Bulk variant of `aget_cache_metadata`: one `WHERE url IN (...)` query per
+        `chunk_size` URLs.
+
+        Returns:
+            Dict[str, Dict]: Metadata keyed by URL; uncached URLs are absent.
+        """
+        urls = list(dict.fromkeys(urls))
+
+        async def _get_metadata(db, chunk):
+            placeholders = ", ".join("?" * len(chunk))
+            async with db.execute(
+                f"""SELECT url, etag, last_modified, head_fingerprint, cached_at, response_headers
+                   FROM crawled_data WHERE url IN ({placeholders})""",
+                chunk,
+            ) as cursor:
+                rows = await cursor.fetchall()
+                columns = [description[0] for description in cursor.description]
+            found = {}
+            for row in rows:
+                row_dict = dict(zip(columns, row))
+                row_dict["response_headers"] = _decode_cached_field(
+                    "response_headers", row_dict["response_headers"]
+                )
+                found[row_dict["url"]] = row_dict
+            return found
+
+        found = {}
+        for start in range(0, len(urls), chunk_size):
+            try:
+                found.update(
+                    await self.execute_with_retry(_get_metadata, urls[start:start + chunk_size])
+                )
+            except Exception as e:
+                self.logger.error(
+                    message="Error retrieving cache metadata: {error}",
+                    tag="ERROR",
+                    force_verbose=True,
+                    params={"error": str(e)},
+                )
+        return found
+
     async def aupdate_cache_metadata(
         self,
         url: str,
@@ -475,8 +867,181 @@ class AsyncDatabaseManager:
                 params={"error": str(e)},
             )
 
+    def set_cache_policy(self, policy: Optional[CachePolicy]):
+        """
+        Bound the cache with `policy` (None removes the bounds). Limits are enforced by a
+        background task every `policy.eviction_interval` seconds once the cache is
+        written to, or on demand with `aenforce_cache_policy()`.
+        """
+        self.cache_policy = policy
+        if policy is None and self._eviction_task and not self._eviction_task.done():
+            self._eviction_task.cancel()
+
+    def _record_access(self, urls: Iterable[str]):
+        if self.cache_policy is None:
+            return
+        self._ensure_eviction_task()
+        now = time.time()
+        for url in urls:
+            stats = self._pending_access.setdefault(url, [now, 0])
+            stats[0] = now
+            stats[1] += 1
+
+    async def _flush_access_stats(self):
+        """Write buffered last_accessed/access_count updates in one transaction"""
+        if not self._pending_access:
+            return
+        pending, self._pending_access = self._pending_access, {}
+
+        async def _update(db):
+            await db.executemany(
+                "UPDATE crawled_data SET last_accessed = ?, access_count = access_count + ? WHERE url = ?",
+                [(last, count, url) for url, (last, count) in pending.items()],
+            )
+
+        try:
+            await self.execute_with_retry(_update)
+        except Exception as e:
+            self.logger.error(
+                message="Error updating cache access stats: {error}",
+                tag="ERROR",
+                force_verbose=True,
+                params={"error": str(e)},
+            )
+
+    def _ensure_eviction_task(self):
+        if self.cache_policy is None:
+            return
+        if self._eviction_task is None or self._eviction_task.done():
+            self._eviction_task = asyncio.create_task(self._eviction_loop())
+
+    async def _eviction_loop(self):
+        while self.cache_policy is not None:
+            await asyncio.sleep(self.cache_policy.eviction_interval)
+            if self.cache_policy is None:
+                break
+            try:
+                await self.aenforce_cache_policy()
+            except Exception as e:
+                self.logger.error(
+                    message="Cache eviction failed: {error}",
+                    tag="ERROR",
+                    force_verbose=True,
+                    params={"error": str(e)},
+                )
+
+    async def aenforce_cache_policy(self, policy: Optional[CachePolicy] = None) -> Dict:
+        """
+        Apply `policy` (default: the manager's policy) now: expire entries older than
+        the TTL, trim domains over their quota, evict LRU/LFU entries over the entry and
+        size limits, then garbage-collect content no entry references any more.
+
+        Returns:
+            Dict: Number of entries removed per rule and the content store's GC stats.
+        """
+        policy = policy or self.cache_policy
+        stats = {"expired": 0, "domain_evicted": 0, "evicted": 0}
+        if policy is None:
+            return stats
+        await self._flush_access_stats()
+
+        if policy.eviction == EvictionStrategy.LFU:
+            victim_order = "access_count ASC, MAX(last_accessed, cached_at) ASC"
+        else:
+            victim_order = "MAX(last_accessed, cached_at) ASC"
+
+        async def _evict(db):
+            # Rows cached before the domain column existed
+            async with db.execute("SELECT url FROM crawled_data WHERE domain = ''") as cursor:
+                legacy = await cursor.fetchall()
+            await db.executemany(
+                "UPDATE crawled_data SET domain = ? WHERE url = ?",
+                [(urlparse(url).netloc, url) for (url,) in legacy],
+            )
+
+            if policy.ttl is not None:
+                cursor = await db.execute(
+                    "DELETE FROM crawled_data WHERE cached_at < ?", (time.time() - policy.ttl,)
+                )
+                stats["expired"] = cursor.rowcount
+
+            if policy.domain_max_entries is not None:
+                async with db.execute(
+                    "SELECT domain, COUNT(*) FROM crawled_data GROUP BY domain"
+                ) as cursor:
+                    domain_counts = await cursor.fetchall()
+                for domain, count in domain_counts:
+                    quota = policy.domain_quota(domain)
+                    if quota is None or count <= quota:
+                        continue
+                    cursor = await db.execute(
+                        f"""DELETE FROM crawled_data WHERE url IN (
+                            SELECT url FROM crawled_data WHERE domain = ?
+                            ORDER BY {victim_order} LIMIT ?)""",
+                        (domain, count - quota),
+                    )
+                    stats["domain_evicted"] += cursor.rowcount
+
+            if policy.max_entries is not None:
+                async with db.execute("SELECT COUNT(*) FROM crawled_data") as cursor:
+                    (count,) = await cursor.fetchone()
+                if count > policy.max_entries:
+                    target = int(policy.max_entries * policy.low_watermark)
+                    cursor = await db.execute(
+                        f"""DELETE FROM crawled_data WHERE url IN (
+                            SELECT url FROM crawled_data ORDER BY {victim_order} LIMIT ?)""",
+                        (count - target,),
+                    )
+                    stats["evicted"] += cursor.rowcount
+
+            if policy.max_bytes is not None:
+                async with db.execute(
+                    "SELECT COALESCE(SUM(content_size), 0) FROM crawled_data"
+                ) as cursor:
+                    (total,) = await cursor.fetchone()
+                if total > policy.max_bytes:
+                    to_free = total - int(policy.max_bytes * policy.low_watermark)
+                    victims = []
+                    async with db.execute(
+                        f"SELECT url, content_size FROM crawled_data ORDER BY {victim_order}"
+                    ) as cursor:
+                        async for url, size in cursor:
+                            if to_free <= 0:
+                                break
+                            victims.append((url,))
+                            to_free -= size or 0
+                    await db.executemany("DELETE FROM crawled_data WHERE url = ?", victims)
+                    stats["evicted"] += len(victims)
+
+        await self.execute_with_retry(_evict)
+
+        if stats["expired"] or stats["domain_evicted"] or stats["evicted"]:
+            # Content is shared across rows by hash, so only unreferenced blobs go
+            stats["content"] = await self.acompact_content()
+            self.logger.info(
+                message="Cache policy evicted {count} entries",
+                tag="CACHE",
+                params={"count": stats["expired"] + stats["domain_evicted"] + stats["evicted"]},
+            )
+        return stats
+
     async def acache_url(self, result: CrawlResult):
-        """Cache CrawlResult data"""
+        """
+        Cache CrawlResult data.
+
+        Inside `batch_writes()` the row is queued and written together with others
+        in one transaction; the content blobs are stored right away either way.
+        """
+        self._ensure_eviction_task()
+        row = await self._prepare_cache_row(result)
+        batch = _active_write_batch.get()
+        if batch is not None and batch.db_manager is self:
+            await batch.add(row)
+        else:
+            await self._write_cache_rows([row])
+
+    async def _prepare_cache_row(self, result: CrawlResult) -> tuple:
+        """Store the content blobs of `result` and build its crawled_data row"""
         # Store content files and get hashes
         content_map = {
             "html": (result.html, "html"),
@@ -518,9 +1083,18 @@ class AsyncDatabaseManager:
                 "markdown",
             )
 
-        content_hashes = {}
-        for field, (content, content_type) in content_map.items():
-            content_hashes[field] = await self._store_content(content, content_type)
+        if result.duplicate_of:
+            # Near duplicates are cached as stubs; their content is read from the page
+            # they duplicate (see _collapse_duplicates)
+            content_map = {}
+            content_hashes = dict.fromkeys(CONTENT_COLUMNS, "")
+        else:
+            # Compaction must not drop these blobs before the row referencing them is written
+            async with self._content_gc_lock:
+                content_hashes = dict(
+                    zip(content_map, await self.content_store.put_many(list(content_map.values())))
+                )
+                self._unwritten_content.update(_row_content_keys(content_hashes))
 
         # Extract cache validation headers from response
         response_headers = result.response_headers or {}
@@ -530,16 +1104,61 @@ class AsyncDatabaseManager:
         head_fingerprint = getattr(result, "head_fingerprint", None) or ""
         cached_at = time.time()
 
+        json_values = [
+            json.dumps(result.media),
+            json.dumps(result.links),
+            json.dumps(result.metadata or {}),
+            json.dumps(result.response_headers or {}),
+            json.dumps(result.downloaded_files or []),
+        ]
+        # Logical size used by CachePolicy.max_bytes
+        content_size = sum(len(content or "") for content, _ in content_map.values()) + sum(
+            len(value) for value in json_values
+        )
+        media, links, metadata, response_headers, downloaded_files = json_values
+
+        return (
+            result.url,
+            content_hashes["html"],
+            content_hashes["cleaned_html"],
+            content_hashes["markdown"],
+            content_hashes["extracted_content"],
+            result.success,
+            media,
+            links,
+            metadata,
+            content_hashes["screenshot"],
+            response_headers,
+            downloaded_files,
+            etag,
+            last_modified,
+            head_fingerprint,
+            cached_at,
+            cached_at,  # last_accessed
+            content_size,
+            urlparse(result.url).netloc,
+            result.content_fingerprint or None,
+            # Stubs are not indexed, so later pages match the original rather than a stub
+            *_simhash_bands(None if result.duplicate_of else result.content_fingerprint),
+            result.duplicate_of or "",
+        )
+
+    async def _write_cache_rows(self, rows: List[tuple]):
+        """Upsert prepared crawled_data rows in a single transaction"""
+
         async def _cache(db):
-            await db.execute(
+            await db.executemany(
                 """
                 INSERT INTO crawled_data (
                     url, html, cleaned_html, markdown,
                     extracted_content, success, media, links, metadata,
                     screenshot, response_headers, downloaded_files,
-                    etag, last_modified, head_fingerprint, cached_at
+                    etag, last_modified, head_fingerprint, cached_at,
+                    last_accessed, content_size, domain,
+                    content_fingerprint, fp_band0, fp_band1, fp_band2, fp_band3,
+                    duplicate_of
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(url) DO UPDATE SET
                     html = excluded.html,
                     cleaned_html = excluded.cleaned_html,
@@ -555,26 +1174,18 @@ class AsyncDatabaseManager:
                     etag = excluded.etag,
                     last_modified = excluded.last_modified,
                     head_fingerprint = excluded.head_fingerprint,
-                    cached_at = excluded.cached_at
+                    cached_at = excluded.cached_at,
+                    last_accessed = excluded.last_accessed,
+                    content_size = excluded.content_size,
+                    domain = excluded.domain,
+                    content_fingerprint = excluded.content_fingerprint,
+                    fp_band0 = excluded.fp_band0,
+                    fp_band1 = excluded.fp_band1,
+                    fp_band2 = excluded.fp_band2,
+                    fp_band3 = excluded.fp_band3,
+                    duplicate_of = excluded.duplicate_of
             """,
-                (
-                    result.url,
-                    content_hashes["html"],
-                    content_hashes["cleaned_html"],
-                    content_hashes["markdown"],
-                    content_hashes["extracted_content"],
-                    result.success,
-                    json.dumps(result.media),
-                    json.dumps(result.links),
-                    json.dumps(result.metadata or {}),
-                    content_hashes["screenshot"],
-                    json.dumps(result.response_headers or {}),
-                    json.dumps(result.downloaded_files or []),
-                    etag,
-                    last_modified,
-                    head_fingerprint,
-                    cached_at,
-                ),
+                rows,
             )
 
         try:
@@ -586,6 +1197,59 @@ class AsyncDatabaseManager:
                 force_verbose=True,
                 params={"error": str(e)},
             )
+        finally:
+            for row in rows:
+                # html, cleaned_html, markdown, extracted_content and screenshot hashes
+                hashes = dict(zip(CONTENT_COLUMNS, (row[1], row[2], row[3], row[4], row[9])))
+                self._unwritten_content.subtract(_row_content_keys(hashes))
+            self._unwritten_content += Counter()  # drop non-positive counts
+
+    async def afind_near_duplicates(
+        self,
+        fingerprint: str,
+        max_distance: int = 3,
+        exclude_url: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[tuple]:
+        """
+        Cached URLs whose content_fingerprint is within `max_distance` bits of `fingerprint`.
+
+        Candidates come from the band indexes, so every match is found for
+        max_distance <= 3; beyond that some matches may be missed.
+
+        Returns:
+            List[tuple]: (url, distance) pairs, closest first.
+        """
+        if not fingerprint:
+            return []
+        bands = _simhash_bands(fingerprint)
+        where = " OR ".join(f"{column} = ?" for column in SIMHASH_BAND_COLUMNS)
+
+        async def _find(db):
+            async with db.execute(
+                f"SELECT url, content_fingerprint FROM crawled_data WHERE {where}", bands
+            ) as cursor:
+                return await cursor.fetchall()
+
+        try:
+            rows = await self.execute_with_retry(_find)
+        except Exception as e:
+            self.logger.error(
+                message="Error finding near duplicates: {error}",
+                tag="ERROR",
+                force_verbose=True,
+                params={"error": str(e)},
+            )
+            return []
+        matches = []
+        for url, candidate in rows:
+            if url == exclude_url or not candidate:
+                continue
+            distance = simhash_distance(fingerprint, candidate)
+            if distance <= max_distance:
+                matches.append((url, distance))
+        matches.sort(key=lambda match: match[1])
+        return matches[:limit]
 
     async def aget_total_count(self) -> int:
         """Get total number of cached URLs"""
@@ -638,40 +1302,86 @@ class AsyncDatabaseManager:
                 params={"error": str(e)},
             )
 
-    async def _store_content(self, content: str, content_type: str) -> str:
-        """Store content in filesystem and return hash"""
-        if not content:
-            return ""
+    def _lazy_content_loader(self, field: str, content_hash: str, url: str):
+        """
+        Loader for a content field resolved on first access.
 
-        content_hash = generate_content_hash(content)
-        file_path = os.path.join(self.content_paths[content_type], content_hash)
+        Attribute access is synchronous, so the loader reads the content store with a
+        blocking call. Code running on the event loop should either request the field
+        through `fields` or resolve it with `await result.aload_lazy_fields()`, which
+        runs loaders in a worker thread. Raises MissingContentError if the blob is gone.
+        """
+        content_type = CONTENT_COLUMNS[field]
+
+        def _load():
+            if not content_hash:
+                return _decode_cached_field(field, "")
+            content = self.content_store.get_many_sync([(content_hash, content_type)])[0]
+            if content is None:
+                raise MissingContentError(
+                    f"Cached {field} of {url} is missing from the content store ({content_hash})"
+                )
+            return _decode_cached_field(field, content)
+
+        return _load
+
+    async def acompact_content(self) -> Dict:
+        """
+        Reclaim content storage: drop blobs no cached row references any more and,
+        for the packed store, rewrite segments that are mostly dead records.
+
+        Blobs stored less than `content_gc_grace_period` seconds ago are kept. This
+        process' rows that are not written yet are tracked exactly; the grace period
+        covers those of other processes sharing the cache.
+        """
+
+        async with self._content_gc_lock:
+            stats = await self.content_store.compact(
+                self._iter_live_content_keys(), grace_period=self.content_gc_grace_period
+            )
+        self.logger.info(
+            message="Content compaction finished: {stats}",
+            tag="COMPACT",
+            params={"stats": stats},
+        )
+        return stats
+
+    async def _iter_live_content_keys(self, page_size: int = 5000):
+        """
+        (hash, content_type) of every blob a cached row references, plus blobs of rows
+        still queued for writing. Rows are read `page_size` at a time, in url order.
+        """
 
-        # Only write if file doesn't exist
-        if not os.path.exists(file_path):
-            async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
-                await f.write(content)
+        async def _page(db, after):
+            columns = ", ".join(CONTENT_COLUMNS)
+            async with db.execute(
+                f"SELECT url, {columns} FROM crawled_data WHERE url > ? ORDER BY url LIMIT ?",
+                (after, page_size),
+            ) as cursor:
+                return await cursor.fetchall()
 
-        return content_hash
+        after = ""
+        while True:
+            rows = await self.execute_with_retry(_page, after)
+            for row in rows:
+                for hash_value, content_type in zip(row[1:], CONTENT_COLUMNS.values()):
+                    if hash_value:
+                        yield hash_value, content_type
+            if len(rows) < page_size:
+                break
+            after = rows[-1][0]
+        for key in list(self._unwritten_content):
+            yield key
+
+    async def _store_content(self, content: str, content_type: str) -> str:
+        """Store content in the content store and return hash"""
+        return await self.content_store.put(content, content_type)
 
     async def _load_content(
         self, content_hash: str, content_type: str
     ) -> Optional[str]:
-        """Load content from filesystem by hash"""
-        if not content_hash:
-            return None
-
-        file_path = os.path.join(self.content_paths[content_type], content_hash)
-        try:
-            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                return await f.read()
-        except:
-            self.logger.error(
-                message="Failed to load content: {file_path}",
-                tag="ERROR",
-                force_verbose=True,
-                params={"file_path": file_path},
-            )
-            return None
+        """Load content from the content store by hash"""
+        return await self.content_store.get(content_hash, content_type)
 
 
 # Create a singleton instance
@@ -1,5 +1,18 @@
-from typing import Dict, Optional, List, Tuple, Union
-from .async_configs import CrawlerRunConfig
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from .async_configs import CrawlerRunConfig, from_serializable_dict, to_serializable_dict
+from .cache_context import CacheContext, CacheMode
 from .models import (
     CrawlResult,
     CrawlerTaskResult,
@@ -8,41 +21,378 @@ from .models import (
 )
 
 from .components.crawler_monitor import CrawlerMonitor
+from .work_queue import Lease, WorkQueue, decode_task_result, encode_task_result
 
 from .types import AsyncWebCrawler
 
+from collections import deque
 from collections.abc import AsyncGenerator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
 import time
 import psutil
 import asyncio
+import heapq
+import itertools
+import json
+import os
+import socket
+import sqlite3
 import uuid
 
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 import random
 from abc import ABC, abstractmethod
 
-from .utils import get_true_memory_usage_percent
+from .utils import RobotsParser, get_base_domain, get_true_memory_usage_percent
+
+
+UrlSource = Union[Iterable[Union[str, Dict]], AsyncIterable[Union[str, Dict]]]
+
+
+async def iter_urls(urls: UrlSource) -> AsyncIterator[str]:
+    """Iterate a sync or async iterable of URLs.
+
+    Items may be URL strings or dicts with a "url" key, such as the entries
+    returned by `AsyncUrlSeeder.urls`. Finished `CrawlerTaskResult`s are passed
+    through unchanged.
+    """
+    if hasattr(urls, "__aiter__"):
+        async for item in urls:
+            yield item["url"] if isinstance(item, dict) else item
+    else:
+        for item in urls:
+            yield item["url"] if isinstance(item, dict) else item
+
+
+class RateLimitStore(ABC):
+    """
+    Shared state of the rate limiter's token buckets.
+
+    Buckets follow the generic cell rate algorithm: each key keeps only the
+    theoretical arrival time (TAT) of its next request. A request is allowed once
+    `now >= TAT - tau`, where `tau` is the burst tolerance, and taking it moves the
+    TAT to `max(TAT, now) + interval`. One number per key makes the state cheap to
+    share between processes through any store with an atomic read-modify-write.
+    """
+
+    @abstractmethod
+    async def get(self, keys: List[str]) -> Dict[str, float]:
+        """TAT of each known key"""
+
+    @abstractmethod
+    async def acquire(self, limits: List[Tuple[str, float, float]], now: float) -> bool:
+        """Atomically take a request from every `(key, interval, tau)` bucket if all allow one"""
+
+    @abstractmethod
+    async def push_back(self, key: str, tat: float) -> None:
+        """Move the TAT of `key` to at least `tat` (e.g. to honour Retry-After)"""
+
+    def busy_until(self) -> float:
+        """Time before which the store can't be asked again (e.g. it was locked); 0 if none"""
+        return 0.0
+
+    @staticmethod
+    def _apply(
+        tats: Dict[str, float], limits: List[Tuple[str, float, float]], now: float
+    ) -> Optional[Dict[str, float]]:
+        """New TATs after taking a request, or None if a bucket doesn't allow one yet"""
+        if any(tats.get(key, 0.0) - tau > now for key, _, tau in limits):
+            return None
+        return {key: max(tats.get(key, 0.0), now) + interval for key, interval, _ in limits}
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Bucket state of a single process"""
+
+    def __init__(self):
+        self._tats: Dict[str, float] = {}
+
+    async def get(self, keys):
+        return {key: self._tats[key] for key in keys if key in self._tats}
+
+    async def acquire(self, limits, now):
+        updated = self._apply(self._tats, limits, now)
+        if updated is None:
+            return False
+        self._tats.update(updated)
+        return True
+
+    async def push_back(self, key, tat):
+        self._tats[key] = max(self._tats.get(key, 0.0), tat)
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    Bucket state in a SQLite file, shared by every process on the machine that opens it.
+
+    Queries run in a dedicated worker thread, one at a time, so the event loop never
+    waits on the file. A locked database is waited on for at most `busy_timeout`
+    seconds; after that the request is refused and `busy_until` holds the buckets back
+    for `retry_interval`, and the scheduler tries again. Push-backs that hit a locked
+    database are applied with the next write.
+
+    Args:
+        path: Database file; created if missing
+        busy_timeout: Seconds to wait for another process's write lock
+        retry_interval: Seconds to wait before retrying after the lock wasn't obtained
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 0.05, retry_interval: float = 0.05):
+        self.path = path
+        self.retry_interval = retry_interval
+        self._busy_until = 0.0
+        self._pending_push_backs: Dict[str, float] = {}
+        # A single thread keeps the connection's transactions from interleaving
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit-store")
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        # Set-up may wait for a concurrent set-up; it runs once, before any crawl
+        self._conn.execute("PRAGMA busy_timeout = 30000")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+        )
+        self._conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+
+    def _locked(self, error: sqlite3.OperationalError) -> bool:
+        """Whether `error` means another process holds the lock; backs off if so"""
+        if "locked" not in str(error) and "busy" not in str(error):
+            return False
+        self._busy_until = time.time() + self.retry_interval
+        return True
+
+    def _select(self, keys: List[str]) -> Dict[str, float]:
+        placeholders = ",".join("?" * len(keys))
+        rows = self._conn.execute(
+            f"SELECT key, tat FROM rate_limits WHERE key IN ({placeholders})", keys
+        ).fetchall()
+        return dict(rows)
+
+    def _write_push_backs(self):
+        self._conn.executemany(
+            "INSERT INTO rate_limits (key, tat) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET tat = MAX(tat, excluded.tat)",
+            list(self._pending_push_backs.items()),
+        )
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def get(self, keys):
+        if not keys:
+            return {}
+        return await self._run(self._get, list(keys))
+
+    async def acquire(self, limits, now):
+        return await self._run(self._acquire, limits, now)
+
+    async def push_back(self, key, tat):
+        await self._run(self._push_back, key, tat)
+
+    def _get(self, keys: List[str]) -> Dict[str, float]:
+        try:
+            tats = self._select(keys)
+        except sqlite3.OperationalError as e:
+            if not self._locked(e):
+                raise
+            tats = {}
+        # Push-backs not written yet still apply to this process
+        for key in keys:
+            if key in self._pending_push_backs:
+                tats[key] = max(tats.get(key, 0.0), self._pending_push_backs[key])
+        return tats
+
+    def _acquire(self, limits: List[Tuple[str, float, float]], now: float) -> bool:
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            if self._locked(e):
+                return False
+            raise
+        try:
+            self._write_push_backs()
+            updated = self._apply(self._select([key for key, _, _ in limits]), limits, now)
+            if updated is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO rate_limits (key, tat) VALUES (?, ?)", updated.items()
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._pending_push_backs.clear()
+        return updated is not None
+
+    def _push_back(self, key: str, tat: float):
+        self._pending_push_backs[key] = max(self._pending_push_backs.get(key, 0.0), tat)
+        try:
+            self._write_push_backs()
+        except sqlite3.OperationalError as e:
+            if not self._locked(e):
+                raise
+        else:
+            self._pending_push_backs.clear()
+
+    def busy_until(self):
+        return self._busy_until
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._conn.close()
 
 
 class RateLimiter:
+    """
+    Spaces out requests per domain and backs off when a domain pushes back.
+
+    By default each domain waits a random `base_delay` between requests, doubled
+    (up to `max_delay`) on every `rate_limit_codes` response. With
+    `requests_per_second` the spacing is a token bucket per host instead, allowing
+    `burst` requests at once; `site_requests_per_second` adds a bucket shared by all
+    hosts of a registrable domain (e.g. every `*.example.com`).
+
+    `Retry-After` headers of rate-limited responses block the host until the given
+    time, and with a `robots_parser` the robots.txt `Crawl-delay` / `Request-rate` of a
+    domain is looked up once (see `prepare`) and never undercut. Bucket state lives
+    in `store`, so a `SQLiteRateLimitStore` shares limits between processes.
+    """
+
+    # How soon a domain whose robots.txt lookup is still running is checked again
+    LOOKUP_RECHECK_INTERVAL = 0.05
+
     def __init__(
         self,
         base_delay: Tuple[float, float] = (1.0, 3.0),
         max_delay: float = 60.0,
         max_retries: int = 3,
         rate_limit_codes: List[int] = None,
+        requests_per_second: Optional[float] = None,
+        burst: int = 1,
+        site_requests_per_second: Optional[float] = None,
+        site_burst: int = 1,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 600.0,
+        robots_parser: Optional[RobotsParser] = None,
+        user_agent: str = "*",
+        store: Optional[RateLimitStore] = None,
     ):
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.max_retries = max_retries
         self.rate_limit_codes = rate_limit_codes or [429, 503]
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.site_requests_per_second = site_requests_per_second
+        self.site_burst = site_burst
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.robots_parser = robots_parser
+        self.user_agent = user_agent
+        self.store = store or MemoryRateLimitStore()
         self.domains: Dict[str, DomainState] = {}
+        self._robots_lookups: Dict[str, asyncio.Task] = {}
 
     def get_domain(self, url: str) -> str:
         return urlparse(url).netloc
 
-    async def wait_if_needed(self, url: str) -> None:
+    def _limits(self, url: str) -> List[Tuple[str, float, float]]:
+        """(key, interval, tau) of the buckets a request to `url` draws from"""
+        domain = self.get_domain(url)
+        state = self.domains.get(domain)
+        crawl_delay = (state.crawl_delay if state else None) or 0.0
+        if self.requests_per_second:
+            interval = 1.0 / self.requests_per_second
+            tau = (self.burst - 1) * interval
+            if crawl_delay > interval:
+                interval, tau = crawl_delay, 0.0
+        else:
+            # Spacing comes from the domain delay; the bucket only carries Retry-After blocks
+            interval = tau = 0.0
+        limits = [(f"host:{domain}", interval, tau)]
+        if self.site_requests_per_second:
+            site_interval = 1.0 / self.site_requests_per_second
+            limits.append(
+                (
+                    f"site:{get_base_domain(url) or domain}",
+                    site_interval,
+                    (self.site_burst - 1) * site_interval,
+                )
+            )
+        return limits
+
+    def prepare_nowait(self, url: str) -> None:
+        """
+        Start the domain's robots.txt crawl delay lookup in the background, if a robots
+        parser is set. Until it finishes `ready_at` keeps the domain waiting.
+        """
+        if not self.robots_parser:
+            return
+        domain = self.get_domain(url)
+        state = self.domains.setdefault(domain, DomainState())
+        if state.crawl_delay is not None or domain in self._robots_lookups:
+            return
+        lookup = self._robots_lookups[domain] = asyncio.ensure_future(
+            self.robots_parser.crawl_delay(url, self.user_agent)
+        )
+        lookup.add_done_callback(lambda lookup: self._lookup_done(domain, lookup))
+
+    def _lookup_done(self, domain: str, lookup: asyncio.Future) -> None:
+        state = self.domains.setdefault(domain, DomainState())
+        if state.crawl_delay is None:
+            failed = lookup.cancelled() or lookup.exception() is not None
+            state.crawl_delay = 0.0 if failed else lookup.result() or 0.0
+        if self._robots_lookups.get(domain) is lookup:
+            del self._robots_lookups[domain]
+
+    async def prepare(self, url: str) -> None:
+        """Look up the domain's robots.txt crawl delay once, if a robots parser is set"""
+        self.prepare_nowait(url)
+        domain = self.get_domain(url)
+        lookup = self._robots_lookups.get(domain)
+        if lookup is None:
+            return
+        try:
+            # Cancelling one waiter mustn't cancel the lookup others share
+            await asyncio.shield(lookup)
+        except Exception:
+            pass
+        self._lookup_done(domain, lookup)
+
+    async def ready_at(self, url: str) -> float:
+        """Earliest time (epoch seconds) a request to the URL's domain is allowed"""
+        domain = self.get_domain(url)
+        if domain in self._robots_lookups:
+            # The crawl delay isn't known yet
+            return time.time() + self.LOOKUP_RECHECK_INTERVAL
+        state = self.domains.get(domain)
+        ready_at = 0.0
+        if state and state.last_request_time:
+            delay = state.current_delay
+            if not self.requests_per_second:
+                delay = max(delay, state.crawl_delay or 0.0)
+            ready_at = state.last_request_time + delay
+        limits = self._limits(url)
+        tats = await self.store.get([key for key, _, _ in limits])
+        for key, _, tau in limits:
+            if key in tats:
+                ready_at = max(ready_at, tats[key] - tau)
+        return max(ready_at, self.store.busy_until())
+
+    async def reserve(self, url: str) -> bool:
+        """Record a request to the URL's domain starting now, without waiting.
+
+        Returns:
+            False if a shared bucket had no request left (another process took it);
+            nothing is recorded then
+        """
+        now = time.time()
+        if not await self.store.acquire(self._limits(url), now):
+            return False
+
         domain = self.get_domain(url)
         state = self.domains.get(domain)
 
@@ -50,31 +400,74 @@ class RateLimiter:
             self.domains[domain] = DomainState()
             state = self.domains[domain]
 
-        now = time.time()
-        if state.last_request_time:
-            wait_time = max(0, state.current_delay - (now - state.last_request_time))
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-
         # Random delay within base range if no current delay
-        if state.current_delay == 0:
+        if state.current_delay == 0 and not self.requests_per_second:
             state.current_delay = random.uniform(*self.base_delay)
 
-        state.last_request_time = time.time()
+        state.last_request_time = now
+        return True
+
+    async def wait_if_needed(self, url: str) -> None:
+        await self.prepare(url)
+        while True:
+            wait_time = await self.ready_at(url) - time.time()
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+            if await self.reserve(url):
+                return
+
+    @staticmethod
+    def _retry_after(response_headers: Optional[Dict[str, str]]) -> Optional[float]:
+        """Seconds asked for by a Retry-After header (delta-seconds or HTTP date)"""
+        if not response_headers:
+            return None
+        value = next(
+            (v for k, v in response_headers.items() if k.lower() == "retry-after"), None
+        )
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
 
-    def update_delay(self, url: str, status_code: int) -> bool:
+    async def update_delay(
+        self,
+        url: str,
+        status_code: int,
+        response_headers: Optional[Dict[str, str]] = None,
+    ) -> bool:
         domain = self.get_domain(url)
-        state = self.domains[domain]
+        state = self.domains.setdefault(domain, DomainState())
 
         if status_code in self.rate_limit_codes:
             state.fail_count += 1
             if state.fail_count > self.max_retries:
                 return False
 
+            retry_after = self._retry_after(response_headers) if self.respect_retry_after else None
+            if retry_after is not None:
+                key, _, tau = self._limits(url)[0]
+                await self.store.push_back(
+                    key, time.time() + min(retry_after, self.max_retry_after) + tau
+                )
+
             # Exponential backoff with random jitter
+            if self.requests_per_second:
+                state.current_delay = max(state.current_delay, 1.0 / self.requests_per_second)
             state.current_delay = min(
                 state.current_delay * 2 * random.uniform(0.75, 1.25), self.max_delay
             )
+        elif self.requests_per_second:
+            # Back off less on success until the bucket alone sets the pace again
+            state.current_delay *= 0.5
+            if state.current_delay < 1.0 / self.requests_per_second:
+                state.current_delay = 0.0
+            state.fail_count = 0
         else:
             # Gradually reduce delay on success
             state.current_delay = max(
@@ -85,18 +478,749 @@ class RateLimiter:
         return True
 
 
+class ConcurrencyController:
+    """Picks how many crawls run at once with additive increase, multiplicative decrease.
+
+    Every successful, uncongested crawl grows the limit by `increase_step / limit`, so
+    it gains about `increase_step` per `limit` completions. A congestion signal cuts
+    it by `decrease_factor`, at most once per `cooldown` seconds so one burst of slow
+    pages counts once. Signals are:
+
+    - latency: the moving average of crawl time exceeds `latency_tolerance` times the
+      best average seen (which slowly drifts up so it follows the sites crawled)
+    - errors: more than `error_rate_threshold` of the last `window` crawls failed, or
+      one timed out
+    - event-loop lag above `loop_lag_threshold` seconds
+    - memory usage (RSS) at or above `memory_threshold_percent`
+
+    Args:
+        min_limit: Lowest number of concurrent crawls
+        max_limit: Highest number of concurrent crawls
+        initial_limit: Starting limit, defaults to `min_limit`
+    """
+
+    def __init__(
+        self,
+        min_limit: int = 1,
+        max_limit: int = 20,
+        initial_limit: Optional[int] = None,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.7,
+        latency_tolerance: float = 2.0,
+        error_rate_threshold: float = 0.25,
+        loop_lag_threshold: float = 0.25,
+        memory_threshold_percent: float = 85.0,
+        window: int = 20,
+        cooldown: float = 2.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.error_rate_threshold = error_rate_threshold
+        self.loop_lag_threshold = loop_lag_threshold
+        self.memory_threshold_percent = memory_threshold_percent
+        self.cooldown = cooldown
+        self._limit = float(min(max(initial_limit or min_limit, min_limit), max_limit))
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._latency: Optional[float] = None  # Moving average of crawl time
+        self._baseline: Optional[float] = None  # Best moving average seen
+        self._loop_lag = 0.0
+        self._memory_percent = 0.0
+        self._last_decrease = 0.0
+        self._active = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def observe(
+        self, loop_lag: Optional[float] = None, memory_percent: Optional[float] = None
+    ) -> None:
+        """Feed the latest event-loop lag and memory usage; high values shrink the limit"""
+        if loop_lag is not None:
+            self._loop_lag = loop_lag
+        if memory_percent is not None:
+            self._memory_percent = memory_percent
+        if (
+            self._loop_lag > self.loop_lag_threshold
+            or self._memory_percent >= self.memory_threshold_percent
+        ):
+            self._decrease()
+
+    def record(self, latency: float, success: bool = True, timed_out: bool = False) -> None:
+        """Feed the outcome of one finished crawl"""
+        self._outcomes.append(success)
+        if success:
+            self._latency = (
+                latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            )
+            self._baseline = (
+                self._latency
+                if self._baseline is None
+                else min(self._baseline * 1.01, self._latency)
+            )
+
+        error_rate = self._outcomes.count(False) / len(self._outcomes)
+        if (
+            timed_out
+            or (
+                len(self._outcomes) >= self._outcomes.maxlen // 2
+                and error_rate > self.error_rate_threshold
+            )
+            or (
+                self._baseline is not None
+                and self._latency > self.latency_tolerance * self._baseline
+            )
+            or self._loop_lag > self.loop_lag_threshold
+            or self._memory_percent >= self.memory_threshold_percent
+        ):
+            self._decrease()
+        elif success:
+            self._set_limit(self._limit + self.increase_step / self._limit)
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._set_limit(self._limit * self.decrease_factor)
+
+    def _set_limit(self, limit: float) -> None:
+        before = self.limit
+        self._limit = min(max(limit, self.min_limit), self.max_limit)
+        if self.limit > before:
+            self._changed.set()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of `limit` crawl slots for the duration of the block"""
+        while self._active >= self.limit:
+            self._changed.clear()
+            await self._changed.wait()
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._changed.set()
+
+
+class MemoryAccountant:
+    """Cheap per-task and per-domain memory estimates for the dispatchers.
+
+    Process RSS is read at most once per `sample_interval`, in one place, instead of
+    around every crawl. Growth of RSS over the level seen when accounting started is
+    taken to be the browser pages' share and split evenly between the crawls running
+    at that sample. A finished crawl is charged its average page share plus the size
+    of its result payload (HTML, markdown, screenshot, PDF...). Estimates are also kept
+    per domain as a moving average, to judge which crawls to shed under pressure.
+
+    Args:
+        sample_interval: Minimum seconds between RSS reads.
+        smoothing: Weight of the newest task in the per-domain moving average.
+    """
+
+    def __init__(self, sample_interval: float = 1.0, smoothing: float = 0.2):
+        self.sample_interval = sample_interval
+        self.smoothing = smoothing
+        self._process = psutil.Process()
+        self.baseline_mb: Optional[float] = None
+        self.rss_mb = 0.0
+        self.page_share_mb = 0.0  # Browser-side memory per running crawl at the last sample
+        self._sampled_at = float("-inf")
+        # task_id -> [page share summed over samples, samples, highest page share]
+        self._running: Dict[str, List[float]] = {}
+        self._domains: Dict[str, float] = {}
+
+    @property
+    def active_tasks(self) -> int:
+        return len(self._running)
+
+    def sample(self, force: bool = False) -> float:
+        """Read process RSS if the last read is older than sample_interval; returns it in MB"""
+        now = time.monotonic()
+        if not force and now - self._sampled_at < self.sample_interval:
+            return self.rss_mb
+        self._sampled_at = now
+        self.rss_mb = self._process.memory_info().rss / (1024 * 1024)
+        if self.baseline_mb is None or not self._running:
+            # Nothing is crawling: all of RSS is the process itself (results kept so far included)
+            self.baseline_mb = self.rss_mb
+        self.page_share_mb = max(0.0, self.rss_mb - self.baseline_mb) / max(1, len(self._running))
+        for stats in self._running.values():
+            stats[0] += self.page_share_mb
+            stats[1] += 1
+            stats[2] = max(stats[2], self.page_share_mb)
+        return self.rss_mb
+
+    def task_started(self, task_id: str) -> None:
+        if self.baseline_mb is None:
+            self.sample(force=True)
+        self._running[task_id] = [0.0, 0, 0.0]
+
+    def task_finished(
+        self, task_id: str, url: str, result: Optional[CrawlResult] = None
+    ) -> Tuple[float, float]:
+        """Stop tracking a task; returns its estimated (memory_usage, peak_memory) in MB"""
+        if task_id not in self._running:
+            return 0.0, 0.0
+        self.sample()
+        total, samples, peak = self._running.pop(task_id)
+        page_mb = total / samples if samples else self.page_share_mb
+        payload_mb = self.result_size(result) / (1024 * 1024) if result is not None else 0.0
+        usage = page_mb + payload_mb
+
+        domain = get_base_domain(url) or urlparse(url).netloc
+        previous = self._domains.get(domain)
+        self._domains[domain] = (
+            usage if previous is None else previous + self.smoothing * (usage - previous)
+        )
+        return usage, max(peak, page_mb) + payload_mb
+
+    def domain_estimate(self, url: str) -> Optional[float]:
+        """Average MB a crawl of this URL's domain has held, None before the first one"""
+        return self._domains.get(get_base_domain(url) or urlparse(url).netloc)
+
+    def domain_estimates(self) -> Dict[str, float]:
+        return dict(self._domains)
+
+    @staticmethod
+    def result_size(result: CrawlResult) -> int:
+        """Approximate bytes held by the content of a crawl result.
+
+        Lazy fields of cached results are not loaded yet and hold nothing; they are
+        skipped, since reading them would run their content store loaders.
+        """
+        size = 0
+        lazy = result._lazy_fields
+        for name in ("html", "cleaned_html", "extracted_content", "screenshot", "pdf", "mhtml"):
+            if name in lazy:
+                continue
+            value = getattr(result, name)
+            if value:
+                size += len(value)
+        fit_html = getattr(result, "_fit_html", None)
+        if fit_html:
+            size += len(fit_html)
+        # Read the stored markdown directly; the property may generate it
+        markdown = getattr(result, "_markdown", None)
+        if markdown is not None:
+            for value in (
+                markdown.raw_markdown,
+                markdown.markdown_with_citations,
+                markdown.references_markdown,
+                markdown.fit_markdown,
+                markdown.fit_html,
+            ):
+                if value:
+                    size += len(value)
+        return size
+
+
+class RetryPolicy:
+    """When and how a dispatcher tries a failed crawl again.
+
+    Failures are sorted into error classes by `classify`: "blocked" (anti-bot
+    detection), "rate_limited" (HTTP 429), "server_error" (5xx), "timeout", "network"
+    and "other". Each class has its own retry budget, counted against the retries a
+    URL already had for that class only. A retry waits `base_delay * 2 ** (attempt - 1)`
+    seconds, counting retries of every class, capped at `max_delay` and spread by up
+    to `jitter` of itself, in a delay queue that holds no crawl slot.
+
+    Args:
+        max_retries: Retries of a URL for every retryable class not in `retry_on`.
+        retry_on: Error class -> retries allowed for it; 0 disables a class. By default
+            every class but "other" is retried.
+        base_delay: Delay before the first retry, in seconds.
+        max_delay: Longest delay between retries.
+        jitter: Random extra share of the delay (0.1 = up to 10% longer).
+        escalation: Configs to crawl the retries with, e.g. with a proxy or a browser
+            instead of plain HTTP; retry n uses `escalation[n - 1]`, the last one
+            repeating. None retries with the original config.
+    """
+
+    ERROR_CLASSES = ("blocked", "rate_limited", "server_error", "timeout", "network", "other")
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        retry_on: Optional[Dict[str, int]] = None,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: float = 0.1,
+        escalation: Optional[List[CrawlerRunConfig]] = None,
+    ):
+        self.max_retries = max_retries
+        self.retry_on = {name: max_retries for name in self.ERROR_CLASSES if name != "other"}
+        self.retry_on["other"] = 0
+        self.retry_on.update(retry_on or {})
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.escalation = escalation or []
+
+    @staticmethod
+    def classify(result: CrawlResult) -> Optional[str]:
+        """Error class of a failed result, None for a successful one"""
+        if result.success:
+            return None
+        message = (result.error_message or "").lower()
+        status = result.status_code or 0
+        if "blocked by anti-bot" in message:
+            return "blocked"
+        if status == 429:
+            return "rate_limited"
+        if status >= 500:
+            return "server_error"
+        if "timeout" in message or "timed out" in message:
+            return "timeout"
+        if "net::" in message or "connection" in message or "dns" in message:
+            return "network"
+        return "other"
+
+    def next_delay(self, result: CrawlResult, retries: Dict[str, int]) -> Optional[float]:
+        """Seconds to wait before retrying a result; None to give up.
+
+        `retries` maps each error class to the retries the URL already had for it.
+        """
+        error_class = self.classify(result)
+        if error_class is None or retries.get(error_class, 0) >= self.retry_on.get(error_class, 0):
+            return None
+        delay = min(self.max_delay, self.base_delay * 2 ** sum(retries.values()))
+        return delay * (1 + random.uniform(0, self.jitter))
+
+    def config_for(self, retry: int) -> Optional[CrawlerRunConfig]:
+        """Config for the given retry (1 for the first), None to keep the original"""
+        if not self.escalation or retry < 1:
+            return None
+        return self.escalation[min(retry, len(self.escalation)) - 1]
+
+
+class DomainScheduler:
+    """Queue of waiting crawl tasks that only hands out tasks whose domain may be hit now.
+
+    Tasks are kept in per-domain heaps. Domains with waiting tasks sit either in a
+    heap ordered by the time the rate limiter next allows a request to them, or, once
+    that time has passed, in a heap ordered by their best task. Taking a task reserves
+    the domain's next request with the rate limiter, so a task never has to sleep on
+    the limiter after it has been given a crawl slot.
+
+    Priorities age incrementally: each domain has a fresh heap ordered by the priority
+    the task was queued with and an aged heap ordered by enqueue time. `promote_aged`
+    moves the tasks that have waited longer than `fairness_timeout` from the first to
+    the second, and aged tasks always come out ahead of fresh ones, oldest first. Every
+    task is promoted at most once, so queue maintenance costs O(log n) per task instead
+    of re-sorting the whole queue.
+
+    Tasks with a deadline come first, earliest deadline first, and `drop_expired`
+    removes those whose deadline has passed before they could start.
+
+    Items are `(priority, (url, task_id, retry_count, enqueue_time))` tuples, as with
+    the `asyncio.PriorityQueue` it replaces, optionally extended with
+    `(priority_class, deadline)`. Without a rate limiter every domain is always
+    eligible and tasks come out in plain priority order.
+    """
+
+    _FRESH, _AGED, _DONE = 0, 1, 2
+
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        fairness_timeout: Optional[float] = None,
+    ):
+        self.rate_limiter = rate_limiter
+        self.fairness_timeout = fairness_timeout
+        # Entries are [priority, seq, item, state]; heaps drop finished entries lazily
+        self._fresh: Dict[str, List[tuple]] = {}  # domain -> heap of ((deadline, priority), seq, entry)
+        self._aged: Dict[str, List[tuple]] = {}  # domain -> heap of ((deadline, enqueue_time), seq, entry)
+        self._counts: Dict[str, int] = {}  # live entries per domain
+        self._waiting: List[Tuple[float, str]] = []  # (ready_at, domain)
+        self._ready: List[Tuple[tuple, str]] = []  # (head key, domain)
+        self._ready_keys: Dict[str, tuple] = {}  # live key of each ready domain
+        self._unaged: List[tuple] = []  # (enqueue_time, seq, entry) awaiting promotion
+        self._aged_all: List[tuple] = []  # (enqueue_time, seq, entry) already promoted
+        self._deadlines: List[tuple] = []  # (deadline, seq, entry) of tasks that have one
+        self._counter = itertools.count()
+        self._size = 0
+        self._enqueue_time_sum = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def _domain(self, url: str) -> str:
+        if self.rate_limiter:
+            return self.rate_limiter.get_domain(url)
+        return urlparse(url).netloc
+
+    @staticmethod
+    def _deadline(item: tuple) -> float:
+        return item[5] if len(item) > 5 and item[5] is not None else float("inf")
+
+    @staticmethod
+    def _peek(heap: List[tuple], state: int) -> Optional[tuple]:
+        while heap and heap[0][2][3] != state:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _head(self, domain: str) -> Tuple[tuple, list]:
+        """Sort key and entry of the domain's best task"""
+        best = None
+        aged = self._peek(self._aged[domain], self._AGED)
+        if aged:
+            (deadline, enqueue_time), seq, entry = aged
+            best = (deadline, 0, enqueue_time, seq), entry
+        fresh = self._peek(self._fresh[domain], self._FRESH)
+        if fresh:
+            (deadline, priority), seq, entry = fresh
+            # Within the same deadline, aged tasks come out ahead of fresh ones
+            if best is None or (deadline, 1, priority, seq) < best[0]:
+                best = (deadline, 1, priority, seq), entry
+        return best
+
+    async def _ready_at(self, domain: str) -> float:
+        if not self.rate_limiter:
+            return 0.0
+        return await self.rate_limiter.ready_at(self._head(domain)[1][2][0])
+
+    def _mark_ready(self, domain: str) -> None:
+        key = self._head(domain)[0]
+        self._ready_keys[domain] = key
+        heapq.heappush(self._ready, (key, domain))
+
+    async def _schedule(self, domain: str) -> None:
+        ready_at = await self._ready_at(domain)
+        if ready_at <= time.time():
+            self._mark_ready(domain)
+        else:
+            heapq.heappush(self._waiting, (ready_at, domain))
+
+    def _refresh(self, domain: str) -> None:
+        """Re-rank a ready domain whose head may have improved"""
+        if domain in self._ready_keys and self._head(domain)[0] < self._ready_keys[domain]:
+            self._mark_ready(domain)
+
+    async def put(self, entry: Tuple[float, tuple]) -> None:
+        priority, item = entry
+        domain = self._domain(item[0])
+        seq = next(self._counter)
+        deadline = self._deadline(item)
+        entry = [priority, seq, item, self._FRESH]
+        is_new = not self._counts.get(domain)
+        if is_new:
+            self._fresh[domain] = []
+            self._aged[domain] = []
+            self._counts[domain] = 0
+        heapq.heappush(self._fresh[domain], ((deadline, priority), seq, entry))
+        self._counts[domain] += 1
+        self._size += 1
+        self._enqueue_time_sum += item[3]
+        heapq.heappush(self._unaged, (item[3], seq, entry))
+        if deadline != float("inf"):
+            heapq.heappush(self._deadlines, (deadline, seq, entry))
+
+        if is_new:
+            await self._schedule(domain)
+        else:
+            self._refresh(domain)
+
+    async def get_nowait(self) -> Tuple[float, tuple]:
+        """Take the best task among domains that may be hit now.
+
+        Raises:
+            asyncio.QueueEmpty: If no domain with waiting tasks is eligible yet
+        """
+        now = time.time()
+        # The delay of a domain may have grown since it was scheduled, so its
+        # ready time is checked again whenever it comes up
+        while self._waiting and self._waiting[0][0] <= now:
+            _, domain = heapq.heappop(self._waiting)
+            if not self._counts.get(domain):
+                continue  # All of its tasks were dropped meanwhile
+            ready_at = await self._ready_at(domain)
+            if ready_at > now:
+                heapq.heappush(self._waiting, (ready_at, domain))
+            else:
+                self._mark_ready(domain)
+
+        while self._ready:
+            key, domain = heapq.heappop(self._ready)
+            if self._ready_keys.get(domain) != key:
+                continue  # Superseded entry
+            del self._ready_keys[domain]
+            ready_at = await self._ready_at(domain)
+            if ready_at > now:
+                heapq.heappush(self._waiting, (ready_at, domain))
+                continue
+
+            _, entry = self._head(domain)
+            if self.rate_limiter and not await self.rate_limiter.reserve(entry[2][0]):
+                # A shared bucket was drained by another process meanwhile
+                heapq.heappush(self._waiting, (await self._ready_at(domain), domain))
+                continue
+            aged = entry[3] == self._AGED
+            priority, _, item, _ = entry
+            if self._remove(domain, entry):
+                await self._schedule(domain)
+            return (-(now - item[3]) if aged else priority), item
+
+        raise asyncio.QueueEmpty
+
+    def _remove(self, domain: str, entry: list) -> bool:
+        """Mark a waiting entry done; returns whether its domain still has tasks"""
+        entry[3] = self._DONE
+        self._size -= 1
+        self._counts[domain] -= 1
+        self._enqueue_time_sum -= entry[2][3]
+        if self._counts[domain]:
+            return True
+        del self._fresh[domain], self._aged[domain], self._counts[domain]
+        self._ready_keys.pop(domain, None)
+        return False
+
+    def drop_expired(self) -> List[Tuple[float, tuple]]:
+        """Remove and return the tasks whose deadline has passed"""
+        now = time.time()
+        expired = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, entry = heapq.heappop(self._deadlines)
+            if entry[3] == self._DONE:
+                continue
+            self._remove(self._domain(entry[2][0]), entry)
+            expired.append((entry[0], entry[2]))
+        return expired
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest deadline among waiting tasks, None if none has one"""
+        while self._deadlines and self._deadlines[0][2][3] == self._DONE:
+            heapq.heappop(self._deadlines)
+        return self._deadlines[0][0] if self._deadlines else None
+
+    def promote_aged(self) -> int:
+        """Move tasks that have waited longer than `fairness_timeout` ahead of fresh ones.
+
+        Returns:
+            Number of tasks promoted
+        """
+        if self.fairness_timeout is None:
+            return 0
+        cutoff = time.time() - self.fairness_timeout
+        promoted = 0
+        while self._unaged and self._unaged[0][0] < cutoff:
+            enqueue_time, seq, entry = heapq.heappop(self._unaged)
+            if entry[3] != self._FRESH:
+                continue
+            entry[3] = self._AGED
+            domain = self._domain(entry[2][0])
+            heapq.heappush(
+                self._aged[domain], ((self._deadline(entry[2]), enqueue_time), seq, entry)
+            )
+            heapq.heappush(self._aged_all, (enqueue_time, seq, entry))
+            self._refresh(domain)
+            promoted += 1
+        return promoted
+
+    def oldest_enqueue_time(self) -> Optional[float]:
+        """Enqueue time of the longest-waiting task, None when the queue is empty"""
+        # Promoted tasks are older than any task still awaiting promotion
+        head = self._peek(self._aged_all, self._AGED) or self._peek(self._unaged, self._FRESH)
+        return head[0] if head else None
+
+    def average_enqueue_time(self) -> Optional[float]:
+        """Mean enqueue time of the waiting tasks, None when the queue is empty"""
+        return self._enqueue_time_sum / self._size if self._size else None
+
+    def next_ready_in(self) -> Optional[float]:
+        """Seconds until a waiting task may become eligible, None when the queue is empty"""
+        if self._ready_keys:
+            return 0.0
+        if self._waiting:
+            return max(0.0, self._waiting[0][0] - time.time())
+        return None
+
+    def items(self) -> List[Tuple[float, tuple]]:
+        """Snapshot of all waiting `(priority, item)` entries"""
+        return [
+            (entry[0], entry[2])
+            for heap in self._fresh.values()
+            for _, _, entry in heap
+            if entry[3] == self._FRESH
+        ] + [
+            (entry[0], entry[2])
+            for heap in self._aged.values()
+            for _, _, entry in heap
+            if entry[3] == self._AGED
+        ]
+
+
+class PriorityClassScheduler:
+    """Task queue with a `DomainScheduler` per priority class.
+
+    Classes are tried in the order given, so a task of an earlier class is always
+    handed out before one of a later class that is eligible at the same time. Within a
+    class, tasks with a deadline go first, earliest deadline first. Classes that were
+    not listed rank after the listed ones, in the order they are first seen.
+
+    Items are `(priority, (url, task_id, retry_count, enqueue_time, priority_class,
+    deadline))`; items without the last two fields belong to `default_class`.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        fairness_timeout: Optional[float] = None,
+        priority_classes: Optional[List[str]] = None,
+        default_class: str = "default",
+    ):
+        self.rate_limiter = rate_limiter
+        self.fairness_timeout = fairness_timeout
+        self.default_class = default_class
+        self._queues: Dict[str, DomainScheduler] = {}
+        for name in priority_classes or [default_class]:
+            self._queue(name)
+
+    def _queue(self, name: str) -> DomainScheduler:
+        queue = self._queues.get(name)
+        if queue is None:
+            queue = self._queues[name] = DomainScheduler(self.rate_limiter, self.fairness_timeout)
+        return queue
+
+    @property
+    def classes(self) -> List[str]:
+        return list(self._queues)
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def empty(self) -> bool:
+        return all(queue.empty() for queue in self._queues.values())
+
+    def queued(self, name: str) -> int:
+        """Tasks waiting in one class"""
+        queue = self._queues.get(name)
+        return len(queue) if queue else 0
+
+    async def put(self, entry: Tuple[float, tuple]) -> None:
+        item = entry[1]
+        await self._queue(item[4] if len(item) > 4 else self.default_class).put(entry)
+
+    async def get_nowait(
+        self, allowed: Optional[Callable[[str], bool]] = None
+    ) -> Tuple[float, tuple]:
+        """Take the best eligible task of the first class that has one.
+
+        Args:
+            allowed: Classes for which it returns False are skipped
+
+        Raises:
+            asyncio.QueueEmpty: If no allowed class has an eligible task
+        """
+        for name, queue in self._queues.items():
+            if queue.empty() or (allowed and not allowed(name)):
+                continue
+            try:
+                return await queue.get_nowait()
+            except asyncio.QueueEmpty:
+                continue
+        raise asyncio.QueueEmpty
+
+    def drop_expired(self) -> List[Tuple[float, tuple]]:
+        return [entry for queue in self._queues.values() for entry in queue.drop_expired()]
+
+    def next_deadline(self) -> Optional[float]:
+        deadlines = [queue.next_deadline() for queue in self._queues.values()]
+        return min((d for d in deadlines if d is not None), default=None)
+
+    def promote_aged(self) -> int:
+        return sum(queue.promote_aged() for queue in self._queues.values())
+
+    def oldest_enqueue_time(self) -> Optional[float]:
+        times = [queue.oldest_enqueue_time() for queue in self._queues.values()]
+        return min((t for t in times if t is not None), default=None)
+
+    def average_enqueue_time(self) -> Optional[float]:
+        size = len(self)
+        if not size:
+            return None
+        return sum(q._enqueue_time_sum for q in self._queues.values()) / size
+
+    def next_ready_in(self, allowed: Optional[Callable[[str], bool]] = None) -> Optional[float]:
+        waits = [
+            queue.next_ready_in()
+            for name, queue in self._queues.items()
+            if not allowed or allowed(name)
+        ]
+        return min((w for w in waits if w is not None), default=None)
+
+    def items(self) -> List[Tuple[float, tuple]]:
+        return [entry for queue in self._queues.values() for entry in queue.items()]
+
 
 class BaseDispatcher(ABC):
     def __init__(
         self,
         rate_limiter: Optional[RateLimiter] = None,
         monitor: Optional[CrawlerMonitor] = None,
+        concurrency_controller: Optional[ConcurrencyController] = None,
+        memory_accountant: Optional[MemoryAccountant] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
         self.crawler = None
         self._domain_last_hit: Dict[str, float] = {}
         self.concurrent_sessions = 0
         self.rate_limiter = rate_limiter
         self.monitor = monitor
+        self.concurrency_controller = concurrency_controller
+        self.memory_accountant = memory_accountant or MemoryAccountant()
+        self.retry_policy = retry_policy
+
+    def _record_crawl(self, latency: float, success: bool, error_message: str = "") -> None:
+        """Report a finished crawl to the concurrency controller and its limit to the monitor"""
+        if not self.concurrency_controller:
+            return
+        self.concurrency_controller.record(
+            latency, success=success, timed_out="timeout" in (error_message or "").lower()
+        )
+        if self.monitor:
+            self.monitor.update_concurrency_limit(self.concurrency_controller.limit)
+
+    async def _crawl_with_retries(
+        self,
+        crawl: Callable[[Union[CrawlerRunConfig, List[CrawlerRunConfig]]], Awaitable[CrawlerTaskResult]],
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> CrawlerTaskResult:
+        """Run `crawl(config)`, retrying failures as the retry policy says.
+
+        The backoff is slept outside `crawl`, so a waiting retry holds no crawl slot.
+        """
+        class_retries: Dict[str, int] = {}
+        retries = 0
+        while True:
+            task_result = await crawl(config)
+            delay = (
+                self.retry_policy.next_delay(task_result.result, class_retries)
+                if self.retry_policy
+                else None
+            )
+            if delay is None:
+                task_result.retry_count += retries
+                return task_result
+            error_class = self.retry_policy.classify(task_result.result)
+            class_retries[error_class] = class_retries.get(error_class, 0) + 1
+            retries += 1
+            if self.monitor:
+                self.monitor.update_task(
+                    task_result.task_id,
+                    status=CrawlStatus.QUEUED,
+                    error_message=f"Retry {retries} in {delay:.1f}s: {task_result.error_message}",
+                )
+            await asyncio.sleep(delay)
+            config = self.retry_policy.config_for(retries) or config
 
     def select_config(self, url: str, configs: Union[CrawlerRunConfig, List[CrawlerRunConfig]]) -> Optional[CrawlerRunConfig]:
         """Select the appropriate config for a given URL.
@@ -124,6 +1248,184 @@ class BaseDispatcher(ABC):
         # No match found - return None to indicate URL should be skipped
         return None
 
+    async def resolve_cache_hits(
+        self,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        urls: List[str],
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> Tuple[List[CrawlerTaskResult], List[str], List[str]]:
+        """Serve cached URLs from one bulk cache lookup before any browser work is scheduled.
+
+        URLs whose config reads the cache (and doesn't ask for a PDF, which is never
+        cached) are looked up with `aget_cached_urls`. With `check_cache_freshness` the
+        hits are revalidated together through the crawler's shared validator. Usable
+        hits are completed concurrently through `crawler.arun`, which takes the
+        prefetched entry instead of querying the cache again, so they never occupy a
+        crawl slot or wait on the rate limiter.
+
+        Args:
+            crawler: The crawler the results are produced with
+            urls: URLs of the batch
+            config: Single config or list of configs to choose from
+
+        Returns:
+            Results for the cache hits, the URLs that still need crawling and, among
+            those, the URLs whose cached entry was found stale (serve them as misses
+            with `crawler.cache_backend.prefetched` to skip a second check)
+        """
+        hits, stale = await self._lookup_cache_hits(crawler, urls, config)
+        results = list(await asyncio.gather(*await self._start_cache_hits(crawler, hits)))
+        remaining = [url for url in urls if url not in hits]
+        return results, remaining, stale
+
+    async def _lookup_cache_hits(
+        self,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        urls: List[str],
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> Tuple[Dict[str, Tuple[CrawlerRunConfig, CrawlResult]], List[str]]:
+        """Usable cache hits among `urls` (URL -> (config, cached result)) and the stale URLs"""
+        groups: Dict[int, Tuple[CrawlerRunConfig, List[str]]] = {}
+        for url in urls:
+            selected_config = self.select_config(url, config)
+            if (
+                selected_config is None
+                or selected_config.pdf
+                or not CacheContext(
+                    url, selected_config.cache_mode or CacheMode.ENABLED
+                ).should_read()
+            ):
+                continue
+            groups.setdefault(id(selected_config), (selected_config, []))[1].append(url)
+
+        hits: Dict[str, Tuple[CrawlerRunConfig, CrawlResult]] = {}
+        stale: List[str] = []
+        for selected_config, group_urls in groups.values():
+            cached = await crawler.cache_backend.aget_cached_urls(
+                group_urls, fields=crawler._cache_read_fields(selected_config)
+            )
+            cached = {
+                url: cached_result
+                for url, cached_result in cached.items()
+                if cached_result.html
+                and (not selected_config.screenshot or cached_result.screenshot)
+            }
+            if selected_config.check_cache_freshness and cached:
+                revalidated = await crawler._revalidate_cached(cached, selected_config)
+                stale.extend(url for url, result in revalidated.items() if result is None)
+                cached = {url: result for url, result in revalidated.items() if result is not None}
+            for url, cached_result in cached.items():
+                hits[url] = (selected_config, cached_result)
+        return hits, stale
+
+    async def _start_cache_hits(
+        self,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        hits: Dict[str, Tuple[CrawlerRunConfig, CrawlResult]],
+    ) -> List[asyncio.Task]:
+        """Start completing every cache hit in its own task.
+
+        The tasks are created inside `prefetched`, so each one's copy of the context
+        serves its cached entry to `arun`. With a processing executor the hits are then
+        scraped in parallel.
+        """
+        if not hits:
+            return []
+        async with crawler.cache_backend.prefetched(
+            {url: cached_result for url, (_, cached_result) in hits.items()}
+        ):
+            return [
+                asyncio.create_task(self._serve_cache_hit(crawler, url, selected_config))
+                for url, (selected_config, _) in hits.items()
+            ]
+
+    async def _serve_cache_hit(
+        self,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        url: str,
+        config: CrawlerRunConfig,
+    ) -> CrawlerTaskResult:
+        task_id = str(uuid.uuid4())
+        start_time = time.time()
+        result = await crawler.arun(url, config=config)
+        end_time = time.time()
+        if self.monitor:
+            self.monitor.add_task(task_id, url)
+            self.monitor.update_task(
+                task_id,
+                status=CrawlStatus.COMPLETED if result.success else CrawlStatus.FAILED,
+                start_time=start_time,
+                end_time=end_time,
+            )
+        return CrawlerTaskResult(
+            task_id=task_id,
+            url=url,
+            result=result,
+            memory_usage=0,
+            peak_memory=0,
+            start_time=start_time,
+            end_time=end_time,
+            error_message=result.error_message or "",
+        )
+
+    async def resolve_cache_hits_stream(
+        self,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        urls: UrlSource,
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+        stale: Dict[str, None],
+        batch_size: int = 500,
+    ) -> AsyncIterator[Union[CrawlerTaskResult, str]]:
+        """`resolve_cache_hits` for a URL source, one batch of URLs at a time.
+
+        Batches start small so the first results come back right away and double up
+        to `batch_size`, so only one batch of cached rows is held at a time. For each
+        batch, yields the URLs that still need crawling (ready to be fed to
+        `run_urls`) and then the result of every cache hit as soon as it is done.
+
+        Args:
+            crawler: The crawler the results are produced with
+            urls: List, or sync or async iterable of URLs
+            config: Single config or list of configs to choose from
+            stale: Mapping yielded by `crawler.cache_backend.prefetched` around the
+                crawl; URLs found stale are added to it so `arun` serves them as misses
+            batch_size: Largest number of URLs looked up at once
+        """
+        size = min(16, batch_size)
+        batch = []
+        async for url in iter_urls(urls):
+            batch.append(url)
+            if len(batch) < size:
+                continue
+            async for item in self._resolve_batch(crawler, batch, config, stale):
+                yield item
+            batch = []
+            size = min(size * 2, batch_size)
+        if batch:
+            async for item in self._resolve_batch(crawler, batch, config, stale):
+                yield item
+
+    async def _resolve_batch(
+        self,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        batch: List[str],
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+        stale: Dict[str, None],
+    ) -> AsyncIterator[Union[CrawlerTaskResult, str]]:
+        hits, stale_urls = await self._lookup_cache_hits(crawler, batch, config)
+        stale.update(dict.fromkeys(stale_urls))
+        tasks = await self._start_cache_hits(crawler, hits)
+        try:
+            # Misses first, so they start crawling while the hits are processed
+            for url in batch:
+                if url not in hits:
+                    yield url
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
     @abstractmethod
     async def crawl_url(
         self,
@@ -137,7 +1439,7 @@ class BaseDispatcher(ABC):
     @abstractmethod
     async def run_urls(
         self,
-        urls: List[str],
+        urls: UrlSource,
         crawler: AsyncWebCrawler,  # noqa: F821
         config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
         monitor: Optional[CrawlerMonitor] = None,
@@ -157,8 +1459,16 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
         memory_wait_timeout: Optional[float] = 600.0,
         rate_limiter: Optional[RateLimiter] = None,
         monitor: Optional[CrawlerMonitor] = None,
+        url_lookahead: int = 1000,  # URLs read ahead of the crawl from a URL source
+        concurrency_controller: Optional[ConcurrencyController] = None,  # Adapts the session limit
+        memory_accountant: Optional[MemoryAccountant] = None,  # Per-task and per-domain memory estimates
+        priority_classes: Optional[List[str]] = None,  # Order in which CrawlerRunConfig.priority_class values are served
+        reserved_slots: Optional[Dict[str, int]] = None,  # Slots only the given priority class may use
+        retry_policy: Optional[RetryPolicy] = None,  # Retries failed crawls after a backoff
     ):
-        super().__init__(rate_limiter, monitor)
+        super().__init__(
+            rate_limiter, monitor, concurrency_controller, memory_accountant, retry_policy
+        )
         self.memory_threshold_percent = memory_threshold_percent
         self.critical_threshold_percent = critical_threshold_percent
         self.recovery_threshold_percent = recovery_threshold_percent
@@ -166,16 +1476,39 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
         self.max_session_permit = max_session_permit
         self.fairness_timeout = fairness_timeout
         self.memory_wait_timeout = memory_wait_timeout
+        self.url_lookahead = url_lookahead
         self.result_queue = asyncio.Queue()
-        self.task_queue = asyncio.PriorityQueue()  # Priority queue for better management
+        # Per-class, per-domain queues that only release URLs the rate limiter allows right now
+        self.task_queue = PriorityClassScheduler(rate_limiter, fairness_timeout, priority_classes)
+        self.reserved_slots = reserved_slots or {}
+        self._class_active: Dict[str, int] = {}  # Running crawls per priority class
+        self._task_meta: Dict[str, Tuple[str, Optional[float]]] = {}  # task_id -> (class, deadline)
+        # Failed tasks waiting out their backoff, off the task queue: (due, seq, item)
+        self._retry_queue: List[Tuple[float, int, tuple]] = []
+        self._retry_seq = itertools.count()
+        self._retries: Dict[str, Dict[str, int]] = {}  # task_id -> error class -> retries scheduled so far
+        self._retry_configs: Dict[str, CrawlerRunConfig] = {}  # task_id -> escalated config
         self.memory_pressure_mode = False  # Flag to indicate when we're in memory pressure mode
         self.current_memory_percent = 0.0  # Track current memory usage
         self._high_memory_start_time: Optional[float] = None
+        self.loop_utilization = 0.0  # Share of time the event loop spent running code
+        self.loop_lag = 0.0  # Seconds the last monitor wake-up came late
         
     async def _memory_monitor_task(self):
         """Background task to continuously monitor memory usage and update state"""
+        loop = asyncio.get_running_loop()
+        # CPU time of the loop's thread doesn't advance while it waits for I/O, so its
+        # growth over wall time is how busy the loop is
+        busy_since, wall_since = time.thread_time(), loop.time()
         while True:
             self.current_memory_percent = get_true_memory_usage_percent()
+            self.memory_accountant.sample()
+            if self.concurrency_controller:
+                self.concurrency_controller.observe(
+                    loop_lag=self.loop_lag, memory_percent=self.current_memory_percent
+                )
+            if self.monitor:
+                self.monitor.update_loop_statistics(self.loop_utilization, self.loop_lag)
 
             # Enter memory pressure mode if we cross the threshold
             if self.current_memory_percent >= self.memory_threshold_percent:
@@ -211,8 +1544,16 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                 if self.monitor:
                     self.monitor.update_memory_status("CRITICAL")
                 # We could implement additional memory-saving measures here
-                
+
+            # Oversleeping means the event loop is saturated
+            slept_at = loop.time()
             await asyncio.sleep(self.check_interval)
+            now = loop.time()
+            self.loop_lag = max(0.0, now - slept_at - self.check_interval)
+            busy = time.thread_time()
+            if now > wall_since:
+                self.loop_utilization = min(1.0, (busy - busy_since) / (now - wall_since))
+            busy_since, wall_since = busy, now
     
     def _get_priority_score(self, wait_time: float, retry_count: int) -> float:
         """Calculate priority score (lower is higher priority)
@@ -236,8 +1577,8 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
         error_message = ""
         memory_usage = peak_memory = 0.0
         
-        # Select appropriate config for this URL
-        selected_config = self.select_config(url, config)
+        # Select appropriate config for this URL, unless a retry escalated it
+        selected_config = self._retry_configs.get(task_id) or self.select_config(url, config)
         
         # If no config matches, return failed result
         if selected_config is None:
@@ -267,10 +1608,6 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                 retry_count=retry_count
             )
         
-        # Get starting memory for accurate measurement
-        process = psutil.Process()
-        start_memory = process.memory_info().rss / (1024 * 1024)
-        
         try:
             if self.monitor:
                 self.monitor.update_task(
@@ -281,16 +1618,17 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                 )
                 
             self.concurrent_sessions += 1
-            
-            if self.rate_limiter:
-                await self.rate_limiter.wait_if_needed(url)
-                
+
+            # No rate limiter wait here: the task queue only hands out URLs whose
+            # domain is eligible and has already reserved the request
+
             # Check if we're in critical memory state
             if self.current_memory_percent >= self.critical_threshold_percent:
                 # Requeue this task with increased priority and retry count
                 enqueue_time = time.time()
                 priority = self._get_priority_score(enqueue_time - start_time, retry_count + 1)
-                await self.task_queue.put((priority, (url, task_id, retry_count + 1, enqueue_time)))
+                meta = self._task_meta.get(task_id, (self.task_queue.default_class, None))
+                await self.task_queue.put((priority, (url, task_id, retry_count + 1, enqueue_time, *meta)))
                 
                 # Update monitoring
                 if self.monitor:
@@ -317,15 +1655,19 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                 )
             
             # Execute the crawl with selected config
+            crawl_start = time.time()
+            self.memory_accountant.task_started(task_id)
             result = await self.crawler.arun(url, config=selected_config, session_id=task_id)
+            self._record_crawl(time.time() - crawl_start, result.success, result.error_message)
             
-            # Measure memory usage
-            end_memory = process.memory_info().rss / (1024 * 1024)
-            memory_usage = peak_memory = end_memory - start_memory
+            # Estimate memory usage
+            memory_usage, peak_memory = self.memory_accountant.task_finished(task_id, url, result)
             
             # Handle rate limiting
             if self.rate_limiter and result.status_code:
-                if not self.rate_limiter.update_delay(url, result.status_code):
+                if not await self.rate_limiter.update_delay(
+                    url, result.status_code, result.response_headers
+                ):
                     error_message = f"Rate limit retry count exceeded for domain {urlparse(url).netloc}"
                     if self.monitor:
                         self.monitor.update_task(task_id, status=CrawlStatus.FAILED)
@@ -340,6 +1682,7 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                 
         except Exception as e:
             error_message = str(e)
+            memory_usage, peak_memory = self.memory_accountant.task_finished(task_id, url)
             if self.monitor:
                 self.monitor.update_task(task_id, status=CrawlStatus.FAILED)
             result = CrawlResult(
@@ -368,257 +1711,325 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
             start_time=start_time,
             end_time=end_time,
             error_message=error_message,
-            retry_count=retry_count
+            retry_count=retry_count,
+            domain_memory=self.memory_accountant.domain_estimate(url) or 0.0,
         )
         
     async def run_urls(
         self,
-        urls: List[str],
+        urls: UrlSource,
         crawler: AsyncWebCrawler,
         config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
     ) -> List[CrawlerTaskResult]:
-        self.crawler = crawler
-        
-        # Start the memory monitor task
-        memory_monitor = asyncio.create_task(self._memory_monitor_task())
-        
+        return [
+            result
+            async for result in self.run_urls_stream(urls=urls, crawler=crawler, config=config)
+        ]
+
+    async def _enqueue_url(
+        self, url: str, config: Union[CrawlerRunConfig, List[CrawlerRunConfig]]
+    ) -> None:
+        task_id = str(uuid.uuid4())
         if self.monitor:
-            self.monitor.start()
-            
-        results = []
+            self.monitor.add_task(task_id, url)
+        enqueue_time = time.time()
+        selected_config = self.select_config(url, config)
+        priority_class = self.task_queue.default_class
+        deadline = None
+        if selected_config is not None:
+            priority_class = selected_config.priority_class
+            if selected_config.deadline is not None:
+                deadline = enqueue_time + selected_config.deadline
+        self._task_meta[task_id] = (priority_class, deadline)
+        # Add to queue with initial priority 0, retry count 0, and current time
+        await self.task_queue.put((0, (url, task_id, 0, enqueue_time, priority_class, deadline)))
 
-        try:
-            # Initialize task queue
-            for url in urls:
-                task_id = str(uuid.uuid4())
-                if self.monitor:
-                    self.monitor.add_task(task_id, url)
-                # Add to queue with initial priority 0, retry count 0, and current time
-                await self.task_queue.put((0, (url, task_id, 0, time.time())))
+    def _class_may_start(self, priority_class: str) -> bool:
+        """Whether a crawl of this class may take a free slot without using one reserved for another class"""
+        free = self._session_limit() - sum(self._class_active.values())
+        held_back = sum(
+            max(0, reserved - self._class_active.get(name, 0))
+            for name, reserved in self.reserved_slots.items()
+            if name != priority_class
+        )
+        return free > held_back
 
-            active_tasks = []
+    def _schedule_retry(self, task_result: CrawlerTaskResult) -> bool:
+        """Put a failed task in the retry queue if the retry policy allows; returns whether it did"""
+        if not self.retry_policy or task_result.error_message.startswith("Rate limit retry count exceeded"):
+            return False
+        task_id = task_result.task_id
+        class_retries = self._retries.get(task_id, {})
+        delay = self.retry_policy.next_delay(task_result.result, class_retries)
+        if delay is None:
+            return False
+        priority_class, deadline = self._task_meta.get(task_id, (self.task_queue.default_class, None))
+        due = time.time() + delay
+        if deadline is not None and due >= deadline:
+            return False
 
-            # Process until both queues are empty
-            while not self.task_queue.empty() or active_tasks:
-                if memory_monitor.done():
-                    exc = memory_monitor.exception()
-                    if exc:
-                        for t in active_tasks:
-                            t.cancel()
-                        raise exc
+        error_class = self.retry_policy.classify(task_result.result)
+        self._retries[task_id] = {**class_retries, error_class: class_retries.get(error_class, 0) + 1}
+        retries = sum(class_retries.values())
+        escalated = self.retry_policy.config_for(retries + 1)
+        if escalated is not None:
+            self._retry_configs[task_id] = escalated
+        item = (task_result.url, task_id, task_result.retry_count + 1, due, priority_class, deadline)
+        heapq.heappush(self._retry_queue, (due, next(self._retry_seq), item))
+        if self.monitor:
+            self.monitor.update_task(
+                task_id,
+                status=CrawlStatus.QUEUED,
+                error_message=f"Retry {retries + 1} in {delay:.1f}s: {task_result.error_message}",
+            )
+        return True
 
-                # If memory pressure is low, greedily fill all available slots
-                if not self.memory_pressure_mode:
-                    slots = self.max_session_permit - len(active_tasks)
-                    while slots > 0:
-                        try:
-                            # Use get_nowait() to immediately get tasks without blocking
-                            priority, (url, task_id, retry_count, enqueue_time) = self.task_queue.get_nowait()
-                            
-                            # Create and start the task
-                            task = asyncio.create_task(
-                                self.crawl_url(url, config, task_id, retry_count)
-                            )
-                            active_tasks.append(task)
-                            
-                            # Update waiting time in monitor
-                            if self.monitor:
-                                wait_time = time.time() - enqueue_time
-                                self.monitor.update_task(
-                                    task_id, 
-                                    wait_time=wait_time,
-                                    status=CrawlStatus.IN_PROGRESS
-                                )
-                            
-                            slots -= 1
-                            
-                        except asyncio.QueueEmpty:
-                            # No more tasks in queue, exit the loop
-                            break
-                        
-                # Wait for completion even if queue is starved
-                if active_tasks:
-                    done, pending = await asyncio.wait(
-                        active_tasks, timeout=0.1, return_when=asyncio.FIRST_COMPLETED
-                    )
-                    
-                    # Process completed tasks
-                    for completed_task in done:
-                        result = await completed_task
-                        results.append(result)
-                        
-                    # Update active tasks list
-                    active_tasks = list(pending)
-                else:
-                    # If no active tasks but still waiting, sleep briefly
-                    await asyncio.sleep(self.check_interval / 2)
-                    
-                # Update priorities for waiting tasks if needed
-                await self._update_queue_priorities()
+    async def _release_due_retries(self) -> None:
+        """Move retries whose backoff has run out to the task queue"""
+        now = time.time()
+        while self._retry_queue and self._retry_queue[0][0] <= now:
+            _, _, item = heapq.heappop(self._retry_queue)
+            await self.task_queue.put((self._get_priority_score(0, item[2]), item))
+
+    def _forget_task(self, task_id: str) -> None:
+        self._task_meta.pop(task_id, None)
+        self._retries.pop(task_id, None)
+        self._retry_configs.pop(task_id, None)
+
+    def _expired_result(self, item: tuple) -> CrawlerTaskResult:
+        """Failed result for a task dropped from the queue at its deadline"""
+        url, task_id, retry_count, enqueue_time = item[:4]
+        self._forget_task(task_id)
+        end_time = time.time()
+        error_message = "Deadline passed before the crawl could start"
+        if self.monitor:
+            self.monitor.update_task(
+                task_id,
+                status=CrawlStatus.FAILED,
+                end_time=end_time,
+                error_message=error_message,
+            )
+        return CrawlerTaskResult(
+            task_id=task_id,
+            url=url,
+            result=CrawlResult(
+                url=url,
+                html="",
+                metadata={"status": "deadline_exceeded"},
+                success=False,
+                error_message=error_message,
+            ),
+            memory_usage=0,
+            peak_memory=0,
+            start_time=enqueue_time,
+            end_time=end_time,
+            error_message=error_message,
+            retry_count=retry_count,
+            wait_time=end_time - enqueue_time,
+        )
+
+    async def _feed_urls(self, urls: UrlSource, inbox: asyncio.Queue, wakeup: asyncio.Event):
+        """Read the URL source into the bounded inbox; blocks while the crawl catches up"""
+        async for item in iter_urls(urls):
+            if self.rate_limiter and isinstance(item, str):
+                # New domains look up robots.txt concurrently; the queue holds their
+                # tasks back until the crawl delay is known
+                self.rate_limiter.prepare_nowait(item)
+            await inbox.put(item)
+            wakeup.set()
+
+    def _session_limit(self) -> int:
+        """Crawls allowed to run at once; max_session_permit caps the controller's limit"""
+        if self.concurrency_controller:
+            return min(self.concurrency_controller.limit, self.max_session_permit)
+        return self.max_session_permit
+
+    def _idle_wait(self) -> Optional[float]:
+        """How long to sleep while queued tasks can't start yet; None to wait for a crawl to finish"""
+        if self.memory_pressure_mode:
+            return self.check_interval / 2
+        next_ready = self.task_queue.next_ready_in(self._class_may_start)
+        if next_ready is None:
+            # Only classes whose slots are all taken have tasks waiting
+            return None
+        return min(self.check_interval / 2, next_ready)
 
-        except Exception as e:
-            if self.monitor:
-                self.monitor.update_memory_status(f"QUEUE_ERROR: {str(e)}")
-            raise       
-        
-        finally:
-            # Clean up
-            memory_monitor.cancel()
-            if self.monitor:
-                self.monitor.stop()
-        return results
-                
     async def _update_queue_priorities(self):
-        """Periodically update priorities of items in the queue to prevent starvation"""
+        """Age waiting tasks past fairness_timeout to the front and report queue statistics.
+
+        Only tasks crossing the timeout since the last call are touched, so this stays
+        cheap however many URLs are queued.
+        """
         # Skip if queue is empty
         if self.task_queue.empty():
             return
-            
-        # Use a drain-and-refill approach to update all priorities
-        temp_items = []
-        
-        # Drain the queue (with a safety timeout to prevent blocking)
-        try:
-            drain_start = time.time()
-            while not self.task_queue.empty() and time.time() - drain_start < 5.0:  # 5 second safety timeout
-                try:
-                    # Get item from queue with timeout
-                    priority, (url, task_id, retry_count, enqueue_time) = await asyncio.wait_for(
-                        self.task_queue.get(), timeout=0.1
-                    )
-                    
-                    # Calculate new priority based on current wait time
-                    current_time = time.time()
-                    wait_time = current_time - enqueue_time
-                    new_priority = self._get_priority_score(wait_time, retry_count)
-                    
-                    # Store with updated priority
-                    temp_items.append((new_priority, (url, task_id, retry_count, enqueue_time)))
-                    
-                    # Update monitoring stats for this task
-                    if self.monitor and task_id in self.monitor.stats:
-                        self.monitor.update_task(task_id, wait_time=wait_time)
-                        
-                except asyncio.TimeoutError:
-                    # Queue might be empty or very slow
-                    break
-        except Exception as e:
-            # If anything goes wrong, make sure we refill the queue with what we've got
-            self.monitor.update_memory_status(f"QUEUE_ERROR: {str(e)}")
-        
-        # Calculate queue statistics
-        if temp_items and self.monitor:
-            total_queued = len(temp_items)
-            wait_times = [item[1][3] for item in temp_items]
-            highest_wait_time = time.time() - min(wait_times) if wait_times else 0
-            avg_wait_time = sum(time.time() - t for t in wait_times) / len(wait_times) if wait_times else 0
-            
-            # Update queue statistics in monitor
+
+        self.task_queue.promote_aged()
+
+        # Update queue statistics in monitor
+        if self.monitor:
+            current_time = time.time()
             self.monitor.update_queue_statistics(
-                total_queued=total_queued,
-                highest_wait_time=highest_wait_time,
-                avg_wait_time=avg_wait_time
+                total_queued=len(self.task_queue),
+                highest_wait_time=current_time - self.task_queue.oldest_enqueue_time(),
+                avg_wait_time=current_time - self.task_queue.average_enqueue_time(),
             )
-        
-        # Sort by priority (lowest number = highest priority)
-        temp_items.sort(key=lambda x: x[0])
-        
-        # Refill the queue with updated priorities
-        for item in temp_items:
-            await self.task_queue.put(item)
-                
+
     async def run_urls_stream(
         self,
-        urls: List[str],
+        urls: UrlSource,
         crawler: AsyncWebCrawler,
         config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
     ) -> AsyncGenerator[CrawlerTaskResult, None]:
+        """Crawl URLs as they arrive and yield every result as soon as it is done.
+
+        `urls` may be a list or any sync or async iterable (see `iter_urls`). It is read
+        by a background task through a small bounded buffer, and at most
+        `url_lookahead` URLs wait in the task queue at a time, so a long or endless
+        source is consumed as slots free up instead of all up front. Finished
+        `CrawlerTaskResult`s in the source (e.g. cache hits resolved upstream) are
+        passed straight through.
+        """
         self.crawler = crawler
         
         # Start the memory monitor task
         memory_monitor = asyncio.create_task(self._memory_monitor_task())
-        
+
+        # Set whenever there is something to do: a crawl finished, URLs arrived or a
+        # background task stopped. The loop sleeps on it instead of polling.
+        wakeup = asyncio.Event()
+        inbox = asyncio.Queue(maxsize=self.max_session_permit)
+        feeder = asyncio.create_task(self._feed_urls(urls, inbox, wakeup))
+        for background in (memory_monitor, feeder):
+            background.add_done_callback(lambda _: wakeup.set())
+
+        active_tasks = set()
+        task_classes: Dict[asyncio.Task, str] = {}
+        finished: Deque[asyncio.Task] = deque()
+
+        def on_crawl_done(task: asyncio.Task) -> None:
+            active_tasks.discard(task)
+            self._class_active[task_classes.pop(task)] -= 1
+            finished.append(task)
+            wakeup.set()
+
         if self.monitor:
             self.monitor.start()
-            
+            self.monitor.update_concurrency_limit(self._session_limit())
+
         try:
-            # Initialize task queue
-            for url in urls:
-                task_id = str(uuid.uuid4())
-                if self.monitor:
-                    self.monitor.add_task(task_id, url)
-                # Add to queue with initial priority 0, retry count 0, and current time
-                await self.task_queue.put((0, (url, task_id, 0, time.time())))
-                
-            active_tasks = []
-            completed_count = 0
-            total_urls = len(urls)
-
-            while completed_count < total_urls:
-                if memory_monitor.done():
-                    exc = memory_monitor.exception()
-                    if exc:
-                        for t in active_tasks:
-                            t.cancel()
-                        raise exc
+            while True:
+                wakeup.clear()
+                for background in (memory_monitor, feeder):
+                    if background.done() and background.exception():
+                        raise background.exception()
+
+                # Take newly arrived URLs, up to the lookahead
+                while len(self.task_queue) < self.url_lookahead and not inbox.empty():
+                    item = inbox.get_nowait()
+                    if isinstance(item, CrawlerTaskResult):
+                        yield item
+                    else:
+                        await self._enqueue_url(item, config)
+
+                await self._release_due_retries()
+
+                # Queued tasks whose deadline passed are dropped, not crawled late
+                for _, item in self.task_queue.drop_expired():
+                    yield self._expired_result(item)
+
+                # Age waiting tasks before picking the next ones
+                await self._update_queue_priorities()
+
                 # If memory pressure is low, greedily fill all available slots
                 if not self.memory_pressure_mode:
-                    slots = self.max_session_permit - len(active_tasks)
+                    slots = self._session_limit() - len(active_tasks)
                     while slots > 0:
                         try:
                             # Use get_nowait() to immediately get tasks without blocking
-                            priority, (url, task_id, retry_count, enqueue_time) = self.task_queue.get_nowait()
-                            
-                            # Create and start the task
-                            task = asyncio.create_task(
-                                self.crawl_url(url, config, task_id, retry_count)
-                            )
-                            active_tasks.append(task)
-                            
-                            # Update waiting time in monitor
-                            if self.monitor:
-                                wait_time = time.time() - enqueue_time
-                                self.monitor.update_task(
-                                    task_id, 
-                                    wait_time=wait_time,
-                                    status=CrawlStatus.IN_PROGRESS
-                                )
-                            
-                            slots -= 1
-                            
+                            priority, item = await self.task_queue.get_nowait(self._class_may_start)
                         except asyncio.QueueEmpty:
-                            # No more tasks in queue, exit the loop
+                            # No task whose domain is eligible and whose class may start right now
                             break
-                        
-                # Process completed tasks and yield results
-                if active_tasks:
-                    done, pending = await asyncio.wait(
-                        active_tasks, timeout=0.1, return_when=asyncio.FIRST_COMPLETED
-                    )
-                    
-                    for completed_task in done:
-                        result = await completed_task
-                        
-                        # Only count as completed if it wasn't requeued
-                        if "requeued" not in result.error_message:
-                            completed_count += 1
-                            yield result
-                        
-                    # Update active tasks list
-                    active_tasks = list(pending)
-                else:
-                    # If no active tasks but still waiting, sleep briefly
-                    await asyncio.sleep(self.check_interval / 2)
-                
-                # Update priorities for waiting tasks if needed
-                await self._update_queue_priorities()
-                
+                        url, task_id, retry_count, enqueue_time, priority_class, _ = item
+
+                        # Create and start the task
+                        task = asyncio.create_task(
+                            self.crawl_url(url, config, task_id, retry_count)
+                        )
+                        active_tasks.add(task)
+                        task_classes[task] = priority_class
+                        self._class_active[priority_class] = self._class_active.get(priority_class, 0) + 1
+                        task.add_done_callback(on_crawl_done)
+
+                        # Update waiting time in monitor
+                        if self.monitor:
+                            wait_time = time.time() - enqueue_time
+                            self.monitor.update_task(
+                                task_id,
+                                wait_time=wait_time,
+                                status=CrawlStatus.IN_PROGRESS
+                            )
+
+                        slots -= 1
+
+                # Yield results of completed tasks
+                while finished:
+                    result = finished.popleft().result()
+
+                    # Requeued tasks are back in the task queue and finish later,
+                    # failures with retries left once their backoff has passed
+                    if "requeued" in result.error_message or self._schedule_retry(result):
+                        continue
+                    self._forget_task(result.task_id)
+                    yield result
+
+                if (
+                    feeder.done()
+                    and inbox.empty()
+                    and self.task_queue.empty()
+                    and not active_tasks
+                    and not finished
+                    and not self._retry_queue
+                ):
+                    break
+                if wakeup.is_set():
+                    continue
+
+                # Sleep until woken. Queued tasks that can't start yet because their
+                # domain is backed off or memory is high are checked again on a timer,
+                # and the loop also wakes up for the next deadline or due retry.
+                timeout = None
+                if not self.task_queue.empty() and (
+                    self.memory_pressure_mode or len(active_tasks) < self._session_limit()
+                ):
+                    timeout = self._idle_wait()
+                wake_at = [self.task_queue.next_deadline()]
+                if self._retry_queue:
+                    wake_at.append(self._retry_queue[0][0])
+                wake_at = [t for t in wake_at if t is not None]
+                if wake_at:
+                    until = max(0.0, min(wake_at) - time.time())
+                    timeout = until if timeout is None else min(timeout, until)
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+        except Exception as e:
+            if self.monitor:
+                self.monitor.update_memory_status(f"QUEUE_ERROR: {str(e)}")
+            raise
+
         finally:
             # Clean up
+            feeder.cancel()
+            for task in active_tasks:
+                task.cancel()
             memory_monitor.cancel()
             if self.monitor:
                 self.monitor.stop()
-                
+
 
 class SemaphoreDispatcher(BaseDispatcher):
     def __init__(
@@ -627,8 +2038,13 @@ class SemaphoreDispatcher(BaseDispatcher):
         max_session_permit: int = 20,
         rate_limiter: Optional[RateLimiter] = None,
         monitor: Optional[CrawlerMonitor] = None,
+        concurrency_controller: Optional[ConcurrencyController] = None,  # Replaces the static semaphore
+        memory_accountant: Optional[MemoryAccountant] = None,
+        retry_policy: Optional[RetryPolicy] = None,  # Retries failed crawls after a backoff
     ):
-        super().__init__(rate_limiter, monitor)
+        super().__init__(
+            rate_limiter, monitor, concurrency_controller, memory_accountant, retry_policy
+        )
         self.semaphore_count = semaphore_count
         self.max_session_permit = max_session_permit
 
@@ -682,16 +2098,18 @@ class SemaphoreDispatcher(BaseDispatcher):
             if self.rate_limiter:
                 await self.rate_limiter.wait_if_needed(url)
 
-            async with semaphore:
-                process = psutil.Process()
-                start_memory = process.memory_info().rss / (1024 * 1024)
+            slot = self.concurrency_controller.slot() if self.concurrency_controller else semaphore
+            async with slot:
+                crawl_start = time.time()
+                self.memory_accountant.task_started(task_id)
                 result = await self.crawler.arun(url, config=selected_config, session_id=task_id)
-                end_memory = process.memory_info().rss / (1024 * 1024)
-
-                memory_usage = peak_memory = end_memory - start_memory
+                self._record_crawl(time.time() - crawl_start, result.success, result.error_message)
+                memory_usage, peak_memory = self.memory_accountant.task_finished(task_id, url, result)
 
                 if self.rate_limiter and result.status_code:
-                    if not self.rate_limiter.update_delay(url, result.status_code):
+                    if not await self.rate_limiter.update_delay(
+                        url, result.status_code, result.response_headers
+                    ):
                         error_message = f"Rate limit retry count exceeded for domain {urlparse(url).netloc}"
                         if self.monitor:
                             self.monitor.update_task(task_id, status=CrawlStatus.FAILED)
@@ -704,6 +2122,7 @@ class SemaphoreDispatcher(BaseDispatcher):
                             start_time=start_time,
                             end_time=time.time(),
                             error_message=error_message,
+                            domain_memory=self.memory_accountant.domain_estimate(url) or 0.0,
                         )
 
                 if not result.success:
@@ -715,6 +2134,7 @@ class SemaphoreDispatcher(BaseDispatcher):
 
         except Exception as e:
             error_message = str(e)
+            memory_usage, peak_memory = self.memory_accountant.task_finished(task_id, url)
             if self.monitor:
                 self.monitor.update_task(task_id, status=CrawlStatus.FAILED)
             result = CrawlResult(
@@ -741,12 +2161,13 @@ class SemaphoreDispatcher(BaseDispatcher):
             start_time=start_time,
             end_time=end_time,
             error_message=error_message,
+            domain_memory=self.memory_accountant.domain_estimate(url) or 0.0,
         )
 
     async def run_urls(
         self,
         crawler: AsyncWebCrawler,  # noqa: F821
-        urls: List[str],
+        urls: UrlSource,
         config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
     ) -> List[CrawlerTaskResult]:
         self.crawler = crawler
@@ -755,18 +2176,340 @@ class SemaphoreDispatcher(BaseDispatcher):
 
         try:
             semaphore = asyncio.Semaphore(self.semaphore_count)
+            # Only as many tasks as there can be crawl slots exist at once: a slot is
+            # taken before the next URL is read from the source
+            pending = asyncio.Semaphore(
+                self.concurrency_controller.max_limit
+                if self.concurrency_controller
+                else self.semaphore_count
+            )
+            finished = []
             tasks = []
 
-            for url in urls:
+            source = iter_urls(urls).__aiter__()
+            while True:
+                await pending.acquire()
+                try:
+                    url = await source.__anext__()
+                except StopAsyncIteration:
+                    break
+                if isinstance(url, CrawlerTaskResult):
+                    finished.append(url)
+                    pending.release()
+                    continue
                 task_id = str(uuid.uuid4())
                 if self.monitor:
                     self.monitor.add_task(task_id, url)
                 task = asyncio.create_task(
-                    self.crawl_url(url, config, task_id, semaphore)
+                    self._crawl_with_retries(
+                        lambda cfg, url=url, task_id=task_id: self.crawl_url(
+                            url, cfg, task_id, semaphore
+                        ),
+                        config,
+                    )
                 )
+                task.add_done_callback(lambda _: pending.release())
                 tasks.append(task)
 
-            return await asyncio.gather(*tasks, return_exceptions=True)
+            return finished + await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            if self.monitor:
+                self.monitor.stop()
+
+class DistributedDispatcher(BaseDispatcher):
+    """
+    Fans one `arun_many` call out over worker processes or hosts through a `WorkQueue`.
+
+    The process calling `arun_many` only coordinates: it pushes the URLs as a job,
+    together with the serialized config, and yields the `CrawlerTaskResult`s the
+    workers publish. Workers run `serve` with their own crawler; they lease tasks for
+    `visibility_timeout` seconds and renew the leases while crawling, so the tasks of a
+    worker that dies are handed to another worker once its leases run out.
+
+    Example:
+        # worker process (any number of them)
+        async with AsyncWebCrawler() as crawler:
+            await DistributedDispatcher(SQLiteWorkQueue("jobs.db")).serve(crawler)
+
+        # coordinator
+        results = await crawler.arun_many(
+            urls, config=config, dispatcher=DistributedDispatcher(SQLiteWorkQueue("jobs.db"))
+        )
+
+    Args:
+        queue: Work queue shared by the coordinator and the workers.
+        job_id: Job id for the coordinator; a random one by default.
+        visibility_timeout: Seconds a lease lasts without being renewed.
+        max_attempts: Leases a task gets before it's reported as failed.
+        max_concurrency: Tasks a worker crawls at once.
+        max_pending: Tasks the coordinator keeps queued and unanswered; reading the
+            URL source pauses beyond that.
+        poll_interval: Seconds between queue polls while there is nothing to do.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        job_id: Optional[str] = None,
+        visibility_timeout: float = 60.0,
+        max_attempts: int = 3,
+        max_concurrency: int = 10,
+        max_pending: int = 10_000,
+        poll_interval: float = 0.5,
+        push_batch_size: int = 100,
+        rate_limiter: Optional[RateLimiter] = None,
+        monitor: Optional[CrawlerMonitor] = None,
+        concurrency_controller: Optional[ConcurrencyController] = None,
+        memory_accountant: Optional[MemoryAccountant] = None,
+    ):
+        super().__init__(rate_limiter, monitor, concurrency_controller, memory_accountant)
+        self.queue = queue
+        self.job_id = job_id
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.poll_interval = poll_interval
+        self.push_batch_size = push_batch_size
+        self._job_configs: Dict[str, Union[CrawlerRunConfig, List[CrawlerRunConfig], None]] = {}
+
+    async def crawl_url(
+        self,
+        url: str,
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+        task_id: str,
+        retry_count: int = 0,
+    ) -> CrawlerTaskResult:
+        start_time = time.time()
+        error_message = ""
+        memory_usage = peak_memory = 0.0
+
+        selected_config = self.select_config(url, config)
+        if selected_config is None:
+            error_message = f"No matching configuration found for URL: {url}"
+            result = CrawlResult(
+                url=url,
+                html="",
+                metadata={"status": "no_config_match"},
+                success=False,
+                error_message=error_message,
+            )
+        else:
+            try:
+                if self.monitor:
+                    self.monitor.update_task(
+                        task_id, status=CrawlStatus.IN_PROGRESS, start_time=start_time
+                    )
+                if self.rate_limiter:
+                    await self.rate_limiter.wait_if_needed(url)
+
+                crawl_start = time.time()
+                self.memory_accountant.task_started(task_id)
+                result = await self.crawler.arun(url, config=selected_config, session_id=task_id)
+                self._record_crawl(time.time() - crawl_start, result.success, result.error_message)
+                memory_usage, peak_memory = self.memory_accountant.task_finished(task_id, url, result)
+
+                if self.rate_limiter and result.status_code:
+                    if not await self.rate_limiter.update_delay(
+                        url, result.status_code, result.response_headers
+                    ):
+                        error_message = f"Rate limit retry count exceeded for domain {urlparse(url).netloc}"
+                if not result.success:
+                    error_message = error_message or result.error_message
+            except Exception as e:
+                error_message = str(e)
+                memory_usage, peak_memory = self.memory_accountant.task_finished(task_id, url)
+                result = CrawlResult(
+                    url=url, html="", metadata={}, success=False, error_message=str(e)
+                )
+
+        end_time = time.time()
+        if self.monitor:
+            self.monitor.update_task(
+                task_id,
+                status=CrawlStatus.FAILED if error_message else CrawlStatus.COMPLETED,
+                end_time=end_time,
+                memory_usage=memory_usage,
+                peak_memory=peak_memory,
+                error_message=error_message,
+                retry_count=retry_count,
+            )
+        return CrawlerTaskResult(
+            task_id=task_id,
+            url=url,
+            result=result,
+            memory_usage=memory_usage,
+            peak_memory=peak_memory,
+            start_time=start_time,
+            end_time=end_time,
+            error_message=error_message,
+            retry_count=retry_count,
+            domain_memory=self.memory_accountant.domain_estimate(url) or 0.0,
+        )
+
+    async def run_urls(
+        self,
+        urls: UrlSource,
+        crawler: AsyncWebCrawler,
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> List[CrawlerTaskResult]:
+        return [
+            task_result
+            async for task_result in self.run_urls_stream(urls, crawler, config)
+        ]
+
+    async def run_urls_stream(
+        self,
+        urls: UrlSource,
+        crawler: AsyncWebCrawler,
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> AsyncGenerator[CrawlerTaskResult, None]:
+        """Submit `urls` as a job and yield the results workers publish for it"""
+        self.crawler = crawler
+        job_id = self.job_id or str(uuid.uuid4())
+        await self.queue.create_job(job_id, json.dumps(to_serializable_dict(config)))
+
+        finished: asyncio.Queue = asyncio.Queue()
+        pushed = received = 0
+
+        async def push_urls():
+            nonlocal pushed
+            batch = []
+
+            async def flush():
+                nonlocal pushed
+                await self.queue.push(job_id, batch)
+                pushed += len(batch)
+                batch.clear()
+
+            async for url in iter_urls(urls):
+                if isinstance(url, CrawlerTaskResult):
+                    finished.put_nowait(url)
+                    continue
+                task_id = str(uuid.uuid4())
+                if self.monitor:
+                    self.monitor.add_task(task_id, url)
+                batch.append((task_id, url))
+                # Flush full batches, and right away while workers have nothing to do
+                if len(batch) >= self.push_batch_size or pushed == received:
+                    await flush()
+                while pushed - received >= self.max_pending:
+                    await asyncio.sleep(self.poll_interval)
+            if batch:
+                await flush()
+
+        if self.monitor:
+            self.monitor.start()
+        pusher = asyncio.create_task(push_urls())
+        cursor = None
+        try:
+            while True:
+                while not finished.empty():
+                    yield finished.get_nowait()
+                if pusher.done():
+                    pusher.result()  # Surface errors from the URL source
+                    if received >= pushed and finished.empty():
+                        break
+
+                rows = await self.queue.results(job_id, cursor)
+                for cursor, payload in rows:
+                    received += 1
+                    task_result = decode_task_result(payload)
+                    if self.monitor:
+                        self.monitor.update_task(
+                            task_result.task_id,
+                            status=CrawlStatus.COMPLETED if task_result.success else CrawlStatus.FAILED,
+                            start_time=task_result.start_time,
+                            end_time=task_result.end_time,
+                            error_message=task_result.error_message,
+                            retry_count=task_result.retry_count,
+                        )
+                    yield task_result
+                if not rows:
+                    await asyncio.sleep(self.poll_interval if pusher.done() else 0.01)
+        finally:
+            pusher.cancel()
+            await asyncio.gather(pusher, return_exceptions=True)
+            # Workers drop whatever is left of the job once its config is gone
+            await self.queue.delete_job(job_id)
+            if self.monitor:
+                self.monitor.stop()
+
+    async def _job_config(self, job_id: str) -> Union[CrawlerRunConfig, List[CrawlerRunConfig], None]:
+        if job_id not in self._job_configs:
+            config = await self.queue.job_config(job_id)
+            if config is None:
+                return None
+            self._job_configs[job_id] = from_serializable_dict(json.loads(config))
+        return self._job_configs[job_id]
+
+    async def _work(self, worker_id: str, lease: Lease) -> None:
+        config = await self._job_config(lease.job_id)
+        if config is None:
+            return  # The coordinator has finished with the job
+        if self.monitor:
+            self.monitor.add_task(lease.task_id, lease.url)
+        task_result = await self.crawl_url(lease.url, config, lease.task_id, lease.attempts - 1)
+        await self.queue.complete(worker_id, lease, encode_task_result(task_result))
+
+    async def serve(
+        self,
+        crawler: AsyncWebCrawler,
+        job_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        stop_when_idle: bool = False,
+    ) -> None:
+        """
+        Crawl tasks from the queue until cancelled.
+
+        Args:
+            crawler: Crawler used for the leased URLs.
+            job_id: Work only on this job; any job by default.
+            worker_id: Lease owner name; host, pid and a random suffix by default.
+            stop_when_idle: Return once the queue has nothing left to lease.
+        """
+        self.crawler = crawler
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        running: Dict[asyncio.Task, Lease] = {}
+        renewed_at = time.monotonic()
+        if self.monitor:
+            self.monitor.start()
+        try:
+            while True:
+                limit = self.max_concurrency
+                if self.concurrency_controller:
+                    limit = min(limit, self.concurrency_controller.limit)
+                leases = await self.queue.lease(
+                    worker_id,
+                    limit - len(running),
+                    self.visibility_timeout,
+                    job_id=job_id,
+                    max_attempts=self.max_attempts,
+                )
+                for lease in leases:
+                    running[asyncio.create_task(self._work(worker_id, lease))] = lease
+
+                if not running:
+                    if stop_when_idle:
+                        return
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    running.pop(task)
+                    # A task whose result couldn't be published is left to its lease
+                    # running out, after which another worker retries it
+                    task.exception()
+
+                if running and time.monotonic() - renewed_at >= self.visibility_timeout / 3:
+                    await self.queue.extend(worker_id, list(running.values()), self.visibility_timeout)
+                    renewed_at = time.monotonic()
         finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
             if self.monitor:
-                self.monitor.stop()
\ No newline at end of file
+                self.monitor.stop()
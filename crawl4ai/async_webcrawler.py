@@ -4,14 +4,18 @@ import re
 import sys
 import time
 from pathlib import Path
-from typing import Optional, List
+from typing import AsyncGenerator, Dict, Optional, List, Set, Union
 import json
+import pickle
 import asyncio
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
 
 # from contextlib import nullcontext, asynccontextmanager
 from contextlib import asynccontextmanager
 from .models import (
     CrawlResult,
+    CrawlerTaskResult,
     MarkdownGenerationResult,
     DispatchResult,
     ScrapingResult,
@@ -19,11 +23,16 @@ from .models import (
     RunManyReturn
 )
 from .async_database import async_db_manager
+from .cache_backend import CacheBackend, LocalCacheBackend
 from .chunking_strategy import *  # noqa: F403
 from .chunking_strategy import IdentityChunking
 from .content_filter_strategy import *  # noqa: F403
 from .extraction_strategy import *  # noqa: F403
-from .extraction_strategy import NoExtractionStrategy
+from .extraction_strategy import (
+    ExtractionStrategy,
+    NoExtractionStrategy,
+    JsonElementExtractionStrategy,
+)
 from .async_crawler_strategy import (
     AsyncCrawlerStrategy,
     AsyncPlaywrightCrawlerStrategy,
@@ -38,8 +47,21 @@ from .deep_crawling import DeepCrawlDecorator
 from .async_logger import AsyncLogger, AsyncLoggerBase
 from .async_configs import BrowserConfig, CrawlerRunConfig, ProxyConfig, SeedingConfig
 from .async_dispatcher import *  # noqa: F403
-from .async_dispatcher import BaseDispatcher, MemoryAdaptiveDispatcher, RateLimiter
+from .async_dispatcher import (
+    BaseDispatcher,
+    MemoryAdaptiveDispatcher,
+    RateLimiter,
+    UrlSource,
+    iter_urls,
+)
 from .async_url_seeder import AsyncUrlSeeder
+from .parsed_document import ParsedDocument
+from .processing import (
+    ProcessingSpec,
+    build_processing_spec,
+    prepare_extraction_input,
+    process_html,
+)
 
 from .utils import (
     sanitize_input_encode,
@@ -47,10 +69,9 @@ from .utils import (
     fast_format_html,
     get_error_context,
     RobotsParser,
-    preprocess_html_for_schema,
     compute_head_fingerprint,
 )
-from .cache_validator import CacheValidator, CacheValidationResult
+from .cache_validator import CacheValidator, CacheValidationResult, ValidationResult
 from .antibot_detector import is_blocked
 
 
@@ -84,6 +105,7 @@ class AsyncWebCrawler:
         logger (AsyncLogger): Logger instance for recording events and errors.
         crawl4ai_folder (str): Directory for storing cache.
         base_directory (str): Base directory for storing cache.
+        processing_executor (Executor): Optional executor for HTML processing.
         ready (bool): Whether the crawler is ready for use.
 
     Methods:
@@ -119,6 +141,8 @@ class AsyncWebCrawler:
             os.getenv("CRAWL4_AI_BASE_DIRECTORY", Path.home())),
         thread_safe: bool = False,
         logger: AsyncLoggerBase = None,
+        processing_executor: Optional[Executor] = None,
+        cache_backend: Optional[CacheBackend] = None,
         **kwargs,
     ):
         """
@@ -129,6 +153,13 @@ class AsyncWebCrawler:
             config: Configuration object for browser settings. Default BrowserConfig()
             base_directory: Base directory for storing cache
             thread_safe: Whether to use thread-safe operations
+            processing_executor: Executor (typically a ProcessPoolExecutor) that runs the
+                HTML -> markdown -> extraction stage off the event loop. Can be overridden
+                per run with CrawlerRunConfig.processing_executor. The caller owns it and
+                is responsible for shutting it down. Default None (process inline).
+            cache_backend: Where cached results are read and written, e.g. a
+                RedisCacheBackend shared by several crawler nodes. Default
+                LocalCacheBackend (the sqlite cache under base_directory).
             **kwargs: Additional arguments for backwards compatibility
         """
         # Handle browser configuration
@@ -155,6 +186,17 @@ class AsyncWebCrawler:
         # Thread safety setup
         self._lock = asyncio.Lock() if thread_safe else None
 
+        # Optional off-loop executor for aprocess_html CPU work
+        self.processing_executor = processing_executor
+        # Whether the processing spec of a run config can be pickled, probed once per config
+        self._picklable_configs: "weakref.WeakKeyDictionary[CrawlerRunConfig, bool]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self.cache_backend = cache_backend or LocalCacheBackend(async_db_manager)
+        # Shared by all freshness checks so their connections are pooled (see check_cache_freshness)
+        self._cache_validator: Optional[CacheValidator] = None
+
         # Initialize directories
         self.crawl4ai_folder = os.path.join(base_directory, ".crawl4ai")
         os.makedirs(self.crawl4ai_folder, exist_ok=True)
@@ -193,6 +235,9 @@ class AsyncWebCrawler:
         2. Close any open pages and contexts
         """
         await self.crawler_strategy.__aexit__(None, None, None)
+        if self._cache_validator:
+            await self._cache_validator.close()
+            self._cache_validator = None
 
     async def __aenter__(self):
         return await self.start()
@@ -205,6 +250,18 @@ class AsyncWebCrawler:
         """异步空上下文管理器"""
         yield
 
+    @staticmethod
+    def _cache_read_fields(config: CrawlerRunConfig) -> Set[str]:
+        """
+        Cached fields arun loads up front on a cache hit. The rest of the CrawlResult
+        (cleaned_html, links, media, metadata, and the screenshot unless requested)
+        is read from the cache only if the caller touches it.
+        """
+        fields = {"html", "markdown", "extracted_content"}
+        if config.screenshot:
+            fields.add("screenshot")
+        return fields
+
     async def arun(
         self,
         url: str,
@@ -249,6 +306,7 @@ class AsyncWebCrawler:
                 "Invalid URL, make sure the URL is a non-empty string")
 
         async with self._lock or self.nullcontext():
+            crawl_claim = None  # token of our claim on url while crawling it (see CacheBackend)
             try:
                 self.logger.verbose = config.verbose
 
@@ -269,51 +327,36 @@ class AsyncWebCrawler:
 
                 # Try to get cached result if appropriate
                 if cache_context.should_read():
-                    cached_result = await async_db_manager.aget_cached_url(url)
+                    cached_result = await self.cache_backend.aget_cached_url(
+                        url, fields=self._cache_read_fields(config)
+                    )
+                    # Another node may be crawling this URL right now; wait for its
+                    # result instead of fetching the page a second time
+                    if (
+                        cached_result is None
+                        and self.cache_backend.lock_urls
+                        and cache_context.should_write()
+                    ):
+                        cached_result, crawl_claim = await self.cache_backend.aclaim_url(
+                            url, fields=self._cache_read_fields(config)
+                        )
 
-                # Smart Cache: Validate cache freshness if enabled
-                if cached_result and config.check_cache_freshness:
-                    cache_metadata = await async_db_manager.aget_cache_metadata(url)
+                # Smart Cache: Validate cache freshness if enabled (results revalidated
+                # in bulk by arun_many arrive with their cache_status already set)
+                if cached_result and config.check_cache_freshness and not cached_result.cache_status:
+                    cache_metadata = await self.cache_backend.aget_cache_metadata(url)
                     if cache_metadata:
-                        async with CacheValidator(timeout=config.cache_validation_timeout) as validator:
-                            validation = await validator.validate(
-                                url=url,
-                                stored_etag=cache_metadata.get("etag"),
-                                stored_last_modified=cache_metadata.get("last_modified"),
-                                stored_head_fingerprint=cache_metadata.get("head_fingerprint"),
-                            )
-
-                        if validation.status == CacheValidationResult.FRESH:
-                            cached_result.cache_status = "hit_validated"
-                            self.logger.info(
-                                message="Cache validated: {reason}",
-                                tag="CACHE",
-                                params={"reason": validation.reason}
-                            )
-                            # Update metadata if we got new values
-                            if validation.new_etag or validation.new_last_modified:
-                                await async_db_manager.aupdate_cache_metadata(
-                                    url=url,
-                                    etag=validation.new_etag,
-                                    last_modified=validation.new_last_modified,
-                                    head_fingerprint=validation.new_head_fingerprint,
-                                )
-                        elif validation.status == CacheValidationResult.ERROR:
-                            cached_result.cache_status = "hit_fallback"
-                            self.logger.warning(
-                                message="Cache validation failed, using cached: {reason}",
-                                tag="CACHE",
-                                params={"reason": validation.reason}
-                            )
-                        else:
-                            # STALE or UNKNOWN - force recrawl
-                            self.logger.info(
-                                message="Cache stale: {reason}",
-                                tag="CACHE",
-                                params={"reason": validation.reason}
-                            )
-                            cached_result = None
-                elif cached_result:
+                        validation = await self.cache_validator.validate(
+                            url=url,
+                            stored_etag=cache_metadata.get("etag"),
+                            stored_last_modified=cache_metadata.get("last_modified"),
+                            stored_head_fingerprint=cache_metadata.get("head_fingerprint"),
+                            timeout=config.cache_validation_timeout,
+                        )
+                        cached_result = await self._apply_cache_validation(
+                            url, cached_result, validation
+                        )
+                elif cached_result and not cached_result.cache_status:
                     cached_result.cache_status = "hit"
 
                 if cached_result:
@@ -327,7 +370,8 @@ class AsyncWebCrawler:
                         else extracted_content
                     )
                     # If screenshot is requested but its not in cache, then set cache_result to None
-                    screenshot_data = cached_result.screenshot
+                    # (only touch the screenshot when asked for; it is loaded lazily otherwise)
+                    screenshot_data = cached_result.screenshot if config.screenshot else None
                     pdf_data = cached_result.pdf
                     # if config.screenshot and not screenshot or config.pdf and not pdf:
                     if config.screenshot and not screenshot_data:
@@ -643,9 +687,10 @@ class AsyncWebCrawler:
                         tag="COMPLETE",
                     )
 
-                    # Update cache if appropriate
+                    # Update cache if appropriate (near duplicates are cached as stubs
+                    # pointing at the page they duplicate)
                     if cache_context.should_write() and not bool(cached_result):
-                        await async_db_manager.acache_url(crawl_result)
+                        await self.cache_backend.acache_url(crawl_result)
 
                     return CrawlResultContainer(crawl_result)
 
@@ -685,6 +730,76 @@ class AsyncWebCrawler:
                         url=url, html="", success=False, error_message=error_message
                     )
                 )
+            finally:
+                if crawl_claim is not None:
+                    await self.cache_backend.release_claim(url, crawl_claim)
+
+    @property
+    def cache_validator(self) -> CacheValidator:
+        """Connection-pooled validator used for check_cache_freshness"""
+        if self._cache_validator is None:
+            self._cache_validator = CacheValidator()
+        return self._cache_validator
+
+    async def _apply_cache_validation(
+        self, url: str, cached_result: CrawlResult, validation: ValidationResult
+    ) -> Optional[CrawlResult]:
+        """Mark `cached_result` with the outcome of a freshness check; None if it must be recrawled"""
+        if validation.status == CacheValidationResult.FRESH:
+            cached_result.cache_status = "hit_validated"
+            self.logger.info(
+                message="Cache validated: {reason}",
+                tag="CACHE",
+                params={"reason": validation.reason}
+            )
+            # Update metadata if we got new values
+            if validation.new_etag or validation.new_last_modified:
+                await self.cache_backend.aupdate_cache_metadata(
+                    url=url,
+                    etag=validation.new_etag,
+                    last_modified=validation.new_last_modified,
+                    head_fingerprint=validation.new_head_fingerprint,
+                )
+        elif validation.status == CacheValidationResult.ERROR:
+            cached_result.cache_status = "hit_fallback"
+            self.logger.warning(
+                message="Cache validation failed, using cached: {reason}",
+                tag="CACHE",
+                params={"reason": validation.reason}
+            )
+        else:
+            # STALE or UNKNOWN - force recrawl
+            self.logger.info(
+                message="Cache stale: {reason}",
+                tag="CACHE",
+                params={"reason": validation.reason}
+            )
+            return None
+        return cached_result
+
+    async def _revalidate_cached(
+        self, cached: Dict[str, CrawlResult], config: CrawlerRunConfig
+    ) -> Dict[str, Optional[CrawlResult]]:
+        """
+        Check the freshness of many cached results at once with the shared validator.
+
+        Returns:
+            The results keyed by URL, None for the ones that must be recrawled
+        """
+        metadata = await self.cache_backend.aget_cache_metadata_many(list(cached))
+        validations = await self.cache_validator.validate_many(
+            metadata, timeout=config.cache_validation_timeout
+        )
+        revalidated = {}
+        for url, cached_result in cached.items():
+            if url in validations:
+                revalidated[url] = await self._apply_cache_validation(
+                    url, cached_result, validations[url]
+                )
+            else:
+                cached_result.cache_status = "hit"
+                revalidated[url] = cached_result
+        return revalidated
 
     async def aprocess_html(
         self,
@@ -734,180 +849,184 @@ class AsyncWebCrawler:
             )
         # === END PREFETCH SHORT-CIRCUIT ===
 
-        cleaned_html = ""
-        try:
-            _url = url if not kwargs.get("is_raw_html", False) else "Raw HTML"
-            t1 = time.perf_counter()
-
-            # Get scraping strategy and ensure it has a logger
-            scraping_strategy = config.scraping_strategy
-            if not scraping_strategy.logger:
-                scraping_strategy.logger = self.logger
-
-            # Process HTML content
-            params = config.__dict__.copy()
-            params.pop("url", None)
-            # add keys from kwargs to params that doesn't exist in params
-            params.update({k: v for k, v in kwargs.items()
-                          if k not in params.keys()})
-
-            ################################
-            # Scraping Strategy Execution  #
-            ################################
-            result: ScrapingResult = scraping_strategy.scrap(
-                url, html, **params)
-
-            if result is None:
-                raise ValueError(
-                    f"Process HTML, Failed to extract content from the website: {url}"
-                )
-
-        except InvalidCSSSelectorError as e:
-            raise ValueError(str(e))
-        except Exception as e:
-            raise ValueError(
-                f"Process HTML, Failed to extract content from the website: {url}, error: {str(e)}"
-            )
+        _url = url if not kwargs.get("is_raw_html", False) else "Raw HTML"
 
-        # Extract results - handle both dict and ScrapingResult
-        if isinstance(result, dict):
-            cleaned_html = sanitize_input_encode(
-                result.get("cleaned_html", ""))
-            media = result.get("media", {})
-            tables = media.pop("tables", []) if isinstance(media, dict) else []
-            links = result.get("links", {})
-            metadata = result.get("metadata", {})
-        else:
-            cleaned_html = sanitize_input_encode(result.cleaned_html)
-            # media = result.media.model_dump()
-            # tables = media.pop("tables", [])
-            # links = result.links.model_dump()
-            media = result.media.model_dump() if hasattr(result.media, 'model_dump') else result.media
-            tables = media.pop("tables", []) if isinstance(media, dict) else []
-            links = result.links.model_dump() if hasattr(result.links, 'model_dump') else result.links
-            metadata = result.metadata
+        # Get scraping strategy and ensure it has a logger
+        scraping_strategy = config.scraping_strategy
+        if not scraping_strategy.logger:
+            scraping_strategy.logger = self.logger
 
-        fit_html = preprocess_html_for_schema(html_content=html, text_threshold= 500, max_size= 300_000)
+        # Process HTML content
+        params = config.__dict__.copy()
+        params.pop("url", None)
+        # add keys from kwargs to params that doesn't exist in params
+        params.update({k: v for k, v in kwargs.items()
+                      if k not in params.keys()})
 
-        ################################
-        # Generate Markdown            #
-        ################################
         markdown_generator: Optional[MarkdownGenerationStrategy] = (
             config.markdown_generator or DefaultMarkdownGenerator()
         )
-
-        # --- SELECT HTML SOURCE BASED ON CONTENT_SOURCE ---
-        # Get the desired source from the generator config, default to 'cleaned_html'
-        selected_html_source = getattr(markdown_generator, 'content_source', 'cleaned_html')
-
-        # Define the source selection logic using dict dispatch
-        html_source_selector = {
-            "raw_html": lambda: html,  # The original raw HTML
-            "cleaned_html": lambda: cleaned_html,  # The HTML after scraping strategy
-            "fit_html": lambda: fit_html,  # The HTML after preprocessing for schema
-        }
-
-        markdown_input_html = cleaned_html  # Default to cleaned_html
-
-        try:
-            # Get the appropriate lambda function, default to returning cleaned_html if key not found
-            source_lambda = html_source_selector.get(selected_html_source, lambda: cleaned_html)
-            # Execute the lambda to get the selected HTML
-            markdown_input_html = source_lambda()
-
-            # Log which source is being used (optional, but helpful for debugging)
-            # if self.logger and verbose:
-            #     actual_source_used = selected_html_source if selected_html_source in html_source_selector else 'cleaned_html (default)'
-            #     self.logger.debug(f"Using '{actual_source_used}' as source for Markdown generation for {url}", tag="MARKDOWN_SRC")
-
-        except Exception as e:
-            # Handle potential errors, especially from preprocess_html_for_schema
-            if self.logger:
-                self.logger.warning(
-                    f"Error getting/processing '{selected_html_source}' for markdown source: {e}. Falling back to cleaned_html.",
-                    tag="MARKDOWN_SRC"
-                )
-            # Ensure markdown_input_html is still the default cleaned_html in case of error
-            markdown_input_html = cleaned_html
-        # --- END: HTML SOURCE SELECTION ---
-
         # Uncomment if by default we want to use PruningContentFilter
         # if not config.content_filter and not markdown_generator.content_filter:
         #     markdown_generator.content_filter = PruningContentFilter()
 
-        # Extract <base href> from raw HTML before it gets stripped by cleaning.
-        # This ensures relative URLs resolve correctly even with cleaned_html.
-        base_url = params.get("base_url") or params.get("redirected_url") or url
-        base_tag_match = re.search(r'<base\s[^>]*href\s*=\s*["\']([^"\']+)["\']', html, re.IGNORECASE)
-        if base_tag_match:
-            base_url = base_tag_match.group(1)
-
-        markdown_result: MarkdownGenerationResult = (
-            markdown_generator.generate_markdown(
-                input_html=markdown_input_html,
-                base_url=base_url
-                # html2text_options=kwargs.get('html2text', {})
-            )
+        run_extraction = (
+            not bool(extracted_content)
+            and config.extraction_strategy
+            and not isinstance(config.extraction_strategy, NoExtractionStrategy)
+        )
+        # Only build fit_html up front if extraction will read it
+        fit_html_required = bool(
+            run_extraction and config.extraction_strategy.input_format == "fit_html"
         )
 
+        ##########################################
+        # Scraping, Markdown (and Extraction)    #
+        ##########################################
+        processing_executor = config.processing_executor or self.processing_executor
+        parsed_document = None
+        processed = None
+        if processing_executor is not None:
+            # Sync (CPU-bound) extraction strategies travel with the page; strategies with
+            # their own async arun() (LLM) stay in the event loop below. So does every
+            # extraction when near duplicates are skipped, since that check needs the
+            # processed page and must come first.
+            ship_extraction = (
+                run_extraction
+                and not config.skip_near_duplicates
+                and type(config.extraction_strategy).arun is ExtractionStrategy.arun
+            )
+            spec = build_processing_spec(
+                scraping_strategy,
+                markdown_generator,
+                params,
+                extraction_strategy=config.extraction_strategy if ship_extraction else None,
+                chunking_strategy=config.chunking_strategy,
+                fit_html_required=fit_html_required,
+                fingerprint=config.skip_near_duplicates,
+            )
+            # Threads share memory; anything else needs the spec pickled. Everything in
+            # the spec comes from the run config, so the probe is made once per config.
+            picklable = isinstance(processing_executor, ThreadPoolExecutor) or (
+                self._picklable_configs.get(config)
+            )
+            if picklable is None:
+                try:
+                    pickle.dumps(spec)
+                    picklable = True
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    # Something in the config can't be shipped to the worker; process inline
+                    picklable = False
+                    self.logger.warning(
+                        message="Cannot process {url} in processing_executor ({error}), processing pages of this config inline",
+                        tag="SCRAPE",
+                        params={"url": _url, "error": str(e)},
+                    )
+                self._picklable_configs[config] = picklable
+            if picklable:
+                # Errors raised while processing propagate, as they do inline
+                processed = await asyncio.get_running_loop().run_in_executor(
+                    processing_executor, process_html, url, html, spec
+                )
+                if ship_extraction:
+                    run_extraction = False
+                    extracted_content = processed["extracted_content"]
+
+        if processed is None:
+            parsed_document = ParsedDocument(html)
+            processed = process_html(
+                url,
+                html,
+                ProcessingSpec(
+                    scraping_strategy,
+                    markdown_generator,
+                    params,
+                    fit_html_required=fit_html_required,
+                    fingerprint=config.skip_near_duplicates,
+                ),
+                logger=self.logger,
+                parsed_document=parsed_document,
+            )
+
+        cleaned_html = processed["cleaned_html"]
+        fit_html = processed["fit_html"]
+        markdown_result: MarkdownGenerationResult = processed["markdown"]
+        media = processed["media"]
+        tables = processed["tables"]
+        links = processed["links"]
+        metadata = processed["metadata"]
+
         # Log processing completion
         self.logger.url_status(
             url=_url,
             success=True,
-            timing=int((time.perf_counter() - t1) * 1000) / 1000,
+            timing=int(processed["scrape_time"] * 1000) / 1000,
             tag="SCRAPE"
         )
-        # self.logger.info(
-        #     message="{url:.50}... | Time: {timing}s",
-        #     tag="SCRAPE",
-        #     params={"url": _url, "timing": int((time.perf_counter() - t1) * 1000) / 1000},
-        # )
+        if processed["extracted_content"] is not None:
+            self.logger.url_status(
+                url=_url,
+                success=bool(html),
+                timing=processed["extraction_time"],
+                tag="EXTRACT",
+            )
+
+        # Pages that nearly duplicate a cached page are not worth extracting again
+        content_fingerprint = processed["content_fingerprint"]
+        duplicate_of = None
+        if config.skip_near_duplicates and content_fingerprint:
+            duplicates = await self.cache_backend.afind_near_duplicates(
+                content_fingerprint,
+                max_distance=config.near_duplicate_distance,
+                exclude_url=url,
+            )
+            if duplicates:
+                duplicate_of, distance = duplicates[0]
+                run_extraction = False
+                self.logger.info(
+                    message="{url} is a near duplicate of {original} (distance {distance})",
+                    tag="DEDUP",
+                    params={"url": _url, "original": duplicate_of, "distance": distance},
+                )
 
         ################################
         # Structured Content Extraction           #
         ################################
-        if (
-            not bool(extracted_content)
-            and config.extraction_strategy
-            and not isinstance(config.extraction_strategy, NoExtractionStrategy)
-        ):
+        if run_extraction:
             t1 = time.perf_counter()
-            # Choose content based on input_format
-            content_format = config.extraction_strategy.input_format
-            if content_format == "fit_markdown" and not markdown_result.fit_markdown:
-
+            content_format, sections = prepare_extraction_input(
+                config.extraction_strategy,
+                config.chunking_strategy,
+                markdown_result,
+                html,
+                fit_html,
+                cleaned_html,
+            )
+            if content_format != config.extraction_strategy.input_format:
                 self.logger.url_status(
                         url=_url,
                         success=bool(html),
                         timing=time.perf_counter() - t1,
                         tag="EXTRACT",
                     )
-                content_format = "markdown"
-
-            content = {
-                "markdown": markdown_result.raw_markdown,
-                "html": html,
-                "fit_html": fit_html,
-                "cleaned_html": cleaned_html,
-                "fit_markdown": markdown_result.fit_markdown,
-            }.get(content_format, markdown_result.raw_markdown)
-
-            # Use IdentityChunking for HTML input, otherwise use provided chunking strategy
-            chunking = (
-                IdentityChunking()
-                if content_format in ["html", "cleaned_html", "fit_html"]
-                else config.chunking_strategy
-            )
-            sections = chunking.chunk(content)
             # extracted_content = config.extraction_strategy.run(_url, sections)
 
+            # Schema strategies reading the raw HTML can reuse the page-level parse
+            extraction_kwargs = {}
+            if content_format == "html" and isinstance(
+                config.extraction_strategy, JsonElementExtractionStrategy
+            ):
+                extraction_kwargs["parsed_document"] = parsed_document or ParsedDocument(html)
+
             # Use async version if available for better parallelism
             if hasattr(config.extraction_strategy, 'arun'):
-                extracted_content = await config.extraction_strategy.arun(_url, sections)
+                extracted_content = await config.extraction_strategy.arun(
+                    _url, sections, **extraction_kwargs
+                )
             else:
                 # Fallback to sync version run in thread pool to avoid blocking
                 extracted_content = await asyncio.to_thread(
-                    config.extraction_strategy.run, url, sections
+                    config.extraction_strategy.run, url, sections, **extraction_kwargs
                 )
                 
             extracted_content = json.dumps(
@@ -933,6 +1052,8 @@ class AsyncWebCrawler:
             fit_html=fit_html,
             cleaned_html=cleaned_html,
             markdown=markdown_result,
+            content_fingerprint=content_fingerprint or None,
+            duplicate_of=duplicate_of,
             media=media,
             tables=tables,                       # NEW
             links=links,
@@ -946,7 +1067,7 @@ class AsyncWebCrawler:
 
     async def arun_many(
         self,
-        urls: List[str],
+        urls: UrlSource,
         config: Optional[Union[CrawlerRunConfig, List[CrawlerRunConfig]]] = None,
         dispatcher: Optional[BaseDispatcher] = None,
         # Legacy parameters maintained for backwards compatibility
@@ -967,7 +1088,10 @@ class AsyncWebCrawler:
         Runs the crawler for multiple URLs concurrently using a configurable dispatcher strategy.
 
         Args:
-        urls: List of URLs to crawl
+        urls: URLs to crawl. Besides a list, any sync or async iterable of URLs (or of
+            `AsyncUrlSeeder.urls` entries) is accepted; it is read as the crawl
+            progresses, with bounded lookahead, so huge URL sources never have to be
+            held in memory and results stream back from the first URLs on
         config: Configuration object(s) controlling crawl behavior. Can be:
             - Single CrawlerRunConfig: Used for all URLs
             - List[CrawlerRunConfig]: Configs with url_matcher for URL-specific settings
@@ -994,6 +1118,18 @@ class AsyncWebCrawler:
             config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS, stream=True),
         ):
             print(f"Processed {result.url}: {len(result.markdown)} chars")
+
+        # Streaming URLs from a file
+        def read_urls(path):
+            with open(path) as f:
+                for line in f:
+                    yield line.strip()
+
+        async for result in await crawler.arun_many(
+            urls=read_urls("urls.txt"),
+            config=CrawlerRunConfig(stream=True),
+        ):
+            print(result.url)
         """
         config = config or CrawlerRunConfig()
 
@@ -1006,7 +1142,7 @@ class AsyncWebCrawler:
         if getattr(primary_cfg, "deep_crawl_strategy", None):
             if primary_cfg.stream:
                 async def _deep_crawl_stream():
-                    for url in urls:
+                    async for url in iter_urls(urls):
                         result = await self.arun(url, config=primary_cfg)
                         if isinstance(result, list):
                             for r in result:
@@ -1017,7 +1153,7 @@ class AsyncWebCrawler:
                 return _deep_crawl_stream()
             else:
                 all_results = []
-                for url in urls:
+                async for url in iter_urls(urls):
                     result = await self.arun(url, config=primary_cfg)
                     if isinstance(result, list):
                         all_results.extend(result)
@@ -1034,6 +1170,13 @@ class AsyncWebCrawler:
                     base_delay=(mean_delay, mean_delay + max_range),
                     max_delay=60.0,
                     max_retries=3,
+                    # Honour robots.txt Crawl-delay whenever robots.txt is checked
+                    robots_parser=(
+                        self.robots_parser
+                        if getattr(primary_cfg, "check_robots_txt", False)
+                        else None
+                    ),
+                    user_agent=self.browser_config.user_agent or "*",
                 ),
             )
 
@@ -1049,6 +1192,7 @@ class AsyncWebCrawler:
                         start_time=task_result.start_time,
                         end_time=task_result.end_time,
                         error_message=task_result.error_message,
+                        domain_memory=task_result.domain_memory,
                     ),
                 )
                 or task_result.result
@@ -1077,13 +1221,15 @@ class AsyncWebCrawler:
                     params={"session_id": primary_config.proxy_session_id}
                 )
 
+        # Cache hits for the whole batch are resolved (and revalidated, with
+        # check_cache_freshness) in bulk before any browser work is scheduled, and new
+        # cache rows are written in batches.
         if stream:
             async def result_transformer():
                 try:
-                    async for task_result in dispatcher.run_urls_stream(
-                        crawler=self, urls=urls, config=config
-                    ):
-                        yield transform_result(task_result)
+                    async with self.cache_backend.batch_writes():
+                        async for task_result in self._dispatch_many(dispatcher, urls, config, stream):
+                            yield transform_result(task_result)
                 finally:
                     # Auto-release session after streaming completes
                     await maybe_release_session()
@@ -1091,12 +1237,71 @@ class AsyncWebCrawler:
             return result_transformer()
         else:
             try:
-                _results = await dispatcher.run_urls(crawler=self, urls=urls, config=config)
+                async with self.cache_backend.batch_writes():
+                    _results = [
+                        task_result
+                        async for task_result in self._dispatch_many(dispatcher, urls, config, stream)
+                    ]
                 return [transform_result(res) for res in _results]
             finally:
                 # Auto-release session after batch completes
                 await maybe_release_session()
 
+    async def _dispatch_many(
+        self,
+        dispatcher: BaseDispatcher,
+        urls: UrlSource,
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+        stream: bool,
+    ) -> AsyncGenerator[CrawlerTaskResult, None]:
+        """Serve the cache hits of `urls` and crawl the rest through the dispatcher.
+
+        The URLs are looked up batch by batch as they are read, and the dispatcher
+        receives the hits and the URLs to crawl as one stream, so neither memory nor the
+        first result waits on a lookup of the whole batch.
+        """
+        if isinstance(config, list) and isinstance(urls, (list, tuple)) and urls:
+            await self._precreate_contexts(dispatcher, urls, config)
+
+        async with self.cache_backend.prefetched({}) as stale:
+            work = dispatcher.resolve_cache_hits_stream(self, urls, config, stale)
+            if stream:
+                async for task_result in dispatcher.run_urls_stream(
+                    crawler=self, urls=work, config=config
+                ):
+                    yield task_result
+            else:
+                for task_result in await dispatcher.run_urls(crawler=self, urls=work, config=config):
+                    yield task_result
+
+    async def _precreate_contexts(
+        self,
+        dispatcher: BaseDispatcher,
+        urls: List[str],
+        configs: List[CrawlerRunConfig],
+    ) -> None:
+        """Create the browser contexts of a list-of-configs batch before it is dispatched.
+
+        The first crawl of each config then does not set up its context while holding a
+        crawl slot. A failure is only logged; the crawls that need the context retry it.
+        """
+        manager = getattr(self.crawler_strategy, "browser_manager", None)
+        if manager is None or manager.browser is None:
+            return
+        used = {}
+        for url in urls:
+            selected = dispatcher.select_config(url, configs)
+            if selected is not None:
+                used.setdefault(id(selected), selected)
+        try:
+            await manager.precreate_contexts(list(used.values()))
+        except Exception as e:
+            self.logger.warning(
+                message="Could not pre-create browser contexts: {error}",
+                tag="BROWSER",
+                params={"error": str(e)},
+            )
+
     async def aseed_urls(
         self,
         domain_or_domains: Union[str, List[str]],
@@ -1,5 +1,6 @@
 import asyncio
 import time
+from collections import deque
 from typing import Dict, List, Optional, Tuple
 import os
 import sys
@@ -11,11 +12,14 @@ import subprocess
 import shlex
 from playwright.async_api import BrowserContext
 import hashlib
+import re
+from urllib.parse import urlsplit
 from .js_snippet import load_js_script
 from .config import DOWNLOAD_PAGE_TIMEOUT
 from .async_configs import BrowserConfig, CrawlerRunConfig
 from .utils import get_chromium_path
 import warnings
+from dataclasses import dataclass
 
 
 BROWSER_DISABLE_OPTIONS = [
@@ -40,6 +44,224 @@ BROWSER_DISABLE_OPTIONS = [
     "--use-mock-keychain",
 ]
 
+# CSS extensions (blocked separately via avoid_css flag)
+CSS_EXTENSIONS = ["css", "less", "scss", "sass"]
+
+# Static resource extensions (blocked when text_mode is enabled)
+STATIC_EXTENSIONS = [
+    # Images
+    "jpg", "jpeg", "png", "gif", "webp", "svg", "ico", "bmp", "tiff", "psd",
+    # Fonts
+    "woff", "woff2", "ttf", "otf", "eot",
+    # Media
+    "mp4", "webm", "ogg", "avi", "mov", "wmv", "flv", "m4v",
+    "mp3", "wav", "aac", "m4a", "opus", "flac",
+    # Documents
+    "pdf", "doc", "docx", "xls", "xlsx", "ppt", "pptx",
+    # Archives
+    "zip", "rar", "7z", "tar", "gz",
+    # Scripts and data
+    "xml", "swf", "wasm",
+]
+
+# Ad and tracker domains (curated from uBlock/EasyList sources), subdomains included
+AD_TRACKER_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "adsystem.com",
+    "adzerk.net",
+    "adnxs.com",
+    "ads.linkedin.com",
+    "facebook.net",
+    "analytics.twitter.com",
+    "ads-twitter.com",
+    "hotjar.com",
+    "clarity.ms",
+    "scorecardresearch.com",
+    "pixel.wp.com",
+    "amazon-adsystem.com",
+    "mixpanel.com",
+    "segment.com",
+]
+
+
+# Makes closed shadow roots open so flatten_shadow_dom can read them
+SHADOW_DOM_INIT_SCRIPT = """
+    const _origAttachShadow = Element.prototype.attachShadow;
+    Element.prototype.attachShadow = function(init) {
+        return _origAttachShadow.call(this, {...init, mode: 'open'});
+    };
+"""
+
+
+@dataclass(frozen=True)
+class ContextTemplate:
+    """
+    Fully prepared setup_context state for a BrowserConfig and set of
+    context-relevant run options, applied to a new context.
+
+    Headers and cookies are read from the BrowserConfig on every build, because
+    crawls update its user agent, browser hint and sec-ch-ua header in place.
+    Only the init scripts, which need file reads, are cached by BrowserManager.
+
+    Attributes:
+        headers (dict or None): Final extra HTTP headers (BrowserConfig headers,
+                                plus User-Agent and sec-ch-ua when a user agent is set).
+        cookies (tuple): BrowserConfig cookies, injected in one batch.
+        init_scripts (tuple): Init scripts in the order they are added to the context.
+        navigator_overrides (bool): Whether the navigator overrider is among the scripts.
+        shadow_dom (bool): Whether the shadow DOM opener is among the scripts.
+    """
+
+    headers: Optional[Dict[str, str]]
+    cookies: Tuple[dict, ...]
+    init_scripts: Tuple[str, ...]
+    navigator_overrides: bool = False
+    shadow_dom: bool = False
+
+    @staticmethod
+    def build_init_scripts(
+        config: BrowserConfig, navigator_overrides: bool = False, shadow_dom: bool = False
+    ) -> Tuple[str, ...]:
+        """Init scripts in the order they are added to the context."""
+        scripts = []
+        if navigator_overrides:
+            scripts.append(load_js_script("navigator_overrider"))
+        if shadow_dom:
+            scripts.append(SHADOW_DOM_INIT_SCRIPT)
+        # Custom init_scripts from BrowserConfig (for stealth evasions, etc.)
+        scripts.extend(config.init_scripts or ())
+        return tuple(scripts)
+
+    @classmethod
+    def build(
+        cls,
+        config: BrowserConfig,
+        navigator_overrides: bool = False,
+        shadow_dom: bool = False,
+        init_scripts: Optional[Tuple[str, ...]] = None,
+    ) -> "ContextTemplate":
+        headers = dict(config.headers) if config.headers else None
+        if config.user_agent:
+            headers = {"User-Agent": config.user_agent, "sec-ch-ua": config.browser_hint}
+            headers.update(config.headers)
+
+        if init_scripts is None:
+            init_scripts = cls.build_init_scripts(config, navigator_overrides, shadow_dom)
+
+        return cls(
+            headers=headers,
+            cookies=tuple(config.cookies or ()),
+            init_scripts=init_scripts,
+            navigator_overrides=navigator_overrides,
+            shadow_dom=shadow_dom,
+        )
+
+
+class RequestBlocker:
+    """
+    Precompiled matcher behind the single request-interception route of a context.
+
+    Instead of one context.route() glob per extension and ad domain, every rule is
+    folded into one extension set, one domain suffix trie and one regular
+    expression. URL-only rules are registered with the regex, which Playwright
+    matches before calling into Python, so only requests that get aborted reach
+    the handler. Resource-type rules need to see every request and use handle().
+
+    Attributes:
+        extensions (frozenset): Lower-case file extensions to block.
+        resource_types (frozenset): Playwright resource types to block
+                                    (e.g. "image", "font", "media", "xhr").
+        url_pattern (re.Pattern): Regex matching the blocked URLs, None without URL rules.
+    """
+
+    def __init__(self, extensions=(), domains=(), resource_types=()):
+        self.extensions = frozenset(ext.lower().lstrip(".") for ext in extensions)
+        self.resource_types = frozenset(resource_types)
+        self._domains = sorted({d.lower().strip(".") for d in domains})
+        # Labels in reverse order ("net" -> "doubleclick"), None marks a blocked suffix
+        self._trie = {}
+        for domain in self._domains:
+            node = self._trie
+            for label in reversed(domain.split(".")):
+                node = node.setdefault(label, {})
+            node[None] = True
+        self.url_pattern = self._compile()
+
+    @classmethod
+    def from_config(cls, config: BrowserConfig) -> Optional["RequestBlocker"]:
+        """Build the blocker for a BrowserConfig, or None when nothing is blocked."""
+        extensions = []
+        if config.avoid_css:
+            extensions.extend(CSS_EXTENSIONS)
+        if config.text_mode:
+            extensions.extend(STATIC_EXTENSIONS)
+        domains = AD_TRACKER_DOMAINS if config.avoid_ads else ()
+        resource_types = config.blocked_resource_types or ()
+        if not (extensions or domains or resource_types):
+            return None
+        return cls(extensions, domains, resource_types)
+
+    def _compile(self):
+        alternatives = []
+        if self._domains:
+            hosts = "|".join(re.escape(d) for d in self._domains)
+            alternatives.append(
+                rf"^[^:/?#]+://(?:[^/?#@]*@)?(?:[^/?#@]*\.)?(?:{hosts})(?::\d+)?(?:[/?#]|$)"
+            )
+        if self.extensions:
+            exts = "|".join(re.escape(e) for e in sorted(self.extensions))
+            alternatives.append(rf"^[^:/?#]+://[^/?#]*/[^?#]*\.(?:{exts})(?:[?#]|$)")
+        if not alternatives:
+            return None
+        return re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def blocks_host(self, host: str) -> bool:
+        """Whether host is one of the blocked domains or a subdomain of one."""
+        node = self._trie
+        for label in reversed(host.lower().rstrip(".").split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+    def blocks(self, url: str, resource_type: Optional[str] = None) -> bool:
+        """Whether a request for url (of the given Playwright resource type) is blocked."""
+        if resource_type is not None and resource_type in self.resource_types:
+            return True
+        parts = urlsplit(url)
+        if self._trie and parts.hostname and self.blocks_host(parts.hostname):
+            return True
+        if self.extensions:
+            name = parts.path.rsplit("/", 1)[-1]
+            if "." in name and name.rsplit(".", 1)[1].lower() in self.extensions:
+                return True
+        return False
+
+    async def register(self, context):
+        """Install the single blocking route on a browser context."""
+        if self.resource_types:
+            await context.route("**/*", self.handle)
+        elif self.url_pattern is not None:
+            await context.route(self.url_pattern, _abort_route)
+
+    async def handle(self, route):
+        """Route handler for contexts that block by resource type."""
+        request = route.request
+        if self.blocks(request.url, request.resource_type):
+            await route.abort()
+        else:
+            await route.fallback()
+
+
+async def _abort_route(route):
+    await route.abort()
+
 
 class ManagedBrowser:
     """
@@ -734,6 +956,8 @@ class BrowserManager:
         # Keep track of contexts by a "config signature," so each unique config reuses a single context
         self.contexts_by_config = {}
         self._contexts_lock = asyncio.Lock()
+        self._context_scripts = {}      # init script inputs -> ContextTemplate.init_scripts
+        self._context_creations = {}    # sig -> Future of a context being created
 
         # Context lifecycle tracking for LRU eviction
         self._context_refcounts = {}    # sig -> int  (active crawls using this context)
@@ -741,6 +965,22 @@ class BrowserManager:
         self._page_to_sig = {}          # page -> sig  (for decrement lookup on release)
         self._max_contexts = 20         # LRU eviction threshold
 
+        # Idle pages kept warm per context signature (BrowserConfig.page_pool_size)
+        self._page_pools: Dict[str, deque] = {}  # sig -> deque of reset pages
+        self._page_uses = {}            # page -> crawls served by a pooled page
+
+        # Compiled request-blocking rules shared by all contexts of this browser
+        self._request_blocker = RequestBlocker.from_config(browser_config)
+
+        # Sharded mode (browser_shards > 1): one child manager per browser process
+        self._shards: List["BrowserManager"] = []
+        self._shard_stats = {}          # shard -> {"pages", "latency", "rss"}
+        self._shard_of = {}             # page -> shard that served it
+        self._session_shards = {}       # session_id -> shard holding the session
+        self._shard_rss_checked = 0.0   # monotonic time of the last RSS sample
+        self._expires_sessions = True   # False for shards, whose parent expires sessions
+        self._driver_pid = None         # pid of the Playwright driver, for shard RSS
+
         # Serialize context.new_page() across concurrent tasks to avoid races
         # when using a shared persistent context (context.pages may be empty
         # for all racers). Prevents 'Target page/context closed' errors.
@@ -788,9 +1028,13 @@ class BrowserManager:
 
         Note: This method should be called in a separate task to avoid blocking the main event loop.
         """
-        if self.playwright is not None:
+        if self.playwright is not None or self._shards:
             await self.close()
 
+        if self._use_shards():
+            await self._start_shards()
+            return
+
         # Use cached CDP connection if enabled and cdp_url is set
         if self.config.cache_cdp_connection and self.config.cdp_url:
             self._using_cached_cdp = True
@@ -807,6 +1051,13 @@ class BrowserManager:
 
             # Initialize playwright
             self.playwright = await async_playwright().start()
+            # Playwright does not expose its driver process publicly. Its pid is read
+            # once here from private attributes; if they change, _browser_rss_mb
+            # returns None and shards are balanced without RSS.
+            try:
+                self._driver_pid = self.playwright._impl_obj._connection._transport._proc.pid
+            except AttributeError:
+                self._driver_pid = None
 
         # ── Persistent context via Playwright's native API ──────────────
         # When use_persistent_context is set and we're not connecting to an
@@ -945,6 +1196,124 @@ class BrowserManager:
         if self._browser_endpoint_key not in BrowserManager._global_pages_in_use:
             BrowserManager._global_pages_in_use[self._browser_endpoint_key] = set()
 
+    def _use_shards(self) -> bool:
+        """Sharding applies only to browsers launched by Playwright itself."""
+        return self.config.browser_shards > 1 and not (
+            self.config.cdp_url
+            or self.config.use_managed_browser
+            or self.config.use_persistent_context
+            or self.config.cache_cdp_connection
+        )
+
+    async def _start_shards(self):
+        """
+        Launch browser_shards child managers, each with its own Playwright driver
+        and browser process. Every shard keeps its own contexts, locks, page pools
+        and recycling state, so max_pages_before_recycle applies per shard.
+        """
+        shard_config = self.config.clone(browser_shards=1)
+        shards = [
+            BrowserManager(shard_config, logger=self.logger, use_undetected=self.use_undetected)
+            for _ in range(self.config.browser_shards)
+        ]
+        for shard in shards:
+            # Expired sessions go through kill_session() here, so the page counts
+            # and session-to-shard map stay in step with the shards
+            shard._expires_sessions = False
+        results = await asyncio.gather(
+            *(shard.start() for shard in shards), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            await asyncio.gather(
+                *(shard.close() for shard in shards), return_exceptions=True
+            )
+            raise errors[0]
+
+        self._shards = shards
+        self._shard_stats = {
+            shard: {"pages": 0, "latency": 0.0, "rss": None} for shard in shards
+        }
+        # The first shard stands in for callers that expect a single browser
+        self.playwright = shards[0].playwright
+        self.browser = shards[0].browser
+        self.default_context = shards[0].default_context
+        if self.logger:
+            self.logger.info(
+                message="Started {count} browser shards",
+                tag="BROWSER",
+                params={"count": len(shards)},
+            )
+
+    def _browser_rss_mb(self) -> Optional[float]:
+        """RSS of the browser processes started by this manager's Playwright driver."""
+        if self._driver_pid is None:
+            return None
+        try:
+            children = psutil.Process(self._driver_pid).children(recursive=True)
+            return sum(p.memory_info().rss for p in children) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def _pick_shard(self) -> "BrowserManager":
+        """
+        Pick the least loaded shard for a new page.
+
+        The load is the number of open pages, scaled up by the recent time to get a
+        page from the shard (in seconds) and by the shard's RSS relative to the
+        average, so a slow or bloated browser receives fewer new pages.
+        """
+        now = time.monotonic()
+        if now - self._shard_rss_checked >= 5.0:
+            self._shard_rss_checked = now
+            for shard, stats in self._shard_stats.items():
+                stats["rss"] = shard._browser_rss_mb()
+
+        known = [s["rss"] for s in self._shard_stats.values() if s["rss"]]
+        average_rss = sum(known) / len(known) if known else None
+
+        def load(shard):
+            stats = self._shard_stats[shard]
+            score = (stats["pages"] + 1) * (1 + stats["latency"])
+            if average_rss and stats["rss"]:
+                score *= stats["rss"] / average_rss
+            return score
+
+        return min(self._shards, key=load)
+
+    async def _get_shard_page(self, crawlerRunConfig: CrawlerRunConfig):
+        """get_page() for sharded mode: sessions stay on their shard, new pages go to the least loaded one."""
+        self._cleanup_expired_sessions()
+        session_id = crawlerRunConfig.session_id
+        shard = self._session_shards.get(session_id) if session_id else None
+        reused = shard is not None and session_id in shard.sessions
+        if not reused:
+            shard = self._pick_shard()
+
+        stats = self._shard_stats[shard]
+        if not reused:
+            stats["pages"] += 1
+        start = time.monotonic()
+        try:
+            page, context = await shard.get_page(crawlerRunConfig)
+        except Exception:
+            if not reused:
+                stats["pages"] -= 1
+            raise
+        stats["latency"] += 0.2 * (time.monotonic() - start - stats["latency"])
+
+        self._shard_of[page] = shard
+        if session_id:
+            self._session_shards[session_id] = shard
+        return page, context
+
+    def _forget_shard_page(self, page):
+        """Stop counting a page against its shard and return that shard."""
+        shard = self._shard_of.pop(page, None)
+        if shard is not None:
+            self._shard_stats[shard]["pages"] -= 1
+        return shard
+
     def _compute_browser_endpoint_key(self) -> str:
         """
         Compute a unique key identifying this browser connection.
@@ -1148,22 +1517,11 @@ class BrowserManager:
         Set up a browser context with the configured options.
 
         How it works:
-        1. Set extra HTTP headers if provided.
-        2. Add cookies if provided.
-        3. Load storage state if provided.
-        4. Accept downloads if enabled.
-        5. Set default timeouts for navigation and download.
-        6. Set user agent if provided.
-        7. Set browser hints if provided.
-        8. Set proxy if provided.
-        9. Set downloads path if provided.
-        10. Set storage state if provided.
-        11. Set cache if provided.
-        12. Set extra HTTP headers if provided.
-        13. Add cookies if provided.
-        14. Set default timeouts for navigation and download if enabled.
-        15. Set user agent if provided.
-        16. Set browser hints if provided.
+        1. Build the ContextTemplate for this config: final extra HTTP headers,
+           BrowserConfig cookies and the (cached) init scripts.
+        2. Set the default timeouts and downloads path if downloads are enabled.
+        3. Apply headers, cookies (in one batch, with the default cookie for the
+           crawled URL) and init scripts concurrently.
 
         Args:
             context (BrowserContext): The browser context to set up
@@ -1172,14 +1530,7 @@ class BrowserManager:
         Returns:
             None
         """
-        if self.config.headers:
-            await context.set_extra_http_headers(self.config.headers)
-
-        if self.config.cookies:
-            await context.add_cookies(self.config.cookies)
-
-        if self.config.storage_state:
-            await context.storage_state(path=None)
+        template = self._context_template(crawlerRunConfig)
 
         if self.config.accept_downloads:
             context.set_default_timeout(DOWNLOAD_PAGE_TIMEOUT)
@@ -1190,16 +1541,8 @@ class BrowserManager:
                     "downloads_path"
                 ] = self.config.downloads_path
 
-        # Handle user agent and browser hints
-        if self.config.user_agent:
-            combined_headers = {
-                "User-Agent": self.config.user_agent,
-                "sec-ch-ua": self.config.browser_hint,
-            }
-            combined_headers.update(self.config.headers)
-            await context.set_extra_http_headers(combined_headers)
-
         # Add default cookie (skip for raw:/file:// URLs which are not valid cookie URLs)
+        cookies = list(template.cookies)
         cookie_url = None
         if crawlerRunConfig and crawlerRunConfig.url:
             url = crawlerRunConfig.url
@@ -1209,42 +1552,43 @@ class BrowserManager:
             elif crawlerRunConfig.base_url and crawlerRunConfig.base_url.startswith(("http://", "https://")):
                 # Use base_url as fallback for raw:/file:// URLs
                 cookie_url = crawlerRunConfig.base_url
-
         if cookie_url:
-            await context.add_cookies(
-                [
-                    {
-                        "name": "cookiesEnabled",
-                        "value": "true",
-                        "url": cookie_url,
-                    }
-                ]
-            )
+            cookies.append({"name": "cookiesEnabled", "value": "true", "url": cookie_url})
 
-        # Handle navigator overrides
-        if crawlerRunConfig:
-            if (
+        async def add_init_scripts():
+            # Sequential, so scripts run in the same order on every page
+            for script in template.init_scripts:
+                await context.add_init_script(script)
+
+        steps = [add_init_scripts()]
+        if template.headers:
+            steps.append(context.set_extra_http_headers(template.headers))
+        if cookies:
+            steps.append(context.add_cookies(cookies))
+        await asyncio.gather(*steps)
+
+        if template.navigator_overrides:
+            context._crawl4ai_nav_overrider_injected = True
+        if template.shadow_dom:
+            context._crawl4ai_shadow_dom_injected = True
+
+    def _context_template(self, crawlerRunConfig: CrawlerRunConfig = None) -> "ContextTemplate":
+        """Return the ContextTemplate for a run config, reusing its cached init scripts."""
+        navigator_overrides = bool(
+            crawlerRunConfig
+            and (
                 crawlerRunConfig.override_navigator
                 or crawlerRunConfig.simulate_user
                 or crawlerRunConfig.magic
-            ):
-                await context.add_init_script(load_js_script("navigator_overrider"))
-                context._crawl4ai_nav_overrider_injected = True
-
-        # Force-open closed shadow roots when flatten_shadow_dom is enabled
-        if crawlerRunConfig and crawlerRunConfig.flatten_shadow_dom:
-            await context.add_init_script("""
-                const _origAttachShadow = Element.prototype.attachShadow;
-                Element.prototype.attachShadow = function(init) {
-                    return _origAttachShadow.call(this, {...init, mode: 'open'});
-                };
-            """)
-            context._crawl4ai_shadow_dom_injected = True
-
-        # Apply custom init_scripts from BrowserConfig (for stealth evasions, etc.)
-        if self.config.init_scripts:
-            for script in self.config.init_scripts:
-                await context.add_init_script(script)
+            )
+        )
+        shadow_dom = bool(crawlerRunConfig and crawlerRunConfig.flatten_shadow_dom)
+        key = (navigator_overrides, shadow_dom, tuple(self.config.init_scripts or ()))
+        scripts = self._context_scripts.get(key)
+        if scripts is None:
+            scripts = ContextTemplate.build_init_scripts(self.config, navigator_overrides, shadow_dom)
+            self._context_scripts[key] = scripts
+        return ContextTemplate.build(self.config, navigator_overrides, shadow_dom, scripts)
 
     async def create_browser_context(self, crawlerRunConfig: CrawlerRunConfig = None):
         """
@@ -1274,49 +1618,6 @@ class BrowserManager:
         }
         proxy_settings = {"server": self.config.proxy} if self.config.proxy else None
 
-        # CSS extensions (blocked separately via avoid_css flag)
-        css_extensions = ["css", "less", "scss", "sass"]
-
-        # Static resource extensions (blocked when text_mode is enabled)
-        static_extensions = [
-            # Images
-            "jpg", "jpeg", "png", "gif", "webp", "svg", "ico", "bmp", "tiff", "psd",
-            # Fonts
-            "woff", "woff2", "ttf", "otf", "eot",
-            # Media
-            "mp4", "webm", "ogg", "avi", "mov", "wmv", "flv", "m4v",
-            "mp3", "wav", "aac", "m4a", "opus", "flac",
-            # Documents
-            "pdf", "doc", "docx", "xls", "xlsx", "ppt", "pptx",
-            # Archives
-            "zip", "rar", "7z", "tar", "gz",
-            # Scripts and data
-            "xml", "swf", "wasm",
-        ]
-
-        # Ad and tracker domain patterns (curated from uBlock/EasyList sources)
-        ad_tracker_patterns = [
-            "**/google-analytics.com/**",
-            "**/googletagmanager.com/**",
-            "**/googlesyndication.com/**",
-            "**/doubleclick.net/**",
-            "**/adservice.google.com/**",
-            "**/adsystem.com/**",
-            "**/adzerk.net/**",
-            "**/adnxs.com/**",
-            "**/ads.linkedin.com/**",
-            "**/facebook.net/**",
-            "**/analytics.twitter.com/**",
-            "**/ads-twitter.com/**",
-            "**/hotjar.com/**",
-            "**/clarity.ms/**",
-            "**/scorecardresearch.com/**",
-            "**/pixel.wp.com/**",
-            "**/amazon-adsystem.com/**",
-            "**/mixpanel.com/**",
-            "**/segment.com/**",
-        ]
-
         # Common context settings
         context_settings = {
             "user_agent": user_agent,
@@ -1368,20 +1669,10 @@ class BrowserManager:
         # Create and return the context with all settings
         context = await self.browser.new_context(**context_settings)
 
-        # Build dynamic blocking list based on config flags
-        to_block = []
-        if self.config.avoid_css:
-            to_block.extend(css_extensions)
-        if self.config.text_mode:
-            to_block.extend(static_extensions)
-
-        if to_block:
-            for ext in to_block:
-                await context.route(f"**/*.{ext}", lambda route: route.abort())
-
-        if self.config.avoid_ads:
-            for pattern in ad_tracker_patterns:
-                await context.route(pattern, lambda route: route.abort())
+        # One route for every blocking rule (avoid_css, text_mode, avoid_ads,
+        # blocked_resource_types) instead of one route per pattern
+        if self._request_blocker is not None:
+            await self._request_blocker.register(context)
 
         return context
 
@@ -1455,6 +1746,7 @@ class BrowserManager:
                 ctx = self.contexts_by_config.pop(evict_sig, None)
                 self._context_refcounts.pop(evict_sig, None)
                 self._context_last_used.pop(evict_sig, None)
+                self._drop_page_pool(evict_sig)
                 # Clean up stale page->sig mappings for evicted context
                 stale_pages = [
                     p for p, s in self._page_to_sig.items() if s == evict_sig
@@ -1466,6 +1758,112 @@ class BrowserManager:
         # All contexts are in active use — cannot evict
         return None
 
+    async def _acquire_context(self, crawlerRunConfig: CrawlerRunConfig, config_signature: str):
+        """
+        Return the context for a config signature, creating it if needed, and
+        take a reference on it (released by release_page_with_context).
+
+        Creation and setup run outside _contexts_lock, so crawls whose context
+        already exists never wait on a slow setup. Concurrent requests for the
+        same new signature share one creation future (single flight).
+        """
+        while True:
+            async with self._contexts_lock:
+                context = self.contexts_by_config.get(config_signature)
+                if context is not None:
+                    # Increment refcount INSIDE lock before releasing
+                    self._context_refcounts[config_signature] = (
+                        self._context_refcounts.get(config_signature, 0) + 1
+                    )
+                    self._context_last_used[config_signature] = time.monotonic()
+                    return context
+                creation = self._context_creations.get(config_signature)
+                owner = creation is None
+                if owner:
+                    creation = asyncio.get_running_loop().create_future()
+                    # Mark a failure as retrieved even if nobody else waits on it
+                    creation.add_done_callback(lambda f: f.cancelled() or f.exception())
+                    self._context_creations[config_signature] = creation
+
+            if not owner:
+                await asyncio.wait([creation])
+                if not creation.cancelled() and creation.exception() is not None:
+                    raise creation.exception()
+                # Created (or the creator was cancelled): take the reference or retry
+                continue
+
+            try:
+                context = await self.create_browser_context(crawlerRunConfig)
+                await self.setup_context(context, crawlerRunConfig)
+            except BaseException as e:
+                async with self._contexts_lock:
+                    self._context_creations.pop(config_signature, None)
+                if isinstance(e, Exception):
+                    creation.set_exception(e)
+                    # A browser version bump may have registered this signature
+                    await self._maybe_cleanup_old_browser(config_signature)
+                else:
+                    creation.cancel()
+                raise
+
+            async with self._contexts_lock:
+                self._context_creations.pop(config_signature, None)
+                self.contexts_by_config[config_signature] = context
+                self._context_refcounts[config_signature] = 1
+                self._context_last_used[config_signature] = time.monotonic()
+                to_close = self._evict_lru_context_locked()
+            creation.set_result(context)
+
+            # Close evicted context OUTSIDE lock
+            if to_close is not None:
+                try:
+                    await to_close.close()
+                except Exception:
+                    pass
+            return context
+
+    async def precreate_contexts(self, configs: List[CrawlerRunConfig]) -> int:
+        """
+        Create the contexts for a batch of configs ahead of the crawls that use them.
+
+        Distinct signatures are created concurrently, at most _max_contexts of them
+        so the batch does not evict its own contexts. Contexts are only cached when
+        each crawl gets its own context per config (regular launched browsers, or
+        managed browsers with create_isolated_context); otherwise nothing is done.
+
+        Args:
+            configs (List[CrawlerRunConfig]): Configs of the upcoming crawls.
+
+        Returns:
+            int: Number of distinct context signatures that are ready.
+        """
+        if self._shards:
+            counts = await asyncio.gather(
+                *(shard.precreate_contexts(configs) for shard in self._shards)
+            )
+            return max(counts, default=0)
+        if self.config.use_managed_browser and not self.config.create_isolated_context:
+            return 0
+
+        by_signature = {}
+        for config in configs:
+            if len(by_signature) >= self._max_contexts:
+                break
+            by_signature.setdefault(self._make_config_signature(config), config)
+
+        async def create(sig, config):
+            await self._acquire_context(config, sig)
+            refcount = -1
+            async with self._contexts_lock:
+                if sig in self._context_refcounts:
+                    refcount = max(0, self._context_refcounts[sig] - 1)
+                    self._context_refcounts[sig] = refcount
+            if refcount == 0:
+                await self._maybe_cleanup_old_browser(sig)
+
+        await asyncio.gather(*(create(sig, config) for sig, config in by_signature.items()))
+        return len(by_signature)
+
     async def _apply_stealth_to_page(self, page):
         """Apply stealth to a page if stealth mode is enabled"""
         if self._stealth_adapter:
@@ -1545,6 +1943,9 @@ class BrowserManager:
         Returns:
             (page, context): The Page and its BrowserContext
         """
+        if self._shards:
+            return await self._get_shard_page(crawlerRunConfig)
+
         self._cleanup_expired_sessions()
 
         # If a session_id is provided and we already have it, reuse that page + context
@@ -1562,34 +1963,11 @@ class BrowserManager:
             # context reuse for multiple URLs with the same config (e.g., batch/deep crawls).
             if self.config.create_isolated_context:
                 config_signature = self._make_config_signature(crawlerRunConfig)
-                to_close = None
-
-                async with self._contexts_lock:
-                    if config_signature in self.contexts_by_config:
-                        context = self.contexts_by_config[config_signature]
-                    else:
-                        context = await self.create_browser_context(crawlerRunConfig)
-                        await self.setup_context(context, crawlerRunConfig)
-                        self.contexts_by_config[config_signature] = context
-                        self._context_refcounts[config_signature] = 0
-                        to_close = self._evict_lru_context_locked()
-
-                    # Increment refcount INSIDE lock before releasing
-                    self._context_refcounts[config_signature] = (
-                        self._context_refcounts.get(config_signature, 0) + 1
-                    )
-                    self._context_last_used[config_signature] = time.monotonic()
-
-                # Close evicted context OUTSIDE lock
-                if to_close is not None:
-                    try:
-                        await to_close.close()
-                    except Exception:
-                        pass
+                context = await self._acquire_context(crawlerRunConfig, config_signature)
 
-                # Always create a new page for each crawl (isolation for navigation)
+                # A fresh or freshly reset page for each crawl (isolation for navigation)
                 try:
-                    page = await context.new_page()
+                    page = await self._acquire_pooled_page(context, config_signature)
                 except Exception:
                     async with self._contexts_lock:
                         if config_signature in self._context_refcounts:
@@ -1597,7 +1975,6 @@ class BrowserManager:
                                 0, self._context_refcounts[config_signature] - 1
                             )
                     raise
-                await self._apply_stealth_to_page(page)
                 self._page_to_sig[page] = config_signature
             elif self.config.storage_state:
                 tmp_context = await self.create_browser_context(crawlerRunConfig)
@@ -1661,35 +2038,11 @@ class BrowserManager:
         else:
             # Otherwise, check if we have an existing context for this config
             config_signature = self._make_config_signature(crawlerRunConfig)
-            to_close = None
+            context = await self._acquire_context(crawlerRunConfig, config_signature)
 
-            async with self._contexts_lock:
-                if config_signature in self.contexts_by_config:
-                    context = self.contexts_by_config[config_signature]
-                else:
-                    # Create and setup a new context
-                    context = await self.create_browser_context(crawlerRunConfig)
-                    await self.setup_context(context, crawlerRunConfig)
-                    self.contexts_by_config[config_signature] = context
-                    self._context_refcounts[config_signature] = 0
-                    to_close = self._evict_lru_context_locked()
-
-                # Increment refcount INSIDE lock before releasing
-                self._context_refcounts[config_signature] = (
-                    self._context_refcounts.get(config_signature, 0) + 1
-                )
-                self._context_last_used[config_signature] = time.monotonic()
-
-            # Close evicted context OUTSIDE lock
-            if to_close is not None:
-                try:
-                    await to_close.close()
-                except Exception:
-                    pass
-
-            # Create a new page from the chosen context
+            # Take a warm page from the pool, or create a new one from the chosen context
             try:
-                page = await context.new_page()
+                page = await self._acquire_pooled_page(context, config_signature)
             except Exception:
                 async with self._contexts_lock:
                     if config_signature in self._context_refcounts:
@@ -1697,7 +2050,6 @@ class BrowserManager:
                             0, self._context_refcounts[config_signature] - 1
                         )
                 raise
-            await self._apply_stealth_to_page(page)
             self._page_to_sig[page] = config_signature
 
         # If a session_id is specified, store this session so we can reuse later
@@ -1719,6 +2071,13 @@ class BrowserManager:
         Args:
             session_id (str): The session ID to kill.
         """
+        if self._shards:
+            shard = self._session_shards.pop(session_id, None)
+            if shard is not None and session_id in shard.sessions:
+                self._forget_shard_page(shard.sessions[session_id][1])
+                await shard.kill_session(session_id)
+            return
+
         if session_id in self.sessions:
             context, page, _ = self.sessions[session_id]
             self._release_page_from_use(page)
@@ -1737,6 +2096,7 @@ class BrowserManager:
                             self.contexts_by_config.pop(sig, None)
                             self._context_refcounts.pop(sig, None)
                             self._context_last_used.pop(sig, None)
+                            self._drop_page_pool(sig)
                             should_close_context = True
             await page.close()
             if should_close_context:
@@ -1748,15 +2108,34 @@ class BrowserManager:
         Release a page from the in-use tracking set (global tracking).
         Sync variant — does NOT decrement context refcount.
         """
+        shard = self._shard_of.get(page)
+        if shard is not None:
+            shard.release_page(page)
+            return
         self._release_page_from_use(page)
 
-    async def release_page_with_context(self, page):
+    async def release_page_with_context(self, page, reusable: bool = False) -> bool:
         """
         Release a page and decrement its context's refcount under the lock.
 
         Should be called from the async crawl finally block instead of
         release_page() so the context lifecycle is properly tracked.
+
+        Args:
+            page: The page returned by get_page().
+            reusable (bool): Whether the crawl left no page state behind that a
+                reset cannot undo, so the page may go back to the page pool.
+
+        Returns:
+            bool: True if the page was kept in the pool. The caller must not
+                close it in that case.
         """
+        if self._shards:
+            shard = self._forget_shard_page(page)
+            if shard is None:
+                return False
+            return await shard.release_page_with_context(page, reusable=reusable)
+
         self._release_page_from_use(page)
         sig = None
         refcount = -1
@@ -1772,6 +2151,70 @@ class BrowserManager:
         if sig is not None and refcount == 0:
             await self._maybe_cleanup_old_browser(sig)
 
+        if reusable and sig is not None:
+            return await self._return_to_pool(page, sig)
+        self._page_uses.pop(page, None)
+        return False
+
+    async def _acquire_pooled_page(self, context, sig: str):
+        """Pop a warm page of this context from the pool, or open a new one."""
+        pool = self._page_pools.get(sig)
+        while pool:
+            page = pool.popleft()
+            if not page.is_closed():
+                return page
+            self._page_uses.pop(page, None)
+        page = await context.new_page()
+        await self._apply_stealth_to_page(page)
+        return page
+
+    async def _return_to_pool(self, page, sig: str) -> bool:
+        """
+        Reset a finished crawl's page and park it in the pool of its context.
+
+        Pages are recycled once they served page_pool_max_uses crawls, and pages
+        that crashed or hang during the reset are never pooled.
+        """
+        size = self.config.page_pool_size
+        if size <= 0 or sig not in self.contexts_by_config or page.is_closed():
+            self._page_uses.pop(page, None)
+            return False
+        uses = self._page_uses.pop(page, 0) + 1
+        if uses >= self.config.page_pool_max_uses:
+            return False
+        if len(self._page_pools.get(sig, ())) >= size:
+            return False
+
+        try:
+            await page.evaluate(
+                "() => { try { sessionStorage.clear(); } catch (e) {} }"
+            )
+            await page.set_extra_http_headers({})
+            await page.goto("about:blank", timeout=5000)
+            viewport = {
+                "width": self.config.viewport_width,
+                "height": self.config.viewport_height,
+            }
+            if page.viewport_size != viewport:
+                await page.set_viewport_size(viewport)
+        except Exception:
+            return False
+
+        # The context may have been evicted or the pool filled during the reset
+        if sig not in self.contexts_by_config:
+            return False
+        pool = self._page_pools.setdefault(sig, deque())
+        if len(pool) >= size:
+            return False
+        self._page_uses[page] = uses
+        pool.append(page)
+        return True
+
+    def _drop_page_pool(self, sig: str):
+        """Forget the pooled pages of a context that is being closed."""
+        for page in self._page_pools.pop(sig, ()):
+            self._page_uses.pop(page, None)
+
     def _should_recycle(self) -> bool:
         """Check if page threshold reached for browser recycling."""
         limit = self.config.max_pages_before_recycle
@@ -1816,6 +2259,12 @@ class BrowserManager:
                                 active_sigs.append(sig)
                             else:
                                 idle_sigs.append(sig)
+                        # Contexts still being created take their first reference
+                        # once ready, so they drain like active ones
+                        active_sigs.extend(
+                            sig for sig in self._context_creations
+                            if sig not in self._context_refcounts
+                        )
 
                     if self.logger:
                         self.logger.info(
@@ -1877,6 +2326,7 @@ class BrowserManager:
                                 context = self.contexts_by_config.pop(sig, None)
                                 self._context_refcounts.pop(sig, None)
                                 self._context_last_used.pop(sig, None)
+                                self._drop_page_pool(sig)
                             if context is not None:
                                 try:
                                     await context.close()
@@ -1891,6 +2341,7 @@ class BrowserManager:
                 context = self.contexts_by_config.pop(sig, None)
                 self._context_refcounts.pop(sig, None)
                 self._context_last_used.pop(sig, None)
+                self._drop_page_pool(sig)
             if context is not None:
                 try:
                     await context.close()
@@ -1924,6 +2375,7 @@ class BrowserManager:
                 context = self.contexts_by_config.pop(sig, None)
                 self._context_refcounts.pop(sig, None)
                 self._context_last_used.pop(sig, None)
+                self._drop_page_pool(sig)
 
             # Close context outside locks
             if context is not None:
@@ -1952,10 +2404,19 @@ class BrowserManager:
 
     def _cleanup_expired_sessions(self):
         """Clean up expired sessions based on TTL."""
+        if not self._expires_sessions:
+            return
+        sessions = self.sessions
+        if self._shards:
+            sessions = {
+                sid: shard.sessions[sid]
+                for sid, shard in self._session_shards.items()
+                if sid in shard.sessions
+            }
         current_time = time.time()
         expired_sessions = [
             sid
-            for sid, (_, _, last_used) in self.sessions.items()
+            for sid, (_, _, last_used) in sessions.items()
             if current_time - last_used > self.session_ttl
         ]
         for sid in expired_sessions:
@@ -1963,6 +2424,20 @@ class BrowserManager:
 
     async def close(self):
         """Close all browser resources and clean up."""
+        self._driver_pid = None
+        if self._shards:
+            await asyncio.gather(
+                *(shard.close() for shard in self._shards), return_exceptions=True
+            )
+            self._shards = []
+            self._shard_stats.clear()
+            self._shard_of.clear()
+            self._session_shards.clear()
+            self.playwright = None
+            self.browser = None
+            self.default_context = None
+            return
+
         # Cached CDP path: only clean up this instance's sessions/contexts,
         # then release the shared connection reference.
         if self._using_cached_cdp:
@@ -1978,6 +2453,8 @@ class BrowserManager:
             self._context_refcounts.clear()
             self._context_last_used.clear()
             self._page_to_sig.clear()
+            self._page_pools.clear()
+            self._page_uses.clear()
             await _CDPConnectionCache.release(self.config.cdp_url)
             self.browser = None
             self.playwright = None
@@ -2004,6 +2481,8 @@ class BrowserManager:
                 self._context_refcounts.clear()
                 self._context_last_used.clear()
                 self._page_to_sig.clear()
+                self._page_pools.clear()
+                self._page_uses.clear()
 
                 # Disconnect from browser (doesn't terminate it, just releases connection)
                 if self.browser:
@@ -2041,6 +2520,8 @@ class BrowserManager:
             self._context_refcounts.clear()
             self._context_last_used.clear()
             self._page_to_sig.clear()
+            self._page_pools.clear()
+            self._page_uses.clear()
 
             # Closing the persistent context also terminates the browser
             if self.default_context:
@@ -2077,6 +2558,8 @@ class BrowserManager:
         self._context_refcounts.clear()
         self._context_last_used.clear()
         self._page_to_sig.clear()
+        self._page_pools.clear()
+        self._page_uses.clear()
 
         if self.browser:
             await self.browser.close()
@@ -0,0 +1,450 @@
+"""
+Cache backends for AsyncWebCrawler.
+
+`AsyncWebCrawler.arun` reads and writes cached results through a `CacheBackend`:
+
+- `LocalCacheBackend`: the sqlite database and content store on this machine
+  (`AsyncDatabaseManager`, the default).
+- `RedisCacheBackend`: a shared key-value store so several crawler nodes reuse each
+  other's results. Works with any client exposing the `redis.asyncio.Redis` subset
+  `get`/`mget`/`set(ex=, nx=)`/`delete`/`eval` (Redis, Valkey, KeyDB, Dragonfly, ...).
+
+Backends can also lock a URL while it is being crawled. With `lock_urls=True` a node that
+misses the cache claims the URL before fetching it; other nodes missing the same URL wait
+for the claim holder to cache the result instead of crawling it a second time. Claims
+expire after `lock_ttl` seconds so a crashed node never blocks a URL for good.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .async_database import AsyncDatabaseManager, async_db_manager, _reset_context_var
+from .models import CrawlResult
+
+# CrawlResult fields kept by remote backends (the same set the sqlite cache stores)
+REMOTE_CACHED_FIELDS = frozenset({
+    "url",
+    "html",
+    "cleaned_html",
+    "markdown",
+    "extracted_content",
+    "success",
+    "media",
+    "links",
+    "metadata",
+    "screenshot",
+    "response_headers",
+    "downloaded_files",
+    "head_fingerprint",
+    "content_fingerprint",
+    "duplicate_of",
+})
+
+_prefetched_results: ContextVar[Optional[Dict[str, CrawlResult]]] = ContextVar(
+    "prefetched_backend_results", default=None
+)
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cached crawl results, shared by every `arun` of a crawler.
+
+    Args:
+        lock_urls: Claim URLs before crawling them so concurrent nodes don't fetch the
+            same page twice (see `aclaim_url`).
+        lock_ttl: Seconds a claim stays valid without renewal; bounds how long a crashed
+            node can hold one. Claims taken by `aclaim_url` are renewed every lock_ttl/3
+            until they are released.
+        lock_wait_timeout: Seconds to wait for another node's claim before crawling anyway.
+        lock_poll_interval: Seconds between cache checks while waiting.
+    """
+
+    def __init__(
+        self,
+        lock_urls: bool = False,
+        lock_ttl: float = 120.0,
+        lock_wait_timeout: float = 60.0,
+        lock_poll_interval: float = 0.5,
+    ):
+        self.lock_urls = lock_urls
+        self.lock_ttl = lock_ttl
+        self.lock_wait_timeout = lock_wait_timeout
+        self.lock_poll_interval = lock_poll_interval
+        # Renewal tasks of the claims taken by aclaim_url, keyed by token
+        self._claim_renewals: Dict[str, asyncio.Task] = {}
+
+    @abstractmethod
+    async def aget_cached_url(
+        self, url: str, fields: Optional[Iterable[str]] = None
+    ) -> Optional[CrawlResult]:
+        """Cached result for `url`, or None. `fields` may limit what is loaded up front."""
+
+    @abstractmethod
+    async def acache_url(self, result: CrawlResult):
+        """Store `result` under `result.url`"""
+
+    @abstractmethod
+    async def aget_cache_metadata(self, url: str) -> Optional[Dict]:
+        """Validation metadata (etag, last_modified, head_fingerprint, cached_at) for `url`"""
+
+    @abstractmethod
+    async def aupdate_cache_metadata(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        head_fingerprint: Optional[str] = None,
+    ):
+        """Update the validation metadata of a cached `url`"""
+
+    async def aget_cached_urls(
+        self, urls: List[str], fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, CrawlResult]:
+        """Cached results keyed by URL; misses are absent"""
+        found = {}
+        for url in dict.fromkeys(urls):
+            result = await self.aget_cached_url(url, fields=fields)
+            if result is not None:
+                found[url] = result
+        return found
+
+    async def aget_cache_metadata_many(self, urls: List[str]) -> Dict[str, Dict]:
+        """Validation metadata keyed by URL; uncached URLs are absent"""
+        found = {}
+        for url in dict.fromkeys(urls):
+            metadata = await self.aget_cache_metadata(url)
+            if metadata is not None:
+                found[url] = metadata
+        return found
+
+    async def afind_near_duplicates(
+        self, fingerprint: str, max_distance: int = 3, exclude_url: Optional[str] = None
+    ) -> List[Tuple[str, int]]:
+        """(url, distance) of cached pages with a similar content_fingerprint; [] if unsupported"""
+        return []
+
+    @asynccontextmanager
+    async def batch_writes(self, batch_size: Optional[int] = None):
+        """Group `acache_url` calls made inside the block; a no-op unless overridden"""
+        yield None
+
+    @asynccontextmanager
+    async def prefetched(self, results: Dict[str, Optional[CrawlResult]]):
+        """
+        Serve `aget_cached_url` from `results` within this block; each entry is handed
+        out once. A None entry is served as a miss without asking the backend.
+        Yields the live mapping; entries added to it later are served as well.
+        """
+        entries = dict(results)
+        token = _prefetched_results.set(entries)
+        try:
+            yield entries
+        finally:
+            _reset_context_var(_prefetched_results, token)
+
+    def _take_prefetched(self, url: str) -> Tuple[bool, Optional[CrawlResult]]:
+        """(True, entry) if `url` was prefetched, (False, None) otherwise"""
+        prefetched = _prefetched_results.get()
+        if prefetched and url in prefetched:
+            return True, prefetched.pop(url)
+        return False, None
+
+    async def acquire_lock(self, url: str, ttl: float) -> Optional[str]:
+        """Claim `url` for `ttl` seconds. Returns a token for `release_lock`, or None if held."""
+        return uuid.uuid4().hex
+
+    async def release_lock(self, url: str, token: str):
+        """Release a claim taken with `acquire_lock`; a no-op if it expired meanwhile"""
+
+    async def renew_lock(self, url: str, token: str, ttl: float) -> bool:
+        """Extend a claim still holding `token` to `ttl` seconds from now. False if it was lost."""
+        return True
+
+    async def release_claim(self, url: str, token: str):
+        """
+        Release the claim `arun` held while crawling `url`. Backends that queue writes
+        keep it until the cached result is visible to the nodes waiting on it.
+        """
+        renewal = self._claim_renewals.pop(token, None)
+        if renewal is not None:
+            renewal.cancel()
+        await self.release_lock(url, token)
+
+    def _keep_claim(self, url: str, token: str):
+        """Renew the claim on `url` every lock_ttl/3 until `release_claim` or until it is lost"""
+
+        async def _renew():
+            while True:
+                await asyncio.sleep(self.lock_ttl / 3)
+                try:
+                    if not await self.renew_lock(url, token, self.lock_ttl):
+                        return
+                except Exception:
+                    # Try again next round; the claim runs out by itself if the
+                    # backend stays unreachable
+                    continue
+
+        task = asyncio.create_task(_renew())
+        self._claim_renewals[token] = task
+        task.add_done_callback(lambda _: self._claim_renewals.pop(token, None))
+
+    async def aclaim_url(
+        self, url: str, fields: Optional[Iterable[str]] = None
+    ) -> Tuple[Optional[CrawlResult], Optional[str]]:
+        """
+        Claim a cache-missed `url` for crawling, or wait for the node crawling it.
+
+        Returns:
+            (result, None) if another node cached the URL while we waited,
+            (None, token) if the claim was taken (release it with `release_claim`; it is
+                renewed until then),
+            (None, None) if waiting timed out; the caller crawls without a claim.
+        """
+        deadline = time.monotonic() + self.lock_wait_timeout
+        while True:
+            token = await self.acquire_lock(url, self.lock_ttl)
+            if token is not None:
+                # The previous holder may have cached the page just before releasing
+                cached = await self.aget_cached_url(url, fields=fields)
+                if cached is not None:
+                    await self.release_lock(url, token)
+                    return cached, None
+                self._keep_claim(url, token)
+                return None, token
+            if time.monotonic() >= deadline:
+                return None, None
+            await asyncio.sleep(self.lock_poll_interval)
+            cached = await self.aget_cached_url(url, fields=fields)
+            if cached is not None:
+                return cached, None
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    The sqlite cache on this machine. Claims are rows of the `crawl_locks` table, so
+    `lock_urls` coordinates processes sharing one database file.
+    """
+
+    def __init__(self, db_manager: Optional[AsyncDatabaseManager] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.db_manager = db_manager or async_db_manager
+
+    async def aget_cached_url(self, url, fields=None):
+        return await self.db_manager.aget_cached_url(url, fields=fields)
+
+    async def aget_cached_urls(self, urls, fields=None):
+        return await self.db_manager.aget_cached_urls(urls, fields=fields)
+
+    async def acache_url(self, result):
+        await self.db_manager.acache_url(result)
+
+    async def aget_cache_metadata(self, url):
+        return await self.db_manager.aget_cache_metadata(url)
+
+    async def aget_cache_metadata_many(self, urls):
+        return await self.db_manager.aget_cache_metadata_many(urls)
+
+    async def afind_near_duplicates(self, fingerprint, max_distance=3, exclude_url=None):
+        return await self.db_manager.afind_near_duplicates(
+            fingerprint, max_distance=max_distance, exclude_url=exclude_url
+        )
+
+    async def aupdate_cache_metadata(self, url, etag=None, last_modified=None, head_fingerprint=None):
+        await self.db_manager.aupdate_cache_metadata(
+            url, etag=etag, last_modified=last_modified, head_fingerprint=head_fingerprint
+        )
+
+    def batch_writes(self, batch_size=None):
+        return self.db_manager.batch_writes(batch_size)
+
+    def prefetched(self, results):
+        return self.db_manager.prefetched(results)
+
+    async def acquire_lock(self, url, ttl):
+        token = uuid.uuid4().hex
+        now = time.time()
+
+        async def _acquire(db):
+            await db.execute(
+                "DELETE FROM crawl_locks WHERE url = ? AND expires_at < ?", (url, now)
+            )
+            cursor = await db.execute(
+                "INSERT OR IGNORE INTO crawl_locks (url, token, expires_at) VALUES (?, ?, ?)",
+                (url, token, now + ttl),
+            )
+            return cursor.rowcount == 1
+
+        return token if await self.db_manager.execute_with_retry(_acquire) else None
+
+    async def release_lock(self, url, token):
+        async def _release(db):
+            await db.execute(
+                "DELETE FROM crawl_locks WHERE url = ? AND token = ?", (url, token)
+            )
+
+        await self.db_manager.execute_with_retry(_release)
+
+    async def renew_lock(self, url, token, ttl):
+        async def _renew(db):
+            cursor = await db.execute(
+                "UPDATE crawl_locks SET expires_at = ? WHERE url = ? AND token = ?",
+                (time.time() + ttl, url, token),
+            )
+            return cursor.rowcount == 1
+
+        return await self.db_manager.execute_with_retry(_renew)
+
+    async def release_claim(self, url, token):
+        # A row queued by batch_writes() isn't committed yet; hold (and keep renewing)
+        # the claim until it is
+        release = super().release_claim
+        if not self.db_manager.defer_until_written(url, lambda: release(url, token)):
+            await release(url, token)
+
+
+# Deletes a claim only if it still holds our token, in one atomic step on the server
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Extends a claim only if it still holds our token (ARGV[2] is the new TTL in ms)
+_RENEW_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Results shared between crawler nodes through Redis (or a protocol-compatible store).
+
+    Each URL has two keys: `<namespace>:result:<url>` with the zlib-compressed result
+    and `<namespace>:meta:<url>` with the validation metadata, so freshness checks
+    don't transfer the page. Results are stored whole; `fields` is accepted for
+    interface compatibility but every field is loaded. Near-duplicate lookups
+    (`afind_near_duplicates`) are not supported.
+
+    Args:
+        client: A `redis.asyncio.Redis` (or compatible) client.
+        namespace: Key prefix, to share one server between crawls.
+        ttl: Seconds before entries expire on the server. None keeps them until evicted.
+        compression_level: zlib level for stored results.
+        lock_urls: Claim URLs across nodes before crawling them. Default True.
+        **kwargs: Lock timing options, see `CacheBackend`.
+
+    Example:
+        backend = RedisCacheBackend.from_url("redis://cache:6379/0", ttl=86400)
+        async with AsyncWebCrawler(cache_backend=backend) as crawler:
+            results = await crawler.arun_many(urls)
+    """
+
+    def __init__(
+        self,
+        client,
+        namespace: str = "crawl4ai",
+        ttl: Optional[int] = None,
+        compression_level: int = 6,
+        lock_urls: bool = True,
+        **kwargs,
+    ):
+        super().__init__(lock_urls=lock_urls, **kwargs)
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl
+        self.compression_level = compression_level
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisCacheBackend":
+        """Create a backend from a redis:// URL (requires the `redis` package)"""
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ImportError("RedisCacheBackend requires the 'redis' package: pip install redis")
+        return cls(redis.from_url(url), **kwargs)
+
+    def _key(self, kind: str, url: str) -> str:
+        return f"{self.namespace}:{kind}:{url}"
+
+    def _encode(self, result: CrawlResult) -> bytes:
+        data = result.model_dump(include=set(REMOTE_CACHED_FIELDS))
+        return zlib.compress(json.dumps(data).encode("utf-8"), self.compression_level)
+
+    @staticmethod
+    def _decode(payload: bytes) -> CrawlResult:
+        return CrawlResult(**json.loads(zlib.decompress(payload)))
+
+    async def aget_cached_url(self, url, fields=None):
+        found, prefetched = self._take_prefetched(url)
+        if found:
+            return prefetched
+        payload = await self.client.get(self._key("result", url))
+        return self._decode(payload) if payload else None
+
+    async def aget_cached_urls(self, urls, fields=None):
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        payloads = await self.client.mget([self._key("result", url) for url in urls])
+        return {url: self._decode(payload) for url, payload in zip(urls, payloads) if payload}
+
+    async def acache_url(self, result):
+        response_headers = result.response_headers or {}
+        metadata = {
+            "url": result.url,
+            "etag": response_headers.get("etag") or response_headers.get("ETag") or "",
+            "last_modified": (
+                response_headers.get("last-modified") or response_headers.get("Last-Modified") or ""
+            ),
+            "head_fingerprint": result.head_fingerprint or "",
+            "cached_at": time.time(),
+            "response_headers": response_headers,
+        }
+        await self.client.set(self._key("result", result.url), self._encode(result), ex=self.ttl)
+        await self.client.set(self._key("meta", result.url), json.dumps(metadata), ex=self.ttl)
+
+    async def aget_cache_metadata(self, url):
+        raw = await self.client.get(self._key("meta", url))
+        return json.loads(raw) if raw else None
+
+    async def aget_cache_metadata_many(self, urls):
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        raw = await self.client.mget([self._key("meta", url) for url in urls])
+        return {url: json.loads(value) for url, value in zip(urls, raw) if value}
+
+    async def aupdate_cache_metadata(self, url, etag=None, last_modified=None, head_fingerprint=None):
+        metadata = await self.aget_cache_metadata(url)
+        if metadata is None:
+            return
+        updates = {"etag": etag, "last_modified": last_modified, "head_fingerprint": head_fingerprint}
+        metadata.update({key: value for key, value in updates.items() if value is not None})
+        await self.client.set(self._key("meta", url), json.dumps(metadata), ex=self.ttl)
+
+    async def acquire_lock(self, url, ttl):
+        token = uuid.uuid4().hex
+        acquired = await self.client.set(self._key("lock", url), token, ex=max(1, int(ttl)), nx=True)
+        return token if acquired else None
+
+    async def release_lock(self, url, token):
+        # Only drop the claim if it is still ours; it may have expired and been retaken.
+        # A GET followed by DELETE could remove a claim retaken in between.
+        await self.client.eval(_RELEASE_LOCK_SCRIPT, 1, self._key("lock", url), token)
+
+    async def renew_lock(self, url, token, ttl):
+        renewed = await self.client.eval(
+            _RENEW_LOCK_SCRIPT, 1, self._key("lock", url), token, max(1, int(ttl * 1000))
+        )
+        return bool(renewed)
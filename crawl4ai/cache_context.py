@@ -1,4 +1,6 @@
+from dataclasses import dataclass
 from enum import Enum
+from typing import Dict, Optional, Union
 
 
 class CacheMode(Enum):
@@ -20,6 +22,61 @@ class CacheMode(Enum):
     BYPASS = "bypass"
 
 
+class EvictionStrategy(Enum):
+    """
+    Order in which cache entries are evicted once a CachePolicy limit is exceeded.
+
+    - LRU: Least recently read (or written) entries first
+    - LFU: Least frequently read entries first, ties broken by recency
+    """
+
+    LRU = "lru"
+    LFU = "lfu"
+
+
+@dataclass
+class CachePolicy:
+    """
+    Bounds for the crawl cache, enforced by `AsyncDatabaseManager`.
+
+    All limits are optional; an empty policy only tracks access statistics. When a
+    count or size limit is exceeded, entries are evicted down to `low_watermark` of the
+    limit so eviction doesn't run again on the next write. Sizes are logical: the sum of
+    an entry's stored content and JSON fields, before compression and deduplication.
+
+    Attributes:
+        max_bytes (int, optional): Total logical size of all entries.
+        max_entries (int, optional): Total number of cached URLs.
+        ttl (float, optional): Seconds after which an entry expires, counted from when
+            it was cached.
+        domain_max_entries (int or Dict[str, int], optional): Entries kept per domain.
+            A dict sets per-domain quotas; its "*" key applies to all other domains.
+        eviction (EvictionStrategy): LRU or LFU ordering for evictions.
+        eviction_interval (float): Seconds between background enforcement passes.
+        low_watermark (float): Fraction of a limit to evict down to.
+    """
+
+    max_bytes: Optional[int] = None
+    max_entries: Optional[int] = None
+    ttl: Optional[float] = None
+    domain_max_entries: Optional[Union[int, Dict[str, int]]] = None
+    eviction: EvictionStrategy = EvictionStrategy.LRU
+    eviction_interval: float = 300.0
+    low_watermark: float = 0.9
+
+    def __post_init__(self):
+        if isinstance(self.eviction, str):
+            self.eviction = EvictionStrategy(self.eviction)
+        if not 0 < self.low_watermark <= 1:
+            raise ValueError("low_watermark must be in (0, 1]")
+
+    def domain_quota(self, domain: str) -> Optional[int]:
+        """Entry quota for `domain`, or None if it is unbounded."""
+        if isinstance(self.domain_max_entries, dict):
+            return self.domain_max_entries.get(domain, self.domain_max_entries.get("*"))
+        return self.domain_max_entries
+
+
 class CacheContext:
     """
     Encapsulates cache-related decisions and URL handling.
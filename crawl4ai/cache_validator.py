@@ -11,12 +11,18 @@ Validation Strategy:
 3. If server returns 200 → fetch <head> and compare fingerprint
 4. If fingerprint matches → cache is FRESH (minor changes only)
 5. Otherwise → cache is STALE, need full recrawl
+
+One validator can be shared by many concurrent validations: its httpx client pools
+connections (so repeat hosts skip the TCP/TLS handshake) and requests to a single host
+are capped at `max_per_host`. `validate_many` revalidates a whole batch concurrently.
 """
 
+import asyncio
 import httpx
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from enum import Enum
+from urllib.parse import urlparse
 
 from .utils import compute_head_fingerprint
 
@@ -57,17 +63,29 @@ class CacheValidator:
        - Catches changes even without server support for conditional requests
     """
 
-    def __init__(self, timeout: float = 10.0, user_agent: Optional[str] = None):
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        user_agent: Optional[str] = None,
+        max_connections: int = 100,
+        max_per_host: int = 6,
+    ):
         """
         Initialize the cache validator.
 
         Args:
             timeout: Request timeout in seconds
             user_agent: Custom User-Agent string (optional)
+            max_connections: Maximum validations in flight (and pooled connections)
+            max_per_host: Maximum concurrent validations against a single host
         """
         self.timeout = timeout
         self.user_agent = user_agent or "Mozilla/5.0 (compatible; Crawl4AI/1.0)"
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
         self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._slots = asyncio.Semaphore(max_connections)
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the httpx client."""
@@ -76,16 +94,28 @@ class CacheValidator:
                 http2=True,
                 timeout=self.timeout,
                 follow_redirects=True,
-                headers={"User-Agent": self.user_agent}
+                headers={"User-Agent": self.user_agent},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
             )
         return self._client
 
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        """Semaphore limiting concurrent validations against the host of `url`."""
+        host = urlparse(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_slots[host]
+
     async def validate(
         self,
         url: str,
         stored_etag: Optional[str] = None,
         stored_last_modified: Optional[str] = None,
         stored_head_fingerprint: Optional[str] = None,
+        timeout: Optional[float] = None,
     ) -> ValidationResult:
         """
         Validate if cached content is still fresh.
@@ -95,10 +125,56 @@ class CacheValidator:
             stored_etag: Previously stored ETag header value
             stored_last_modified: Previously stored Last-Modified header value
             stored_head_fingerprint: Previously computed head fingerprint
+            timeout: Request timeout for this validation (default: the validator's)
 
         Returns:
             ValidationResult with status and any updated metadata
         """
+        # Host slot first, so queued requests to a busy host don't hold global slots
+        async with self._host_slot(url), self._slots:
+            return await self._validate(
+                url,
+                stored_etag,
+                stored_last_modified,
+                stored_head_fingerprint,
+                httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+            )
+
+    async def validate_many(
+        self, metadata: Dict[str, Dict], timeout: Optional[float] = None
+    ) -> Dict[str, ValidationResult]:
+        """
+        Validate many cached URLs concurrently, within the connection and per-host limits.
+
+        Args:
+            metadata: Cache metadata keyed by URL, as returned by `aget_cache_metadata`
+                (etag, last_modified, head_fingerprint)
+            timeout: Request timeout for each validation (default: the validator's)
+
+        Returns:
+            ValidationResult keyed by URL
+        """
+        urls = list(metadata)
+        results = await asyncio.gather(*(
+            self.validate(
+                url,
+                stored_etag=metadata[url].get("etag"),
+                stored_last_modified=metadata[url].get("last_modified"),
+                stored_head_fingerprint=metadata[url].get("head_fingerprint"),
+                timeout=timeout,
+            )
+            for url in urls
+        ))
+        return dict(zip(urls, results))
+
+    async def _validate(
+        self,
+        url: str,
+        stored_etag: Optional[str],
+        stored_last_modified: Optional[str],
+        stored_head_fingerprint: Optional[str],
+        timeout,
+    ) -> ValidationResult:
         client = await self._get_client()
 
         # Build conditional request headers
@@ -111,7 +187,7 @@ class CacheValidator:
         try:
             # Step 1: Try HEAD request with conditional headers
             if headers:
-                response = await client.head(url, headers=headers)
+                response = await client.head(url, headers=headers, timeout=timeout)
 
                 if response.status_code == 304:
                     return ValidationResult(
@@ -125,7 +201,7 @@ class CacheValidator:
 
                 # If we have fingerprint, compare it
                 if stored_head_fingerprint:
-                    head_html, _, _ = await self._fetch_head(url)
+                    head_html, _, _ = await self._fetch_head(url, timeout)
                     if head_html:
                         new_fingerprint = compute_head_fingerprint(head_html)
                         if new_fingerprint and new_fingerprint == stored_head_fingerprint:
@@ -155,7 +231,7 @@ class CacheValidator:
 
             # Step 2: No conditional headers available, try fingerprint only
             if stored_head_fingerprint:
-                head_html, new_etag, new_last_modified = await self._fetch_head(url)
+                head_html, new_etag, new_last_modified = await self._fetch_head(url, timeout)
 
                 if head_html:
                     new_fingerprint = compute_head_fingerprint(head_html)
@@ -200,7 +276,9 @@ class CacheValidator:
                 reason=f"Validation error: {str(e)}"
             )
 
-    async def _fetch_head(self, url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    async def _fetch_head(
+        self, url: str, timeout=httpx.USE_CLIENT_DEFAULT
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
         Fetch only the <head> section of a page.
 
@@ -209,6 +287,7 @@ class CacheValidator:
 
         Args:
             url: The URL to fetch
+            timeout: Request timeout (default: the client's)
 
         Returns:
             Tuple of (head_html, etag, last_modified)
@@ -219,7 +298,8 @@ class CacheValidator:
             async with client.stream(
                 "GET",
                 url,
-                headers={"Accept-Encoding": "identity"}  # Disable compression for easier parsing
+                headers={"Accept-Encoding": "identity"},  # Disable compression for easier parsing
+                timeout=timeout,
             ) as response:
                 etag = response.headers.get("etag")
                 last_modified = response.headers.get("last-modified")
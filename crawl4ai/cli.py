@@ -1567,6 +1567,83 @@ def shrink_cmd(profile_name: str, level: str, dry_run: bool):
     if dry_run:
         console.print("\n[yellow]Dry run - no files were actually removed.[/yellow]")
 
+@cli.group("cache")
+def cache_cmd():
+    """Manage the local crawl cache"""
+    pass
+
+
+@cache_cmd.command("compact")
+def cache_compact_cmd():
+    """Reclaim disk space used by cached content
+
+    Removes content no cached URL references any more. With the packed content
+    store (CRAWL4_AI_CONTENT_STORE=packed), also rewrites pack segments that are
+    mostly overwritten entries.
+
+    Example:
+      crwl cache compact
+    """
+    from crawl4ai.async_database import async_db_manager
+
+    try:
+        stats = anyio.run(async_db_manager.acompact_content)
+    except Exception as e:
+        console.print(f"[red]Error compacting cache: {str(e)}[/red]")
+        sys.exit(1)
+
+    console.print("[green]Cache compaction finished.[/green]")
+    for key, value in stats.items():
+        if "bytes" in key:
+            value = _format_size(value)
+        console.print(f"  {key.replace('_', ' ').capitalize()}: {value}")
+
+
+@cache_cmd.command("evict")
+@click.option("--max-bytes", type=int, help="Evict down to this total logical size")
+@click.option("--max-entries", type=int, help="Evict down to this number of cached URLs")
+@click.option("--ttl", type=float, help="Expire entries cached more than this many seconds ago")
+@click.option("--domain-max-entries", type=int, help="Entries kept per domain")
+@click.option(
+    "--strategy",
+    type=click.Choice(["lru", "lfu"]),
+    default="lru",
+    help="Eviction order (default: lru)",
+)
+def cache_evict_cmd(max_bytes, max_entries, ttl, domain_max_entries, strategy):
+    """Evict cache entries over the given limits
+
+    Removes expired entries, trims domains over their quota and evicts the least
+    recently (or least frequently) used entries, then deletes content no longer
+    referenced by any entry.
+
+    Examples:
+      crwl cache evict --ttl 604800
+      crwl cache evict --max-bytes 10000000000 --strategy lfu
+    """
+    from crawl4ai.async_database import async_db_manager
+    from crawl4ai.cache_context import CachePolicy
+
+    policy = CachePolicy(
+        max_bytes=max_bytes,
+        max_entries=max_entries,
+        ttl=ttl,
+        domain_max_entries=domain_max_entries,
+        eviction=strategy,
+        low_watermark=1.0,
+    )
+    try:
+        stats = anyio.run(async_db_manager.aenforce_cache_policy, policy)
+    except Exception as e:
+        console.print(f"[red]Error evicting cache entries: {str(e)}[/red]")
+        sys.exit(1)
+
+    console.print("[green]Cache eviction finished.[/green]")
+    console.print(f"  Expired: {stats['expired']}")
+    console.print(f"  Over domain quota: {stats['domain_evicted']}")
+    console.print(f"  Over size/count limits: {stats['evicted']}")
+
+
 @cli.command(name="")
 @click.argument("url", required=False)
 @click.option("--example", is_flag=True, help="Show usage examples")
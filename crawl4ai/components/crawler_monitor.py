@@ -169,6 +169,8 @@ class TerminalUI:
         status_text.append(f"Web Crawler Dashboard | Runtime: {runtime} | Memory: {memory_percent:.1f}% {memory_icon}\n")
         status_text.append(f"Status: {memory_status} | URLs: {summary['urls_completed']}/{summary['urls_total']} | ")
         status_text.append(f"Peak Mem: {summary['peak_memory_percent']:.1f}% at {self.monitor._format_time(summary['peak_memory_time'])}")
+        if summary['loop_utilization'] is not None:
+            status_text.append(f" | Event Loop: {summary['loop_utilization'] * 100:.0f}% busy, {summary['loop_lag'] * 1000:.0f}ms lag")
         
         return Panel(status_text, title="Crawler Status", border_style="blue")
     
@@ -217,6 +219,7 @@ class TerminalUI:
             f"{status_counts.get(CrawlStatus.FAILED.name, 0) / total * 100:.1f}%",
             "Concurrent Tasks",
             str(status_counts.get(CrawlStatus.IN_PROGRESS.name, 0))
+            + (f"/{summary['concurrency_limit']}" if summary.get('concurrency_limit') else "")
         )
         
         table.add_row(
@@ -413,6 +416,9 @@ class CrawlerMonitor:
             "highest_wait_time": 0.0,
             "avg_wait_time": 0.0
         }
+        self.concurrency_limit: Optional[int] = None  # Set by the dispatcher
+        self.loop_utilization: Optional[float] = None  # Set by the dispatcher
+        self.loop_lag = 0.0
         self.urls_total = urls_total
         self.urls_completed = 0
         self.peak_memory_percent = 0.0
@@ -604,6 +610,28 @@ class CrawlerMonitor:
         with self._lock:
             self.memory_status = status
     
+    def update_concurrency_limit(self, limit: int):
+        """
+        Update the number of crawls the dispatcher currently allows at once.
+        
+        Args:
+            limit: Current concurrency limit (adapted by a ConcurrencyController, if any)
+        """
+        with self._lock:
+            self.concurrency_limit = limit
+    
+    def update_loop_statistics(self, utilization: float, lag: float):
+        """
+        Update how busy the dispatcher's event loop is.
+        
+        Args:
+            utilization: Share of time (0-1) the loop spent running code rather than waiting
+            lag: Seconds the dispatcher's last timer fired late
+        """
+        with self._lock:
+            self.loop_utilization = utilization
+            self.loop_lag = lag
+    
     def update_queue_statistics(
         self,
         total_queued: int,
@@ -688,6 +716,9 @@ class CrawlerMonitor:
             - avg_task_duration: Average task processing time
             - estimated_completion_time: Projected finish time
             - requeue_rate: Percentage of tasks requeued
+            - concurrency_limit: Crawls currently allowed at once (None if unknown)
+            - loop_utilization: Share of time the event loop was busy (None if unknown)
+            - loop_lag: Seconds the dispatcher's last timer fired late
         """
         with self._lock:
             # Calculate runtime
@@ -734,7 +765,10 @@ class CrawlerMonitor:
                 "avg_task_duration": avg_task_duration,
                 "estimated_completion_time": estimated_completion_time,
                 "requeue_rate": requeue_rate,
-                "requeued_count": self.requeued_count
+                "requeued_count": self.requeued_count,
+                "concurrency_limit": self.concurrency_limit,
+                "loop_utilization": self.loop_utilization,
+                "loop_lag": self.loop_lag
             }
     
     def render(self):
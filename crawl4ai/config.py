@@ -102,6 +102,10 @@ SCREENSHOT_HEIGHT_TRESHOLD = 10000
 PAGE_TIMEOUT = 60000
 DOWNLOAD_PAGE_TIMEOUT = 60000
 
+# preprocess_html_for_schema limits used for CrawlResult.fit_html
+FIT_HTML_TEXT_THRESHOLD = 500
+FIT_HTML_MAX_SIZE = 300_000
+
 # Delimiter for concatenating multiple HTML examples in schema generation
 HTML_EXAMPLE_DELIMITER = "=== HTML EXAMPLE {index} ==="
 
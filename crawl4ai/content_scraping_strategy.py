@@ -618,7 +618,13 @@ class LXMLWebScrapingStrategy(ContentScrapingStrategy):
 
         success = True
         try:
-            doc = lhtml.document_fromstring(html)
+            # Reuse the page-level parse when the crawler provides one; scraping
+            # mutates the tree, so work on a private fork of it.
+            parsed_document = kwargs.get("parsed_document")
+            if parsed_document is not None and parsed_document.matches(html):
+                doc = parsed_document.fork()
+            else:
+                doc = lhtml.document_fromstring(html)
             # Match BeautifulSoup's behavior of using body or full doc
             # body = doc.xpath('//body')[0] if doc.xpath('//body') else doc
             body = doc
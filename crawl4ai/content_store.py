@@ -0,0 +1,801 @@
+"""
+Content backends for the crawl cache.
+
+`AsyncDatabaseManager` keeps one row per URL in sqlite and stores the large fields
+(html, cleaned_html, markdown, extracted_content, screenshot) outside the table, keyed by
+content hash. Where those blobs live is decided by a `ContentStore`:
+
+- `FileContentStore`: the original layout, one file per blob under `~/.crawl4ai/<type>/<hash>`.
+- `PackedContentStore`: append-only segment files plus a sqlite index. Blobs written
+  together (all fields of one `acache_url` call) are adjacent in a segment, so a cache hit
+  is a single index lookup and a single seek-and-read. Blobs are compressed with zstd when
+  `zstandard` is installed, zlib otherwise.
+
+Use `crawl4ai-migrate --to-packed` to move an existing cache to the packed layout and
+`crwl cache compact` to reclaim space from overwritten entries.
+"""
+
+import asyncio
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+import aiofiles
+
+from .utils import generate_content_hash
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Both spellings are used by callers for the screenshot field
+_CONTENT_TYPE_ALIASES = {"screenshot": "screenshots"}
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+_CODEC_NAMES = {"none": CODEC_NONE, "zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+
+# magic, codec, len(content_type), len(hash), len(payload)
+_RECORD_HEADER = struct.Struct("<4sBBBI")
+_RECORD_MAGIC = b"C4PK"
+_SEGMENT_NAME = re.compile(r"^segment-(\d{6})\.pack$")
+
+# Blobs smaller than this are stored uncompressed; compression rarely pays off there
+_MIN_COMPRESS_SIZE = 256
+# Adjacent blobs separated by less than this are fetched with a single read
+_READ_COALESCE_GAP = 64 * 1024
+# Live keys handed to compact() are loaded into a temporary sqlite table this many at a time
+_LIVE_KEY_BATCH = 10_000
+
+LiveKeys = Union[Iterable[Tuple[str, str]], AsyncIterable[Tuple[str, str]]]
+
+
+def _normalize_type(content_type: str) -> str:
+    return _CONTENT_TYPE_ALIASES.get(content_type, content_type)
+
+
+class MissingContentError(LookupError):
+    """A cache row references a content blob that is not in the content store."""
+
+
+async def _live_key_batches(live_keys: LiveKeys) -> AsyncIterator[List[Tuple[str, str]]]:
+    """Normalized (content_type, hash) keys from a sync or async iterable, in batches."""
+    batch = []
+    if hasattr(live_keys, "__aiter__"):
+        async for content_hash, content_type in live_keys:
+            if content_hash:
+                batch.append((_normalize_type(content_type), content_hash))
+            if len(batch) >= _LIVE_KEY_BATCH:
+                yield batch
+                batch = []
+    else:
+        for content_hash, content_type in live_keys:
+            if content_hash:
+                batch.append((_normalize_type(content_type), content_hash))
+            if len(batch) >= _LIVE_KEY_BATCH:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _create_live_keys_table(db: sqlite3.Connection, temp: bool = True):
+    db.execute(
+        f"CREATE {'TEMP ' if temp else ''}TABLE IF NOT EXISTS live_keys (content_type TEXT, "
+        "hash TEXT, PRIMARY KEY (content_type, hash)) WITHOUT ROWID"
+    )
+
+
+def _insert_live_keys(db: sqlite3.Connection, batch: List[Tuple[str, str]]):
+    db.execute("BEGIN")
+    db.executemany("INSERT OR IGNORE INTO live_keys VALUES (?, ?)", batch)
+    db.execute("COMMIT")
+
+
+class ContentStore(ABC):
+    """
+    Storage for cached content blobs, addressed by (content_hash, content_type).
+
+    Subclasses implement the batch methods; the single-item helpers are built on them.
+    Content hashes are `generate_content_hash(content)`, so the same blob is stored once
+    no matter how many cache rows reference it.
+    """
+
+    @abstractmethod
+    async def put_many(self, items: List[Tuple[str, str]]) -> List[str]:
+        """
+        Store blobs and return their hashes.
+
+        Args:
+            items: List of (content, content_type) pairs. Empty content is not stored
+                and yields an empty hash.
+
+        Returns:
+            List[str]: Content hashes in the same order as `items`.
+        """
+
+    @abstractmethod
+    async def get_many(self, keys: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Load blobs by (content_hash, content_type). Missing blobs come back as None.
+        """
+
+    @abstractmethod
+    def get_many_sync(self, keys: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Blocking variant of `get_many`, used to resolve lazily loaded cache fields on
+        attribute access.
+        """
+
+    async def put(self, content: str, content_type: str) -> str:
+        return (await self.put_many([(content, content_type)]))[0]
+
+    async def get(self, content_hash: str, content_type: str) -> Optional[str]:
+        return (await self.get_many([(content_hash, content_type)]))[0]
+
+    async def compact(
+        self, live_keys: Optional[LiveKeys] = None, grace_period: float = 0.0
+    ) -> Dict:
+        """
+        Reclaim space. When `live_keys` is given, blobs not in it are dropped.
+
+        `live_keys` is a sync or async iterable of (content_hash, content_type); stores
+        consume it in batches, so it can be streamed from the cache database. Blobs
+        stored (or stored again) less than `grace_period` seconds before the call are
+        kept even when they are not live: another process may have stored them for a
+        row it has not committed yet.
+
+        Returns:
+            Dict: Backend specific statistics about the work done.
+        """
+        return {}
+
+    def close(self):
+        pass
+
+
+class FileContentStore(ContentStore):
+    """One file per blob: `<content_paths[content_type]>/<hash>`."""
+
+    def __init__(self, content_paths: Dict[str, str], logger=None):
+        self.content_paths = content_paths
+        self.logger = logger
+
+    async def _store(self, content: str, content_type: str) -> str:
+        if not content:
+            return ""
+
+        content_hash = generate_content_hash(content)
+        file_path = os.path.join(self.content_paths[content_type], content_hash)
+
+        # Only write if file doesn't exist; otherwise mark it as stored again, so
+        # compaction's grace period covers the row about to reference it
+        if not os.path.exists(file_path):
+            async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
+                await f.write(content)
+        else:
+            try:
+                os.utime(file_path)
+            except OSError:
+                pass
+
+        return content_hash
+
+    async def _load(self, content_hash: str, content_type: str) -> Optional[str]:
+        if not content_hash:
+            return None
+
+        file_path = os.path.join(self.content_paths[content_type], content_hash)
+        try:
+            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+                return await f.read()
+        except Exception:
+            if self.logger:
+                self.logger.error(
+                    message="Failed to load content: {file_path}",
+                    tag="ERROR",
+                    force_verbose=True,
+                    params={"file_path": file_path},
+                )
+            return None
+
+    def _load_sync(self, content_hash: str, content_type: str) -> Optional[str]:
+        if not content_hash:
+            return None
+
+        file_path = os.path.join(self.content_paths[content_type], content_hash)
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    async def put_many(self, items: List[Tuple[str, str]]) -> List[str]:
+        return [await self._store(content, content_type) for content, content_type in items]
+
+    def get_many_sync(self, keys: List[Tuple[str, str]]) -> List[Optional[str]]:
+        return [self._load_sync(content_hash, content_type) for content_hash, content_type in keys]
+
+    async def get_many(self, keys: List[Tuple[str, str]]) -> List[Optional[str]]:
+        return [await self._load(content_hash, content_type) for content_hash, content_type in keys]
+
+    async def compact(
+        self, live_keys: Optional[LiveKeys] = None, grace_period: float = 0.0
+    ) -> Dict:
+        """
+        Remove blob files that no cache row references and that were last stored more
+        than `grace_period` seconds ago. A no-op without `live_keys`.
+        """
+        if live_keys is None:
+            return {"files_removed": 0, "bytes_freed": 0}
+        cutoff = time.time() - grace_period
+        # Collect the keys in a private temporary database rather than a Python set
+        live = sqlite3.connect("", check_same_thread=False, isolation_level=None)
+        try:
+            _create_live_keys_table(live, temp=False)
+            async for batch in _live_key_batches(live_keys):
+                await asyncio.to_thread(_insert_live_keys, live, batch)
+            return await asyncio.to_thread(self._remove_orphans, live, cutoff)
+        finally:
+            live.close()
+
+    def _remove_orphans(self, live: sqlite3.Connection, cutoff: float) -> Dict:
+        removed = freed = 0
+        seen_dirs = set()
+        for content_type, directory in self.content_paths.items():
+            content_type = _normalize_type(content_type)
+            if directory in seen_dirs or not os.path.isdir(directory):
+                continue
+            seen_dirs.add(directory)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or live.execute(
+                        "SELECT 1 FROM live_keys WHERE content_type = ? AND hash = ?",
+                        (content_type, entry.name),
+                    ).fetchone():
+                        continue
+                    try:
+                        stat = entry.stat()
+                        if stat.st_mtime >= cutoff:
+                            continue
+                        os.remove(entry.path)
+                    except OSError:
+                        continue
+                    size = stat.st_size
+                    removed += 1
+                    freed += size
+        return {"files_removed": removed, "bytes_freed": freed}
+
+
+class PackedContentStore(ContentStore):
+    """
+    Append-only pack files with a sqlite index.
+
+    Each blob is appended to the active `segment-NNNNNN.pack` file as a small
+    self-describing record (header, content type, hash, payload). `index.db` maps
+    (content_type, hash) to (segment, offset, length, codec). A new segment is started
+    once the active one reaches `max_segment_size`. Overwritten cache entries leave dead
+    records behind; `compact()` rewrites segments whose garbage ratio exceeds
+    `min_garbage_ratio`.
+
+    Index access and appends are serialized by a thread lock and run in worker threads,
+    so the event loop never blocks on disk I/O. Appends and compaction also take an
+    exclusive `flock` on `store.lock`, so several processes can share one store; the
+    writer re-checks the active segment and its end offset under that lock. A
+    compaction holds the lock from before it reads the live keys until it is done, so
+    other processes can't add blobs the live-key snapshot misses; each index entry
+    records when it was last stored, for the compaction grace period. Without `fcntl`
+    (Windows) only threads of one process are serialized.
+
+    Args:
+        directory (str): Directory holding the segments and the index.
+        compression (str): "auto" (zstd if available, else zlib), "zstd", "zlib" or "none".
+        compression_level (int, optional): Codec specific level. Defaults to 3 for zstd
+            and 6 for zlib.
+        max_segment_size (int): Size in bytes after which a new segment is started.
+        logger (AsyncLogger, optional): Logger for read errors.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        compression: str = "auto",
+        compression_level: Optional[int] = None,
+        max_segment_size: int = 256 * 1024 * 1024,
+        logger=None,
+    ):
+        if compression == "auto":
+            compression = "zstd" if HAS_ZSTD else "zlib"
+        if compression not in _CODEC_NAMES:
+            raise ValueError(
+                f"Unknown compression '{compression}', expected one of: auto, {', '.join(_CODEC_NAMES)}"
+            )
+        if compression == "zstd" and not HAS_ZSTD:
+            raise ImportError("zstd compression requires the 'zstandard' package: pip install zstandard")
+
+        self.directory = directory
+        self.codec = _CODEC_NAMES[compression]
+        self.compression_level = compression_level
+        self.max_segment_size = max_segment_size
+        self.logger = logger
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()  # index and writer state
+        self._write_lock = threading.Lock()  # appends and compaction of this process
+        self._compaction_lock = threading.Lock()
+        self._store_held = False  # a compaction of this process holds the store lock
+        self._lock_file = open(os.path.join(directory, "store.lock"), "a")
+        self._index = sqlite3.connect(
+            os.path.join(directory, "index.db"), check_same_thread=False, isolation_level=None
+        )
+        self._index.execute("PRAGMA journal_mode = WAL")
+        self._index.execute("PRAGMA synchronous = NORMAL")
+        self._index.execute(
+            """
+            CREATE TABLE IF NOT EXISTS content_index (
+                content_type TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                codec INTEGER NOT NULL,
+                stored_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (content_type, hash)
+            ) WITHOUT ROWID
+            """
+        )
+        columns = {row[1] for row in self._index.execute("PRAGMA table_info(content_index)")}
+        if "stored_at" not in columns:
+            try:
+                self._index.execute(
+                    "ALTER TABLE content_index ADD COLUMN stored_at REAL NOT NULL DEFAULT 0"
+                )
+            except sqlite3.OperationalError:
+                pass  # added by another process meanwhile
+        self._index.execute(
+            "CREATE INDEX IF NOT EXISTS idx_content_segment ON content_index (segment, offset)"
+        )
+
+        segments = self._segment_numbers()
+        self._active_segment = segments[-1] if segments else 1
+        self._writer = None
+
+    # ---- segment files ----------------------------------------------------
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment:06d}.pack")
+
+    def _segment_numbers(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.directory):
+            match = _SEGMENT_NAME.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the store for appending or compaction, across threads and processes."""
+        with self._write_lock:
+            # Readers only wait for the index lock, not for other processes
+            lock_file = fcntl is not None and not self._store_held
+            if lock_file:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                with self._lock:
+                    yield
+            finally:
+                if lock_file:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _hold_store(self):
+        """
+        Take the store lock for a whole compaction, until `_release_store`. Other
+        processes wait; appends of this process go on, as the caller keeps track of
+        its own unwritten rows.
+        """
+        self._compaction_lock.acquire()
+        with self._write_lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._store_held = True
+
+    def _release_store(self):
+        with self._write_lock:
+            self._store_held = False
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+        self._compaction_lock.release()
+
+    def _get_writer(self):
+        # Another process may have rolled to a new segment or compacted ours away
+        segments = self._segment_numbers()
+        latest = segments[-1] if segments else 1
+        if self._writer is not None and (
+            latest != self._active_segment or os.fstat(self._writer.fileno()).st_nlink == 0
+        ):
+            self._close_writer()
+        if self._writer is None:
+            self._active_segment = latest
+            self._writer = open(self._segment_path(self._active_segment), "ab")
+        # ... and appended to it since our last write
+        self._writer.seek(0, os.SEEK_END)
+        if self._writer.tell() >= self.max_segment_size:
+            self._writer.close()
+            self._active_segment += 1
+            self._writer = open(self._segment_path(self._active_segment), "ab")
+        return self._writer
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    # ---- codecs -----------------------------------------------------------
+
+    def _compress(self, data: bytes) -> Tuple[bytes, int]:
+        if self.codec == CODEC_NONE or len(data) < _MIN_COMPRESS_SIZE:
+            return data, CODEC_NONE
+        if self.codec == CODEC_ZSTD:
+            packed = zstandard.ZstdCompressor(level=self.compression_level or 3).compress(data)
+        else:
+            packed = zlib.compress(data, self.compression_level or 6)
+        if len(packed) >= len(data):
+            return data, CODEC_NONE
+        return packed, self.codec
+
+    @staticmethod
+    def _decompress(payload: bytes, codec: int) -> bytes:
+        if codec == CODEC_NONE:
+            return payload
+        if codec == CODEC_ZSTD:
+            if not HAS_ZSTD:
+                raise ImportError("Cached content is zstd compressed; install 'zstandard' to read it")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(payload)
+        raise ValueError(f"Unknown codec {codec}")
+
+    @staticmethod
+    def _record(content_type: str, content_hash: str, payload: bytes, codec: int) -> bytes:
+        type_bytes = content_type.encode()
+        hash_bytes = content_hash.encode()
+        header = _RECORD_HEADER.pack(
+            _RECORD_MAGIC, codec, len(type_bytes), len(hash_bytes), len(payload)
+        )
+        return header + type_bytes + hash_bytes + payload
+
+    # ---- writes -----------------------------------------------------------
+
+    async def put_many(self, items: List[Tuple[str, str]]) -> List[str]:
+        return await asyncio.to_thread(self._put_many, items)
+
+    def _put_many(self, items: List[Tuple[str, str]]) -> List[str]:
+        hashes = []
+        pending = {}
+        for content, content_type in items:
+            if not content:
+                hashes.append("")
+                continue
+            content_hash = generate_content_hash(content)
+            hashes.append(content_hash)
+            pending.setdefault((_normalize_type(content_type), content_hash), content)
+
+        if not pending:
+            return hashes
+
+        with self._exclusive():
+            now = time.time()
+            new_items, stored = [], []
+            for key in pending:
+                (stored if self._contains(*key) else new_items).append(key)
+            if stored:
+                # Stored again: restart their compaction grace period
+                self._index.execute("BEGIN")
+                self._index.executemany(
+                    "UPDATE content_index SET stored_at = ? WHERE content_type = ? AND hash = ?",
+                    [(now, *key) for key in stored],
+                )
+                self._index.execute("COMMIT")
+            if not new_items:
+                return hashes
+
+            # Encode everything first so the blobs of one call land contiguously
+            writer = self._get_writer()
+            segment = self._active_segment
+            position = writer.tell()
+            chunks = []
+            rows = []
+            for content_type, content_hash in new_items:
+                payload, codec = self._compress(pending[(content_type, content_hash)].encode("utf-8"))
+                record = self._record(content_type, content_hash, payload, codec)
+                offset = position + len(record) - len(payload)
+                rows.append((content_type, content_hash, segment, offset, len(payload), codec, now))
+                chunks.append(record)
+                position += len(record)
+
+            writer.write(b"".join(chunks))
+            writer.flush()
+            self._index.execute("BEGIN")
+            self._index.executemany(
+                "INSERT OR REPLACE INTO content_index "
+                "(content_type, hash, segment, offset, length, codec, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._index.execute("COMMIT")
+        return hashes
+
+    def _contains(self, content_type: str, content_hash: str) -> bool:
+        row = self._index.execute(
+            "SELECT 1 FROM content_index WHERE content_type = ? AND hash = ?",
+            (content_type, content_hash),
+        ).fetchone()
+        return row is not None
+
+    # ---- reads ------------------------------------------------------------
+
+    async def get_many(self, keys: List[Tuple[str, str]]) -> List[Optional[str]]:
+        return await asyncio.to_thread(self._get_many, keys)
+
+    def get_many_sync(self, keys: List[Tuple[str, str]]) -> List[Optional[str]]:
+        return self._get_many(keys)
+
+    def _locate(self, keys: List[Tuple[str, str]]) -> Dict[int, Tuple[int, int, int, int]]:
+        """Map key positions to (segment, offset, length, codec)."""
+        locations = {}
+        with self._lock:
+            for i, (content_hash, content_type) in enumerate(keys):
+                if not content_hash:
+                    continue
+                row = self._index.execute(
+                    "SELECT segment, offset, length, codec FROM content_index "
+                    "WHERE content_type = ? AND hash = ?",
+                    (_normalize_type(content_type), content_hash),
+                ).fetchone()
+                if row:
+                    locations[i] = row
+        return locations
+
+    def _get_many(self, keys: List[Tuple[str, str]], _retry: bool = True) -> List[Optional[str]]:
+        results: List[Optional[str]] = [None] * len(keys)
+        locations = self._locate(keys)
+
+        by_segment: Dict[int, List[Tuple[int, int, int, int]]] = {}
+        for i, (segment, offset, length, codec) in locations.items():
+            by_segment.setdefault(segment, []).append((offset, length, codec, i))
+
+        for segment, entries in by_segment.items():
+            entries.sort()
+            try:
+                with open(self._segment_path(segment), "rb") as f:
+                    for span in self._coalesce(entries):
+                        start = span[0][0]
+                        end = span[-1][0] + span[-1][1]
+                        f.seek(start)
+                        buffer = f.read(end - start)
+                        for offset, length, codec, i in span:
+                            payload = buffer[offset - start:offset - start + length]
+                            results[i] = self._decompress(payload, codec).decode("utf-8")
+            except FileNotFoundError:
+                # The segment was rewritten by a concurrent compaction; look up again
+                if _retry:
+                    return self._get_many(keys, _retry=False)
+                self._log_read_error(segment, "segment file missing")
+            except Exception as e:
+                self._log_read_error(segment, str(e))
+        return results
+
+    @staticmethod
+    def _coalesce(entries):
+        """Group sorted (offset, length, ...) entries into spans readable with one read."""
+        span = [entries[0]]
+        for entry in entries[1:]:
+            previous = span[-1]
+            if entry[0] - (previous[0] + previous[1]) <= _READ_COALESCE_GAP:
+                span.append(entry)
+            else:
+                yield span
+                span = [entry]
+        yield span
+
+    def _log_read_error(self, segment: int, error: str):
+        if self.logger:
+            self.logger.error(
+                message="Failed to load content from {path}: {error}",
+                tag="ERROR",
+                force_verbose=True,
+                params={"path": self._segment_path(segment), "error": error},
+            )
+
+    # ---- maintenance ------------------------------------------------------
+
+    def stats(self) -> Dict:
+        """Entry count, live payload bytes, segment count and total segment bytes."""
+        with self._lock:
+            entries, live_bytes = self._index.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM content_index"
+            ).fetchone()
+            segments = self._segment_numbers()
+        total = sum(os.path.getsize(self._segment_path(s)) for s in segments)
+        return {
+            "entries": entries,
+            "live_bytes": live_bytes,
+            "segments": len(segments),
+            "total_bytes": total,
+        }
+
+    async def compact(
+        self,
+        live_keys: Optional[LiveKeys] = None,
+        min_garbage_ratio: float = 0.3,
+        grace_period: float = 0.0,
+    ) -> Dict:
+        """
+        Drop index entries not in `live_keys` (if given) that were last stored more than
+        `grace_period` seconds ago, and rewrite segments in which at least
+        `min_garbage_ratio` of the bytes are dead. Writers of other processes wait while
+        this runs, from before the live keys are read.
+
+        The live keys are streamed into a temporary table of the index, so memory use
+        doesn't grow with the number of cached rows.
+        """
+        cutoff = time.time() - grace_period
+        await asyncio.to_thread(self._hold_store)
+        try:
+            if live_keys is not None:
+                await asyncio.to_thread(self._reset_live_keys)
+                async for batch in _live_key_batches(live_keys):
+                    await asyncio.to_thread(self._add_live_keys, batch)
+            return await asyncio.to_thread(
+                self._compact, live_keys is not None, min_garbage_ratio, cutoff
+            )
+        finally:
+            await asyncio.to_thread(self._release_store)
+
+    def _reset_live_keys(self):
+        with self._lock:
+            _create_live_keys_table(self._index)
+            self._index.execute("DELETE FROM live_keys")
+
+    def _add_live_keys(self, batch: List[Tuple[str, str]]):
+        with self._lock:
+            _insert_live_keys(self._index, batch)
+
+    def _compact(self, drop_dead: bool, min_garbage_ratio: float, cutoff: float) -> Dict:
+        with self._exclusive():
+            self._close_writer()
+            entries_dropped = 0
+            if drop_dead:
+                entries_dropped = self._drop_dead_entries(cutoff)
+
+            live_by_segment = dict(
+                self._index.execute(
+                    "SELECT segment, SUM(length) FROM content_index GROUP BY segment"
+                ).fetchall()
+            )
+            segments = self._segment_numbers()
+            bytes_before = 0
+            candidates = []
+            for segment in segments:
+                size = os.path.getsize(self._segment_path(segment))
+                bytes_before += size
+                live = live_by_segment.get(segment, 0)
+                if size and (size - live) / size >= min_garbage_ratio:
+                    candidates.append(segment)
+
+            if candidates:
+                self._rewrite_segments(candidates, (segments[-1] if segments else 0) + 1)
+
+            segments = self._segment_numbers()
+            bytes_after = sum(os.path.getsize(self._segment_path(s)) for s in segments)
+            self._active_segment = segments[-1] if segments else 1
+        return {
+            "entries_dropped": entries_dropped,
+            "segments_rewritten": len(candidates),
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+        }
+
+    def _drop_dead_entries(self, cutoff: float) -> int:
+        """
+        Delete index entries stored before `cutoff` that are missing from the live_keys
+        table filled by compact().
+        """
+        self._index.execute("BEGIN")
+        cursor = self._index.execute(
+            "DELETE FROM content_index WHERE stored_at < ? AND NOT EXISTS (SELECT 1 "
+            "FROM live_keys WHERE live_keys.content_type = content_index.content_type "
+            "AND live_keys.hash = content_index.hash)",
+            (cutoff,),
+        )
+        dropped = cursor.rowcount
+        self._index.execute("COMMIT")
+        self._index.execute("DROP TABLE live_keys")
+        return dropped
+
+    def _rewrite_segments(self, candidates: List[int], first_new_segment: int):
+        """Copy the live records of `candidates` into new segments, then drop the old files."""
+        new_segment = first_new_segment
+        out = open(self._segment_path(new_segment), "ab")
+        moved = []
+        try:
+            for segment in candidates:
+                rows = self._index.execute(
+                    "SELECT content_type, hash, offset, length, codec FROM content_index "
+                    "WHERE segment = ? ORDER BY offset",
+                    (segment,),
+                ).fetchall()
+                if not rows:
+                    continue
+                with open(self._segment_path(segment), "rb") as f:
+                    for content_type, content_hash, offset, length, codec in rows:
+                        if out.tell() >= self.max_segment_size:
+                            out.flush()
+                            os.fsync(out.fileno())
+                            out.close()
+                            new_segment += 1
+                            out = open(self._segment_path(new_segment), "ab")
+                        f.seek(offset)
+                        payload = f.read(length)
+                        record = self._record(content_type, content_hash, payload, codec)
+                        new_offset = out.tell() + len(record) - len(payload)
+                        out.write(record)
+                        moved.append((new_segment, new_offset, content_type, content_hash))
+            out.flush()
+            os.fsync(out.fileno())
+        finally:
+            out.close()
+
+        # New segments are durable before the index points at them; a crash before the
+        # commit below only leaves unreferenced segments for the next compaction.
+        self._index.execute("BEGIN")
+        self._index.executemany(
+            "UPDATE content_index SET segment = ?, offset = ? WHERE content_type = ? AND hash = ?",
+            moved,
+        )
+        self._index.execute("COMMIT")
+
+        for segment in candidates:
+            os.remove(self._segment_path(segment))
+        for segment in range(first_new_segment, new_segment + 1):
+            path = self._segment_path(segment)
+            if os.path.exists(path) and os.path.getsize(path) == 0:
+                os.remove(path)
+
+    def close(self):
+        with self._lock:
+            self._close_writer()
+            self._index.close()
+            self._lock_file.close()
+
+
+def create_content_store(
+    kind: Optional[str], content_paths: Dict[str, str], base_directory: str, logger=None
+) -> ContentStore:
+    """
+    Build the content store named by `kind` ("files" or "packed").
+
+    `None` reads the `CRAWL4_AI_CONTENT_STORE` environment variable and falls back to "files".
+    """
+    kind = kind or os.getenv("CRAWL4_AI_CONTENT_STORE", "files")
+    if kind == "files":
+        return FileContentStore(content_paths, logger=logger)
+    if kind == "packed":
+        return PackedContentStore(os.path.join(base_directory, "content_packs"), logger=logger)
+    raise ValueError(f"Unknown content store '{kind}', expected 'files' or 'packed'")
@@ -160,6 +160,10 @@ class BestFirstCrawlingStrategy(DeepCrawlStrategy):
         new_depth = current_depth + 1
         if new_depth > self.max_depth:
             return
+
+        # A near duplicate of an already cached page links to the same places
+        if result.duplicate_of:
+            return
             
         # If we've reached the max pages limit, don't discover new links
         remaining_capacity = self.max_pages - self._pages_crawled
@@ -149,6 +149,10 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
         if next_depth > self.max_depth:
             return
 
+        # A near duplicate of an already cached page links to the same places
+        if result.duplicate_of:
+            return
+
         # If we've reached the max pages limit, don't discover new links
         remaining_capacity = self.max_pages - self._pages_crawled
         if remaining_capacity <= 0:
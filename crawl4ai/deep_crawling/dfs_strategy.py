@@ -277,6 +277,10 @@ class DFSDeepCrawlStrategy(BFSDeepCrawlStrategy):
         if next_depth > self.max_depth:
             return
 
+        # A near duplicate of an already cached page links to the same places
+        if result.duplicate_of:
+            return
+
         remaining_capacity = self.max_pages - self._pages_crawled
         if remaining_capacity <= 0:
             self.logger.info(
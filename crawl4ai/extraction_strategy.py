@@ -1124,6 +1124,7 @@ class JsonElementExtractionStrategy(ExtractionStrategy):
         _apply_transform(value, transform): Applies a transformation to a value.
         _compute_field(item, field): Computes a field value using an expression or function.
         run(url, sections, *q, **kwargs): Combines HTML sections and runs the extraction strategy.
+        _parse_document(parsed_document): Reuses a crawler-provided parse of the page, if supported.
 
     Abstract Methods:
         _parse_html(html_content): Parses raw HTML into a structured format (e.g., BeautifulSoup or lxml).
@@ -1168,7 +1169,13 @@ class JsonElementExtractionStrategy(ExtractionStrategy):
             List[Dict[str, Any]]: A list of extracted items, each represented as a dictionary.
         """
 
-        parsed_html = self._parse_html(html_content)
+        # Reuse the crawler's parse of this page when the strategy can read it
+        parsed_html = None
+        parsed_document = kwargs.get("parsed_document")
+        if parsed_document is not None and parsed_document.matches(html_content):
+            parsed_html = self._parse_document(parsed_document)
+        if parsed_html is None:
+            parsed_html = self._parse_html(html_content)
         base_elements = self._get_base_elements(
             parsed_html, self.schema["baseSelector"]
         )
@@ -1197,6 +1204,10 @@ class JsonElementExtractionStrategy(ExtractionStrategy):
         """Parse HTML content into appropriate format"""
         pass
 
+    def _parse_document(self, parsed_document):
+        """Reuse an already-parsed `ParsedDocument`; None means parse the HTML instead"""
+        return None
+
     @abstractmethod
     def _get_base_elements(self, parsed_html, selector: str):
         """Get all base elements using the selector"""
@@ -2138,6 +2149,10 @@ class JsonLxmlExtractionStrategy(JsonElementExtractionStrategy):
                     print(f"Critical error parsing HTML: {e2}")
                 # Create minimal document as fallback
                 return self.etree.Element("html")
+
+    def _parse_document(self, parsed_document):
+        # Selection is read-only, so the shared tree can be used without a copy
+        return parsed_document.tree
     
     def _optimize_selector(self, selector_str):
         """Optimize common selector patterns for better performance"""
@@ -2532,6 +2547,12 @@ class JsonXPathExtractionStrategy(JsonElementExtractionStrategy):
     def _parse_html(self, html_content: str):
         return html.fromstring(html_content)
 
+    def _parse_document(self, parsed_document):
+        # html.fromstring() only yields the same root as the shared tree for full documents
+        if parsed_document.is_full_document:
+            return parsed_document.tree
+        return None
+
     def _get_base_elements(self, parsed_html, selector: str):
         return parsed_html.xpath(selector)
 
@@ -177,6 +177,94 @@ async def run_migration(db_path: Optional[str] = None):
     await migration.migrate_database()
 
 
+async def migrate_to_packed_store(
+    db_path: Optional[str] = None,
+    pack_dir: Optional[str] = None,
+    remove_files: bool = False,
+    batch_size: int = 500,
+) -> int:
+    """
+    Copy cached content from the one-file-per-blob layout into a PackedContentStore.
+
+    Content hashes are unchanged, so crawled_data rows keep working as they are. Set
+    CRAWL4_AI_CONTENT_STORE=packed afterwards to make the crawler read from the packs.
+
+    Args:
+        db_path: Database path, defaults to ~/.crawl4ai/crawl4ai.db.
+        pack_dir: Pack directory, defaults to content_packs next to the database.
+        remove_files: Delete the per-blob files once everything has been copied.
+        batch_size: Rows copied per pack write.
+
+    Returns:
+        int: Number of rows migrated.
+    """
+    from .content_store import FileContentStore, PackedContentStore
+    from .async_database import CONTENT_COLUMNS
+
+    if db_path is None:
+        db_path = os.path.join(Path.home(), ".crawl4ai", "crawl4ai.db")
+    if not os.path.exists(db_path):
+        logger.info("No existing database found. Skipping migration.", tag="INIT")
+        return 0
+
+    base_path = os.path.dirname(db_path)
+    file_store = FileContentStore(DatabaseMigration(db_path).content_paths)
+    packed_store = PackedContentStore(pack_dir or os.path.join(base_path, "content_packs"))
+    logger.info("Migrating cached content to packed storage...", tag="INIT")
+
+    migrated_count = 0
+    missing_count = 0
+    try:
+        async with aiosqlite.connect(db_path) as db:
+            columns = ", ".join(CONTENT_COLUMNS)
+            async with db.execute(f"SELECT {columns} FROM crawled_data") as cursor:
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    keys = [
+                        (hash_value, content_type)
+                        for row in rows
+                        for hash_value, content_type in zip(row, CONTENT_COLUMNS.values())
+                        if hash_value
+                    ]
+                    contents = await file_store.get_many(keys)
+                    items = []
+                    for (hash_value, content_type), content in zip(keys, contents):
+                        if content is None:
+                            missing_count += 1
+                        else:
+                            items.append((content, content_type))
+                    await packed_store.put_many(items)
+
+                    migrated_count += len(rows)
+                    logger.info(f"Migrated {migrated_count} records...", tag="INIT")
+    except Exception as e:
+        logger.error(
+            message="Migration failed: {error}",
+            tag="ERROR",
+            params={"error": str(e)},
+        )
+        raise
+    finally:
+        packed_store.close()
+
+    if missing_count:
+        logger.warning(
+            f"{missing_count} content files referenced by the database were missing.",
+            tag="INIT",
+        )
+    if remove_files:
+        for directory in set(file_store.content_paths.values()):
+            shutil.rmtree(directory, ignore_errors=True)
+
+    logger.success(
+        f"Migration completed. {migrated_count} records processed.",
+        tag="COMPLETE",
+    )
+    return migrated_count
+
+
 def main():
     """CLI entry point for migration"""
     import argparse
@@ -185,9 +273,25 @@ def main():
         description="Migrate Crawl4AI database to file-based storage"
     )
     parser.add_argument("--db-path", help="Custom database path")
+    parser.add_argument(
+        "--to-packed",
+        action="store_true",
+        help="Move cached content from one file per blob into packed segment files",
+    )
+    parser.add_argument("--pack-dir", help="Custom pack directory (with --to-packed)")
+    parser.add_argument(
+        "--remove-files",
+        action="store_true",
+        help="Delete the per-blob content files after a successful --to-packed migration",
+    )
     args = parser.parse_args()
 
-    asyncio.run(run_migration(args.db_path))
+    if args.to_packed:
+        asyncio.run(
+            migrate_to_packed_store(args.db_path, args.pack_dir, args.remove_files)
+        )
+    else:
+        asyncio.run(run_migration(args.db_path))
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import asyncio
 from pydantic import BaseModel, HttpUrl, PrivateAttr, Field, ConfigDict, BeforeValidator
 from typing import Annotated
 from typing import List, Dict, Optional, Callable, Awaitable, Union, Any
@@ -6,6 +7,7 @@ from typing import Generic, TypeVar
 from enum import Enum
 from dataclasses import dataclass
 from .ssl_certificate import SSLCertificate
+from .config import FIT_HTML_TEXT_THRESHOLD, FIT_HTML_MAX_SIZE
 from datetime import datetime
 from datetime import timedelta
 
@@ -18,6 +20,7 @@ class DomainState:
     last_request_time: float = 0
     current_delay: float = 0
     fail_count: int = 0
+    crawl_delay: Optional[float] = None  # From robots.txt, once looked up
 
 
 @dataclass
@@ -32,6 +35,7 @@ class CrawlerTaskResult:
     error_message: str = ""
     retry_count: int = 0
     wait_time: float = 0.0
+    domain_memory: float = 0.0  # Average estimated MB of a crawl on this URL's domain
     
     @property
     def success(self) -> bool:
@@ -116,6 +120,7 @@ class DispatchResult(BaseModel):
     start_time: Union[datetime, float]
     end_time: Union[datetime, float]
     error_message: str = ""
+    domain_memory: float = 0.0
 
 class MarkdownGenerationResult(BaseModel):
     raw_markdown: str
@@ -127,10 +132,17 @@ class MarkdownGenerationResult(BaseModel):
     def __str__(self):
         return self.raw_markdown
     
+# CrawlResult fields that can be filled on first access (see CrawlResult.set_lazy_field)
+LAZY_RESULT_FIELDS = frozenset(
+    {"html", "cleaned_html", "markdown", "extracted_content", "screenshot", "media", "links", "metadata"}
+)
+
+
 class CrawlResult(BaseModel):
     url: str
     html: str
-    fit_html: Optional[str] = None
+    _fit_html: Optional[str] = PrivateAttr(default=None)
+    _lazy_fields: Dict[str, Callable[[], Any]] = PrivateAttr(default_factory=dict)
     success: bool
     cleaned_html: Optional[str] = None
     media: Dict[str, List[Dict]] = {}
@@ -158,6 +170,10 @@ class CrawlResult(BaseModel):
     head_fingerprint: Optional[str] = None
     cached_at: Optional[float] = None
     cache_status: Optional[str] = None  # "hit", "hit_validated", "hit_fallback", "miss"
+    # Near-duplicate detection (CrawlerRunConfig.skip_near_duplicates): SimHash of the
+    # page text (see utils.compute_simhash) and the cached URL this page duplicates
+    content_fingerprint: Optional[str] = None
+    duplicate_of: Optional[str] = None
     # Anti-bot retry/proxy usage stats
     crawl_stats: Optional[Dict[str, Any]] = None
 
@@ -177,7 +193,10 @@ class CrawlResult(BaseModel):
     
     def __init__(self, **data):
         markdown_result = data.pop('markdown', None)
+        fit_html = data.pop('fit_html', None)
         super().__init__(**data)
+        if isinstance(fit_html, str):
+            self._fit_html = fit_html
         if markdown_result is not None:
             self._markdown = (
                 MarkdownGenerationResult(**markdown_result)
@@ -185,6 +204,61 @@ class CrawlResult(BaseModel):
                 else markdown_result
             )
     
+    def __getattribute__(self, name):
+        if name in LAZY_RESULT_FIELDS:
+            private = object.__getattribute__(self, "__pydantic_private__")
+            if private and private.get("_lazy_fields") and name in private["_lazy_fields"]:
+                # Assigning drops the loader; if it raises, the field stays pending
+                setattr(self, name, private["_lazy_fields"][name]())
+        return super().__getattribute__(name)
+
+    def __setattr__(self, name, value):
+        if name in LAZY_RESULT_FIELDS:
+            self._lazy_fields.pop(name, None)
+        super().__setattr__(name, value)
+
+    def __getstate__(self):
+        # Loaders are closures over the cache backend; resolve them before pickling
+        self.load_lazy_fields()
+        return super().__getstate__()
+
+    def set_lazy_field(self, name: str, loader: Callable[[], Any]):
+        """
+        Defer loading of `name` until it is first read. `loader` is called once,
+        synchronously, and its return value is assigned to the field.
+
+        Used by cache reads that only load the fields a caller asked for.
+        """
+        if name not in LAZY_RESULT_FIELDS:
+            raise ValueError(f"'{name}' can't be loaded lazily")
+        self._lazy_fields[name] = loader
+
+    def load_lazy_fields(self, names: Optional[List[str]] = None):
+        """Resolve pending lazy fields (all of them, or only `names`)."""
+        for name in list(self._lazy_fields):
+            if names is None or name in names:
+                getattr(self, name)
+
+    async def aload_lazy_fields(self, names: Optional[List[str]] = None):
+        """
+        Like `load_lazy_fields`, but runs the (blocking) loaders in a worker thread so
+        code on the event loop doesn't stall on cache reads.
+        """
+        pending = {
+            name: loader
+            for name, loader in self._lazy_fields.items()
+            if names is None or name in names
+        }
+        if not pending:
+            return
+        values = await asyncio.to_thread(
+            lambda: {name: loader() for name, loader in pending.items()}
+        )
+        for name, value in values.items():
+            # Skip fields assigned while the loaders ran
+            if self._lazy_fields.get(name) is pending[name]:
+                setattr(self, name, value)
+
     @property
     def markdown(self):
         """
@@ -235,14 +309,29 @@ class CrawlResult(BaseModel):
         )
     
     @property
-    def fit_html(self):
+    def fit_html(self) -> Optional[str]:
         """
-        Deprecated property that raises an AttributeError when accessed.
+        The page HTML preprocessed by `preprocess_html_for_schema`.
+
+        Only computed during processing when the markdown generator or the extraction
+        strategy reads it; otherwise it is derived from `html` on first access and
+        memoized, so crawls that never look at it don't pay for it. `model_dump`
+        emits the memoized value (None if it was never built) unless `fit_html`
+        is passed in `include`.
         """
-        raise AttributeError(
-            "The 'fit_html' attribute is deprecated and has been removed. "
-            "Please use 'markdown.fit_html' instead."
-        )
+        if self._fit_html is None and self.html:
+            from .utils import preprocess_html_for_schema
+
+            self._fit_html = preprocess_html_for_schema(
+                html_content=self.html,
+                text_threshold=FIT_HTML_TEXT_THRESHOLD,
+                max_size=FIT_HTML_MAX_SIZE,
+            )
+        return self._fit_html
+
+    @fit_html.setter
+    def fit_html(self, value: Optional[str]):
+        self._fit_html = value
 
     def model_dump(self, *args, **kwargs):
         """
@@ -259,11 +348,19 @@ class CrawlResult(BaseModel):
         serialized despite being stored in a private attribute. If the serialization
         requirements change, this is where you would update the logic.
         """
+        include, exclude = kwargs.get("include"), kwargs.get("exclude")
+        if self._lazy_fields:
+            self.load_lazy_fields(
+                [
+                    name for name in self._lazy_fields
+                    if (include is None or name in include) and (exclude is None or name not in exclude)
+                ]
+            )
         result = super().model_dump(*args, **kwargs)
         
         # Remove any property descriptors that might have been included
         # These deprecated properties should not be in the serialized output
-        for key in ['fit_html', 'fit_markdown', 'markdown_v2']:
+        for key in ['fit_markdown', 'markdown_v2']:
             if key in result and isinstance(result[key], property):
                 # del result[key]
                 # Nasrin: I decided to convert it to string instead of removing it.
@@ -272,6 +369,13 @@ class CrawlResult(BaseModel):
         # Add the markdown field properly
         if self._markdown is not None:
             result["markdown"] = self._markdown.model_dump() 
+
+        # fit_html is lazy: dump whatever is memoised, and only compute it
+        # when the caller explicitly includes it
+        if include is not None and "fit_html" in include:
+            result["fit_html"] = self.fit_html
+        elif include is None and (exclude is None or "fit_html" not in exclude):
+            result["fit_html"] = self._fit_html
         return result
 
 class StringCompatibleMarkdown(str):
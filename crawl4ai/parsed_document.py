@@ -0,0 +1,50 @@
+import copy
+import re
+
+from lxml import html as lhtml
+
+# Same test lxml.html.fromstring() uses to decide between document and fragment parsing
+_FULL_DOCUMENT_RE = re.compile(r"^\s*<(?:html|!doctype)", re.IGNORECASE)
+
+
+class ParsedDocument:
+    """
+    Parse-once holder for the raw HTML of a single crawled page.
+
+    `AsyncWebCrawler.aprocess_html` builds one instance per page and hands it to every
+    stage that needs an lxml tree of the raw HTML (scraping, fit_html preprocessing,
+    lxml-based schema extraction), so the page is parsed at most once.
+
+    Stages that only read the tree use `tree` directly. Stages that mutate it must call
+    `fork()` and work on the private copy, which keeps the shared tree intact for the
+    next consumer. Copying a parsed tree is roughly twice as fast as parsing it again.
+
+    Attributes:
+        html (str): The raw HTML this document was built from.
+    """
+
+    __slots__ = ("html", "_tree")
+
+    def __init__(self, html: str):
+        self.html = html
+        self._tree = None
+
+    @property
+    def tree(self) -> lhtml.HtmlElement:
+        """Shared document tree, parsed on first access. Treat it as read-only."""
+        if self._tree is None:
+            self._tree = lhtml.document_fromstring(self.html)
+        return self._tree
+
+    @property
+    def is_full_document(self) -> bool:
+        """True if the HTML is a complete document rather than a fragment."""
+        return bool(_FULL_DOCUMENT_RE.match(self.html))
+
+    def fork(self) -> lhtml.HtmlElement:
+        """Return a private deep copy of the tree for stages that modify it."""
+        return copy.deepcopy(self.tree)
+
+    def matches(self, html: str) -> bool:
+        """Check whether this document was built from `html`."""
+        return html is self.html or html == self.html
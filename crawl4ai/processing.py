@@ -0,0 +1,329 @@
+"""
+CPU-bound half of `AsyncWebCrawler.aprocess_html`: HTML -> ScrapingResult -> Markdown -> extraction.
+
+Everything in this module is synchronous and free of crawler state, so the same code runs
+inline in the event loop or inside a worker of an opt-in `processing_executor`
+(e.g. `concurrent.futures.ProcessPoolExecutor`). For the worker case the strategies are
+shipped as a picklable `ProcessingSpec` and only the result fields come back.
+"""
+
+import copy
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from .async_configs import LinkPreviewConfig
+from .chunking_strategy import ChunkingStrategy, IdentityChunking
+from .config import FIT_HTML_MAX_SIZE, FIT_HTML_TEXT_THRESHOLD
+from .content_scraping_strategy import ContentScrapingStrategy
+from .extraction_strategy import ExtractionStrategy, JsonElementExtractionStrategy
+from .markdown_generation_strategy import MarkdownGenerationStrategy
+from .models import MarkdownGenerationResult, ScrapingResult
+from .parsed_document import ParsedDocument
+from .table_extraction import TableExtractionStrategy
+from .utils import (
+    InvalidCSSSelectorError,
+    compute_simhash,
+    preprocess_html_for_schema,
+    sanitize_input_encode,
+)
+
+BASE_TAG_REGEX = re.compile(r'<base\s[^>]*href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Config/kwargs values that are not plain data but are still needed by the scraping strategy
+_SHIPPABLE_PARAM_TYPES = (TableExtractionStrategy, LinkPreviewConfig)
+
+
+@dataclass
+class ProcessingSpec:
+    """
+    Everything `process_html` needs, in a form that can be pickled to a worker process.
+
+    Attributes:
+        scraping_strategy (ContentScrapingStrategy): Strategy producing cleaned HTML, media and links.
+        markdown_generator (MarkdownGenerationStrategy): Strategy producing the markdown result.
+        params (dict): Keyword arguments for `scraping_strategy.scrap()`.
+        extraction_strategy (ExtractionStrategy, optional): Run extraction as part of processing.
+            Left as None when the caller runs extraction itself (e.g. async LLM strategies).
+        chunking_strategy (ChunkingStrategy, optional): Chunking used for extraction input.
+        fit_html_required (bool): Compute fit_html even if nothing in the spec reads it
+            (the caller runs an extraction strategy with input_format="fit_html" itself).
+        fingerprint (bool): Compute content_fingerprint (used for near-duplicate detection).
+    """
+
+    scraping_strategy: ContentScrapingStrategy
+    markdown_generator: MarkdownGenerationStrategy
+    params: Dict[str, Any] = field(default_factory=dict)
+    extraction_strategy: Optional[ExtractionStrategy] = None
+    chunking_strategy: Optional[ChunkingStrategy] = None
+    fit_html_required: bool = False
+    fingerprint: bool = False
+
+
+def _without_logger(obj):
+    """Shallow copy of a strategy with its logger detached (loggers hold locks and can't be pickled)."""
+    if getattr(obj, "logger", None) is None:
+        return obj
+    obj = copy.copy(obj)
+    obj.logger = None
+    return obj
+
+
+def _is_plain(value) -> bool:
+    if value is None or isinstance(value, (str, int, float, bool, Enum)):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(_is_plain(k) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+def build_processing_spec(
+    scraping_strategy: ContentScrapingStrategy,
+    markdown_generator: MarkdownGenerationStrategy,
+    params: Dict[str, Any],
+    extraction_strategy: Optional[ExtractionStrategy] = None,
+    chunking_strategy: Optional[ChunkingStrategy] = None,
+    fit_html_required: bool = False,
+    fingerprint: bool = False,
+) -> ProcessingSpec:
+    """
+    Build a picklable `ProcessingSpec` for running `process_html` in a worker process.
+
+    Loggers are detached from the strategies and `params` is reduced to plain data plus
+    the few strategy objects the scraper reads. Live objects such as proxy rotation
+    strategies, hooks or the executor itself are dropped; the scraper never uses them.
+    """
+    shipped_params = {}
+    for key, value in params.items():
+        if _is_plain(value):
+            shipped_params[key] = value
+        elif isinstance(value, _SHIPPABLE_PARAM_TYPES):
+            shipped_params[key] = _without_logger(value)
+
+    return ProcessingSpec(
+        scraping_strategy=_without_logger(scraping_strategy),
+        markdown_generator=_without_logger(markdown_generator),
+        params=shipped_params,
+        extraction_strategy=_without_logger(extraction_strategy) if extraction_strategy else None,
+        chunking_strategy=chunking_strategy,
+        fit_html_required=fit_html_required,
+        fingerprint=fingerprint,
+    )
+
+
+def prepare_extraction_input(
+    extraction_strategy: ExtractionStrategy,
+    chunking_strategy: ChunkingStrategy,
+    markdown_result: MarkdownGenerationResult,
+    html: str,
+    fit_html: str,
+    cleaned_html: str,
+):
+    """
+    Pick the representation the extraction strategy asked for and chunk it.
+
+    Returns:
+        tuple: (content_format, sections). `content_format` falls back to "markdown"
+        when "fit_markdown" was requested but no fit markdown was generated.
+    """
+    content_format = extraction_strategy.input_format
+    if content_format == "fit_markdown" and not markdown_result.fit_markdown:
+        content_format = "markdown"
+
+    content = {
+        "markdown": markdown_result.raw_markdown,
+        "html": html,
+        "fit_html": fit_html,
+        "cleaned_html": cleaned_html,
+        "fit_markdown": markdown_result.fit_markdown,
+    }.get(content_format, markdown_result.raw_markdown)
+
+    # Use IdentityChunking for HTML input, otherwise use provided chunking strategy
+    chunking = (
+        IdentityChunking()
+        if content_format in ["html", "cleaned_html", "fit_html"]
+        else chunking_strategy
+    )
+    return content_format, chunking.chunk(content)
+
+
+def process_html(
+    url: str,
+    html: str,
+    spec: ProcessingSpec,
+    logger=None,
+    parsed_document: Optional[ParsedDocument] = None,
+) -> Dict[str, Any]:
+    """
+    Run scraping, fit_html preprocessing, markdown generation and (if the spec carries
+    one) extraction for a single page.
+
+    This is the function submitted to a `processing_executor`, so it must stay a
+    module-level function with picklable arguments and return value.
+
+    Args:
+        url (str): The URL being processed.
+        html (str): Raw HTML content.
+        spec (ProcessingSpec): Strategies and scraping parameters.
+        logger (AsyncLogger, optional): Logger for warnings (None inside workers).
+        parsed_document (ParsedDocument, optional): Shared parse of `html`; built here if missing.
+
+    Returns:
+        dict: cleaned_html, media, tables, links, metadata, fit_html (None if nothing
+        needed it), markdown
+        (MarkdownGenerationResult), content_fingerprint (SimHash of the markdown, ""
+        unless spec.fingerprint is set),
+        extracted_content (JSON string or None),
+        scrape_time and extraction_time (seconds).
+    """
+    t1 = time.perf_counter()
+    if parsed_document is None:
+        parsed_document = ParsedDocument(html)
+    params = dict(spec.params)
+    # Parse the page once and share the tree with every stage below
+    params["parsed_document"] = parsed_document
+
+    try:
+        ################################
+        # Scraping Strategy Execution  #
+        ################################
+        result: ScrapingResult = spec.scraping_strategy.scrap(url, html, **params)
+
+        if result is None:
+            raise ValueError(
+                f"Process HTML, Failed to extract content from the website: {url}"
+            )
+
+    except InvalidCSSSelectorError as e:
+        raise ValueError(str(e))
+    except Exception as e:
+        raise ValueError(
+            f"Process HTML, Failed to extract content from the website: {url}, error: {str(e)}"
+        )
+
+    # Extract results - handle both dict and ScrapingResult
+    if isinstance(result, dict):
+        cleaned_html = sanitize_input_encode(result.get("cleaned_html", ""))
+        media = result.get("media", {})
+        tables = media.pop("tables", []) if isinstance(media, dict) else []
+        links = result.get("links", {})
+        metadata = result.get("metadata", {})
+    else:
+        cleaned_html = sanitize_input_encode(result.cleaned_html)
+        media = result.media.model_dump() if hasattr(result.media, 'model_dump') else result.media
+        tables = media.pop("tables", []) if isinstance(media, dict) else []
+        links = result.links.model_dump() if hasattr(result.links, 'model_dump') else result.links
+        metadata = result.metadata
+
+    # fit_html is demand-driven: computed here only if markdown or extraction reads it,
+    # otherwise CrawlResult.fit_html derives it lazily on first access.
+    fit_html = None
+
+    def get_fit_html() -> str:
+        nonlocal fit_html
+        if fit_html is None:
+            fit_html = preprocess_html_for_schema(
+                html_content=html,
+                text_threshold=FIT_HTML_TEXT_THRESHOLD,
+                max_size=FIT_HTML_MAX_SIZE,
+                parsed_document=parsed_document,
+            )
+        return fit_html
+
+    if spec.fit_html_required or (
+        spec.extraction_strategy is not None
+        and spec.extraction_strategy.input_format == "fit_html"
+    ):
+        get_fit_html()
+
+    ################################
+    # Generate Markdown            #
+    ################################
+    markdown_generator = spec.markdown_generator
+
+    # --- SELECT HTML SOURCE BASED ON CONTENT_SOURCE ---
+    # Get the desired source from the generator config, default to 'cleaned_html'
+    selected_html_source = getattr(markdown_generator, 'content_source', 'cleaned_html')
+
+    # Define the source selection logic using dict dispatch
+    html_source_selector = {
+        "raw_html": lambda: html,  # The original raw HTML
+        "cleaned_html": lambda: cleaned_html,  # The HTML after scraping strategy
+        "fit_html": get_fit_html,  # The HTML after preprocessing for schema
+    }
+
+    markdown_input_html = cleaned_html  # Default to cleaned_html
+
+    try:
+        # Get the appropriate lambda function, default to returning cleaned_html if key not found
+        source_lambda = html_source_selector.get(selected_html_source, lambda: cleaned_html)
+        # Execute the lambda to get the selected HTML
+        markdown_input_html = source_lambda()
+    except Exception as e:
+        # Handle potential errors, especially from preprocess_html_for_schema
+        if logger:
+            logger.warning(
+                f"Error getting/processing '{selected_html_source}' for markdown source: {e}. Falling back to cleaned_html.",
+                tag="MARKDOWN_SRC"
+            )
+        # Ensure markdown_input_html is still the default cleaned_html in case of error
+        markdown_input_html = cleaned_html
+    # --- END: HTML SOURCE SELECTION ---
+
+    # Extract <base href> from raw HTML before it gets stripped by cleaning.
+    # This ensures relative URLs resolve correctly even with cleaned_html.
+    base_url = params.get("base_url") or params.get("redirected_url") or url
+    base_tag_match = BASE_TAG_REGEX.search(html)
+    if base_tag_match:
+        base_url = base_tag_match.group(1)
+
+    markdown_result: MarkdownGenerationResult = markdown_generator.generate_markdown(
+        input_html=markdown_input_html,
+        base_url=base_url,
+    )
+    # Body-level fingerprint for near-duplicate detection (see CrawlResult.content_fingerprint)
+    content_fingerprint = (
+        compute_simhash(markdown_result.raw_markdown) if spec.fingerprint else ""
+    )
+    scrape_time = time.perf_counter() - t1
+
+    ################################
+    # Structured Content Extraction #
+    ################################
+    extracted_content = None
+    extraction_time = 0.0
+    if spec.extraction_strategy is not None:
+        t1 = time.perf_counter()
+        content_format, sections = prepare_extraction_input(
+            spec.extraction_strategy, spec.chunking_strategy, markdown_result,
+            html, fit_html, cleaned_html,
+        )
+        extraction_kwargs = {}
+        if content_format == "html" and isinstance(
+            spec.extraction_strategy, JsonElementExtractionStrategy
+        ):
+            extraction_kwargs["parsed_document"] = parsed_document
+        extracted_content = json.dumps(
+            spec.extraction_strategy.run(url, sections, **extraction_kwargs),
+            indent=4, default=str, ensure_ascii=False,
+        )
+        extraction_time = time.perf_counter() - t1
+
+    return {
+        "cleaned_html": cleaned_html,
+        "media": media,
+        "tables": tables,
+        "links": links,
+        "metadata": metadata,
+        "fit_html": fit_html,
+        "markdown": markdown_result,
+        "content_fingerprint": content_fingerprint,
+        "extracted_content": extracted_content,
+        "scrape_time": scrape_time,
+        "extraction_time": extraction_time,
+    }
@@ -310,25 +310,16 @@ class RobotsParser:
                     (domain, content, int(time.time()), hash_val)
                 )
 
-    async def can_fetch(self, url: str, user_agent: str = "*") -> bool:
-        """
-        Check if URL can be fetched according to robots.txt rules.
-        
-        Args:
-            url: The URL to check
-            user_agent: User agent string to check against (default: "*")
-            
-        Returns:
-            bool: True if allowed, False if disallowed by robots.txt
-        """
+    async def _get_parser(self, url: str) -> Optional[RobotFileParser]:
+        """Parsed robots.txt for the URL's domain, None if there is none or it can't be read"""
         # Handle empty/invalid URLs
         try:
             parsed = urlparse(url)
             domain = parsed.netloc
             if not domain:
-                return True
+                return None
         except Exception as _ex:
-            return True
+            return None
 
         # Fast path - check cache first
         rules, is_fresh = self._get_cached_rules(domain)
@@ -346,13 +337,13 @@ class RobotsParser:
                             rules = await response.text()
                             self._cache_rules(domain, rules)
                         else:
-                            return True
+                            return None
             except Exception as _ex:
                 # On any error (timeout, connection failed, etc), allow access
-                return True
+                return None
 
         if not rules:
-            return True
+            return None
 
         # Create parser for this check
         parser = RobotFileParser() 
@@ -360,10 +351,51 @@ class RobotsParser:
         
         # If parser can't read rules, allow access
         if not parser.mtime():
-            return True
+            return None
+        return parser
+
+    async def can_fetch(self, url: str, user_agent: str = "*") -> bool:
+        """
+        Check if URL can be fetched according to robots.txt rules.
+        
+        Args:
+            url: The URL to check
+            user_agent: User agent string to check against (default: "*")
             
+        Returns:
+            bool: True if allowed, False if disallowed by robots.txt
+        """
+        parser = await self._get_parser(url)
+        if parser is None:
+            return True
         return parser.can_fetch(user_agent, url)
 
+    async def crawl_delay(self, url: str, user_agent: str = "*") -> Optional[float]:
+        """
+        Seconds to wait between requests to the URL's domain according to robots.txt.
+
+        Uses `Crawl-delay`, or `Request-rate` (requests per seconds) if that asks for
+        more spacing.
+
+        Args:
+            url: The URL to check
+            user_agent: User agent string to check against (default: "*")
+
+        Returns:
+            Optional[float]: The delay, or None if robots.txt doesn't set one
+        """
+        parser = await self._get_parser(url)
+        if parser is None:
+            return None
+        delays = []
+        crawl_delay = parser.crawl_delay(user_agent)
+        if crawl_delay is not None:
+            delays.append(float(crawl_delay))
+        request_rate = parser.request_rate(user_agent)
+        if request_rate is not None and request_rate.requests:
+            delays.append(request_rate.seconds / request_rate.requests)
+        return max(delays) if delays else None
+
     def clear_cache(self):
         """Clear all cached robots.txt entries"""
         with sqlite3.connect(self.db_path) as conn:
@@ -2943,6 +2975,48 @@ def compute_head_fingerprint(head_html: str) -> str:
     return xxhash.xxh64(combined.encode()).hexdigest()
 
 
+SIMHASH_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def compute_simhash(text: str, shingle_size: int = 3) -> str:
+    """
+    Compute a 64-bit SimHash of page text for near-duplicate detection.
+
+    Words are lowercased and grouped into overlapping shingles of `shingle_size` words;
+    each shingle hash votes on every bit. Pages differing only in boilerplate, tracking
+    parameters or a few sentences end up a few bits apart (see `simhash_distance`),
+    while unrelated pages differ in about half of the bits.
+
+    Args:
+        text: Page text, typically the raw markdown
+        shingle_size: Words per shingle
+
+    Returns:
+        A 16-character hex fingerprint, or empty string if the text has no words
+    """
+    words = SIMHASH_WORD_PATTERN.findall(text.lower()) if text else []
+    if not words:
+        return ""
+    shingles = [
+        " ".join(words[i:i + shingle_size])
+        for i in range(max(1, len(words) - shingle_size + 1))
+    ]
+    hashes = np.fromiter(
+        (xxhash.xxh64_intdigest(shingle) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    # One row of 64 bits per shingle; a bit is set if most shingles set it
+    bits = np.unpackbits(hashes.astype(">u8").view(np.uint8)).reshape(-1, 64)
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return np.packbits(majority).tobytes().hex()
+
+
+def simhash_distance(a: str, b: str) -> int:
+    """Number of differing bits between two `compute_simhash` fingerprints."""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
 def ensure_content_dirs(base_path: str) -> Dict[str, str]:
     """Create content directories if they don't exist"""
     dirs = {
@@ -3119,24 +3193,62 @@ class HeadPeekr:
         title_match = re.search(r'<title>(.*?)</title>', head_content, re.IGNORECASE | re.DOTALL)
         return title_match.group(1) if title_match else None
 
-def preprocess_html_for_schema(html_content, text_threshold=100, attr_value_threshold=200, max_size=100000):
+# Elements whose inner and trailing whitespace can be visible text (close to the
+# list libxml2 consults for remove_blank_text)
+_TEXT_LEVEL_TAGS = frozenset("""
+    a abbr acronym address applet b bdo big blockquote body button caption center cite
+    code dd del dfn div dt em font form h1 h2 h3 h4 h5 h6 i iframe ins kbd label legend
+    li noscript object p pre q s samp small span strike strong td th tt u var
+""".split())
+
+
+def _strip_blank_text(tree):
+    """
+    Remove whitespace-only text that is layout rather than content: the leading
+    text of block containers (`<ul> <li>`) and the text after block-level
+    elements. Whitespace inside or after text-level elements is kept, as in
+    `<p>a <b>b</b> <i>c</i></p>`.
+    """
+    for el in tree.iter(tag=etree.Element):
+        if el.text is not None and el.text.isspace() and el.tag not in _TEXT_LEVEL_TAGS:
+            el.text = None
+        for child in el:
+            if child.tail is not None and child.tail.isspace() and child.tag not in _TEXT_LEVEL_TAGS:
+                child.tail = None
+
+
+def preprocess_html_for_schema(html_content, text_threshold=100, attr_value_threshold=200, max_size=100000, parsed_document=None):
     """
     Preprocess HTML to reduce size while preserving structure for schema generation.
-    
+
     Args:
         html_content (str): Raw HTML content
         text_threshold (int): Maximum length for text nodes before truncation
         attr_value_threshold (int): Maximum length for attribute values before truncation
         max_size (int): Target maximum size for output HTML
-        
+        parsed_document (ParsedDocument, optional): Already-parsed `html_content`. When given
+            (and it is a full document), a fork of its tree is used instead of parsing again.
+
     Returns:
         str: Preprocessed HTML content
     """
     try:
-        # Parse HTML with error recovery
-        parser = etree.HTMLParser(remove_comments=True, remove_blank_text=True)
-        tree = lhtml.fromstring(html_content, parser=parser)
-        
+        if (
+            parsed_document is not None
+            and parsed_document.is_full_document
+            and parsed_document.matches(html_content)
+        ):
+            tree = parsed_document.fork()
+            # Mirror remove_comments=True of the dedicated parser below (keeps comment tails)
+            etree.strip_tags(tree, etree.Comment)
+        else:
+            # Parse HTML with error recovery
+            parser = etree.HTMLParser(remove_comments=True)
+            tree = lhtml.fromstring(html_content, parser=parser)
+        # Drop layout whitespace after parsing, so a shared and a dedicated parse
+        # end up with the same tree
+        _strip_blank_text(tree)
+
         # 1. Remove HEAD section (keep only BODY)
         head_elements = tree.xpath('//head')
         for head in head_elements:
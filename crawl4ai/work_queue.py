@@ -0,0 +1,510 @@
+"""
+Shared work queues for DistributedDispatcher.
+
+A `WorkQueue` holds crawl jobs: the URLs of one `arun_many` call plus its serialized
+config. Workers lease tasks for a visibility timeout and extend the lease while they
+crawl; a lease that runs out (the worker died or hung) makes the task available to
+other workers again, up to `max_attempts` leases. Finished tasks are published as
+encoded `CrawlerTaskResult`s that the process which submitted the job reads back.
+
+- `SQLiteWorkQueue`: a sqlite file shared by the processes of one machine (also a
+  stand-in for tests).
+- `RedisWorkQueue`: Redis streams with a consumer group, for workers on many hosts.
+  Works with a `redis.asyncio.Redis` client.
+"""
+
+import asyncio
+import base64
+import json
+import time
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from .models import CrawlerTaskResult, CrawlResult
+
+# CrawlResult fields not sent between processes (objects that don't serialize, lazy caches)
+_UNSHIPPED_FIELDS = {"ssl_certificate", "fit_html"}
+
+
+def _json_default(value: Any):
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, datetime):
+        return value.timestamp()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _json_object_hook(value: Dict):
+    if set(value) == {"__bytes__"}:
+        return base64.b64decode(value["__bytes__"])
+    return value
+
+
+def encode_task_result(task_result: CrawlerTaskResult, compression_level: int = 6) -> bytes:
+    """Serialize a task result for a work queue"""
+    data = {
+        field.name: getattr(task_result, field.name)
+        for field in fields(task_result)
+        if field.name != "result"
+    }
+    data["result"] = task_result.result.model_dump(exclude=_UNSHIPPED_FIELDS)
+    return zlib.compress(
+        json.dumps(data, default=_json_default).encode("utf-8"), compression_level
+    )
+
+
+def decode_task_result(payload: bytes) -> CrawlerTaskResult:
+    data = json.loads(zlib.decompress(payload), object_hook=_json_object_hook)
+    data["result"] = CrawlResult(**data["result"])
+    return CrawlerTaskResult(**data)
+
+
+def _expired_task_result(task_id: str, url: str, attempts: int) -> bytes:
+    error_message = f"Task lease expired {attempts} times without a result"
+    now = time.time()
+    return encode_task_result(
+        CrawlerTaskResult(
+            task_id=task_id,
+            url=url,
+            result=CrawlResult(url=url, html="", success=False, error_message=error_message),
+            memory_usage=0,
+            peak_memory=0,
+            start_time=now,
+            end_time=now,
+            error_message=error_message,
+            retry_count=attempts,
+        )
+    )
+
+
+@dataclass
+class Lease:
+    job_id: str
+    task_id: str
+    url: str
+    attempts: int  # Times the task has been leased, this lease included
+    receipt: Optional[str] = None  # Queue-specific handle (e.g. a stream entry id)
+
+
+class WorkQueue(ABC):
+    """Tasks of distributed crawl jobs, leased by workers and answered with results"""
+
+    @abstractmethod
+    async def create_job(self, job_id: str, config: str):
+        """Register a job with its serialized config"""
+
+    @abstractmethod
+    async def job_config(self, job_id: str) -> Optional[str]:
+        """Serialized config of a job, None once the job is deleted"""
+
+    @abstractmethod
+    async def push(self, job_id: str, tasks: List[Tuple[str, str]]):
+        """Add `(task_id, url)` tasks to a job"""
+
+    @abstractmethod
+    async def lease(
+        self,
+        worker_id: str,
+        count: int,
+        visibility_timeout: float,
+        job_id: Optional[str] = None,
+        max_attempts: int = 3,
+    ) -> List[Lease]:
+        """
+        Lease up to `count` tasks (of `job_id`, or of any job) for `visibility_timeout`
+        seconds. Tasks whose lease ran out are leased again; one that ran out
+        `max_attempts` times is completed with a failed result instead.
+        """
+
+    @abstractmethod
+    async def extend(self, worker_id: str, leases: List[Lease], visibility_timeout: float):
+        """Renew leases still held by `worker_id`"""
+
+    @abstractmethod
+    async def complete(self, worker_id: str, lease: Lease, payload: bytes) -> bool:
+        """Publish the result of a leased task. False if the task was already completed."""
+
+    @abstractmethod
+    async def results(
+        self, job_id: str, cursor: Optional[Any] = None, limit: int = 500
+    ) -> List[Tuple[Any, bytes]]:
+        """`(cursor, payload)` of results published after `cursor`, oldest first"""
+
+    @abstractmethod
+    async def delete_job(self, job_id: str):
+        """Drop a job with its remaining tasks and results"""
+
+    async def close(self):
+        pass
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Work queue in a sqlite file; every process that opens the same file shares it.
+
+    Args:
+        path: Database file; created if missing
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[aiosqlite.Connection] = None
+        # The connection is shared by the coroutines of this process, one transaction at a time
+        self._lock = asyncio.Lock()
+
+    async def _conn(self) -> aiosqlite.Connection:
+        if self._db is None:
+            db = await aiosqlite.connect(self.path, timeout=30, isolation_level=None)
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS work_jobs (job_id TEXT PRIMARY KEY, config TEXT NOT NULL)"
+            )
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS work_tasks (
+                    task_id TEXT PRIMARY KEY,
+                    job_id TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'queued',
+                    owner TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_work_tasks_state ON work_tasks (state, lease_expires)"
+            )
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS work_results (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    payload BLOB NOT NULL
+                )
+                """
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_work_results_job ON work_results (job_id, seq)"
+            )
+            self._db = db
+        return self._db
+
+    @asynccontextmanager
+    async def _transaction(self, db: aiosqlite.Connection):
+        async with self._lock:
+            # IMMEDIATE takes the write lock up front, so two processes never lease the same task
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                await db.execute("ROLLBACK")
+                raise
+            await db.execute("COMMIT")
+
+    async def create_job(self, job_id, config):
+        db = await self._conn()
+        async with self._transaction(db):
+            await db.execute(
+                "INSERT OR REPLACE INTO work_jobs (job_id, config) VALUES (?, ?)", (job_id, config)
+            )
+
+    async def job_config(self, job_id):
+        db = await self._conn()
+        async with db.execute("SELECT config FROM work_jobs WHERE job_id = ?", (job_id,)) as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def push(self, job_id, tasks):
+        db = await self._conn()
+        async with self._transaction(db):
+            await db.executemany(
+                "INSERT OR IGNORE INTO work_tasks (task_id, job_id, url) VALUES (?, ?, ?)",
+                [(task_id, job_id, url) for task_id, url in tasks],
+            )
+
+    async def lease(self, worker_id, count, visibility_timeout, job_id=None, max_attempts=3):
+        if count <= 0:
+            return []
+        db = await self._conn()
+        now = time.time()
+        query = (
+            "SELECT task_id, job_id, url, attempts FROM work_tasks"
+            " WHERE (state = 'queued' OR (state = 'leased' AND lease_expires < ?))"
+        )
+        params: List[Any] = [now]
+        if job_id is not None:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        query += " ORDER BY rowid LIMIT ?"
+
+        leases = []
+        async with self._transaction(db):
+            while len(leases) < count:
+                async with db.execute(query, params + [count - len(leases)]) as cursor:
+                    rows = await cursor.fetchall()
+                if not rows:
+                    break
+                for task_id, task_job_id, url, attempts in rows:
+                    if attempts >= max_attempts:
+                        await db.execute(
+                            "UPDATE work_tasks SET state = 'done', owner = NULL WHERE task_id = ?",
+                            (task_id,),
+                        )
+                        await db.execute(
+                            "INSERT INTO work_results (job_id, task_id, payload) VALUES (?, ?, ?)",
+                            (task_job_id, task_id, _expired_task_result(task_id, url, attempts)),
+                        )
+                        continue
+                    await db.execute(
+                        "UPDATE work_tasks SET state = 'leased', owner = ?, lease_expires = ?,"
+                        " attempts = attempts + 1 WHERE task_id = ?",
+                        (worker_id, now + visibility_timeout, task_id),
+                    )
+                    leases.append(Lease(task_job_id, task_id, url, attempts + 1))
+        return leases
+
+    async def extend(self, worker_id, leases, visibility_timeout):
+        if not leases:
+            return
+        db = await self._conn()
+        task_ids = [lease.task_id for lease in leases]
+        placeholders = ",".join("?" * len(task_ids))
+        async with self._transaction(db):
+            await db.execute(
+                f"UPDATE work_tasks SET lease_expires = ? WHERE owner = ? AND state = 'leased'"
+                f" AND task_id IN ({placeholders})",
+                [time.time() + visibility_timeout, worker_id, *task_ids],
+            )
+
+    async def complete(self, worker_id, lease, payload):
+        db = await self._conn()
+        async with self._transaction(db):
+            async with db.execute(
+                "SELECT state FROM work_tasks WHERE task_id = ?", (lease.task_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            completed = row is not None and row[0] != "done"
+            if completed:
+                await db.execute(
+                    "UPDATE work_tasks SET state = 'done', owner = NULL WHERE task_id = ?",
+                    (lease.task_id,),
+                )
+                await db.execute(
+                    "INSERT INTO work_results (job_id, task_id, payload) VALUES (?, ?, ?)",
+                    (lease.job_id, lease.task_id, payload),
+                )
+        return completed
+
+    async def results(self, job_id, cursor=None, limit=500):
+        db = await self._conn()
+        async with db.execute(
+            "SELECT seq, payload FROM work_results WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (job_id, cursor or 0, limit),
+        ) as rows:
+            return [(seq, payload) for seq, payload in await rows.fetchall()]
+
+    async def delete_job(self, job_id):
+        db = await self._conn()
+        async with self._transaction(db):
+            for table in ("work_results", "work_tasks", "work_jobs"):
+                await db.execute(f"DELETE FROM {table} WHERE job_id = ?", (job_id,))
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+
+# Records a task as done, publishes its result and acknowledges its lease in one atomic
+# step, so a worker dying in between can't leave a result without its ack (or the reverse).
+# KEYS: done set, results stream, tasks stream. ARGV: task id, payload, group, entry id.
+_COMPLETE_SCRIPT = """
+local completed = redis.call('sadd', KEYS[1], ARGV[1])
+if completed == 1 then
+    redis.call('xadd', KEYS[2], '*', 'task_id', ARGV[1], 'payload', ARGV[2])
+end
+redis.call('xack', KEYS[3], ARGV[3], ARGV[4])
+return completed
+"""
+
+
+# Resets the idle time of pending entries still owned by a worker, so a worker renewing
+# late can't take back an entry another worker claimed after its lease ran out.
+# KEYS: tasks stream. ARGV: group, worker id, entry ids.
+_EXTEND_SCRIPT = """
+for i = 3, #ARGV do
+    local pending = redis.call('xpending', KEYS[1], ARGV[1], ARGV[i], ARGV[i], 1)
+    if pending[1] and pending[1][2] == ARGV[2] then
+        redis.call('xclaim', KEYS[1], ARGV[1], ARGV[2], 0, ARGV[i], 'JUSTID')
+    end
+end
+return 0
+"""
+
+
+class RedisWorkQueue(WorkQueue):
+    """
+    Work queue on Redis streams, for workers spread over several hosts.
+
+    Each job has a task stream read through the consumer group `group`, so a task is
+    delivered to one worker and stays in that worker's pending list until it is
+    acknowledged. Pending entries idle for longer than the visibility timeout are
+    claimed by the next worker that asks for work (`XAUTOCLAIM`); extending a lease
+    re-claims the entries the worker still owns to reset their idle time. Results go to a second stream
+    per job and a set of completed task ids keeps duplicates out.
+
+    Args:
+        client: A `redis.asyncio.Redis` client.
+        namespace: Key prefix, to share one server between deployments.
+        group: Consumer group the workers read through.
+    """
+
+    def __init__(self, client, namespace: str = "crawl4ai", group: str = "crawl4ai-workers"):
+        self.client = client
+        self.namespace = namespace
+        self.group = group
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisWorkQueue":
+        """Create a queue from a redis:// URL (requires the `redis` package)"""
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ImportError("RedisWorkQueue requires the 'redis' package: pip install redis")
+        return cls(redis.from_url(url), **kwargs)
+
+    def _key(self, job_id: str, kind: str) -> str:
+        return f"{self.namespace}:job:{job_id}:{kind}"
+
+    @staticmethod
+    def _text(value) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    @classmethod
+    def _field(cls, fields: Dict, name: str):
+        value = fields.get(name)
+        if value is None:
+            value = fields.get(name.encode("utf-8"))
+        return value
+
+    async def create_job(self, job_id, config):
+        await self.client.set(self._key(job_id, "config"), config)
+        try:
+            await self.client.xgroup_create(
+                self._key(job_id, "tasks"), self.group, id="0", mkstream=True
+            )
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        await self.client.sadd(f"{self.namespace}:jobs", job_id)
+
+    async def job_config(self, job_id):
+        config = await self.client.get(self._key(job_id, "config"))
+        return self._text(config) if config is not None else None
+
+    async def push(self, job_id, tasks):
+        stream = self._key(job_id, "tasks")
+        async with self.client.pipeline(transaction=False) as pipe:
+            for task_id, url in tasks:
+                pipe.xadd(stream, {"task_id": task_id, "url": url})
+            await pipe.execute()
+
+    def _lease_from(self, job_id: str, entry_id, fields: Dict, attempts: int) -> Lease:
+        return Lease(
+            job_id=job_id,
+            task_id=self._text(self._field(fields, "task_id")),
+            url=self._text(self._field(fields, "url")),
+            attempts=attempts,
+            receipt=self._text(entry_id),
+        )
+
+    async def lease(self, worker_id, count, visibility_timeout, job_id=None, max_attempts=3):
+        if job_id is not None:
+            job_ids = [job_id]
+        else:
+            job_ids = [self._text(j) for j in await self.client.smembers(f"{self.namespace}:jobs")]
+
+        leases = []
+        for current_job in job_ids:
+            if len(leases) >= count:
+                break
+            stream = self._key(current_job, "tasks")
+
+            # Take over tasks whose worker stopped renewing its lease
+            _, claimed, *_ = await self.client.xautoclaim(
+                stream,
+                self.group,
+                worker_id,
+                min_idle_time=int(visibility_timeout * 1000),
+                start_id="0-0",
+                count=count - len(leases),
+            )
+            for entry_id, fields in claimed:
+                pending = await self.client.xpending_range(
+                    stream, self.group, min=entry_id, max=entry_id, count=1
+                )
+                attempts = pending[0]["times_delivered"] if pending else 1
+                lease = self._lease_from(current_job, entry_id, fields, attempts)
+                if attempts > max_attempts:
+                    await self.complete(
+                        worker_id, lease, _expired_task_result(lease.task_id, lease.url, attempts - 1)
+                    )
+                    continue
+                leases.append(lease)
+
+            if len(leases) < count:
+                response = await self.client.xreadgroup(
+                    self.group, worker_id, {stream: ">"}, count=count - len(leases)
+                )
+                for _, entries in response or []:
+                    for entry_id, fields in entries:
+                        leases.append(self._lease_from(current_job, entry_id, fields, 1))
+        return leases
+
+    async def extend(self, worker_id, leases, visibility_timeout):
+        by_job: Dict[str, List[str]] = {}
+        for lease in leases:
+            by_job.setdefault(lease.job_id, []).append(lease.receipt)
+        for job_id, receipts in by_job.items():
+            await self.client.eval(
+                _EXTEND_SCRIPT, 1, self._key(job_id, "tasks"), self.group, worker_id, *receipts
+            )
+
+    async def complete(self, worker_id, lease, payload):
+        completed = await self.client.eval(
+            _COMPLETE_SCRIPT,
+            3,
+            self._key(lease.job_id, "done"),
+            self._key(lease.job_id, "results"),
+            self._key(lease.job_id, "tasks"),
+            lease.task_id,
+            payload,
+            self.group,
+            lease.receipt,
+        )
+        return bool(completed)
+
+    async def results(self, job_id, cursor=None, limit=500):
+        entries = await self.client.xrange(
+            self._key(job_id, "results"),
+            min=f"({self._text(cursor)}" if cursor else "-",
+            count=limit,
+        )
+        return [(self._text(entry_id), self._field(fields, "payload")) for entry_id, fields in entries]
+
+    async def delete_job(self, job_id):
+        await self.client.srem(f"{self.namespace}:jobs", job_id)
+        await self.client.delete(
+            *(self._key(job_id, kind) for kind in ("config", "tasks", "results", "done"))
+        )
+
+    async def close(self):
+        await self.client.aclose()
@@ -0,0 +1,175 @@
+"""Unit tests for multi-browser sharding in BrowserManager.
+
+Covers new pages going to the least loaded shard (open pages, page latency,
+RSS), sessions staying on their shard, releases and kills reaching the right
+shard, expired sessions being killed through the parent, and shard start-up
+failures. No browser or network required.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from crawl4ai import BrowserConfig, CrawlerRunConfig
+from crawl4ai.browser_manager import BrowserManager
+
+
+class FakeShard:
+    def __init__(self, name: str, delay: float = 0.0, rss: float = None):
+        self.name = name
+        self.delay = delay
+        self.rss = rss
+        self.sessions = {}
+        self.released = []
+        self.killed = []
+
+    async def get_page(self, config):
+        await asyncio.sleep(self.delay)
+        if config.session_id in self.sessions:
+            return self.sessions[config.session_id][1], None
+        page = f"{self.name}-page-{len(self.released) + len(self.sessions)}-{id(config)}"
+        if config.session_id:
+            self.sessions[config.session_id] = (None, page, time.time())
+        return page, None
+
+    async def release_page_with_context(self, page, reusable=False):
+        self.released.append(page)
+        return False
+
+    async def kill_session(self, session_id):
+        self.killed.append(session_id)
+        del self.sessions[session_id]
+
+    def _browser_rss_mb(self):
+        return self.rss
+
+
+def _manager(*shards) -> BrowserManager:
+    manager = BrowserManager(BrowserConfig(browser_shards=len(shards)))
+    manager._shards = list(shards)
+    manager._shard_stats = {s: {"pages": 0, "latency": 0.0, "rss": None} for s in shards}
+    return manager
+
+
+def _pages(manager):
+    return [manager._shard_stats[s]["pages"] for s in manager._shards]
+
+
+class TestShardBalancing:
+    @pytest.mark.asyncio
+    async def test_pages_spread_by_open_pages(self):
+        manager = _manager(FakeShard("a"), FakeShard("b"), FakeShard("c"))
+        pages = [(await manager.get_page(CrawlerRunConfig()))[0] for _ in range(6)]
+        assert _pages(manager) == [2, 2, 2]
+
+        for page in pages[:2]:
+            assert await manager.release_page_with_context(page) is False
+        assert _pages(manager) == [1, 1, 2]
+        assert manager._shards[0].released == pages[:1]
+
+        # The next page goes to a shard with the fewest open pages
+        page, _ = await manager.get_page(CrawlerRunConfig())
+        assert not page.startswith("c-")
+
+    @pytest.mark.asyncio
+    async def test_slow_and_heavy_shards_get_fewer_pages(self):
+        slow = FakeShard("slow", delay=0.05)
+        manager = _manager(slow, FakeShard("fast"))
+        manager._shard_stats[slow]["latency"] = 2.0
+        for _ in range(4):
+            await manager.get_page(CrawlerRunConfig())
+        assert _pages(manager) == [1, 3]
+
+        heavy, light = FakeShard("heavy", rss=900), FakeShard("light", rss=300)
+        manager = _manager(heavy, light)
+        for _ in range(4):
+            await manager.get_page(CrawlerRunConfig())
+        assert _pages(manager) == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_sessions_stick_to_their_shard(self):
+        manager = _manager(FakeShard("a"), FakeShard("b"))
+        config = CrawlerRunConfig(session_id="s1")
+        first, _ = await manager.get_page(config)
+        await manager.get_page(CrawlerRunConfig())
+        again, _ = await manager.get_page(config)
+        assert again == first
+        # A reused session page is counted once
+        assert sorted(_pages(manager)) == [1, 1]
+
+        shard = manager._session_shards["s1"]
+        await manager.kill_session("s1")
+        assert shard.killed == ["s1"]
+        assert manager._shard_stats[shard]["pages"] == 0
+        assert "s1" not in manager._session_shards
+
+    @pytest.mark.asyncio
+    async def test_expired_sessions_are_killed_through_the_parent(self):
+        manager = _manager(FakeShard("a"), FakeShard("b"))
+        manager.session_ttl = 60
+        await manager.get_page(CrawlerRunConfig(session_id="s1"))
+        shard = manager._session_shards["s1"]
+        _, page, _ = shard.sessions["s1"]
+        shard.sessions["s1"] = (None, page, time.time() - 120)
+
+        await manager.get_page(CrawlerRunConfig())
+        await asyncio.sleep(0)
+        assert shard.killed == ["s1"]
+        assert "s1" not in manager._session_shards
+        assert page not in manager._shard_of
+        assert sorted(_pages(manager)) == [0, 1]
+
+    def test_shards_leave_session_expiry_to_the_parent(self):
+        shard = BrowserManager(BrowserConfig())
+        shard.session_ttl = 60
+        shard._expires_sessions = False
+        shard.sessions["s1"] = (None, "page", time.time() - 120)
+        shard._cleanup_expired_sessions()
+        assert "s1" in shard.sessions
+
+    def test_rss_needs_the_driver_pid(self):
+        manager = BrowserManager(BrowserConfig())
+        assert manager._browser_rss_mb() is None
+
+    @pytest.mark.asyncio
+    async def test_close_closes_every_shard(self):
+        closed = []
+
+        class ClosingShard(FakeShard):
+            async def close(self):
+                closed.append(self.name)
+
+        manager = _manager(ClosingShard("a"), ClosingShard("b"))
+        await manager.close()
+        assert sorted(closed) == ["a", "b"]
+        assert manager._shards == [] and manager.browser is None
+
+
+class TestShardStartup:
+    def test_sharding_is_limited_to_launched_browsers(self):
+        assert BrowserManager(BrowserConfig(browser_shards=4))._use_shards()
+        assert not BrowserManager(BrowserConfig())._use_shards()
+        assert not BrowserManager(
+            BrowserConfig(browser_shards=4, cdp_url="http://localhost:9222")
+        )._use_shards()
+
+    @pytest.mark.asyncio
+    async def test_failed_start_closes_started_shards(self, monkeypatch):
+        started, closed = [], []
+
+        async def start(self):
+            if len(started) == 1:
+                raise RuntimeError("launch failed")
+            started.append(self)
+
+        async def close(self):
+            closed.append(self)
+
+        monkeypatch.setattr(BrowserManager, "start", start)
+        monkeypatch.setattr(BrowserManager, "close", close)
+        manager = BrowserManager(BrowserConfig(browser_shards=3))
+        with pytest.raises(RuntimeError):
+            await manager._start_shards()
+        assert len(closed) == 3
+        assert manager._shards == []
@@ -0,0 +1,246 @@
+"""Unit tests for pluggable cache backends.
+
+Covers RedisCacheBackend against an in-memory stand-in for the Redis client, URL claims
+(cross-node locking) for both the Redis and the local sqlite backend, claims renewed
+while held and outliving batched writes, and two crawlers sharing one backend so a page is fetched once. No browser or network required.
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.cache_backend import LocalCacheBackend, RedisCacheBackend
+from crawl4ai.models import AsyncCrawlResponse, CrawlResult, MarkdownGenerationResult
+
+URL = "https://example.com/page"
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis used by RedisCacheBackend, kept in memory"""
+
+    def __init__(self):
+        self.data = {}
+        self.evals = 0
+
+    def _live(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    async def get(self, key):
+        return self._live(key)
+
+    async def mget(self, keys):
+        return [self._live(key) for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and self._live(key) is not None:
+            return None
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        self.data[key] = (value, time.time() + ex if ex else None)
+        return True
+
+    async def delete(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    async def eval(self, script, numkeys, *args):
+        # Only the compare-and-delete/compare-and-pexpire scripts of the claims are supported
+        assert numkeys == 1
+        self.evals += 1
+        key, token, *ttl_ms = args
+        if self._live(key) != token.encode("utf-8"):
+            return 0
+        if "redis.call('pexpire', KEYS[1], ARGV[2])" in script:
+            self.data[key] = (self.data[key][0], time.time() + ttl_ms[0] / 1000)
+            return 1
+        assert "redis.call('del', KEYS[1])" in script
+        return await self.delete(key)
+
+
+class CountingStrategy(AsyncCrawlerStrategy):
+    """Serves a fixed page slowly and counts fetches"""
+
+    def __init__(self):
+        self.fetches = 0
+
+    async def crawl(self, url, **kwargs):
+        self.fetches += 1
+        await asyncio.sleep(0.2)
+        return AsyncCrawlResponse(
+            html=f"<html><body><h1>{url}</h1>{'<p>Some article text.</p>' * 100}</body></html>",
+            response_headers={"etag": '"v1"'},
+            status_code=200,
+        )
+
+
+def _result(url: str = URL) -> CrawlResult:
+    return CrawlResult(
+        url=url,
+        html=f"<html><body>{url}</body></html>",
+        success=True,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=url, markdown_with_citations=url, references_markdown=""
+        ),
+        links={"internal": [{"href": url}], "external": []},
+        response_headers={"ETag": '"abc"'},
+    )
+
+
+@pytest.fixture
+def backend():
+    return RedisCacheBackend(FakeRedis(), lock_poll_interval=0.02, lock_wait_timeout=2)
+
+
+@pytest_asyncio.fixture
+async def local_backend(tmp_path):
+    manager = AsyncDatabaseManager(content_store="files")
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_store.content_paths = {
+        key: str(tmp_path) for key in manager.content_store.content_paths
+    }
+    await manager.ainit_db()
+    await manager.update_db_schema()
+    manager._initialized = True
+    return LocalCacheBackend(manager, lock_urls=True)
+
+
+class TestRedisCacheBackend:
+    @pytest.mark.asyncio
+    async def test_round_trip(self, backend):
+        assert await backend.aget_cached_url(URL) is None
+        await backend.acache_url(_result())
+        cached = await backend.aget_cached_url(URL)
+        assert cached.html == f"<html><body>{URL}</body></html>"
+        assert cached.markdown.raw_markdown == URL
+        assert cached.links["internal"][0]["href"] == URL
+
+    @pytest.mark.asyncio
+    async def test_metadata(self, backend):
+        await backend.acache_url(_result())
+        metadata = await backend.aget_cache_metadata(URL)
+        assert metadata["etag"] == '"abc"'
+        await backend.aupdate_cache_metadata(URL, etag='"def"')
+        metadata = await backend.aget_cache_metadata(URL)
+        assert metadata["etag"] == '"def"'
+        assert metadata["response_headers"] == {"ETag": '"abc"'}
+
+    @pytest.mark.asyncio
+    async def test_bulk_lookup_and_prefetch(self, backend):
+        urls = [f"{URL}/{i}" for i in range(3)]
+        for url in urls[:2]:
+            await backend.acache_url(_result(url))
+        found = await backend.aget_cached_urls(urls)
+        assert set(found) == set(urls[:2])
+
+        async with backend.prefetched(found):
+            assert await backend.aget_cached_url(urls[0]) is found[urls[0]]
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self):
+        backend = RedisCacheBackend(FakeRedis(), ttl=1)
+        await backend.acache_url(_result())
+        for value in backend.client.data.values():
+            assert value[1] is not None
+
+
+class TestUrlClaims:
+    @pytest.mark.asyncio
+    async def test_lock_is_exclusive(self, backend):
+        token = await backend.acquire_lock(URL, 30)
+        assert token
+        assert await backend.acquire_lock(URL, 30) is None
+        await backend.release_lock(URL, "someone-else")
+        assert await backend.acquire_lock(URL, 30) is None
+        await backend.release_lock(URL, token)
+        assert await backend.acquire_lock(URL, 30)
+        assert backend.client.evals == 2
+
+    @pytest.mark.asyncio
+    async def test_waiter_gets_holders_result(self, backend):
+        assert (await backend.aclaim_url(URL))[1]
+
+        async def holder():
+            await asyncio.sleep(0.1)
+            await backend.acache_url(_result())
+
+        asyncio.create_task(holder())
+        cached, token = await backend.aclaim_url(URL)
+        assert token is None
+        assert cached.url == URL
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self, backend):
+        backend.lock_wait_timeout = 0.05
+        await backend.acquire_lock(URL, 30)
+        assert await backend.aclaim_url(URL) == (None, None)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("kind", ["redis", "local"])
+    async def test_claims_are_renewed_until_released(self, kind, backend, local_backend):
+        backend = backend if kind == "redis" else local_backend
+        backend.lock_ttl = 0.3
+        _, token = await backend.aclaim_url(URL)
+        assert token
+        # Held well past lock_ttl (and the 1s minimum of a Redis SET EX)
+        await asyncio.sleep(1.3)
+        assert await backend.acquire_lock(URL, 30) is None
+
+        await backend.release_claim(URL, token)
+        assert backend._claim_renewals == {}
+        assert not await backend.renew_lock(URL, token, 30)
+        assert await backend.acquire_lock(URL, 30)
+
+    @pytest.mark.asyncio
+    async def test_local_claims(self, local_backend):
+        token = await local_backend.acquire_lock(URL, 30)
+        assert token
+        assert await local_backend.acquire_lock(URL, 30) is None
+        await local_backend.release_lock(URL, token)
+        # Expired claims are taken over
+        assert await local_backend.acquire_lock(URL, -1)
+        assert await local_backend.acquire_lock(URL, 30)
+
+    @pytest.mark.asyncio
+    async def test_claim_held_until_batched_row_commits(self, local_backend):
+        crawler = AsyncWebCrawler(crawler_strategy=CountingStrategy(), cache_backend=local_backend)
+        crawler.ready = True
+        config = CrawlerRunConfig(cache_mode=CacheMode.ENABLED, verbose=False)
+        async with local_backend.batch_writes():
+            assert (await crawler.arun(URL, config=config)).success
+            # The row is still queued, so a waiting node must keep waiting
+            assert await local_backend.db_manager.aget_cached_url(URL) is None
+            assert await local_backend.acquire_lock(URL, 30) is None
+        assert await local_backend.aget_cached_url(URL) is not None
+        assert await local_backend.acquire_lock(URL, 30)
+
+    @pytest.mark.asyncio
+    async def test_claim_released_at_once_without_queued_row(self, local_backend):
+        token = await local_backend.acquire_lock(URL, 30)
+        async with local_backend.batch_writes():
+            await local_backend.release_claim(URL, token)
+            assert await local_backend.acquire_lock(URL, 30)
+
+
+class TestSharedCrawl:
+    @pytest.mark.asyncio
+    async def test_two_nodes_fetch_once(self, backend):
+        strategies = [CountingStrategy(), CountingStrategy()]
+        crawlers = []
+        for strategy in strategies:
+            crawler = AsyncWebCrawler(crawler_strategy=strategy, cache_backend=backend)
+            crawler.ready = True
+            crawlers.append(crawler)
+
+        config = CrawlerRunConfig(cache_mode=CacheMode.ENABLED, verbose=False)
+        results = await asyncio.gather(*(crawler.arun(URL, config=config) for crawler in crawlers))
+        assert all(result.success for result in results)
+        assert sum(strategy.fetches for strategy in strategies) == 1
+        assert await backend.acquire_lock(URL, 30)
@@ -0,0 +1,186 @@
+"""Unit tests for batched cache access in arun_many.
+
+Covers bulk lookups (aget_cached_urls), the write-behind batch for acache_url and
+dispatcher-side resolution of cache hits before any browser work, batch by batch
+and with the hits of a batch completed concurrently. The crawler is
+marked ready without starting a browser; only cache hits are exercised.
+No browser or network required.
+"""
+
+import asyncio
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+import crawl4ai.async_webcrawler as async_webcrawler
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.async_dispatcher import MemoryAdaptiveDispatcher
+from crawl4ai.models import CrawlResult, MarkdownGenerationResult
+
+URLS = [f"https://example.com/page-{i}" for i in range(5)]
+
+
+def _result(url: str) -> CrawlResult:
+    return CrawlResult(
+        url=url,
+        html=f"<html><body><p>{url}</p></body></html>",
+        success=True,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=url, markdown_with_citations=url, references_markdown=""
+        ),
+    )
+
+
+async def _row_count(manager) -> int:
+    async with aiosqlite.connect(manager.db_path) as db:
+        async with db.execute("SELECT COUNT(*) FROM crawled_data") as cursor:
+            return (await cursor.fetchone())[0]
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path, monkeypatch):
+    manager = AsyncDatabaseManager(content_store="files")
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_store.content_paths = {
+        key: str(tmp_path) for key in manager.content_store.content_paths
+    }
+    await manager.ainit_db()
+    await manager.update_db_schema()
+    manager._initialized = True
+    monkeypatch.setattr(async_webcrawler, "async_db_manager", manager)
+    return manager
+
+
+class TestBulkLookup:
+    @pytest.mark.asyncio
+    async def test_returns_hits_only(self, manager):
+        for url in URLS[:3]:
+            await manager.acache_url(_result(url))
+        found = await manager.aget_cached_urls(URLS, chunk_size=2)
+        assert set(found) == set(URLS[:3])
+        assert found[URLS[1]].markdown.raw_markdown == URLS[1]
+
+    @pytest.mark.asyncio
+    async def test_projection_applies(self, manager):
+        await manager.acache_url(_result(URLS[0]))
+        found = await manager.aget_cached_urls(URLS[:1], fields={"markdown"})
+        assert "html" in found[URLS[0]]._lazy_fields
+        assert found[URLS[0]].html.startswith("<html>")
+
+    @pytest.mark.asyncio
+    async def test_prefetched_results_are_served_once(self, manager):
+        prefetched = _result(URLS[0])
+        async with manager.prefetched({URLS[0]: prefetched}):
+            assert await manager.aget_cached_url(URLS[0]) is prefetched
+            assert await manager.aget_cached_url(URLS[0]) is None
+
+
+class TestWriteBehind:
+    @pytest.mark.asyncio
+    async def test_rows_flush_in_batches(self, manager):
+        async with manager.batch_writes(batch_size=2) as batch:
+            await manager.acache_url(_result(URLS[0]))
+            assert await _row_count(manager) == 0
+            await manager.acache_url(_result(URLS[1]))
+            assert await _row_count(manager) == 2
+            await manager.acache_url(_result(URLS[2]))
+            # Nested batches reuse the outer one
+            async with manager.batch_writes() as inner:
+                assert inner is batch
+        assert await _row_count(manager) == 3
+        assert batch.written == 3
+
+    @pytest.mark.asyncio
+    async def test_writes_are_immediate_outside_batch(self, manager):
+        await manager.acache_url(_result(URLS[0]))
+        assert await _row_count(manager) == 1
+
+
+class TestResolveCacheHits:
+    @pytest.mark.asyncio
+    async def test_hits_resolved_before_dispatch(self, manager):
+        for url in URLS[:3]:
+            await manager.acache_url(_result(url))
+        crawler = AsyncWebCrawler()
+        crawler.ready = True
+        dispatcher = MemoryAdaptiveDispatcher()
+
+        results, remaining, stale = await dispatcher.resolve_cache_hits(
+            crawler, URLS, CrawlerRunConfig(cache_mode=CacheMode.ENABLED, verbose=False)
+        )
+        assert remaining == URLS[3:]
+        assert stale == []
+        assert sorted(r.url for r in results) == URLS[:3]
+        assert all(r.result.cache_status == "hit" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cache_skipping_configs_are_left_alone(self, manager):
+        for url in URLS:
+            await manager.acache_url(_result(url))
+        crawler = AsyncWebCrawler()
+        crawler.ready = True
+        dispatcher = MemoryAdaptiveDispatcher()
+
+        for config in (
+            CrawlerRunConfig(cache_mode=CacheMode.BYPASS),
+            CrawlerRunConfig(cache_mode=CacheMode.ENABLED, screenshot=True),
+        ):
+            results, remaining, stale = await dispatcher.resolve_cache_hits(crawler, URLS, config)
+            assert results == []
+            assert remaining == URLS
+
+    @pytest.mark.asyncio
+    async def test_arun_many_all_cached(self, manager):
+        for url in URLS:
+            await manager.acache_url(_result(url))
+        crawler = AsyncWebCrawler()
+        crawler.ready = True
+
+        results = await crawler.arun_many(
+            URLS, config=CrawlerRunConfig(cache_mode=CacheMode.ENABLED, verbose=False)
+        )
+        assert sorted(r.url for r in results) == URLS
+        assert all(r.success for r in results)
+
+    @pytest.mark.asyncio
+    async def test_list_is_resolved_in_batches_with_concurrent_hits(self, manager, monkeypatch):
+        urls = [f"https://example.com/many-{i}" for i in range(40)]
+        for url in urls:
+            await manager.acache_url(_result(url))
+        crawler = AsyncWebCrawler()
+        crawler.ready = True
+
+        lookups = []
+        lookup = manager.aget_cached_urls
+
+        async def counting_lookup(batch, **kwargs):
+            lookups.append(len(batch))
+            return await lookup(batch, **kwargs)
+
+        monkeypatch.setattr(manager, "aget_cached_urls", counting_lookup)
+        running, peak = [0], [0]
+        arun = crawler.arun
+
+        async def slow_arun(url, config=None, **kwargs):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            try:
+                await asyncio.sleep(0.01)
+                return await arun(url, config=config, **kwargs)
+            finally:
+                running[0] -= 1
+
+        crawler.arun = slow_arun
+        config = CrawlerRunConfig(cache_mode=CacheMode.ENABLED, verbose=False)
+        items = [
+            item
+            async for item in MemoryAdaptiveDispatcher().resolve_cache_hits_stream(
+                crawler, urls, config, {}
+            )
+        ]
+        assert lookups == [16, 24]
+        assert peak[0] > 1
+        assert sorted(item.url for item in items) == sorted(urls)
+        assert all(item.result.cache_status == "hit" for item in items)
@@ -0,0 +1,184 @@
+"""Unit tests for CachePolicy enforcement in AsyncDatabaseManager.
+
+Covers TTL expiry (on read and by the sweep), LRU/LFU eviction, per-domain quotas, size
+limits, content garbage collection with streamed live keys and the background eviction
+task. No browser or network required.
+"""
+
+import asyncio
+import os
+import time
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.cache_context import CachePolicy, EvictionStrategy
+from crawl4ai.content_store import FileContentStore
+from crawl4ai.models import CrawlResult, MarkdownGenerationResult
+from crawl4ai.utils import ensure_content_dirs, generate_content_hash
+
+
+def _result(url: str, body: str = None) -> CrawlResult:
+    body = body or url
+    return CrawlResult(
+        url=url,
+        html=f"<html><body>{body}</body></html>",
+        success=True,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=body, markdown_with_citations=body, references_markdown=""
+        ),
+    )
+
+
+async def _urls(manager):
+    async with aiosqlite.connect(manager.db_path) as db:
+        async with db.execute("SELECT url FROM crawled_data ORDER BY url") as cursor:
+            return [url for (url,) in await cursor.fetchall()]
+
+
+async def _age(manager, ages):
+    """Set cached_at/last_accessed to now - age for each url"""
+    now = time.time()
+    async with aiosqlite.connect(manager.db_path) as db:
+        await db.executemany(
+            "UPDATE crawled_data SET cached_at = ?, last_accessed = ? WHERE url = ?",
+            [(now - age, now - age, url) for url, age in ages.items()],
+        )
+        await db.commit()
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path):
+    manager = AsyncDatabaseManager(
+        content_store=FileContentStore(ensure_content_dirs(str(tmp_path))), content_gc_grace_period=0
+    )
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    await manager.ainit_db()
+    await manager.update_db_schema()
+    manager._initialized = True
+    yield manager
+    manager.set_cache_policy(None)
+
+
+URLS = [f"https://a.com/{i}" for i in range(5)]
+
+
+class TestCachePolicy:
+    def test_domain_quota_lookup(self):
+        assert CachePolicy(domain_max_entries=3).domain_quota("x.com") == 3
+        policy = CachePolicy(domain_max_entries={"big.com": 10, "*": 2})
+        assert policy.domain_quota("big.com") == 10
+        assert policy.domain_quota("small.com") == 2
+        assert CachePolicy(domain_max_entries={"big.com": 10}).domain_quota("x.com") is None
+        assert CachePolicy(eviction="lfu").eviction is EvictionStrategy.LFU
+        with pytest.raises(ValueError):
+            CachePolicy(low_watermark=0)
+
+
+class TestEnforcement:
+    @pytest.mark.asyncio
+    async def test_ttl_expires_old_entries(self, manager):
+        for url in URLS[:2]:
+            await manager.acache_url(_result(url))
+        await _age(manager, {URLS[0]: 7200})
+        stats = await manager.aenforce_cache_policy(CachePolicy(ttl=3600))
+        assert stats["expired"] == 1
+        assert await _urls(manager) == [URLS[1]]
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_not_served_before_the_sweep(self, manager):
+        manager.set_cache_policy(CachePolicy(ttl=3600, eviction_interval=3600))
+        for url in URLS[:2]:
+            await manager.acache_url(_result(url))
+        await _age(manager, {URLS[0]: 7200})
+        assert await manager.aget_cached_url(URLS[0]) is None
+        assert set(await manager.aget_cached_urls(URLS[:2])) == {URLS[1]}
+        # Still in the table until the sweep runs
+        assert await _urls(manager) == URLS[:2]
+
+    @pytest.mark.asyncio
+    async def test_lru_keeps_recently_read(self, manager):
+        manager.set_cache_policy(CachePolicy(max_entries=3, low_watermark=1.0, eviction_interval=3600))
+        for url in URLS:
+            await manager.acache_url(_result(url))
+        await _age(manager, {url: 100 - i for i, url in enumerate(URLS)})
+        await manager.aget_cached_url(URLS[0])
+        await manager.aget_cached_url(URLS[1])
+
+        stats = await manager.aenforce_cache_policy()
+        assert stats["evicted"] == 2
+        assert await _urls(manager) == [URLS[0], URLS[1], URLS[4]]
+
+    @pytest.mark.asyncio
+    async def test_lfu_keeps_frequently_read(self, manager):
+        manager.set_cache_policy(
+            CachePolicy(max_entries=2, low_watermark=1.0, eviction="lfu", eviction_interval=3600)
+        )
+        for url in URLS[:3]:
+            await manager.acache_url(_result(url))
+        for _ in range(3):
+            await manager.aget_cached_url(URLS[0])
+        await manager.aget_cached_url(URLS[2])
+        await manager.aget_cached_url(URLS[2])
+        await manager.aget_cached_url(URLS[1])
+        await manager.aenforce_cache_policy()
+        assert await _urls(manager) == [URLS[0], URLS[2]]
+
+    @pytest.mark.asyncio
+    async def test_domain_quotas(self, manager):
+        urls = [f"https://big.com/{i}" for i in range(4)] + [f"https://small.com/{i}" for i in range(3)]
+        for url in urls:
+            await manager.acache_url(_result(url))
+        await _age(manager, {url: 100 - i for i, url in enumerate(urls)})
+        stats = await manager.aenforce_cache_policy(
+            CachePolicy(domain_max_entries={"big.com": 3, "*": 1})
+        )
+        assert stats["domain_evicted"] == 3
+        assert await _urls(manager) == urls[1:4] + urls[6:]
+
+    @pytest.mark.asyncio
+    async def test_max_bytes_and_content_gc(self, manager, tmp_path):
+        await manager.acache_url(_result(URLS[0], "x" * 5000))
+        await manager.acache_url(_result(URLS[1], "small"))
+        await _age(manager, {URLS[0]: 100, URLS[1]: 1})
+        big_html = generate_content_hash("<html><body>" + "x" * 5000 + "</body></html>")
+        assert os.path.exists(tmp_path / "html_content" / big_html)
+
+        stats = await manager.aenforce_cache_policy(CachePolicy(max_bytes=2000))
+        assert stats["evicted"] == 1
+        assert stats["content"]["files_removed"] >= 2
+        assert await _urls(manager) == [URLS[1]]
+        assert not os.path.exists(tmp_path / "html_content" / big_html)
+        assert (await manager.aget_cached_url(URLS[1])).html == "<html><body>small</body></html>"
+
+    @pytest.mark.asyncio
+    async def test_gc_keeps_content_of_queued_rows(self, manager):
+        async with manager.batch_writes(batch_size=10):
+            await manager.acache_url(_result(URLS[0]))
+            await manager.acompact_content()
+        assert (await manager.aget_cached_url(URLS[0])).html == f"<html><body>{URLS[0]}</body></html>"
+
+    @pytest.mark.asyncio
+    async def test_live_keys_are_streamed_in_pages(self, manager):
+        for url in URLS:
+            await manager.acache_url(_result(url))
+        keys = [key async for key in manager._iter_live_content_keys(page_size=2)]
+        expected = {
+            (generate_content_hash(f"<html><body>{url}</body></html>"), "html") for url in URLS
+        }
+        assert expected <= set(keys)
+        assert len(keys) == len(set(keys))
+
+        stats = await manager.acompact_content()
+        assert stats["files_removed"] == 0
+        assert (await manager.aget_cached_url(URLS[4])).html == f"<html><body>{URLS[4]}</body></html>"
+
+    @pytest.mark.asyncio
+    async def test_background_eviction(self, manager):
+        manager.set_cache_policy(CachePolicy(max_entries=2, low_watermark=1.0, eviction_interval=0.05))
+        for url in URLS:
+            await manager.acache_url(_result(url))
+        await asyncio.sleep(0.3)
+        assert len(await _urls(manager)) == 2
@@ -0,0 +1,145 @@
+"""Unit tests for field-selective cache reads.
+
+aget_cached_url(url, fields=...) loads only the requested fields; the other content
+blobs and JSON fields are read on first attribute access (or in a worker thread with
+aload_lazy_fields), and blobs missing from the content store surface as cache misses.
+No browser or network required.
+"""
+
+import pickle
+
+import pytest
+import pytest_asyncio
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.content_store import MissingContentError, PackedContentStore
+from crawl4ai.models import CrawlResult, MarkdownGenerationResult
+
+URL = "https://example.com/"
+
+
+class CountingStore(PackedContentStore):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.sync_reads = []
+
+    def get_many_sync(self, keys):
+        self.sync_reads.extend(content_type for _, content_type in keys)
+        return super().get_many_sync(keys)
+
+    def forget(self, content_type):
+        self._index.execute("DELETE FROM content_index WHERE content_type = ?", (content_type,))
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path):
+    store = CountingStore(str(tmp_path / "packs"))
+    manager = AsyncDatabaseManager(content_store=store)
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    await manager.ainit_db()
+    await manager.update_db_schema()
+    manager._initialized = True
+    await manager.acache_url(
+        CrawlResult(
+            url=URL,
+            html="<html><body><p>Hello</p></body></html>",
+            success=True,
+            cleaned_html="<p>Hello</p>",
+            markdown=MarkdownGenerationResult(
+                raw_markdown="Hello", markdown_with_citations="Hello", references_markdown=""
+            ),
+            links={"internal": [{"href": "https://example.com/a"}], "external": []},
+            metadata={"title": "Example"},
+            screenshot="c2NyZWVuc2hvdA==",
+        )
+    )
+    yield manager
+    store.close()
+
+
+class TestFieldSelectiveReads:
+    @pytest.mark.asyncio
+    async def test_only_requested_fields_are_loaded(self, manager):
+        result = await manager.aget_cached_url(URL, fields={"markdown", "links"})
+        assert set(result._lazy_fields) == {
+            "html", "cleaned_html", "extracted_content", "screenshot", "media", "metadata"
+        }
+        assert result.markdown.raw_markdown == "Hello"
+        assert result.links["internal"][0]["href"] == "https://example.com/a"
+        assert manager.content_store.sync_reads == []
+
+    @pytest.mark.asyncio
+    async def test_lazy_fields_load_on_access(self, manager):
+        result = await manager.aget_cached_url(URL, fields={"markdown"})
+        assert result.screenshot == "c2NyZWVuc2hvdA=="
+        assert result.metadata == {"title": "Example"}
+        assert result.cleaned_html == "<p>Hello</p>"
+        assert manager.content_store.sync_reads == ["screenshots", "cleaned"]
+        # Loaded once, then served from the model
+        assert result.screenshot == "c2NyZWVuc2hvdA=="
+        assert manager.content_store.sync_reads == ["screenshots", "cleaned"]
+
+    @pytest.mark.asyncio
+    async def test_full_read_by_default(self, manager):
+        result = await manager.aget_cached_url(URL)
+        assert result._lazy_fields == {}
+        assert result.html == "<html><body><p>Hello</p></body></html>"
+
+    @pytest.mark.asyncio
+    async def test_dump_and_pickle_resolve_lazy_fields(self, manager):
+        result = await manager.aget_cached_url(URL, fields={"html"})
+        assert "screenshot" not in result.model_dump(exclude={"screenshot"})
+        assert "screenshot" in result._lazy_fields
+
+        dumped = result.model_dump()
+        assert dumped["screenshot"] == "c2NyZWVuc2hvdA=="
+        assert dumped["markdown"]["raw_markdown"] == "Hello"
+
+        lazy = await manager.aget_cached_url(URL, fields={"html"})
+        restored = pickle.loads(pickle.dumps(lazy))
+        assert restored.metadata == {"title": "Example"}
+        assert restored._lazy_fields == {}
+
+    @pytest.mark.asyncio
+    async def test_assignment_overrides_pending_load(self, manager):
+        result = await manager.aget_cached_url(URL, fields={"html"})
+        result.screenshot = None
+        assert result.screenshot is None
+        assert "screenshots" not in manager.content_store.sync_reads
+
+
+    @pytest.mark.asyncio
+    async def test_async_load_resolves_fields_off_loop(self, manager):
+        result = await manager.aget_cached_url(URL, fields={"markdown"})
+        await result.aload_lazy_fields(["screenshot", "cleaned_html"])
+        assert sorted(manager.content_store.sync_reads) == ["cleaned", "screenshots"]
+        assert "screenshot" not in result._lazy_fields
+        assert result.cleaned_html == "<p>Hello</p>"
+        assert len(manager.content_store.sync_reads) == 2
+
+
+class TestMissingContent:
+    @pytest.mark.asyncio
+    async def test_missing_lazy_blob_raises(self, manager):
+        manager.content_store.forget("screenshots")
+        result = await manager.aget_cached_url(URL, fields={"html"})
+        with pytest.raises(MissingContentError):
+            result.screenshot
+        # The field stays pending rather than turning into an empty value
+        assert "screenshot" in result._lazy_fields
+        assert result.cleaned_html == "<p>Hello</p>"
+
+    @pytest.mark.asyncio
+    async def test_missing_eager_blob_is_a_cache_miss(self, manager):
+        manager.content_store.forget("html")
+        assert await manager.aget_cached_url(URL, fields={"html"}) is None
+        assert await manager.aget_cached_urls([URL]) == {}
+        assert await manager.aget_cached_url(URL, fields={"markdown"}) is not None
+
+
+class TestArunCacheFields:
+    def test_screenshot_only_when_requested(self):
+        assert "screenshot" not in AsyncWebCrawler._cache_read_fields(CrawlerRunConfig())
+        assert "screenshot" in AsyncWebCrawler._cache_read_fields(CrawlerRunConfig(screenshot=True))
+        assert {"html", "markdown"} <= AsyncWebCrawler._cache_read_fields(CrawlerRunConfig())
@@ -0,0 +1,162 @@
+"""Unit tests for batched cache revalidation.
+
+Covers CacheValidator.validate_many (pooled client, per-host limits) and arun_many with
+check_cache_freshness revalidating all cached URLs before dispatching the stale ones.
+HTTP is served by an httpx.MockTransport. No browser or network required.
+"""
+
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+import pytest_asyncio
+
+import crawl4ai.async_webcrawler as async_webcrawler
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.cache_validator import CacheValidationResult, CacheValidator
+from crawl4ai.models import AsyncCrawlResponse, CrawlResult, MarkdownGenerationResult
+
+FRESH = [f"https://fresh.com/{i}" for i in range(2)]
+STALE = [f"https://stale.com/{i}" for i in range(2)]
+
+
+def _result(url: str) -> CrawlResult:
+    return CrawlResult(
+        url=url,
+        html=f"<html><body><p>{url}</p></body></html>",
+        success=True,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=url, markdown_with_citations=url, references_markdown=""
+        ),
+        response_headers={"etag": '"v1"'},
+    )
+
+
+class ConditionalServer:
+    """Answers 304 for fresh.com and 200 with a new etag elsewhere; records concurrency"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = Counter()
+        self.in_flight = Counter()
+        self.peak = Counter()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.requests[host] += 1
+        self.in_flight[host] += 1
+        self.peak[host] = max(self.peak[host], self.in_flight[host])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight[host] -= 1
+        if host == "fresh.com" and request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"etag": '"v2"'})
+
+
+class CountingStrategy(AsyncCrawlerStrategy):
+    def __init__(self):
+        self.fetched = []
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def crawl(self, url, **kwargs):
+        self.fetched.append(url)
+        return AsyncCrawlResponse(
+            html=f"<html><body><h1>{url}</h1>{'<p>Some article text.</p>' * 100}</body></html>",
+            response_headers={"etag": '"v2"'},
+            status_code=200,
+        )
+
+
+def _validator(server: ConditionalServer, **kwargs) -> CacheValidator:
+    validator = CacheValidator(**kwargs)
+    validator._client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+    return validator
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path, monkeypatch):
+    manager = AsyncDatabaseManager(content_store="files")
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_store.content_paths = {
+        key: str(tmp_path) for key in manager.content_store.content_paths
+    }
+    await manager.ainit_db()
+    await manager.update_db_schema()
+    manager._initialized = True
+    monkeypatch.setattr(async_webcrawler, "async_db_manager", manager)
+    for url in FRESH + STALE:
+        await manager.acache_url(_result(url))
+    return manager
+
+
+class TestValidateMany:
+    @pytest.mark.asyncio
+    async def test_statuses(self):
+        server = ConditionalServer()
+        validator = _validator(server)
+        results = await validator.validate_many(
+            {url: {"etag": '"v1"'} for url in FRESH + STALE}
+        )
+        assert {results[url].status for url in FRESH} == {CacheValidationResult.FRESH}
+        assert {results[url].status for url in STALE} == {CacheValidationResult.STALE}
+        assert results[STALE[0]].new_etag == '"v2"'
+        await validator.close()
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        server = ConditionalServer(delay=0.02)
+        validator = _validator(server, max_per_host=2)
+        urls = [f"https://fresh.com/{i}" for i in range(10)] + [f"https://other.com/{i}" for i in range(4)]
+        await validator.validate_many({url: {"etag": '"v1"'} for url in urls})
+        assert server.requests == {"fresh.com": 10, "other.com": 4}
+        assert server.peak["fresh.com"] == 2
+        assert server.peak["other.com"] == 2
+        await validator.close()
+
+
+class TestBatchedRevalidation:
+    @pytest.mark.asyncio
+    async def test_only_stale_urls_are_crawled(self, manager):
+        server = ConditionalServer()
+        strategy = CountingStrategy()
+        crawler = AsyncWebCrawler(crawler_strategy=strategy)
+        crawler.ready = True
+        crawler._cache_validator = _validator(server)
+
+        config = CrawlerRunConfig(
+            cache_mode=CacheMode.ENABLED, check_cache_freshness=True, verbose=False
+        )
+        results = await crawler.arun_many(FRESH + STALE, config=config)
+
+        by_url = {result.url: result for result in results}
+        assert {by_url[url].cache_status for url in FRESH} == {"hit_validated"}
+        assert sorted(strategy.fetched) == STALE
+        # One conditional request per URL; stale ones are not checked again in arun
+        assert server.requests == {"fresh.com": 2, "stale.com": 2}
+        assert (await manager.aget_cache_metadata(STALE[0]))["etag"] == '"v2"'
+        await crawler._cache_validator.close()
+
+    @pytest.mark.asyncio
+    async def test_arun_uses_shared_validator(self, manager):
+        server = ConditionalServer()
+        crawler = AsyncWebCrawler(crawler_strategy=CountingStrategy())
+        crawler.ready = True
+        validator = _validator(server)
+        crawler._cache_validator = validator
+
+        config = CrawlerRunConfig(
+            cache_mode=CacheMode.ENABLED, check_cache_freshness=True, verbose=False
+        )
+        for url in FRESH:
+            result = await crawler.arun(url, config=config)
+            assert result.cache_status == "hit_validated"
+        assert crawler.cache_validator is validator
+        await crawler.close()
+        assert crawler._cache_validator is None
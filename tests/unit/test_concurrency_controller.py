@@ -0,0 +1,108 @@
+"""Unit tests for the AIMD concurrency controller.
+
+Covers ConcurrencyController reacting to latency, errors, timeouts, event-loop
+lag and memory, its slot limiter, and MemoryAdaptiveDispatcher growing its session
+limit and reporting it to CrawlerMonitor. No browser or network required.
+"""
+
+import asyncio
+
+import pytest
+
+from crawl4ai import CrawlerMonitor, CrawlerRunConfig
+from crawl4ai.async_dispatcher import ConcurrencyController, MemoryAdaptiveDispatcher
+from crawl4ai.models import CrawlResult
+
+
+class FakeCrawler:
+    def __init__(self, duration: float = 0.01):
+        self.duration = duration
+        self.running = 0
+        self.peak = 0
+
+    async def arun(self, url, config=None, session_id=None):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.running -= 1
+        return CrawlResult(url=url, html="<html></html>", success=True, status_code=200)
+
+
+class TestConcurrencyController:
+    def test_additive_increase(self):
+        controller = ConcurrencyController(min_limit=1, max_limit=5, initial_limit=2)
+        for _ in range(4):
+            controller.record(1.0)
+        assert controller.limit == 3
+        for _ in range(100):
+            controller.record(1.0)
+        assert controller.limit == 5
+
+    def test_timeout_decreases_once_per_cooldown(self):
+        controller = ConcurrencyController(max_limit=20, initial_limit=10, cooldown=60)
+        controller.record(1.0, success=False, timed_out=True)
+        assert controller.limit == 7
+        controller.record(1.0, success=False, timed_out=True)
+        assert controller.limit == 7
+
+    def test_latency_and_error_rate(self):
+        controller = ConcurrencyController(max_limit=20, initial_limit=10, cooldown=0)
+        for _ in range(5):
+            controller.record(1.0)
+        limit = controller.limit
+        for _ in range(3):
+            controller.record(10.0)
+        assert controller.limit < limit
+
+        controller = ConcurrencyController(max_limit=20, initial_limit=10, cooldown=0, window=10)
+        for success in [True, False] * 5:
+            controller.record(1.0, success=success)
+        assert controller.limit < 10
+
+    def test_loop_lag_and_memory(self):
+        controller = ConcurrencyController(max_limit=20, initial_limit=10, cooldown=0)
+        controller.observe(loop_lag=0.01, memory_percent=50)
+        assert controller.limit == 10
+        controller.observe(loop_lag=1.0)
+        assert controller.limit == 7
+        controller.observe(loop_lag=0.0, memory_percent=95)
+        assert controller.limit == 4
+        # No growth while memory stays high
+        controller.record(1.0)
+        assert controller.limit <= 4
+
+    @pytest.mark.asyncio
+    async def test_slot_follows_limit(self):
+        controller = ConcurrencyController(min_limit=2, max_limit=2)
+        crawler = FakeCrawler()
+
+        async def crawl():
+            async with controller.slot():
+                await crawler.arun("https://a.com/")
+
+        await asyncio.gather(*(crawl() for _ in range(8)))
+        assert crawler.peak == 2
+
+
+class TestAdaptiveDispatch:
+    @pytest.mark.asyncio
+    async def test_limit_grows_and_is_reported(self):
+        controller = ConcurrencyController(min_limit=1, max_limit=8, cooldown=0)
+        monitor = CrawlerMonitor(enable_ui=False)
+        dispatcher = MemoryAdaptiveDispatcher(
+            memory_threshold_percent=100.0,
+            critical_threshold_percent=100.0,
+            max_session_permit=6,
+            concurrency_controller=controller,
+            monitor=monitor,
+        )
+        crawler = FakeCrawler()
+        urls = [f"https://site{i}.com/" for i in range(60)]
+        results = await dispatcher.run_urls(urls, crawler, CrawlerRunConfig())
+
+        assert len(results) == 60
+        assert 1 < crawler.peak <= 6
+        assert controller.limit == 8
+        assert monitor.get_summary()["concurrency_limit"] == 8
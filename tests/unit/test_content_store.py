@@ -0,0 +1,310 @@
+"""Unit tests for the crawl cache content stores.
+
+Covers the packed segment store (round trips, dedup, single-read rows, compaction,
+several processes sharing one store, other processes waiting for a compaction and
+its grace period), orphan removal in the file store, AsyncDatabaseManager wired to a packed store and the
+migration from the one-file-per-blob layout. No browser or network required.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import aiosqlite
+import pytest
+
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.content_store import FileContentStore, PackedContentStore
+from crawl4ai.migrations import migrate_to_packed_store
+from crawl4ai.models import CrawlResult, MarkdownGenerationResult
+from crawl4ai.utils import ensure_content_dirs, generate_content_hash
+
+HTML = "<html><body>" + "<p>Some repeated paragraph text.</p>" * 200 + "</body></html>"
+
+
+def _markdown(text):
+    return MarkdownGenerationResult(raw_markdown=text, markdown_with_citations=text, references_markdown="")
+
+
+def _segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".pack"))
+
+
+def _write_blobs(directory, writer, count):
+    """Append `count` blobs from a separate process, one put_many call each."""
+    store = PackedContentStore(directory, compression="none", max_segment_size=4096)
+    hashes = [store._put_many([(f"{writer}-{i} " * 40, "html")])[0] for i in range(count)]
+    store.close()
+    return hashes
+
+
+def _put_blob(directory, content):
+    """Store one blob from a separate process."""
+    store = PackedContentStore(directory, compression="none")
+    try:
+        return store._put_many([(content, "html")])[0]
+    finally:
+        store.close()
+
+
+async def _manager(tmp_path, store) -> AsyncDatabaseManager:
+    manager = AsyncDatabaseManager(content_store=store, content_gc_grace_period=0)
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    await manager.ainit_db()
+    await manager.update_db_schema()
+    manager._initialized = True
+    return manager
+
+
+class TestPackedContentStore:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("compression", ["none", "zlib", "auto"])
+    async def test_round_trip(self, tmp_path, compression):
+        store = PackedContentStore(str(tmp_path), compression=compression)
+        hashes = await store.put_many([(HTML, "html"), ("", "markdown"), ("# Title", "markdown")])
+        assert hashes == [generate_content_hash(HTML), "", generate_content_hash("# Title")]
+        assert await store.get_many([(hashes[0], "html"), ("", "markdown"), (hashes[2], "markdown")]) == [
+            HTML, None, "# Title"
+        ]
+        assert await store.get("missing", "html") is None
+        if compression != "none":
+            assert os.path.getsize(tmp_path / _segments(tmp_path)[0]) < len(HTML)
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_dedup_and_screenshot_alias(self, tmp_path):
+        store = PackedContentStore(str(tmp_path))
+        first = await store.put("base64data", "screenshots")
+        size = os.path.getsize(tmp_path / _segments(tmp_path)[0])
+        assert await store.put("base64data", "screenshots") == first
+        assert os.path.getsize(tmp_path / _segments(tmp_path)[0]) == size
+        assert await store.get(first, "screenshot") == "base64data"
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_row_is_read_with_one_read(self, tmp_path, monkeypatch):
+        store = PackedContentStore(str(tmp_path))
+        items = [(HTML, "html"), ("clean", "cleaned"), ("# md", "markdown")]
+        hashes = await store.put_many(items)
+
+        spans = []
+        original = PackedContentStore._coalesce
+
+        def recording_coalesce(entries):
+            spans.extend(original(entries))
+            return spans
+
+        monkeypatch.setattr(PackedContentStore, "_coalesce", staticmethod(recording_coalesce))
+        contents = await store.get_many([(h, t) for h, (_, t) in zip(hashes, items)])
+        assert contents == [c for c, _ in items]
+        assert len(spans) == 1
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_survives_reopen_and_rolls_segments(self, tmp_path):
+        store = PackedContentStore(str(tmp_path), compression="none", max_segment_size=512)
+        hashes = [await store.put(f"{i}" * 800, "html") for i in range(3)]
+        store.close()
+        assert len(_segments(tmp_path)) == 3
+
+        reopened = PackedContentStore(str(tmp_path), compression="none", max_segment_size=512)
+        assert await reopened.get_many([(h, "html") for h in hashes]) == [f"{i}" * 800 for i in range(3)]
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_compact_drops_dead_entries(self, tmp_path):
+        store = PackedContentStore(str(tmp_path), compression="none")
+        keep = await store.put("keep me " * 100, "markdown")
+        drop = await store.put("drop me " * 100, "markdown")
+
+        stats = await store.compact(live_keys={(keep, "markdown")})
+        assert stats["entries_dropped"] == 1
+        assert stats["segments_rewritten"] == 1
+        assert stats["bytes_after"] < stats["bytes_before"]
+        assert await store.get(keep, "markdown") == "keep me " * 100
+        assert await store.get(drop, "markdown") is None
+
+        # Appends keep working after the active segment was rewritten
+        again = await store.put("new content", "markdown")
+        assert await store.get(again, "markdown") == "new content"
+        assert store.stats()["entries"] == 2
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_processes_share_one_store(self, tmp_path):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            futures = {
+                writer: executor.submit(_write_blobs, str(tmp_path), writer, 150)
+                for writer in ("a", "b")
+            }
+            hashes = {writer: future.result() for writer, future in futures.items()}
+
+        store = PackedContentStore(str(tmp_path), compression="none", max_segment_size=4096)
+        for writer, writer_hashes in hashes.items():
+            contents = await store.get_many([(h, "html") for h in writer_hashes])
+            assert contents == [f"{writer}-{i} " * 40 for i in range(150)]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_writer_follows_compaction_by_another_store(self, tmp_path):
+        writer = PackedContentStore(str(tmp_path), compression="none")
+        compactor = PackedContentStore(str(tmp_path), compression="none")
+        keep = await writer.put("keep me " * 100, "markdown")
+        await writer.put("drop me " * 100, "markdown")
+
+        # The compactor rewrites the segment the writer still has open
+        stats = await compactor.compact(live_keys={(keep, "markdown")})
+        assert stats["segments_rewritten"] == 1
+        added = await writer.put("added later " * 50, "markdown")
+        compactor.close()
+        writer.close()
+
+        reopened = PackedContentStore(str(tmp_path), compression="none")
+        assert await reopened.get(keep, "markdown") == "keep me " * 100
+        assert await reopened.get(added, "markdown") == "added later " * 50
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_other_processes_wait_for_the_live_key_scan(self, tmp_path):
+        store = PackedContentStore(str(tmp_path), compression="none")
+        keep = await store.put("keep me " * 100, "html")
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            executor.submit(os.getpid).result()  # worker is up before the scan starts
+            late = None
+
+            async def live_keys():
+                nonlocal late
+                late = executor.submit(_put_blob, str(tmp_path), "late " * 100)
+                await asyncio.sleep(0.5)
+                # The other process can't store blobs the snapshot would miss
+                assert not late.done()
+                yield keep, "html"
+
+            stats = await store.compact(live_keys=live_keys())
+            late_hash = late.result(timeout=10)
+        assert stats["entries_dropped"] == 0
+        assert await store.get_many([(keep, "html"), (late_hash, "html")]) == [
+            "keep me " * 100, "late " * 100
+        ]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_grace_period_keeps_blobs_of_uncommitted_rows(self, tmp_path):
+        # Another process stored a blob for a row it has not committed yet
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            executor.submit(_put_blob, str(tmp_path), "pending row " * 100).result()
+
+        store = PackedContentStore(str(tmp_path), compression="none")
+        assert (await store.compact(live_keys=set(), grace_period=60))["entries_dropped"] == 0
+
+        # Storing a blob again restarts its grace period
+        store._index.execute("UPDATE content_index SET stored_at = 0")
+        await store.put("pending row " * 100, "html")
+        assert (await store.compact(live_keys=set(), grace_period=60))["entries_dropped"] == 0
+        assert (await store.compact(live_keys=set()))["entries_dropped"] == 1
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_compact_streams_live_keys(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("crawl4ai.content_store._LIVE_KEY_BATCH", 2)
+        store = PackedContentStore(str(tmp_path), compression="none")
+        hashes = [await store.put(f"blob {i} " * 100, "markdown") for i in range(5)]
+
+        async def live_keys():
+            for content_hash in hashes[:3]:
+                yield content_hash, "markdown"
+
+        stats = await store.compact(live_keys=live_keys())
+        assert stats["entries_dropped"] == 2
+        assert await store.get_many([(h, "markdown") for h in hashes]) == [
+            f"blob {i} " * 100 for i in range(3)
+        ] + [None, None]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_compact_leaves_dense_segments_alone(self, tmp_path):
+        store = PackedContentStore(str(tmp_path))
+        await store.put(HTML, "html")
+        before = _segments(tmp_path)
+        stats = await store.compact()
+        assert stats["segments_rewritten"] == 0
+        assert _segments(tmp_path) == before
+        store.close()
+
+    def test_rejects_unknown_compression(self, tmp_path):
+        with pytest.raises(ValueError):
+            PackedContentStore(str(tmp_path), compression="lz4")
+
+
+class TestFileContentStore:
+    @pytest.mark.asyncio
+    async def test_compact_removes_orphans(self, tmp_path):
+        store = FileContentStore(ensure_content_dirs(str(tmp_path)))
+        live = await store.put("live", "markdown")
+        orphan = await store.put("orphan", "markdown")
+        stats = await store.compact(live_keys={(live, "markdown")})
+        assert stats["files_removed"] == 1
+        assert await store.get(live, "markdown") == "live"
+        assert not os.path.exists(tmp_path / "markdown_content" / orphan)
+
+    @pytest.mark.asyncio
+    async def test_compact_keeps_recently_stored_orphans(self, tmp_path):
+        store = FileContentStore(ensure_content_dirs(str(tmp_path)))
+        orphan = await store.put("orphan", "markdown")
+        path = tmp_path / "markdown_content" / orphan
+        assert (await store.compact(live_keys=set(), grace_period=60))["files_removed"] == 0
+
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        await store.put("orphan", "markdown")
+        assert (await store.compact(live_keys=set(), grace_period=60))["files_removed"] == 0
+        os.utime(path, (old, old))
+        assert (await store.compact(live_keys=set(), grace_period=60))["files_removed"] == 1
+
+
+class TestDatabaseWithPackedStore:
+    @pytest.mark.asyncio
+    async def test_cache_round_trip_and_compaction(self, tmp_path):
+        store = PackedContentStore(str(tmp_path / "packs"))
+        manager = await _manager(tmp_path, store)
+
+        url = "https://example.com/"
+        await manager.acache_url(
+            CrawlResult(url=url, html=HTML, success=True, cleaned_html="<p>clean</p>",
+                        markdown=_markdown("# Example"), screenshot="c2NyZWVu")
+        )
+        cached = await manager.aget_cached_url(url)
+        assert cached.html == HTML
+        assert cached.cleaned_html == "<p>clean</p>"
+        assert cached.markdown.raw_markdown == "# Example"
+        assert cached.screenshot == "c2NyZWVu"
+
+        # Overwriting the entry leaves the old html unreferenced
+        await manager.acache_url(CrawlResult(url=url, html="<p>v2</p>", success=True, markdown=_markdown("v2")))
+        stats = await manager.acompact_content()
+        assert stats["entries_dropped"] == 4
+        assert (await manager.aget_cached_url(url)).html == "<p>v2</p>"
+        store.close()
+
+
+class TestPackedMigration:
+    @pytest.mark.asyncio
+    async def test_migrates_file_layout(self, tmp_path):
+        files = FileContentStore(ensure_content_dirs(str(tmp_path)))
+        manager = await _manager(tmp_path, files)
+        url = "https://example.com/"
+        await manager.acache_url(CrawlResult(url=url, html=HTML, success=True, markdown=_markdown("# Hi")))
+
+        assert await migrate_to_packed_store(manager.db_path, remove_files=True) == 1
+        assert not os.path.exists(tmp_path / "html_content")
+
+        packed = PackedContentStore(str(tmp_path / "content_packs"))
+        manager.content_store = packed
+        cached = await manager.aget_cached_url(url)
+        assert cached.html == HTML
+        assert cached.markdown.raw_markdown == "# Hi"
+        async with aiosqlite.connect(manager.db_path) as db:
+            async with db.execute("SELECT html FROM crawled_data") as cursor:
+                assert (await cursor.fetchone())[0] == generate_content_hash(HTML)
+        packed.close()
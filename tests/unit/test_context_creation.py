@@ -0,0 +1,192 @@
+"""Unit tests for single-flight context creation in BrowserManager.
+
+Covers concurrent requests for a new signature sharing one creation, existing
+contexts staying available while another one is being set up, failures and
+cancellations of the creating request, contexts created across a browser
+version bump being cleaned up, and pre-creating contexts for a batch of
+configs, including from AsyncWebCrawler.arun_many. No browser or network
+required.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, SemaphoreDispatcher
+from crawl4ai.browser_manager import BrowserManager
+
+
+class FakeContext:
+    def __init__(self, locale):
+        self.locale = locale
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def _manager(gate: asyncio.Event = None, fail: int = 0):
+    manager = BrowserManager(BrowserConfig())
+    manager.created = []
+    failures = [fail]
+
+    async def create_browser_context(config=None):
+        if gate is not None:
+            await gate.wait()
+        if failures[0]:
+            failures[0] -= 1
+            raise RuntimeError("proxy auth failed")
+        manager.created.append(config.locale)
+        return FakeContext(config.locale)
+
+    async def setup_context(context, config=None, is_default=False):
+        await asyncio.sleep(0)
+
+    manager.create_browser_context = create_browser_context
+    manager.setup_context = setup_context
+    return manager
+
+
+async def _acquire(manager, locale=None):
+    config = CrawlerRunConfig(locale=locale)
+    return await manager._acquire_context(config, manager._make_config_signature(config))
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_creation(self):
+        manager = _manager()
+        contexts = await asyncio.gather(*(_acquire(manager, "en-US") for _ in range(5)))
+        assert manager.created == ["en-US"]
+        assert all(context is contexts[0] for context in contexts)
+        (sig,) = manager.contexts_by_config
+        assert manager._context_refcounts[sig] == 5
+        assert manager._context_creations == {}
+
+    @pytest.mark.asyncio
+    async def test_slow_setup_does_not_block_other_signatures(self):
+        gate = asyncio.Event()
+        manager = _manager(gate)
+        gate.set()
+        existing = await _acquire(manager, "de-DE")
+        gate.clear()
+
+        slow = asyncio.create_task(_acquire(manager, "fr-FR"))
+        await asyncio.sleep(0.01)
+        assert await asyncio.wait_for(_acquire(manager, "de-DE"), timeout=0.5) is existing
+        assert not slow.done()
+        gate.set()
+        assert (await slow).locale == "fr-FR"
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_waiters_and_next_call_retries(self):
+        gate = asyncio.Event()
+        manager = _manager(gate, fail=1)
+        tasks = [asyncio.create_task(_acquire(manager, "en-US")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        gate.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert manager.contexts_by_config == {}
+
+        assert (await _acquire(manager, "en-US")).locale == "en-US"
+
+    @pytest.mark.asyncio
+    async def test_waiter_takes_over_when_creator_is_cancelled(self):
+        gate = asyncio.Event()
+        manager = _manager(gate)
+        creator = asyncio.create_task(_acquire(manager, "en-US"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(_acquire(manager, "en-US"))
+        await asyncio.sleep(0.01)
+        creator.cancel()
+        await asyncio.sleep(0.01)
+        gate.set()
+        assert (await waiter).locale == "en-US"
+        assert manager.created == ["en-US"]
+        (sig,) = manager.contexts_by_config
+        assert manager._context_refcounts[sig] == 1
+
+
+class TestVersionBump:
+    @pytest.mark.asyncio
+    async def test_context_created_during_bump_is_cleaned_up(self):
+        gate = asyncio.Event()
+        manager = _manager(gate)
+        manager.config.max_pages_before_recycle = 1
+        creating = asyncio.create_task(_acquire(manager, "en-US"))
+        await asyncio.sleep(0.01)
+
+        manager._pages_served = 1
+        await manager._maybe_bump_browser_version()
+        gate.set()
+        context = await creating
+        (sig,) = manager.contexts_by_config
+        assert sig in manager._pending_cleanup
+
+        manager._context_refcounts[sig] = 0
+        await manager._maybe_cleanup_old_browser(sig)
+        assert context.closed
+        assert manager.contexts_by_config == {} and manager._pending_cleanup == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_creation_during_bump_leaves_nothing_pending(self):
+        gate = asyncio.Event()
+        manager = _manager(gate, fail=1)
+        manager.config.max_pages_before_recycle = 1
+        creating = asyncio.create_task(_acquire(manager, "en-US"))
+        await asyncio.sleep(0.01)
+
+        manager._pages_served = 1
+        await manager._maybe_bump_browser_version()
+        gate.set()
+        with pytest.raises(RuntimeError):
+            await creating
+        assert manager._pending_cleanup == {}
+
+
+class TestPrecreate:
+    @pytest.mark.asyncio
+    async def test_precreate_contexts_for_a_batch(self):
+        manager = _manager()
+        configs = [
+            CrawlerRunConfig(locale="en-US"),
+            CrawlerRunConfig(locale="en-US", css_selector="main"),
+            CrawlerRunConfig(locale="fr-FR"),
+        ]
+        assert await manager.precreate_contexts(configs) == 2
+        assert sorted(manager.created) == ["en-US", "fr-FR"]
+        assert set(manager._context_refcounts.values()) == {0}
+
+        await _acquire(manager, "fr-FR")
+        assert sorted(manager.created) == ["en-US", "fr-FR"]
+
+    @pytest.mark.asyncio
+    async def test_shared_default_context_is_not_precreated(self):
+        manager = BrowserManager(BrowserConfig(use_managed_browser=True))
+        assert await manager.precreate_contexts([CrawlerRunConfig()]) == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_is_capped_at_max_contexts(self):
+        manager = _manager()
+        manager._max_contexts = 2
+        configs = [CrawlerRunConfig(locale=locale) for locale in ("en-US", "fr-FR", "de-DE")]
+        assert await manager.precreate_contexts(configs) == 2
+        assert manager.created == ["en-US", "fr-FR"]
+
+    @pytest.mark.asyncio
+    async def test_crawler_precreates_the_configs_its_urls_use(self):
+        manager = _manager()
+        manager.browser = object()
+        crawler = SimpleNamespace(
+            crawler_strategy=SimpleNamespace(browser_manager=manager), logger=None
+        )
+        configs = [
+            CrawlerRunConfig(locale="en-US", url_matcher="*.pdf"),
+            CrawlerRunConfig(locale="fr-FR", url_matcher="*/fr/*"),
+            CrawlerRunConfig(locale="de-DE", url_matcher="*/de/*"),
+        ]
+        urls = ["https://a.com/fr/1", "https://a.com/fr/2", "https://a.com/doc.pdf"]
+        await AsyncWebCrawler._precreate_contexts(crawler, SemaphoreDispatcher(), urls, configs)
+        assert sorted(manager.created) == ["en-US", "fr-FR"]
@@ -0,0 +1,107 @@
+"""Unit tests for context templates used by BrowserManager.setup_context.
+
+Covers the init scripts being built once per set of setup inputs, the final
+headers and init scripts a template captures, headers and cookies following
+per-crawl user agent changes, and setup_context applying the template with a
+single batched cookie injection. No browser or network required.
+"""
+
+import pytest
+
+import crawl4ai.browser_manager as browser_manager
+from crawl4ai import BrowserConfig, CrawlerRunConfig
+from crawl4ai.browser_manager import SHADOW_DOM_INIT_SCRIPT, BrowserManager, ContextTemplate
+
+
+class FakeContext:
+    def __init__(self):
+        self.calls = []
+
+    async def set_extra_http_headers(self, headers):
+        self.calls.append(("headers", headers))
+
+    async def add_cookies(self, cookies):
+        self.calls.append(("cookies", cookies))
+
+    async def add_init_script(self, script):
+        self.calls.append(("script", script))
+
+
+COOKIE = {"name": "session", "value": "1", "url": "https://example.com"}
+
+
+class TestContextTemplate:
+    def test_build_merges_headers_and_orders_scripts(self):
+        config = BrowserConfig(
+            user_agent="agent/1.0", headers={"X-Team": "crawl"}, init_scripts=["window.a = 1;"]
+        )
+        template = ContextTemplate.build(config, navigator_overrides=True, shadow_dom=True)
+        assert template.headers["User-Agent"] == "agent/1.0"
+        assert template.headers["X-Team"] == "crawl"
+        assert "sec-ch-ua" in template.headers
+        assert template.init_scripts[1:] == (SHADOW_DOM_INIT_SCRIPT, "window.a = 1;")
+        assert "navigator" in template.init_scripts[0]
+
+    def test_scripts_are_built_once_per_setup_inputs(self, monkeypatch):
+        loads = []
+        load = browser_manager.load_js_script
+        monkeypatch.setattr(
+            browser_manager, "load_js_script", lambda name: loads.append(name) or load(name)
+        )
+        manager = BrowserManager(BrowserConfig())
+        magic = [CrawlerRunConfig(magic=True, locale=f"l{i}") for i in range(3)]
+        scripts = {id(manager._context_template(config).init_scripts) for config in magic}
+        assert len(scripts) == 1
+        assert loads == ["navigator_overrider"]
+        assert (
+            manager._context_template(CrawlerRunConfig()).init_scripts
+            != manager._context_template(magic[0]).init_scripts
+        )
+
+    def test_template_follows_browser_config_changes(self):
+        # _crawl_web updates the shared BrowserConfig per crawl (magic / random user agents)
+        browser_config = BrowserConfig(user_agent="agent/1.0")
+        manager = BrowserManager(browser_config)
+        first = manager._context_template(CrawlerRunConfig(magic=True))
+
+        browser_config.user_agent = "agent/2.0"
+        browser_config.browser_hint = '"Agent";v="2"'
+        browser_config.headers["sec-ch-ua"] = browser_config.browser_hint
+        browser_config.cookies = [COOKIE]
+        browser_config.init_scripts = ["window.c = 3;"]
+        second = manager._context_template(CrawlerRunConfig(magic=True))
+
+        assert first.headers["User-Agent"] == "agent/1.0"
+        assert second.headers["User-Agent"] == "agent/2.0"
+        assert second.headers["sec-ch-ua"] == '"Agent";v="2"'
+        assert second.cookies == (COOKIE,)
+        assert second.init_scripts[-1] == "window.c = 3;"
+        assert second.init_scripts[:-1] == first.init_scripts
+
+
+class TestSetupContext:
+    @pytest.mark.asyncio
+    async def test_setup_applies_template_with_one_cookie_batch(self):
+        manager = BrowserManager(
+            BrowserConfig(cookies=[COOKIE], init_scripts=["window.b = 2;"])
+        )
+        context = FakeContext()
+        config = CrawlerRunConfig(url="https://example.com/page", override_navigator=True)
+        await manager.setup_context(context, config)
+
+        cookie_calls = [args for kind, args in context.calls if kind == "cookies"]
+        assert cookie_calls == [
+            [COOKIE, {"name": "cookiesEnabled", "value": "true", "url": "https://example.com/page"}]
+        ]
+        assert len([c for c in context.calls if c[0] == "headers"]) == 1
+        scripts = [args for kind, args in context.calls if kind == "script"]
+        assert scripts[-1] == "window.b = 2;" and len(scripts) == 2
+        assert context._crawl4ai_nav_overrider_injected is True
+        assert not hasattr(context, "_crawl4ai_shadow_dom_injected")
+
+    @pytest.mark.asyncio
+    async def test_raw_urls_get_no_default_cookie(self):
+        manager = BrowserManager(BrowserConfig())
+        context = FakeContext()
+        await manager.setup_context(context, CrawlerRunConfig(url="raw:<html></html>"))
+        assert all(kind != "cookies" for kind, _ in context.calls)
@@ -0,0 +1,81 @@
+"""Unit tests for the event-driven scheduling loop of MemoryAdaptiveDispatcher.
+
+Covers slots being refilled as soon as a crawl finishes, the loop sleeping while
+every slot is busy, and event-loop utilisation being reported to CrawlerMonitor.
+No browser or network required.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from crawl4ai import CrawlerMonitor, CrawlerRunConfig
+from crawl4ai.async_dispatcher import MemoryAdaptiveDispatcher
+from crawl4ai.models import CrawlResult
+
+
+class FakeCrawler:
+    def __init__(self, duration: float = 0.0, busy: float = 0.0):
+        self.duration = duration
+        self.busy = busy
+        self.started = []
+
+    async def arun(self, url, config=None, session_id=None):
+        self.started.append(time.monotonic())
+        await asyncio.sleep(self.duration)
+        # Hold the event loop, as parsing a page would
+        deadline = time.perf_counter() + self.busy
+        while time.perf_counter() < deadline:
+            pass
+        return CrawlResult(url=url, html="<html></html>", success=True, status_code=200)
+
+
+def _dispatcher(**kwargs) -> MemoryAdaptiveDispatcher:
+    return MemoryAdaptiveDispatcher(
+        memory_threshold_percent=100.0, critical_threshold_percent=100.0, **kwargs
+    )
+
+
+class TestDispatchLoop:
+    @pytest.mark.asyncio
+    async def test_slot_is_refilled_on_completion(self):
+        crawler = FakeCrawler(duration=0.02)
+        dispatcher = _dispatcher(max_session_permit=1)
+        urls = [f"https://site{i}.com/" for i in range(10)]
+        results = await dispatcher.run_urls(urls, crawler, CrawlerRunConfig())
+
+        assert len(results) == 10
+        gaps = [b - a for a, b in zip(crawler.started, crawler.started[1:])]
+        assert max(gaps) < 0.02 + 0.05
+
+    @pytest.mark.asyncio
+    async def test_loop_sleeps_while_slots_are_busy(self, monkeypatch):
+        dispatcher = _dispatcher(max_session_permit=4)
+        passes = 0
+        update = dispatcher._update_queue_priorities
+
+        async def counting_update():
+            nonlocal passes
+            passes += 1
+            await update()
+
+        monkeypatch.setattr(dispatcher, "_update_queue_priorities", counting_update)
+        urls = [f"https://site{i}.com/" for i in range(8)]
+        results = await dispatcher.run_urls(urls, FakeCrawler(duration=0.5), CrawlerRunConfig())
+
+        assert len(results) == 8
+        # About one pass per completion, not one per polling tick
+        assert passes <= 20
+
+    @pytest.mark.asyncio
+    async def test_loop_utilization_is_reported(self):
+        monitor = CrawlerMonitor(enable_ui=False)
+        dispatcher = _dispatcher(max_session_permit=2, check_interval=0.05, monitor=monitor)
+        urls = [f"https://site{i}.com/" for i in range(20)]
+        await dispatcher.run_urls(urls, FakeCrawler(duration=0.01, busy=0.03), CrawlerRunConfig())
+
+        assert 0.1 < dispatcher.loop_utilization <= 1.0
+        summary = monitor.get_summary()
+        assert summary["loop_utilization"] is not None
+        assert summary["loop_lag"] >= 0
@@ -0,0 +1,182 @@
+"""Unit tests for DistributedDispatcher and the sqlite work queue.
+
+Covers leases expiring and moving to another worker, tasks failing after
+max_attempts, result payloads surviving the queue, and a coordinator fanning a
+URL stream out over several workers. No browser or network required.
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.async_dispatcher import DistributedDispatcher
+from crawl4ai.models import CrawlerTaskResult, CrawlResult
+from crawl4ai.work_queue import SQLiteWorkQueue, decode_task_result, encode_task_result
+
+
+class FakeCrawler:
+    def __init__(self):
+        self.crawled = []
+
+    async def arun(self, url, config=None, session_id=None):
+        await asyncio.sleep(0.01)
+        self.crawled.append(url)
+        return CrawlResult(url=url, html="<html></html>", success=True, status_code=200)
+
+
+@pytest_asyncio.fixture
+async def queue_path(tmp_path):
+    return str(tmp_path / "work.db")
+
+
+@pytest_asyncio.fixture
+async def queue(queue_path):
+    queue = SQLiteWorkQueue(queue_path)
+    yield queue
+    await queue.close()
+
+
+def _task_result(task_id: str, url: str, **kwargs) -> CrawlerTaskResult:
+    return CrawlerTaskResult(
+        task_id=task_id,
+        url=url,
+        result=CrawlResult(url=url, html="<html></html>", success=True, **kwargs),
+        memory_usage=1.5,
+        peak_memory=2.0,
+        start_time=time.time(),
+        end_time=time.time(),
+    )
+
+
+class TestSQLiteWorkQueue:
+    @pytest.mark.asyncio
+    async def test_expired_lease_moves_to_another_worker(self, queue):
+        await queue.create_job("job", "{}")
+        await queue.push("job", [(f"t{i}", f"https://a.com/{i}") for i in range(3)])
+
+        first = await queue.lease("w1", 2, visibility_timeout=0.1)
+        second = await queue.lease("w2", 5, visibility_timeout=10)
+        assert [lease.task_id for lease in first] == ["t0", "t1"]
+        assert [lease.task_id for lease in second] == ["t2"]
+
+        # w1 keeps t0 alive, t1 runs out
+        await asyncio.sleep(0.05)
+        await queue.extend("w1", first[:1], visibility_timeout=10)
+        await asyncio.sleep(0.1)
+        taken = await queue.lease("w2", 5, visibility_timeout=10)
+        assert [(lease.task_id, lease.attempts) for lease in taken] == [("t1", 2)]
+
+        assert await queue.complete("w2", taken[0], b"late") is True
+        assert await queue.complete("w1", first[1], b"stale") is False
+        rows = await queue.results("job")
+        assert [payload for _, payload in rows] == [b"late"]
+        assert await queue.results("job", rows[-1][0]) == []
+
+    @pytest.mark.asyncio
+    async def test_exhausted_attempts_publish_a_failure(self, queue):
+        await queue.create_job("job", "{}")
+        await queue.push("job", [("t0", "https://a.com/")])
+        for _ in range(2):
+            assert await queue.lease("w", 1, visibility_timeout=0, max_attempts=2)
+            await asyncio.sleep(0.01)
+        assert await queue.lease("w", 1, visibility_timeout=0, max_attempts=2) == []
+
+        (_, payload), = await queue.results("job")
+        task_result = decode_task_result(payload)
+        assert task_result.task_id == "t0"
+        assert not task_result.success
+        assert "expired 2 times" in task_result.error_message
+
+    @pytest.mark.asyncio
+    async def test_delete_job(self, queue):
+        await queue.create_job("job", '{"a": 1}')
+        assert await queue.job_config("job") == '{"a": 1}'
+        await queue.push("job", [("t0", "https://a.com/")])
+        await queue.delete_job("job")
+        assert await queue.job_config("job") is None
+        assert await queue.lease("w", 1, visibility_timeout=10) == []
+
+    def test_payload_round_trip(self):
+        task_result = _task_result(
+            "t", "https://a.com/doc.pdf", pdf=b"%PDF-\xff\x00", response_headers={"a": "b"}
+        )
+        decoded = decode_task_result(encode_task_result(task_result))
+        assert decoded.result.pdf == b"%PDF-\xff\x00"
+        assert decoded.result.response_headers == {"a": "b"}
+        assert decoded.peak_memory == 2.0
+        assert decoded.start_time == task_result.start_time
+
+
+class TestDistributedDispatch:
+    @pytest.mark.asyncio
+    async def test_job_fans_out_over_workers(self, queue, queue_path):
+        crawlers = [FakeCrawler(), FakeCrawler()]
+        worker_queues = [SQLiteWorkQueue(queue_path) for _ in crawlers]
+        workers = [
+            asyncio.create_task(
+                DistributedDispatcher(q, max_concurrency=3, poll_interval=0.02).serve(crawler)
+            )
+            for q, crawler in zip(worker_queues, crawlers)
+        ]
+
+        async def source():
+            for i in range(40):
+                yield f"https://site{i}.com/"
+
+        dispatcher = DistributedDispatcher(
+            queue, job_id="job", poll_interval=0.02, push_batch_size=8, max_pending=10
+        )
+        try:
+            results = [
+                result
+                async for result in dispatcher.run_urls_stream(
+                    source(), crawler=None, config=CrawlerRunConfig()
+                )
+            ]
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for q in worker_queues:
+                await q.close()
+
+        assert sorted(r.url for r in results) == sorted(f"https://site{i}.com/" for i in range(40))
+        assert all(r.success for r in results)
+        assert all(crawler.crawled for crawler in crawlers)
+        assert sum(len(crawler.crawled) for crawler in crawlers) == 40
+        # The coordinator cleans the job up
+        assert await queue.job_config("job") is None
+
+    @pytest.mark.asyncio
+    async def test_tasks_of_a_dead_worker_are_retried(self, queue, queue_path):
+        dispatcher = DistributedDispatcher(
+            queue, job_id="job", visibility_timeout=0.2, poll_interval=0.02
+        )
+        urls = [f"https://a.com/{i}" for i in range(4)]
+        collect = asyncio.create_task(dispatcher.run_urls(urls, None, CrawlerRunConfig()))
+
+        # A worker leases everything and dies without renewing its leases
+        dead = SQLiteWorkQueue(queue_path)
+        leased = []
+        while len(leased) < 4:
+            leased += await dead.lease("dead", 4, visibility_timeout=0.2)
+            await asyncio.sleep(0.01)
+        await dead.close()
+
+        worker_queue = SQLiteWorkQueue(queue_path)
+        crawler = FakeCrawler()
+        worker = DistributedDispatcher(worker_queue, visibility_timeout=0.2, poll_interval=0.02)
+        serving = asyncio.create_task(worker.serve(crawler))
+        try:
+            results = await asyncio.wait_for(collect, timeout=5)
+        finally:
+            serving.cancel()
+            await asyncio.gather(serving, return_exceptions=True)
+            await worker_queue.close()
+
+        assert sorted(r.url for r in results) == urls
+        assert all(r.retry_count == 1 for r in results)
+        assert sorted(crawler.crawled) == urls
@@ -0,0 +1,137 @@
+"""Unit tests for the domain-aware task queue of MemoryAdaptiveDispatcher.
+
+Covers DomainScheduler handing out only URLs whose domain the rate limiter allows,
+and run_urls keeping slots busy with other domains while one domain is backed off.
+No browser or network required.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.async_dispatcher import DomainScheduler, MemoryAdaptiveDispatcher, RateLimiter
+from crawl4ai.models import CrawlResult
+
+
+def _entry(url: str, priority: float = 0):
+    return (priority, (url, url, 0, time.time()))
+
+
+class FakeCrawler:
+    """Records when each URL starts; every crawl takes `duration` seconds"""
+
+    def __init__(self, duration: float = 0.01):
+        self.duration = duration
+        self.started = {}
+
+    async def arun(self, url, config=None, session_id=None):
+        self.started[url] = time.monotonic()
+        await asyncio.sleep(self.duration)
+        return CrawlResult(url=url, html="<html></html>", success=True, status_code=200)
+
+
+class TestDomainScheduler:
+    @pytest.mark.asyncio
+    async def test_only_eligible_domains_are_handed_out(self):
+        scheduler = DomainScheduler(RateLimiter(base_delay=(10, 10)))
+        for url in ["https://a.com/1", "https://a.com/2", "https://b.com/1"]:
+            await scheduler.put(_entry(url))
+
+        assert (await scheduler.get_nowait())[1][0] == "https://a.com/1"
+        assert (await scheduler.get_nowait())[1][0] == "https://b.com/1"
+        with pytest.raises(asyncio.QueueEmpty):
+            await scheduler.get_nowait()
+        assert len(scheduler) == 1
+        assert 9 < scheduler.next_ready_in() <= 10
+
+    @pytest.mark.asyncio
+    async def test_delay_growth_is_respected(self):
+        limiter = RateLimiter(base_delay=(0, 0))
+        scheduler = DomainScheduler(limiter)
+        await scheduler.put(_entry("https://a.com/1"))
+        await scheduler.put(_entry("https://a.com/2"))
+        await scheduler.get_nowait()
+        limiter.domains["a.com"].current_delay = 10
+        with pytest.raises(asyncio.QueueEmpty):
+            await scheduler.get_nowait()
+
+    @pytest.mark.asyncio
+    async def test_priority_order_without_rate_limiter(self):
+        scheduler = DomainScheduler()
+        await scheduler.put(_entry("https://a.com/1", priority=2))
+        await scheduler.put(_entry("https://a.com/2", priority=1))
+        await scheduler.put(_entry("https://b.com/1", priority=0))
+        await scheduler.put(_entry("https://a.com/3", priority=-1))
+        order = [(await scheduler.get_nowait())[1][0] for _ in range(4)]
+        assert order == ["https://a.com/3", "https://b.com/1", "https://a.com/2", "https://a.com/1"]
+        assert scheduler.empty()
+        assert scheduler.next_ready_in() is None
+
+    @pytest.mark.asyncio
+    async def test_aged_tasks_jump_ahead(self):
+        scheduler = DomainScheduler(fairness_timeout=60)
+        now = time.time()
+        await scheduler.put((0, ("https://a.com/new", "new", 0, now)))
+        await scheduler.put((2, ("https://a.com/old", "old", 2, now - 120)))
+        await scheduler.put((1, ("https://b.com/older", "older", 1, now - 300)))
+        assert (await scheduler.get_nowait())[1][1] == "new"
+
+        await scheduler.put((0, ("https://a.com/new", "new", 0, now)))
+        assert scheduler.promote_aged() == 2
+        assert scheduler.promote_aged() == 0
+        priority, item = await scheduler.get_nowait()
+        assert item[1] == "older" and priority <= -300
+        assert (await scheduler.get_nowait())[1][1] == "old"
+        assert (await scheduler.get_nowait())[1][1] == "new"
+
+    @pytest.mark.asyncio
+    async def test_queue_statistics(self):
+        scheduler = DomainScheduler(fairness_timeout=60)
+        now = time.time()
+        for i, age in enumerate([10, 100, 30]):
+            await scheduler.put((0, (f"https://a.com/{i}", str(i), 0, now - age)))
+        assert scheduler.oldest_enqueue_time() == now - 100
+        scheduler.promote_aged()
+        assert scheduler.oldest_enqueue_time() == now - 100
+        assert scheduler.average_enqueue_time() == pytest.approx(now - 140 / 3)
+        assert (await scheduler.get_nowait())[1][1] == "1"
+        assert scheduler.oldest_enqueue_time() == now - 30
+        assert sorted(item[1] for _, item in scheduler.items()) == ["0", "2"]
+
+    @pytest.mark.asyncio
+    async def test_aging_touches_only_crossing_tasks(self):
+        scheduler = DomainScheduler(fairness_timeout=60)
+        now = time.time()
+        for i in range(50_000):
+            await scheduler.put((0, (f"https://site{i % 100}.com/{i}", str(i), 0, now)))
+        start = time.perf_counter()
+        for _ in range(1000):
+            scheduler.promote_aged()
+        assert time.perf_counter() - start < 0.5
+
+
+class TestDomainAwareDispatch:
+    @pytest.mark.asyncio
+    async def test_backed_off_domain_does_not_hold_slots(self):
+        delay = 0.3
+        dispatcher = MemoryAdaptiveDispatcher(
+            memory_threshold_percent=100.0,
+            critical_threshold_percent=100.0,
+            max_session_permit=2,
+            rate_limiter=RateLimiter(base_delay=(delay, delay)),
+        )
+        crawler = FakeCrawler()
+        slow = [f"https://slow.com/{i}" for i in range(3)]
+        others = [f"https://site{i}.com/" for i in range(6)]
+
+        start = time.monotonic()
+        results = await dispatcher.run_urls(slow + others, crawler, config=CrawlerRunConfig())
+
+        assert {result.url for result in results} == set(slow + others)
+        assert all(result.result.success for result in results)
+        # Every other domain is crawled before slow.com becomes eligible again
+        assert max(crawler.started[url] for url in others) - start < delay
+        starts = sorted(crawler.started[url] for url in slow)
+        assert all(b - a >= delay * 0.9 for a, b in zip(starts, starts[1:]))
@@ -0,0 +1,88 @@
+"""Unit tests for demand-driven fit_html computation.
+
+fit_html is only built during aprocess_html when the markdown generator or the
+extraction strategy reads it; otherwise CrawlResult.fit_html computes it on first access.
+model_dump emits the memoised value and computes it only when fit_html is included.
+No browser or network required.
+"""
+
+import pytest
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, DefaultMarkdownGenerator
+from crawl4ai.config import FIT_HTML_MAX_SIZE, FIT_HTML_TEXT_THRESHOLD
+from crawl4ai.extraction_strategy import RegexExtractionStrategy
+from crawl4ai.models import CrawlResult
+from crawl4ai.utils import preprocess_html_for_schema
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Contact</title><script>track()</script></head>
+<body>
+  <h1>Contact us</h1>
+  <p class="lead" onclick="x()">Mail hello@example.com for anything at all.</p>
+</body>
+</html>"""
+
+
+async def _process(config: CrawlerRunConfig) -> CrawlResult:
+    return await AsyncWebCrawler().aprocess_html(
+        url="https://example.com/contact",
+        html=PAGE,
+        extracted_content=None,
+        config=config,
+        screenshot_data=None,
+        pdf_data=None,
+        verbose=False,
+    )
+
+
+def _expected_fit_html():
+    return preprocess_html_for_schema(
+        PAGE, text_threshold=FIT_HTML_TEXT_THRESHOLD, max_size=FIT_HTML_MAX_SIZE
+    )
+
+
+@pytest.mark.asyncio
+async def test_fit_html_skipped_for_markdown_only_runs():
+    result = await _process(CrawlerRunConfig(verbose=False))
+    assert result._fit_html is None
+    # Still available on demand, and memoized
+    assert result.fit_html == _expected_fit_html()
+    assert result._fit_html is not None
+
+
+@pytest.mark.asyncio
+async def test_fit_html_built_when_markdown_reads_it():
+    config = CrawlerRunConfig(
+        markdown_generator=DefaultMarkdownGenerator(content_source="fit_html"),
+        verbose=False,
+    )
+    result = await _process(config)
+    assert result._fit_html is not None
+    assert "Contact us" in result.markdown.raw_markdown
+
+
+@pytest.mark.asyncio
+async def test_fit_html_built_when_extraction_reads_it():
+    strategy = RegexExtractionStrategy(pattern=RegexExtractionStrategy.Email)
+    assert strategy.input_format == "fit_html"
+    result = await _process(CrawlerRunConfig(extraction_strategy=strategy, verbose=False))
+    assert result._fit_html is not None
+    assert "hello@example.com" in result.extracted_content
+
+
+def test_crawl_result_fit_html_field_behaviour():
+    explicit = CrawlResult(url="u", html=PAGE, success=True, fit_html="<p>given</p>")
+    assert explicit.fit_html == "<p>given</p>"
+
+    empty = CrawlResult(url="u", html="", success=False)
+    assert empty.fit_html is None
+
+    lazy = CrawlResult(url="u", html=PAGE, success=True)
+    assert "fit_html" not in lazy.model_dump(exclude={"fit_html"})
+    assert lazy._fit_html is None
+    # Dumping doesn't compute it unless it is asked for explicitly
+    assert lazy.model_dump()["fit_html"] is None
+    assert lazy._fit_html is None
+    assert lazy.model_dump(include={"url", "fit_html"})["fit_html"] == _expected_fit_html()
+    assert lazy.model_dump()["fit_html"] == _expected_fit_html()
@@ -0,0 +1,107 @@
+"""Unit tests for the dispatchers' memory accounting.
+
+Covers MemoryAccountant sampling RSS at most once per interval, splitting RSS growth
+between running crawls, charging result payloads without loading lazy cached
+fields, keeping per-domain estimates,
+and the estimates reaching CrawlerTaskResult. No browser or network required.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.async_dispatcher import MemoryAccountant, MemoryAdaptiveDispatcher
+from crawl4ai.models import CrawlResult
+
+MB = 1024 * 1024
+
+
+class FakeProcess:
+    def __init__(self, rss_mb: float):
+        self.rss_mb = rss_mb
+        self.reads = 0
+
+    def memory_info(self):
+        self.reads += 1
+        return SimpleNamespace(rss=int(self.rss_mb * MB))
+
+
+def _accountant(rss_mb: float = 100, **kwargs):
+    accountant = MemoryAccountant(**kwargs)
+    accountant._process = FakeProcess(rss_mb)
+    return accountant
+
+
+def _result(url: str, size_mb: float = 0) -> CrawlResult:
+    return CrawlResult(url=url, html="x" * int(size_mb * MB), success=True, status_code=200)
+
+
+class TestMemoryAccountant:
+    def test_growth_is_split_between_running_tasks(self):
+        accountant = _accountant(rss_mb=100, sample_interval=0)
+        accountant.task_started("a")
+        accountant.task_started("b")
+        accountant._process.rss_mb = 300
+        accountant.sample()
+        assert accountant.page_share_mb == pytest.approx(100)
+
+        usage, peak = accountant.task_finished("a", "https://a.com/1", _result("https://a.com/1", 1))
+        # Sampled once more on finish: 200 MB over two tasks, then the payload
+        assert usage == pytest.approx(101)
+        assert peak == pytest.approx(101)
+        assert accountant.active_tasks == 1
+
+    def test_rss_is_read_once_per_interval(self):
+        accountant = _accountant(sample_interval=60)
+        for i in range(100):
+            accountant.task_started(str(i))
+            accountant.task_finished(str(i), f"https://a.com/{i}", _result("https://a.com/"))
+        assert accountant._process.reads == 1
+
+    def test_domain_estimates(self):
+        accountant = _accountant(sample_interval=60, smoothing=0.5)
+        assert accountant.domain_estimate("https://a.com/") is None
+        for size in (2, 4):
+            accountant.task_started("t")
+            accountant.task_finished("t", "https://www.a.com/page", _result("https://a.com/", size))
+        assert accountant.domain_estimate("https://a.com/other") == pytest.approx(3)
+        assert list(accountant.domain_estimates()) == ["a.com"]
+
+    def test_lazy_fields_are_not_loaded_for_sizing(self):
+        result = CrawlResult(url="https://a.com/", html="", cleaned_html="x" * 10, success=True)
+
+        def missing():
+            raise AssertionError("loader ran")
+
+        result.set_lazy_field("html", missing)
+        assert MemoryAccountant.result_size(result) == 10
+        assert "html" in result._lazy_fields
+
+    def test_untracked_task_is_not_counted(self):
+        accountant = _accountant()
+        assert accountant.task_finished("missing", "https://a.com/") == (0.0, 0.0)
+        assert accountant.domain_estimates() == {}
+
+
+class TestDispatcherAccounting:
+    @pytest.mark.asyncio
+    async def test_estimates_reach_task_results(self):
+        class FakeCrawler:
+            async def arun(self, url, config=None, session_id=None):
+                await asyncio.sleep(0)
+                return _result(url, 2)
+
+        accountant = _accountant(sample_interval=60)
+        dispatcher = MemoryAdaptiveDispatcher(
+            memory_threshold_percent=100.0,
+            critical_threshold_percent=100.0,
+            memory_accountant=accountant,
+        )
+        urls = [f"https://a.com/{i}" for i in range(5)]
+        results = await dispatcher.run_urls(urls, FakeCrawler(), CrawlerRunConfig())
+
+        assert all(r.memory_usage == pytest.approx(2) for r in results)
+        assert all(r.domain_memory == pytest.approx(2) for r in results)
+        assert accountant._process.reads == 1
@@ -0,0 +1,182 @@
+"""Unit tests for content fingerprints and near-duplicate detection.
+
+Covers compute_simhash, the fingerprint band index behind
+AsyncDatabaseManager.afind_near_duplicates, arun with skip_near_duplicates, inline
+and with a processing_executor, and the cache stubs of near duplicates. No browser or
+network required.
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pytest_asyncio
+
+import crawl4ai.async_webcrawler as async_webcrawler
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.extraction_strategy import ExtractionStrategy
+from crawl4ai.models import AsyncCrawlResponse, CrawlResult, MarkdownGenerationResult
+from crawl4ai.utils import compute_simhash, simhash_distance
+
+_rng = random.Random(7)
+_VOCAB = [f"word{i}" for i in range(2000)]
+ARTICLE = " ".join(_rng.choice(_VOCAB) for _ in range(800))
+OTHER_ARTICLE = " ".join(_rng.choice(_VOCAB) for _ in range(800))
+
+
+def _result(url: str, text: str) -> CrawlResult:
+    return CrawlResult(
+        url=url,
+        html=f"<html><body><p>{text}</p></body></html>",
+        success=True,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=text, markdown_with_citations=text, references_markdown=""
+        ),
+        content_fingerprint=compute_simhash(text),
+    )
+
+
+class MirrorStrategy(AsyncCrawlerStrategy):
+    """Serves the same article for every URL"""
+
+    async def crawl(self, url, **kwargs):
+        return AsyncCrawlResponse(
+            html=f"<html><body><article><p>{ARTICLE}</p></article></body></html>",
+            response_headers={},
+            status_code=200,
+        )
+
+
+class CountingExtraction(ExtractionStrategy):
+    """Sync extraction (shipped to a processing_executor) counting its runs"""
+
+    calls = 0
+
+    def extract(self, url, html, *q, **kwargs):
+        CountingExtraction.calls += 1
+        return [{"url": url}]
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path, monkeypatch):
+    manager = AsyncDatabaseManager(content_store="files")
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_store.content_paths = {
+        key: str(tmp_path) for key in manager.content_store.content_paths
+    }
+    await manager.ainit_db()
+    await manager.update_db_schema()
+    manager._initialized = True
+    monkeypatch.setattr(async_webcrawler, "async_db_manager", manager)
+    return manager
+
+
+class TestSimHash:
+    def test_similar_texts_are_close(self):
+        fingerprint = compute_simhash(ARTICLE)
+        assert len(fingerprint) == 16
+        assert compute_simhash(ARTICLE.upper()) == fingerprint
+        assert simhash_distance(fingerprint, compute_simhash(ARTICLE + " Print this page")) <= 3
+        assert simhash_distance(fingerprint, compute_simhash(OTHER_ARTICLE)) > 10
+
+    def test_empty_text(self):
+        assert compute_simhash("") == ""
+        assert compute_simhash("  --- ") == ""
+        assert len(compute_simhash("one")) == 16
+
+
+class TestFindNearDuplicates:
+    @pytest.mark.asyncio
+    async def test_lookup(self, manager):
+        await manager.acache_url(_result("https://a.com/article", ARTICLE))
+        await manager.acache_url(_result("https://a.com/other", OTHER_ARTICLE))
+
+        fingerprint = compute_simhash(ARTICLE + " Share on social media")
+        matches = await manager.afind_near_duplicates(fingerprint)
+        assert [url for url, _ in matches] == ["https://a.com/article"]
+        assert await manager.afind_near_duplicates(
+            compute_simhash(ARTICLE), exclude_url="https://a.com/article"
+        ) == []
+        assert await manager.afind_near_duplicates("") == []
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_round_trips(self, manager):
+        await manager.acache_url(_result("https://a.com/article", ARTICLE))
+        cached = await manager.aget_cached_url("https://a.com/article")
+        assert cached.content_fingerprint == compute_simhash(ARTICLE)
+
+
+class TestSkipNearDuplicates:
+    @pytest.mark.asyncio
+    async def test_mirror_is_collapsed(self, manager):
+        crawler = AsyncWebCrawler(crawler_strategy=MirrorStrategy())
+        crawler.ready = True
+        config = CrawlerRunConfig(
+            cache_mode=CacheMode.ENABLED, skip_near_duplicates=True, verbose=False
+        )
+
+        original = await crawler.arun("https://shop.com/item?id=1", config=config)
+        assert original.content_fingerprint
+        assert original.duplicate_of is None
+
+        mirror = await crawler.arun("https://shop.com/item?id=1&session=abc", config=config)
+        assert mirror.success
+        assert mirror.duplicate_of == "https://shop.com/item?id=1"
+
+        # Cached as a stub served with the original's content
+        stub = await manager.aget_cached_url("https://shop.com/item?id=1&session=abc")
+        assert stub.duplicate_of == "https://shop.com/item?id=1"
+        assert stub.html == original.html
+        assert stub.markdown.raw_markdown == original.markdown.raw_markdown
+
+        # Stubs are not matched themselves; later mirrors point at the original
+        again = await crawler.arun("https://shop.com/item?id=1&session=def", config=config)
+        assert again.duplicate_of == "https://shop.com/item?id=1"
+
+    @pytest.mark.asyncio
+    async def test_stub_of_evicted_original_is_a_miss(self, manager):
+        await manager.acache_url(_result("https://a.com/article", ARTICLE))
+        mirror = _result("https://a.com/article?ref=x", ARTICLE)
+        mirror.duplicate_of = "https://a.com/article"
+        await manager.acache_url(mirror)
+        assert (await manager.aget_cached_url("https://a.com/article?ref=x")).html
+
+        async def _evict(db):
+            await db.execute("DELETE FROM crawled_data WHERE url = ?", ("https://a.com/article",))
+
+        await manager.execute_with_retry(_evict)
+        assert await manager.aget_cached_url("https://a.com/article?ref=x") is None
+
+    @pytest.mark.asyncio
+    async def test_off_by_default(self, manager):
+        crawler = AsyncWebCrawler(crawler_strategy=MirrorStrategy())
+        crawler.ready = True
+        config = CrawlerRunConfig(cache_mode=CacheMode.ENABLED, verbose=False)
+        await crawler.arun("https://shop.com/a", config=config)
+        mirror = await crawler.arun("https://shop.com/b", config=config)
+        assert mirror.duplicate_of is None
+        # Pages are only fingerprinted when near duplicates are skipped
+        assert not mirror.content_fingerprint
+
+    @pytest.mark.asyncio
+    async def test_duplicates_are_not_extracted_in_executor(self, manager):
+        CountingExtraction.calls = 0
+        crawler = AsyncWebCrawler(crawler_strategy=MirrorStrategy())
+        crawler.ready = True
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            config = CrawlerRunConfig(
+                cache_mode=CacheMode.ENABLED,
+                skip_near_duplicates=True,
+                extraction_strategy=CountingExtraction(),
+                processing_executor=executor,
+                verbose=False,
+            )
+            original = await crawler.arun("https://shop.com/item?id=1", config=config)
+            mirror = await crawler.arun("https://shop.com/item?id=1&ref=x", config=config)
+
+        assert original.extracted_content is not None
+        assert mirror.duplicate_of == "https://shop.com/item?id=1"
+        assert mirror.extracted_content is None
+        assert CountingExtraction.calls == 1
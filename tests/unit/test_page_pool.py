@@ -0,0 +1,151 @@
+"""Unit tests for the pre-warmed page pool of BrowserManager.
+
+Covers pages going back to the pool of their context after a crawl, the reset
+applied between uses, recycling after page_pool_max_uses, crashed pages being
+dropped, pages touched by hooks or console/network capture not being pooled, and
+the pool being forgotten with its context. No browser or network
+required.
+"""
+
+import pytest
+
+from crawl4ai import BrowserConfig, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncPlaywrightCrawlerStrategy
+from crawl4ai.browser_manager import BrowserManager
+
+
+class FakePage:
+    def __init__(self, crash: bool = False):
+        self.crash = crash
+        self.closed = False
+        self.calls = []
+        self.viewport_size = {"width": 400, "height": 300}
+
+    def is_closed(self):
+        return self.closed
+
+    async def evaluate(self, script):
+        self.calls.append("evaluate")
+
+    async def set_extra_http_headers(self, headers):
+        self.calls.append(("headers", headers))
+
+    async def goto(self, url, timeout=None):
+        if self.crash:
+            raise RuntimeError("Target crashed")
+        self.calls.append(("goto", url))
+
+    async def set_viewport_size(self, viewport):
+        self.viewport_size = viewport
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+def _manager(**kwargs):
+    manager = BrowserManager(BrowserConfig(**kwargs))
+    context = FakeContext()
+    sig = manager._make_config_signature(CrawlerRunConfig())
+    manager.contexts_by_config[sig] = context
+    manager._context_refcounts[sig] = 0
+    return manager, context, sig
+
+
+class TestPagePool:
+    @pytest.mark.asyncio
+    async def test_page_is_reset_and_reused(self):
+        manager, context, sig = _manager(page_pool_size=2)
+        page, _ = await manager.get_page(CrawlerRunConfig())
+        assert await manager.release_page_with_context(page, reusable=True) is True
+
+        assert ("goto", "about:blank") in page.calls
+        assert ("headers", {}) in page.calls
+        assert page.viewport_size == {"width": 1080, "height": 600}
+        assert manager._context_refcounts[sig] == 0
+
+        again, _ = await manager.get_page(CrawlerRunConfig())
+        assert again is page
+        assert len(context.pages) == 1
+        assert manager._context_refcounts[sig] == 1
+
+    @pytest.mark.asyncio
+    async def test_pool_is_bounded(self):
+        manager, context, sig = _manager(page_pool_size=1)
+        pages = [(await manager.get_page(CrawlerRunConfig()))[0] for _ in range(3)]
+        kept = [await manager.release_page_with_context(p, reusable=True) for p in pages]
+        assert kept == [True, False, False]
+        assert len(manager._page_pools[sig]) == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_or_unreusable_pages_are_not_pooled(self):
+        manager, _, sig = _manager()
+        page, _ = await manager.get_page(CrawlerRunConfig())
+        assert await manager.release_page_with_context(page, reusable=True) is False
+
+        manager, _, sig = _manager(page_pool_size=2)
+        page, _ = await manager.get_page(CrawlerRunConfig())
+        assert await manager.release_page_with_context(page) is False
+        assert not manager._page_pools.get(sig)
+
+    @pytest.mark.parametrize(
+        "hook_type, config",
+        [
+            ("before_goto", CrawlerRunConfig()),
+            ("on_page_context_created", CrawlerRunConfig()),
+            (None, CrawlerRunConfig(capture_console_messages=True)),
+            (None, CrawlerRunConfig(capture_network_requests=True)),
+        ],
+    )
+    def test_pages_with_hooks_or_capture_are_not_pooled(self, hook_type, config):
+        strategy = AsyncPlaywrightCrawlerStrategy(browser_config=BrowserConfig(page_pool_size=2))
+        assert strategy._page_is_reusable(CrawlerRunConfig())
+        strategy.set_hook("on_browser_created", lambda browser, **kwargs: browser)
+        assert strategy._page_is_reusable(CrawlerRunConfig())
+
+        if hook_type:
+            strategy.set_hook(hook_type, lambda page, context, **kwargs: page)
+        assert not strategy._page_is_reusable(config)
+
+    @pytest.mark.asyncio
+    async def test_page_is_recycled_after_max_uses(self):
+        manager, context, _ = _manager(page_pool_size=1, page_pool_max_uses=3)
+        kept = []
+        for _ in range(4):
+            page, _ = await manager.get_page(CrawlerRunConfig())
+            kept.append(await manager.release_page_with_context(page, reusable=True))
+        assert kept == [True, True, False, True]
+        assert len(context.pages) == 2
+
+    @pytest.mark.asyncio
+    async def test_crashed_and_closed_pages_are_dropped(self):
+        manager, context, sig = _manager(page_pool_size=2)
+        page, _ = await manager.get_page(CrawlerRunConfig())
+        page.crash = True
+        assert await manager.release_page_with_context(page, reusable=True) is False
+        assert page not in manager._page_uses
+
+        page, _ = await manager.get_page(CrawlerRunConfig())
+        await manager.release_page_with_context(page, reusable=True)
+        page.closed = True
+        fresh, _ = await manager.get_page(CrawlerRunConfig())
+        assert fresh is not page
+        assert len(context.pages) == 3
+
+    @pytest.mark.asyncio
+    async def test_pool_is_forgotten_with_its_context(self):
+        manager, _, sig = _manager(page_pool_size=2)
+        page, _ = await manager.get_page(CrawlerRunConfig())
+        await manager.release_page_with_context(page, reusable=True)
+
+        manager._max_contexts = 0
+        async with manager._contexts_lock:
+            assert manager._evict_lru_context_locked() is not None
+        assert sig not in manager._page_pools
+        assert manager._page_uses == {}
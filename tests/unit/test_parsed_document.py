@@ -0,0 +1,113 @@
+"""Unit tests for ParsedDocument, the parse-once tree shared by aprocess_html stages.
+
+Checks that stages given a ParsedDocument produce the same output as stages that
+parse the HTML themselves, and that mutating stages never touch the shared tree.
+No browser or network required.
+"""
+
+from lxml import html as lhtml
+
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+from crawl4ai.extraction_strategy import JsonLxmlExtractionStrategy, JsonXPathExtractionStrategy
+from crawl4ai.parsed_document import ParsedDocument
+from crawl4ai.utils import preprocess_html_for_schema
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Shop</title><meta name="description" content="Products"></head>
+<body>
+  <!-- listing -->
+  <div class="product"><h2>Apple</h2><span class="price">$1</span><a href="/apple">more</a></div>
+  <div class="product"><h2>Pear</h2><span class="price">$2</span><a href="/pear">more</a></div>
+  <script>var x = 1;</script>
+  <p>Fresh fruit delivered daily to your door, every day of the week.</p>
+</body>
+</html>"""
+
+SCHEMA = {
+    "name": "products",
+    "baseSelector": "div.product",
+    "fields": [
+        {"name": "name", "selector": "h2", "type": "text"},
+        {"name": "price", "selector": ".price", "type": "text"},
+    ],
+}
+
+
+class TestParsedDocument:
+    def test_tree_is_parsed_once(self):
+        doc = ParsedDocument(PAGE)
+        assert doc.tree is doc.tree
+
+    def test_fork_does_not_touch_shared_tree(self):
+        doc = ParsedDocument(PAGE)
+        before = lhtml.tostring(doc.tree)
+        fork = doc.fork()
+        for el in fork.xpath("//div"):
+            el.getparent().remove(el)
+        assert lhtml.tostring(doc.tree) == before
+        assert len(doc.tree.xpath("//div")) == 2
+
+    def test_full_document_detection(self):
+        assert ParsedDocument(PAGE).is_full_document
+        assert ParsedDocument("  <html><body></body></html>").is_full_document
+        assert not ParsedDocument("<div>fragment</div>").is_full_document
+
+    def test_matches(self):
+        doc = ParsedDocument(PAGE)
+        assert doc.matches(PAGE)
+        assert not doc.matches("<p>other</p>")
+
+
+class TestSharedStages:
+    def test_scraper_output_unchanged(self):
+        doc = ParsedDocument(PAGE)
+        strategy = LXMLWebScrapingStrategy()
+        plain = strategy.scrap("https://shop.test/", PAGE)
+        shared = strategy.scrap("https://shop.test/", PAGE, parsed_document=doc)
+        assert shared.cleaned_html == plain.cleaned_html
+        assert shared.links == plain.links
+        assert shared.metadata == plain.metadata
+        # Scraping removed scripts from its fork only
+        assert doc.tree.xpath("//script")
+
+    def test_scraper_ignores_document_for_other_html(self):
+        doc = ParsedDocument("<html><body><p>stale</p></body></html>")
+        result = LXMLWebScrapingStrategy().scrap("https://shop.test/", PAGE, parsed_document=doc)
+        assert "Apple" in result.cleaned_html
+
+    def test_fit_html_matches_fresh_parse(self):
+        doc = ParsedDocument(PAGE)
+        plain = preprocess_html_for_schema(PAGE, text_threshold=500, max_size=300_000)
+        shared = preprocess_html_for_schema(
+            PAGE, text_threshold=500, max_size=300_000, parsed_document=doc
+        )
+        assert shared == plain
+        assert "listing" not in shared
+        assert doc.tree.xpath("//head")
+
+    def test_fit_html_layout_whitespace_matches_fresh_parse(self):
+        page = (
+            "<html><body> <ul> <li> a </li> <li>b</li> </ul>\n"
+            "<p>x <b>y</b> <i>z</i></p> <section> <div class='c'> </div> </section></body></html>"
+        )
+        plain = preprocess_html_for_schema(page)
+        assert preprocess_html_for_schema(page, parsed_document=ParsedDocument(page)) == plain
+        # Layout whitespace goes, spaces between inline elements stay
+        assert "<ul><li>" in plain
+        assert "<b>y</b> <i>z</i>" in plain
+
+    def test_lxml_schema_extraction_reuses_tree(self):
+        doc = ParsedDocument(PAGE)
+        strategy = JsonLxmlExtractionStrategy(SCHEMA)
+        assert strategy._parse_document(doc) is doc.tree
+        plain = JsonLxmlExtractionStrategy(SCHEMA).run("https://shop.test/", [PAGE])
+        shared = strategy.run("https://shop.test/", [PAGE], parsed_document=doc)
+        assert shared == plain == [
+            {"name": "Apple", "price": "$1"},
+            {"name": "Pear", "price": "$2"},
+        ]
+
+    def test_xpath_extraction_skips_fragments(self):
+        fragment = ParsedDocument("<div class='product'><h2>Fig</h2></div>")
+        assert JsonXPathExtractionStrategy(SCHEMA)._parse_document(fragment) is None
@@ -0,0 +1,142 @@
+"""Unit tests for priority classes and deadlines in MemoryAdaptiveDispatcher.
+
+Covers earliest-deadline-first ordering and dropping of expired tasks in
+DomainScheduler, class ordering in PriorityClassScheduler, and the dispatcher
+keeping reserved slots free for an interactive class while bulk crawls run.
+No browser or network required.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.async_dispatcher import (
+    DomainScheduler,
+    MemoryAdaptiveDispatcher,
+    PriorityClassScheduler,
+)
+from crawl4ai.models import CrawlResult
+
+
+class FakeCrawler:
+    def __init__(self, duration: float = 0.01):
+        self.duration = duration
+        self.started = {}
+        self.running = {}
+        self.peak = {}
+
+    async def arun(self, url, config=None, session_id=None):
+        name = config.priority_class
+        self.started[url] = time.monotonic()
+        self.running[name] = self.running.get(name, 0) + 1
+        self.peak[name] = max(self.peak.get(name, 0), self.running[name])
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.running[name] -= 1
+        return CrawlResult(url=url, html="<html></html>", success=True, status_code=200)
+
+
+def _item(url: str, priority_class: str = "default", deadline: float = None):
+    return (0, (url, url, 0, time.time(), priority_class, deadline))
+
+
+class TestDeadlines:
+    @pytest.mark.asyncio
+    async def test_earliest_deadline_first(self):
+        scheduler = DomainScheduler()
+        now = time.time()
+        await scheduler.put(_item("https://a.com/none"))
+        await scheduler.put(_item("https://b.com/late", deadline=now + 10))
+        await scheduler.put(_item("https://a.com/soon", deadline=now + 5))
+        order = [(await scheduler.get_nowait())[1][0] for _ in range(3)]
+        assert order == ["https://a.com/soon", "https://b.com/late", "https://a.com/none"]
+
+    @pytest.mark.asyncio
+    async def test_expired_tasks_are_dropped(self):
+        scheduler = DomainScheduler()
+        now = time.time()
+        await scheduler.put(_item("https://a.com/expired", deadline=now - 1))
+        await scheduler.put(_item("https://a.com/later", deadline=now + 60))
+        await scheduler.put(_item("https://b.com/expired", deadline=now - 2))
+        assert scheduler.next_deadline() == now - 2
+
+        dropped = sorted(item[0] for _, item in scheduler.drop_expired())
+        assert dropped == ["https://a.com/expired", "https://b.com/expired"]
+        assert len(scheduler) == 1
+        assert (await scheduler.get_nowait())[1][0] == "https://a.com/later"
+        with pytest.raises(asyncio.QueueEmpty):
+            await scheduler.get_nowait()
+        assert scheduler.next_deadline() is None
+
+
+class TestPriorityClassScheduler:
+    @pytest.mark.asyncio
+    async def test_class_order_and_filter(self):
+        scheduler = PriorityClassScheduler(priority_classes=["interactive", "bulk"])
+        await scheduler.put(_item("https://a.com/bulk", "bulk"))
+        await scheduler.put(_item("https://a.com/other", "other"))
+        await scheduler.put(_item("https://a.com/fast", "interactive"))
+        assert scheduler.classes == ["interactive", "bulk", "other"]
+        assert scheduler.queued("bulk") == 1
+
+        assert (await scheduler.get_nowait(lambda name: name != "interactive"))[1][0] == "https://a.com/bulk"
+        assert (await scheduler.get_nowait())[1][0] == "https://a.com/fast"
+        assert (await scheduler.get_nowait())[1][0] == "https://a.com/other"
+        assert scheduler.empty()
+
+
+class TestClassDispatch:
+    @pytest.mark.asyncio
+    async def test_reserved_slots_keep_interactive_latency_low(self):
+        configs = [
+            CrawlerRunConfig(url_matcher="*interactive*", priority_class="interactive", deadline=5),
+            CrawlerRunConfig(priority_class="bulk"),
+        ]
+        dispatcher = MemoryAdaptiveDispatcher(
+            memory_threshold_percent=100.0,
+            critical_threshold_percent=100.0,
+            max_session_permit=4,
+            priority_classes=["interactive", "bulk"],
+            reserved_slots={"interactive": 2},
+        )
+        crawler = FakeCrawler(duration=0.1)
+        submitted = {}
+
+        async def source():
+            for i in range(20):
+                yield f"https://bulk{i}.com/"
+            await asyncio.sleep(0.15)
+            for i in range(2):
+                url = f"https://interactive{i}.com/"
+                submitted[url] = time.monotonic()
+                yield url
+
+        results = await dispatcher.run_urls(source(), crawler, configs)
+
+        assert len(results) == 22 and all(r.success for r in results)
+        assert crawler.peak["bulk"] == 2
+        # Interactive URLs start right away, ahead of the bulk backlog
+        assert all(crawler.started[url] - submitted[url] < 0.05 for url in submitted)
+
+    @pytest.mark.asyncio
+    async def test_expired_tasks_fail_without_crawling(self):
+        dispatcher = MemoryAdaptiveDispatcher(
+            memory_threshold_percent=100.0,
+            critical_threshold_percent=100.0,
+            max_session_permit=1,
+        )
+        crawler = FakeCrawler(duration=0.1)
+        urls = [f"https://site{i}.com/" for i in range(5)]
+        start = time.monotonic()
+        results = await dispatcher.run_urls(urls, crawler, CrawlerRunConfig(deadline=0.15))
+
+        assert len(results) == 5
+        dropped = [r for r in results if not r.success]
+        assert len(crawler.started) == 2
+        assert len(dropped) == 3
+        assert all(r.result.metadata["status"] == "deadline_exceeded" for r in dropped)
+        assert time.monotonic() - start < 0.35
+        assert dispatcher._task_meta == {}
@@ -0,0 +1,161 @@
+"""Unit tests for running aprocess_html's CPU stage in a processing_executor.
+
+Covers ProcessingSpec pickling and result parity between inline processing and a
+ProcessPoolExecutor, falling back inline only when the spec cannot be pickled (probed
+once per run config), and worker errors propagating. No browser or network required (aprocess_html is called
+directly).
+"""
+
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, DefaultMarkdownGenerator, PruningContentFilter
+from crawl4ai.async_logger import AsyncLogger
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+from crawl4ai.processing import build_processing_spec, process_html
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Shop</title></head>
+<body>
+  <h1>Fruit shop</h1>
+  <div class="product"><h2>Apple</h2><span class="price">$1</span><a href="/apple">Apple details</a></div>
+  <div class="product"><h2>Pear</h2><span class="price">$2</span><a href="/pear">Pear details</a></div>
+  <p>Fresh fruit delivered daily to your door, every single day of the week, all year round.</p>
+</body>
+</html>"""
+
+SCHEMA = {
+    "name": "products",
+    "baseSelector": "div.product",
+    "fields": [
+        {"name": "name", "selector": "h2", "type": "text"},
+        {"name": "price", "selector": ".price", "type": "text"},
+    ],
+}
+
+
+class FailingScrapingStrategy(LXMLWebScrapingStrategy):
+    """Raises from scrap; counts the calls made in this process."""
+
+    calls = 0
+
+    def scrap(self, url, html, **kwargs):
+        FailingScrapingStrategy.calls += 1
+        raise TypeError("scraper bug")
+
+
+def _process(config: CrawlerRunConfig, crawler: AsyncWebCrawler):
+    return crawler.aprocess_html(
+        url="https://shop.test/",
+        html=PAGE,
+        extracted_content=None,
+        config=config,
+        screenshot_data=None,
+        pdf_data=None,
+        verbose=False,
+    )
+
+
+class TestProcessingSpec:
+    def test_spec_is_picklable(self):
+        strategy = LXMLWebScrapingStrategy(logger=AsyncLogger())
+        params = {
+            "css_selector": None,
+            "excluded_tags": ["nav"],
+            "fallback_fetch_function": lambda url: url,
+            "logger": AsyncLogger(),
+        }
+        spec = build_processing_spec(strategy, DefaultMarkdownGenerator(), params)
+        restored = pickle.loads(pickle.dumps(spec))
+        assert restored.params == {"css_selector": None, "excluded_tags": ["nav"]}
+        assert restored.scraping_strategy.logger is None
+        # The caller's strategy keeps its logger
+        assert strategy.logger is not None
+
+    def test_process_html_extracts_with_spec(self):
+        spec = build_processing_spec(
+            LXMLWebScrapingStrategy(),
+            DefaultMarkdownGenerator(),
+            {},
+            extraction_strategy=JsonCssExtractionStrategy(SCHEMA),
+        )
+        fields = process_html("https://shop.test/", PAGE, spec)
+        assert "Fruit shop" in fields["markdown"].raw_markdown
+        assert json.loads(fields["extracted_content"]) == [
+            {"name": "Apple", "price": "$1"},
+            {"name": "Pear", "price": "$2"},
+        ]
+
+
+class TestProcessingExecutor:
+    @pytest.mark.asyncio
+    async def test_executor_matches_inline(self):
+        crawler = AsyncWebCrawler()
+        config = CrawlerRunConfig(
+            extraction_strategy=JsonCssExtractionStrategy(SCHEMA),
+            markdown_generator=DefaultMarkdownGenerator(content_filter=PruningContentFilter()),
+            verbose=False,
+        )
+        inline = await _process(config, crawler)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            offloaded = await _process(config.clone(processing_executor=executor), crawler)
+
+        for field in ("cleaned_html", "fit_html", "links", "media", "metadata", "extracted_content"):
+            assert getattr(offloaded, field) == getattr(inline, field), field
+        assert offloaded.markdown.raw_markdown == inline.markdown.raw_markdown
+        assert offloaded.markdown.fit_markdown == inline.markdown.fit_markdown
+
+    @pytest.mark.asyncio
+    async def test_crawler_level_executor(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            crawler = AsyncWebCrawler(processing_executor=executor)
+            result = await _process(CrawlerRunConfig(verbose=False), crawler)
+        assert result.success
+        assert "Pear details" in result.markdown.raw_markdown
+
+    @pytest.mark.asyncio
+    async def test_worker_errors_propagate(self):
+        FailingScrapingStrategy.calls = 0
+        config = CrawlerRunConfig(scraping_strategy=FailingScrapingStrategy(), verbose=False)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(ValueError, match="scraper bug"):
+                await _process(config.clone(processing_executor=executor), AsyncWebCrawler())
+        # The page was not processed a second time inline
+        assert FailingScrapingStrategy.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_spec_processes_inline(self):
+        strategy = LXMLWebScrapingStrategy()
+        strategy.hook = lambda html: html
+        config = CrawlerRunConfig(scraping_strategy=strategy, verbose=False)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = await _process(config.clone(processing_executor=executor), AsyncWebCrawler())
+        assert "Pear details" in result.markdown.raw_markdown
+
+    @pytest.mark.asyncio
+    async def test_spec_is_probed_once_per_config(self, monkeypatch):
+        dumps = []
+        real_dumps = pickle.dumps
+        monkeypatch.setattr(
+            "crawl4ai.async_webcrawler.pickle.dumps",
+            lambda obj, *args, **kwargs: dumps.append(obj) or real_dumps(obj, *args, **kwargs),
+        )
+        crawler = AsyncWebCrawler()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            config = CrawlerRunConfig(processing_executor=executor, verbose=False)
+            for _ in range(3):
+                assert (await _process(config, crawler)).success
+            assert len(dumps) == 1
+            await _process(config.clone(), crawler)
+            assert len(dumps) == 2
+
+    def test_config_keeps_executor_out_of_dump(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            config = CrawlerRunConfig(processing_executor=executor)
+            assert config.clone().processing_executor is executor
+            assert config.dump()["params"].get("processing_executor") is None
@@ -0,0 +1,249 @@
+"""Unit tests for the token-bucket RateLimiter.
+
+Covers per-host and per-registrable-domain buckets, Retry-After, robots.txt
+crawl delays (looked up in the background while the dispatcher feeds URLs), and
+bucket state shared through SQLiteRateLimitStore, queried off the event loop.
+No browser or network required.
+"""
+
+import asyncio
+import sqlite3
+import time
+from email.utils import formatdate
+
+import pytest
+
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.async_dispatcher import (
+    DomainScheduler,
+    MemoryAdaptiveDispatcher,
+    RateLimiter,
+    SQLiteRateLimitStore,
+)
+from crawl4ai.models import CrawlResult
+from crawl4ai.utils import RobotsParser
+
+ROBOTS_TXT = """
+User-agent: *
+Crawl-delay: 5
+Disallow: /private
+
+User-agent: slowbot
+Request-rate: 1/20
+"""
+
+
+class FakeRobotsParser:
+    def __init__(self, delay, lookup_time: float = 0.0):
+        self.delay = delay
+        self.lookup_time = lookup_time
+        self.lookups = 0
+
+    async def crawl_delay(self, url, user_agent="*"):
+        self.lookups += 1
+        await asyncio.sleep(self.lookup_time)
+        return self.delay
+
+
+class StampingCrawler:
+    def __init__(self):
+        self.started = {}
+
+    async def arun(self, url, config=None, session_id=None):
+        self.started[url] = time.monotonic()
+        return CrawlResult(url=url, html="<html></html>", success=True, status_code=200)
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_burst(self):
+        limiter = RateLimiter(requests_per_second=10, burst=3)
+        url = "https://a.com/"
+        assert all([await limiter.reserve(url) for _ in range(3)])
+        assert not await limiter.reserve(url)
+        assert 0 < await limiter.ready_at(url) - time.time() <= 0.1
+
+    @pytest.mark.asyncio
+    async def test_registrable_domain_is_shared(self):
+        limiter = RateLimiter(requests_per_second=100, site_requests_per_second=1)
+        assert await limiter.reserve("https://a.example.com/")
+        assert not await limiter.reserve("https://b.example.com/")
+        assert await limiter.reserve("https://other.org/")
+
+    @pytest.mark.asyncio
+    async def test_backoff_without_retry_after(self):
+        limiter = RateLimiter(requests_per_second=10)
+        url = "https://a.com/"
+        await limiter.reserve(url)
+        assert await limiter.update_delay(url, 429)
+        assert await limiter.ready_at(url) - time.time() > 0.1
+        await limiter.update_delay(url, 200)
+        await limiter.update_delay(url, 200)
+        assert limiter.domains["a.com"].current_delay == 0
+
+
+class TestRetryAfter:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("requests_per_second", [None, 10])
+    async def test_seconds(self, requests_per_second):
+        limiter = RateLimiter(requests_per_second=requests_per_second, base_delay=(0, 0))
+        url = "https://a.com/page"
+        await limiter.reserve(url)
+        await limiter.update_delay(url, 429, {"Retry-After": "30"})
+        assert await limiter.ready_at(url) - time.time() >= 29
+        assert not await limiter.reserve(url)
+
+    @pytest.mark.asyncio
+    async def test_http_date_and_cap(self):
+        limiter = RateLimiter(max_retry_after=60)
+        url = "https://a.com/"
+        await limiter.reserve(url)
+        await limiter.update_delay(url, 503, {"retry-after": formatdate(time.time() + 3600, usegmt=True)})
+        assert 55 <= await limiter.ready_at(url) - time.time() <= 61
+
+    @pytest.mark.asyncio
+    async def test_ignored_when_disabled(self):
+        limiter = RateLimiter(base_delay=(0, 0), respect_retry_after=False)
+        url = "https://a.com/"
+        await limiter.reserve(url)
+        await limiter.update_delay(url, 429, {"Retry-After": "30"})
+        assert await limiter.ready_at(url) - time.time() < 1
+
+
+class TestCrawlDelay:
+    @pytest.mark.asyncio
+    async def test_seeds_bucket_interval(self):
+        robots = FakeRobotsParser(delay=5)
+        limiter = RateLimiter(requests_per_second=10, burst=5, robots_parser=robots)
+        url = "https://a.com/"
+        await asyncio.gather(limiter.prepare(url), limiter.prepare(url))
+        await limiter.prepare(url)
+        assert robots.lookups == 1
+        assert await limiter.reserve(url)
+        assert not await limiter.reserve(url)
+        assert await limiter.ready_at(url) - time.time() > 4
+
+    @pytest.mark.asyncio
+    async def test_raises_base_delay(self):
+        limiter = RateLimiter(base_delay=(0.1, 0.1), robots_parser=FakeRobotsParser(delay=3))
+        url = "https://a.com/"
+        await limiter.prepare(url)
+        await limiter.reserve(url)
+        assert await limiter.ready_at(url) - time.time() > 2
+
+    @pytest.mark.asyncio
+    async def test_background_lookup_holds_only_its_domain(self):
+        robots = FakeRobotsParser(delay=2, lookup_time=0.1)
+        limiter = RateLimiter(requests_per_second=10, robots_parser=robots)
+        limiter.prepare_nowait("https://a.com/")
+        limiter.prepare_nowait("https://a.com/other")
+        assert await limiter.ready_at("https://a.com/") > time.time()
+        assert await limiter.ready_at("https://b.com/") <= time.time()
+
+        await asyncio.sleep(0.15)
+        assert robots.lookups == 1
+        assert limiter.domains["a.com"].crawl_delay == 2
+        assert await limiter.ready_at("https://a.com/") <= time.time()
+
+    @pytest.mark.asyncio
+    async def test_feeder_does_not_wait_for_lookups(self):
+        robots = FakeRobotsParser(delay=0, lookup_time=0.3)
+        dispatcher = MemoryAdaptiveDispatcher(
+            memory_threshold_percent=100.0,
+            critical_threshold_percent=100.0,
+            rate_limiter=RateLimiter(base_delay=(0, 0), robots_parser=robots),
+        )
+        crawler = StampingCrawler()
+        urls = [f"https://site{i}.com/" for i in range(5)]
+        start = time.monotonic()
+        results = await dispatcher.run_urls(urls, crawler, CrawlerRunConfig())
+        assert len(results) == 5
+        assert robots.lookups == 5
+        # Lookups ran side by side instead of one after the other
+        assert max(crawler.started.values()) - start < 0.3 * 2
+
+    @pytest.mark.asyncio
+    async def test_robots_parser_crawl_delay(self, tmp_path, monkeypatch):
+        parser = RobotsParser(cache_dir=str(tmp_path))
+        monkeypatch.setattr(parser, "_get_cached_rules", lambda domain: (ROBOTS_TXT, True))
+        assert await parser.crawl_delay("https://a.com/") == 5
+        assert await parser.crawl_delay("https://a.com/", "slowbot") == 20
+        assert not await parser.can_fetch("https://a.com/private")
+
+
+class TestSharedStore:
+    @pytest.mark.asyncio
+    async def test_buckets_are_shared(self, tmp_path):
+        path = str(tmp_path / "limits.db")
+        first = RateLimiter(requests_per_second=1, store=SQLiteRateLimitStore(path))
+        second = RateLimiter(requests_per_second=1, store=SQLiteRateLimitStore(path))
+        url = "https://a.com/"
+        assert await first.reserve(url)
+        assert not await second.reserve(url)
+        assert await second.ready_at(url) > time.time()
+
+        await second.update_delay(url, 429, {"Retry-After": "30"})
+        assert await first.ready_at(url) - time.time() >= 29
+
+    @pytest.mark.asyncio
+    async def test_scheduler_skips_drained_bucket(self, tmp_path):
+        path = str(tmp_path / "limits.db")
+        ours = RateLimiter(requests_per_second=1, store=SQLiteRateLimitStore(path))
+        theirs = RateLimiter(requests_per_second=1, store=SQLiteRateLimitStore(path))
+        scheduler = DomainScheduler(ours)
+        await scheduler.put((0, ("https://a.com/1", "1", 0, time.time())))
+        await scheduler.put((0, ("https://b.com/1", "2", 0, time.time())))
+        assert await theirs.reserve("https://a.com/other")
+        assert (await scheduler.get_nowait())[1][0] == "https://b.com/1"
+        with pytest.raises(asyncio.QueueEmpty):
+            await scheduler.get_nowait()
+        assert len(scheduler) == 1
+
+    @pytest.mark.asyncio
+    async def test_locked_store_refuses_quickly_and_retries(self, tmp_path):
+        path = str(tmp_path / "limits.db")
+        store = SQLiteRateLimitStore(path, busy_timeout=0.01, retry_interval=0.2)
+        limiter = RateLimiter(requests_per_second=1, store=store)
+        url = "https://a.com/"
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+
+        start = time.monotonic()
+        assert not await limiter.reserve(url)
+        await limiter.update_delay(url, 429, {"Retry-After": "30"})
+        assert time.monotonic() - start < 0.5
+        # Held back while locked, and the unwritten push-back still applies here
+        assert await limiter.ready_at(url) - time.time() >= 29
+
+        other.execute("ROLLBACK")
+        other.close()
+        assert not await limiter.reserve(url)
+        tats = await SQLiteRateLimitStore(path).get(["host:a.com"])
+        assert tats["host:a.com"] - time.time() >= 29
+
+    @pytest.mark.asyncio
+    async def test_store_does_not_block_the_event_loop(self, tmp_path):
+        path = str(tmp_path / "limits.db")
+        limiter = RateLimiter(
+            requests_per_second=1, store=SQLiteRateLimitStore(path, busy_timeout=0.3)
+        )
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        try:
+            # Waits out busy_timeout on the locked file while the loop keeps running
+            assert not await limiter.reserve("https://a.com/")
+        finally:
+            task.cancel()
+            other.execute("ROLLBACK")
+            other.close()
+            limiter.store.close()
+        assert ticks >= 10
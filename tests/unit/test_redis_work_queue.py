@@ -0,0 +1,94 @@
+"""Unit tests for RedisWorkQueue against fakeredis.
+
+Covers leasing through the consumer group, XAUTOCLAIM takeover of tasks whose lease
+ran out, extend() renewing only leases the worker still owns, failures published
+after max_attempts, and complete() publishing a result once. Skipped unless fakeredis (with lupa, for the Lua scripts) is installed.
+No browser or network required.
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from crawl4ai.work_queue import RedisWorkQueue, decode_task_result  # noqa: E402
+
+URLS = [f"https://a.com/{i}" for i in range(3)]
+
+
+@pytest_asyncio.fixture
+async def queue():
+    queue = RedisWorkQueue(fakeredis.FakeAsyncRedis())
+    await queue.create_job("job", "{}")
+    await queue.push("job", [(f"t{i}", url) for i, url in enumerate(URLS)])
+    yield queue
+    await queue.close()
+
+
+class TestRedisWorkQueue:
+    @pytest.mark.asyncio
+    async def test_tasks_are_leased_once(self, queue):
+        assert await queue.job_config("job") == "{}"
+        first = await queue.lease("w1", 2, visibility_timeout=10)
+        second = await queue.lease("w2", 5, visibility_timeout=10)
+        assert [(lease.task_id, lease.url) for lease in first] == [("t0", URLS[0]), ("t1", URLS[1])]
+        assert [lease.task_id for lease in second] == ["t2"]
+        assert await queue.lease("w3", 5, visibility_timeout=10) == []
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_taken_over(self, queue):
+        # Redis leases expire by idle time, measured against the claiming worker's timeout
+        first = await queue.lease("w1", 2, visibility_timeout=0.3)
+
+        # w1 keeps t0 alive, t1 runs out
+        await asyncio.sleep(0.2)
+        await queue.extend("w1", first[:1], visibility_timeout=0.3)
+        assert [lease.task_id for lease in await queue.lease("w2", 1, 0.3)] == ["t2"]
+        await asyncio.sleep(0.2)
+        taken = await queue.lease("w2", 5, visibility_timeout=0.3)
+        assert [(lease.task_id, lease.attempts) for lease in taken] == [("t1", 2)]
+
+        assert await queue.complete("w2", taken[0], b"late") is True
+        assert await queue.complete("w1", first[1], b"stale") is False
+        rows = await queue.results("job")
+        assert [payload for _, payload in rows] == [b"late"]
+        assert await queue.results("job", rows[-1][0]) == []
+        # The task was acknowledged, so nobody takes it over again
+        await asyncio.sleep(0.15)
+        assert "t1" not in [lease.task_id for lease in await queue.lease("w3", 5, 0.1)]
+
+    @pytest.mark.asyncio
+    async def test_extend_skips_leases_taken_over(self, queue):
+        first = await queue.lease("w1", 1, visibility_timeout=0.1)
+        await asyncio.sleep(0.15)
+        taken = await queue.lease("w2", 1, visibility_timeout=0.1)
+        assert [lease.task_id for lease in taken] == ["t0"]
+
+        # w1 renews too late: the entry stays with w2 and keeps aging
+        await queue.extend("w1", first, visibility_timeout=0.1)
+        assert await queue.client.xpending_range(
+            queue._key("job", "tasks"), queue.group, min="-", max="+", count=10,
+            consumername="w1",
+        ) == []
+        await asyncio.sleep(0.15)
+        again = await queue.lease("w3", 1, visibility_timeout=0.1)
+        assert [(lease.task_id, lease.attempts) for lease in again] == [("t0", 3)]
+
+    @pytest.mark.asyncio
+    async def test_exhausted_attempts_publish_a_failure(self, queue):
+        await queue.delete_job("job")
+        await queue.create_job("job", "{}")
+        await queue.push("job", [("t0", URLS[0])])
+        for _ in range(2):
+            assert await queue.lease("w", 1, visibility_timeout=0, max_attempts=2)
+            await asyncio.sleep(0.01)
+        assert await queue.lease("w", 1, visibility_timeout=0, max_attempts=2) == []
+
+        (_, payload), = await queue.results("job")
+        task_result = decode_task_result(payload)
+        assert task_result.task_id == "t0"
+        assert not task_result.success
+        assert "expired 2 times" in task_result.error_message
@@ -0,0 +1,134 @@
+"""Unit tests for the compiled request-interception router.
+
+Covers RequestBlocker matching extensions and ad/tracker domain suffixes, its
+regex agreeing with the Python matcher, resource-type rules, and a browser
+context getting a single route for all rules. No browser or network required.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from crawl4ai.async_configs import BrowserConfig
+from crawl4ai.browser_manager import (
+    AD_TRACKER_DOMAINS,
+    CSS_EXTENSIONS,
+    STATIC_EXTENSIONS,
+    BrowserManager,
+    RequestBlocker,
+)
+
+URLS = {
+    "https://example.com/": False,
+    "https://example.com/logo.PNG": True,
+    "https://example.com/logo.png?v=3#top": True,
+    "https://example.com/style.css": True,
+    "https://example.com/page.html": False,
+    "https://example.png/": False,
+    "https://example.com/png": False,
+    "https://doubleclick.net/ad": True,
+    "https://stats.g.doubleclick.net/r/collect": True,
+    "https://notdoubleclick.net/": False,
+    "https://www.google-analytics.com:443/analytics.js": True,
+    "https://google.com/adservice.google.com/": False,
+    "https://linkedin.com/feed": False,
+    "https://ads.linkedin.com/px": True,
+}
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+
+def _blocker(**kwargs):
+    return RequestBlocker(CSS_EXTENSIONS + STATIC_EXTENSIONS, AD_TRACKER_DOMAINS, **kwargs)
+
+
+class TestRequestBlocker:
+    @pytest.mark.parametrize("url,blocked", URLS.items())
+    def test_matcher_and_regex_agree(self, url, blocked):
+        blocker = _blocker()
+        assert blocker.blocks(url) is blocked
+        assert bool(blocker.url_pattern.search(url)) is blocked
+
+    def test_domain_suffix_trie(self):
+        blocker = RequestBlocker(domains=["doubleclick.net", "pixel.wp.com"])
+        assert blocker.blocks_host("ad.doubleclick.net")
+        assert blocker.blocks_host("PIXEL.wp.com.")
+        assert not blocker.blocks_host("wp.com")
+        assert not blocker.blocks_host("net")
+
+    def test_from_config(self):
+        assert RequestBlocker.from_config(BrowserConfig()) is None
+        blocker = RequestBlocker.from_config(BrowserConfig(avoid_css=True))
+        assert blocker.extensions == frozenset(CSS_EXTENSIONS)
+        assert blocker.url_pattern is not None
+        blocker = RequestBlocker.from_config(BrowserConfig(blocked_resource_types=["font"]))
+        assert blocker.resource_types == {"font"}
+        assert blocker.url_pattern is None
+
+    @pytest.mark.asyncio
+    async def test_resource_types_use_the_catch_all_handler(self):
+        blocker = _blocker(resource_types=["image", "xhr"])
+        context = FakeContext()
+        await blocker.register(context)
+        assert context.routes == [("**/*", blocker.handle)]
+
+        outcomes = {}
+        for url, resource_type in [
+            ("https://example.com/api", "xhr"),
+            ("https://example.com/app.js", "script"),
+            ("https://doubleclick.net/ad.js", "script"),
+        ]:
+            route = FakeRoute(url, resource_type)
+            await blocker.handle(route)
+            outcomes[url] = route.outcome
+        assert outcomes == {
+            "https://example.com/api": "abort",
+            "https://example.com/app.js": "fallback",
+            "https://doubleclick.net/ad.js": "abort",
+        }
+
+
+class TestContextRouting:
+    @pytest.mark.asyncio
+    async def test_one_route_per_context(self):
+        manager = BrowserManager(BrowserConfig(text_mode=True, avoid_ads=True, avoid_css=True))
+        context = FakeContext()
+
+        async def new_context(**settings):
+            return context
+
+        manager.browser = SimpleNamespace(new_context=new_context)
+        assert await manager.create_browser_context() is context
+        assert len(context.routes) == 1
+        pattern, _ = context.routes[0]
+        assert pattern is manager._request_blocker.url_pattern
+
+    @pytest.mark.asyncio
+    async def test_no_route_without_rules(self):
+        manager = BrowserManager(BrowserConfig())
+        context = FakeContext()
+
+        async def new_context(**settings):
+            return context
+
+        manager.browser = SimpleNamespace(new_context=new_context)
+        await manager.create_browser_context()
+        assert context.routes == []
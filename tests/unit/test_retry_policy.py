@@ -0,0 +1,125 @@
+"""Unit tests for retrying failed crawls in the dispatchers.
+
+Covers RetryPolicy error classes, backoff and escalation, MemoryAdaptiveDispatcher
+keeping slots busy while retries wait in its delay queue, and SemaphoreDispatcher
+retrying with an escalated config. No browser or network required.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.async_dispatcher import MemoryAdaptiveDispatcher, RetryPolicy, SemaphoreDispatcher
+from crawl4ai.models import CrawlResult
+
+
+def _failure(status_code=None, error_message=""):
+    return CrawlResult(
+        url="https://a.com/", html="", success=False, status_code=status_code, error_message=error_message
+    )
+
+
+class FlakyCrawler:
+    """Fails the first `failures` attempts of URLs containing "flaky" with a 503"""
+
+    def __init__(self, failures: int = 1, duration: float = 0.01):
+        self.failures = failures
+        self.duration = duration
+        self.attempts = {}
+        self.started = []
+
+    async def arun(self, url, config=None, session_id=None):
+        self.started.append((url, time.monotonic()))
+        self.attempts[url] = self.attempts.get(url, 0) + 1
+        await asyncio.sleep(self.duration)
+        escalated = config.experimental.get("escalated", False)
+        if "flaky" in url and self.attempts[url] <= self.failures and not escalated:
+            return CrawlResult(url=url, html="", success=False, status_code=503, error_message="HTTP 503")
+        if "missing" in url:
+            return CrawlResult(url=url, html="", success=False, status_code=404, error_message="HTTP 404")
+        return CrawlResult(url=url, html="<html></html>", success=True, status_code=200)
+
+
+class TestRetryPolicy:
+    def test_classify(self):
+        classify = RetryPolicy.classify
+        assert classify(CrawlResult(url="https://a.com/", html="", success=True)) is None
+        assert classify(_failure(403, "Blocked by anti-bot protection: Cloudflare")) == "blocked"
+        assert classify(_failure(429)) == "rate_limited"
+        assert classify(_failure(502)) == "server_error"
+        assert classify(_failure(None, "Page.goto: Timeout 30000ms exceeded")) == "timeout"
+        assert classify(_failure(None, "net::ERR_CONNECTION_RESET")) == "network"
+        assert classify(_failure(404)) == "other"
+
+    def test_budgets_and_backoff(self):
+        policy = RetryPolicy(
+            max_retries=3, retry_on={"timeout": 1}, base_delay=1, max_delay=3, jitter=0
+        )
+        server_error = _failure(500)
+        assert [policy.next_delay(server_error, {"server_error": n}) for n in range(4)] == [
+            1, 2, 3, None
+        ]
+        assert policy.next_delay(_failure(None, "timeout"), {"timeout": 1}) is None
+        assert policy.next_delay(_failure(404), {}) is None
+
+    def test_budgets_are_per_error_class(self):
+        policy = RetryPolicy(
+            max_retries=3, retry_on={"timeout": 1}, base_delay=1, max_delay=10, jitter=0
+        )
+        # Earlier server errors do not use up the timeout budget, but do grow the backoff
+        assert policy.next_delay(_failure(None, "timeout"), {"server_error": 2}) == 4
+        assert policy.next_delay(_failure(None, "timeout"), {"server_error": 2, "timeout": 1}) is None
+        assert policy.next_delay(_failure(503), {"timeout": 1, "server_error": 2}) == 8
+
+    def test_escalation(self):
+        proxy, browser = CrawlerRunConfig(), CrawlerRunConfig()
+        policy = RetryPolicy(escalation=[proxy, browser])
+        assert policy.config_for(0) is None
+        assert [policy.config_for(n) for n in (1, 2, 3)] == [proxy, browser, browser]
+        assert RetryPolicy().config_for(1) is None
+
+
+class TestDispatcherRetries:
+    @pytest.mark.asyncio
+    async def test_backoff_does_not_hold_a_slot(self):
+        delay = 0.2
+        dispatcher = MemoryAdaptiveDispatcher(
+            memory_threshold_percent=100.0,
+            critical_threshold_percent=100.0,
+            max_session_permit=1,
+            retry_policy=RetryPolicy(base_delay=delay, jitter=0),
+        )
+        crawler = FlakyCrawler(failures=2)
+        urls = ["https://flaky.com/", "https://missing.com/"] + [f"https://site{i}.com/" for i in range(5)]
+        results = {r.url: r for r in await dispatcher.run_urls(urls, crawler, CrawlerRunConfig())}
+
+        assert len(results) == 7
+        assert results["https://flaky.com/"].success
+        assert results["https://flaky.com/"].retry_count == 2
+        assert crawler.attempts["https://flaky.com/"] == 3
+        # Client errors are final
+        assert not results["https://missing.com/"].success
+        assert crawler.attempts["https://missing.com/"] == 1
+
+        flaky = [t for url, t in crawler.started if url == "https://flaky.com/"]
+        assert flaky[1] - flaky[0] >= delay and flaky[2] - flaky[1] >= 2 * delay
+        # Every other URL went through the single slot while the first retry waited
+        others = [t for url, t in crawler.started if "site" in url]
+        assert max(others) < flaky[1]
+        assert dispatcher._retry_queue == [] and dispatcher._retries == {}
+
+    @pytest.mark.asyncio
+    async def test_retries_are_escalated(self):
+        escalated = CrawlerRunConfig(experimental={"escalated": True})
+        dispatcher = SemaphoreDispatcher(
+            retry_policy=RetryPolicy(base_delay=0.01, escalation=[escalated])
+        )
+        crawler = FlakyCrawler(failures=5)
+        results = await dispatcher.run_urls(
+            crawler, ["https://flaky.com/", "https://ok.com/"], CrawlerRunConfig()
+        )
+        assert all(r.success for r in results)
+        assert crawler.attempts["https://flaky.com/"] == 2
+        assert [r.retry_count for r in results] == [1, 0]
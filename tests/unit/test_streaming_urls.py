@@ -0,0 +1,180 @@
+"""Unit tests for streaming URL input to arun_many and the dispatchers.
+
+Covers MemoryAdaptiveDispatcher reading sync and async URL sources with bounded
+lookahead, SemaphoreDispatcher keeping no more tasks than crawl slots, and arun_many resolving cache hits of a URL stream batch by batch.
+No browser or network required.
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+import crawl4ai.async_webcrawler as async_webcrawler
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.async_dispatcher import MemoryAdaptiveDispatcher, SemaphoreDispatcher
+from crawl4ai.models import AsyncCrawlResponse, CrawlResult, MarkdownGenerationResult
+
+
+class FakeCrawler:
+    async def arun(self, url, config=None, session_id=None):
+        await asyncio.sleep(0)
+        return CrawlResult(url=url, html="<html></html>", success=True, status_code=200)
+
+
+class CountingStrategy(AsyncCrawlerStrategy):
+    def __init__(self):
+        self.fetched = []
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def crawl(self, url, **kwargs):
+        self.fetched.append(url)
+        return AsyncCrawlResponse(
+            html=f"<html><body><h1>{url}</h1>{'<p>Some article text.</p>' * 100}</body></html>",
+            response_headers={},
+            status_code=200,
+        )
+
+
+def _dispatcher(**kwargs) -> MemoryAdaptiveDispatcher:
+    return MemoryAdaptiveDispatcher(
+        memory_threshold_percent=100.0, critical_threshold_percent=100.0, **kwargs
+    )
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path, monkeypatch):
+    manager = AsyncDatabaseManager(content_store="files")
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_store.content_paths = {
+        key: str(tmp_path) for key in manager.content_store.content_paths
+    }
+    await manager.ainit_db()
+    await manager.update_db_schema()
+    manager._initialized = True
+    monkeypatch.setattr(async_webcrawler, "async_db_manager", manager)
+    return manager
+
+
+class TestDispatcherUrlSource:
+    @pytest.mark.asyncio
+    async def test_lookahead_is_bounded(self):
+        read = 0
+
+        async def source():
+            nonlocal read
+            for i in range(2000):
+                read += 1
+                yield f"https://site{i % 50}.com/{i}"
+
+        dispatcher = _dispatcher(max_session_permit=5, url_lookahead=40)
+        done = 0
+        ahead = 0
+        async for result in dispatcher.run_urls_stream(source(), FakeCrawler(), CrawlerRunConfig()):
+            done += 1
+            ahead = max(ahead, read - done)
+        assert done == read == 2000
+        # Task queue + hand-off buffer + running crawls, plus one item in flight
+        assert ahead <= 40 + 5 + 5 + 1
+
+    @pytest.mark.asyncio
+    async def test_endless_source(self):
+        async def source():
+            i = 0
+            while True:
+                i += 1
+                yield {"url": f"https://site{i}.com/", "status": "valid"}
+
+        dispatcher = _dispatcher(max_session_permit=2)
+        stream = dispatcher.run_urls_stream(source(), FakeCrawler(), CrawlerRunConfig())
+        urls = []
+        async for result in stream:
+            urls.append(result.url)
+            if len(urls) == 3:
+                break
+        await stream.aclose()
+        assert len(set(urls)) == 3
+
+    @pytest.mark.asyncio
+    async def test_sync_iterable(self):
+        dispatcher = _dispatcher()
+        urls = (f"https://a{i}.com/" for i in range(7))
+        results = await dispatcher.run_urls(urls, FakeCrawler(), CrawlerRunConfig())
+        assert sorted(r.url for r in results) == sorted(f"https://a{i}.com/" for i in range(7))
+
+
+class TestSemaphoreDispatcherUrlSource:
+    @pytest.mark.asyncio
+    async def test_source_is_read_as_slots_free(self):
+        read = 0
+        done = 0
+        ahead = 0
+
+        class CountingCrawler:
+            async def arun(self, url, config=None, session_id=None):
+                nonlocal done, ahead
+                ahead = max(ahead, read - done)
+                await asyncio.sleep(0.001)
+                done += 1
+                return CrawlResult(url=url, html="<html></html>", success=True, status_code=200)
+
+        def source():
+            nonlocal read
+            for i in range(200):
+                read += 1
+                yield f"https://site{i}.com/"
+
+        results = await SemaphoreDispatcher(semaphore_count=4).run_urls(
+            CountingCrawler(), source(), CrawlerRunConfig()
+        )
+        assert len(results) == 200
+        assert ahead <= 4
+
+
+class TestArunManyUrlSource:
+    @pytest.mark.asyncio
+    async def test_cache_hits_in_stream(self, manager):
+        cached = [f"https://cached.com/{i}" for i in range(20)]
+        fresh = [f"https://new{i}.com/" for i in range(5)]
+        for url in cached:
+            await manager.acache_url(
+                CrawlResult(
+                    url=url,
+                    html=f"<html><body><p>{url}</p></body></html>",
+                    success=True,
+                    markdown=MarkdownGenerationResult(
+                        raw_markdown=url, markdown_with_citations=url, references_markdown=""
+                    ),
+                )
+            )
+
+        strategy = CountingStrategy()
+        crawler = AsyncWebCrawler(crawler_strategy=strategy)
+        crawler.ready = True
+
+        async def source():
+            for url in cached + fresh:
+                yield url
+
+        config = CrawlerRunConfig(cache_mode=CacheMode.ENABLED, stream=True, verbose=False)
+        results = [
+            result
+            async for result in await crawler.arun_many(
+                source(), config=config, dispatcher=_dispatcher()
+            )
+        ]
+        assert sorted(r.url for r in results) == sorted(cached + fresh)
+        assert all(r.success for r in results)
+        assert sorted(strategy.fetched) == sorted(fresh)
+
+        batch = await crawler.arun_many(
+            iter(cached + fresh),
+            config=config.clone(stream=False),
+            dispatcher=_dispatcher(),
+        )
+        assert sorted(r.url for r in batch) == sorted(cached + fresh)
+        assert sorted(strategy.fetched) == sorted(fresh)